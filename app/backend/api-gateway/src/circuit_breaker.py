@@ -0,0 +1,224 @@
+"""
+Circuit breaker та адаптивні таймаути для мікросервісів API Gateway
+
+Коли мікросервіс деградує, breaker розмикається і запити до нього
+одразу отримують 503 замість очікування повного таймауту. Після паузи
+breaker пропускає пробні запити (half-open) і замикається, якщо вони
+успішні. Таймаут очікування відповіді обчислюється з перцентилів
+спостережуваної затримки, а не фіксованих 30 секунд. Затримка ведеться
+окремо для кожного класу маршрутів (префікс шляху), щоб часті швидкі
+запити (/ai/status) не зменшували таймаут повільних (/ai/generate).
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional
+
+from shared.config.logging import get_logger
+
+logger = get_logger("api-gateway-circuit-breaker")
+
+
+class CircuitState(str, Enum):
+    """Стан circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerConfig:
+    """Налаштування circuit breaker"""
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    success_threshold: int = 1
+    timeout_percentile: float = 99.0
+    timeout_multiplier: float = 3.0
+    min_timeout: float = 1.0
+    max_timeout: float = 30.0
+    min_samples: int = 20
+    window_size: int = 200
+    route_depth: int = 2
+    max_routes: int = 100
+
+
+def route_class(path: str, depth: int = 2) -> str:
+    """
+    Клас маршруту для вимірювань затримки
+
+    Args:
+        path: Шлях запиту
+        depth: Кількість сегментів шляху
+
+    Returns:
+        Префікс шляху, напр. /ai/generate для /ai/generate/proposal
+    """
+    segments = [segment for segment in path.split("/") if segment][:depth]
+    return "/" + "/".join(segments)
+
+
+def _percentile(values, percent: float) -> float:
+    """Перцентиль"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """Circuit breaker для одного мікросервісу"""
+
+    def __init__(self, name: str, config: BreakerConfig = None, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.config = config or BreakerConfig()
+        self._clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+        self.latencies: Deque[float] = deque(maxlen=self.config.window_size)
+        # Затримка за класами маршрутів (LRU, не більше max_routes)
+        self.route_latencies: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+        self.stats = {
+            "trips": 0,
+            "rejected": 0,
+            "successes": 0,
+            "failures": 0
+        }
+
+    def _percentile(self, percent: float) -> float:
+        """Перцентиль спостережуваної затримки"""
+        return _percentile(self.latencies, percent)
+
+    def current_timeout(self, route: Optional[str] = None) -> float:
+        """
+        Адаптивний таймаут очікування відповіді
+
+        Args:
+            route: Клас маршруту (None - за всіма запитами)
+
+        Returns:
+            Перцентиль затримки × множник, обмежений min/max;
+            max_timeout, поки не набрано достатньо вимірювань
+        """
+        latencies = self.latencies if route is None else self.route_latencies.get(route, ())
+        if len(latencies) < self.config.min_samples:
+            return self.config.max_timeout
+
+        timeout = _percentile(latencies, self.config.timeout_percentile) * self.config.timeout_multiplier
+        return max(self.config.min_timeout, min(self.config.max_timeout, timeout))
+
+    def _record_latency(self, latency: float, route: Optional[str]):
+        """Запис затримки загалом та для класу маршруту"""
+        self.latencies.append(latency)
+        if route is None:
+            return
+        latencies = self.route_latencies.get(route)
+        if latencies is None:
+            latencies = self.route_latencies[route] = deque(maxlen=self.config.window_size)
+            while len(self.route_latencies) > self.config.max_routes:
+                self.route_latencies.popitem(last=False)
+        else:
+            self.route_latencies.move_to_end(route)
+        latencies.append(latency)
+
+    def allow_request(self) -> bool:
+        """
+        Перевірка чи можна надіслати запит
+
+        Returns:
+            False якщо breaker розімкнений (запит треба відхилити)
+        """
+        if self.state == CircuitState.OPEN:
+            if self._clock() - self.opened_at < self.config.recovery_timeout:
+                self.stats["rejected"] += 1
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self.half_open_in_flight >= self.config.half_open_max_calls:
+                self.stats["rejected"] += 1
+                return False
+            self.half_open_in_flight += 1
+
+        return True
+
+    def record_success(self, latency: float, route: Optional[str] = None):
+        """Запис успішного запиту"""
+        self.stats["successes"] += 1
+        self._record_latency(latency, route)
+        self.consecutive_failures = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+            self.half_open_successes += 1
+            if self.half_open_successes >= self.config.success_threshold:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        """Запис невдалого запиту (таймаут, помилка з'єднання, 5xx)"""
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+            self._trip()
+        elif self.state == CircuitState.CLOSED and self.consecutive_failures >= self.config.failure_threshold:
+            self._trip()
+
+    def record_ignored(self):
+        """Запит скасовано без результату: звільняємо пробний слот, стан не змінюється"""
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_in_flight = max(0, self.half_open_in_flight - 1)
+
+    def retry_after(self) -> int:
+        """Секунди до наступної пробної спроби"""
+        remaining = self.config.recovery_timeout - (self._clock() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def _trip(self):
+        """Розмикання breaker"""
+        self.stats["trips"] += 1
+        self._transition(CircuitState.OPEN)
+        self.opened_at = self._clock()
+        logger.warning(f"⚠️ Circuit breaker {self.name} розімкнено після {self.consecutive_failures} помилок")
+
+    def _transition(self, state: CircuitState):
+        """Зміна стану"""
+        if state != self.state:
+            logger.info(f"Circuit breaker {self.name}: {self.state.value} → {state.value}")
+        self.state = state
+        self.half_open_in_flight = 0
+        self.half_open_successes = 0
+        if state == CircuitState.CLOSED:
+            self.consecutive_failures = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Стан та статистика breaker"""
+        if self.latencies:
+            p50_ms = self._percentile(50) * 1000
+            p99_ms = self._percentile(99) * 1000
+        else:
+            p50_ms = p99_ms = 0.0
+
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "current_timeout_s": round(self.current_timeout(), 3),
+            "latency_p50_ms": round(p50_ms, 3),
+            "latency_p99_ms": round(p99_ms, 3),
+            "routes": {
+                route: {
+                    "current_timeout_s": round(self.current_timeout(route), 3),
+                    "latency_p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+                    "samples": len(latencies)
+                }
+                for route, latencies in self.route_latencies.items()
+            },
+            **self.stats
+        }
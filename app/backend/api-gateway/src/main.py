@@ -4,8 +4,6 @@ API Gateway - Головний файл для маршрутизації зап
 
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import httpx
 import sys
 import os
 from datetime import datetime
@@ -19,6 +17,8 @@ from shared.config.logging import setup_logging, get_logger
 from shared.utils.rate_limiter import rate_limit_middleware
 from shared.utils.validation_middleware import validation_middleware_handler
 from shared.utils.auth_middleware import auth_middleware_handler
+from .response_cache import create_response_cache
+from .upstreams import create_upstream_registry
 
 # Налаштування логування
 setup_logging(service_name="api-gateway")
@@ -84,8 +84,11 @@ async def security_headers_middleware(request: Request, call_next):
 #             detail="Помилка обробки запиту"
 #         )
 
-# HTTP клієнт для запитів до мікросервісів
-http_client = httpx.AsyncClient(timeout=30.0)
+# HTTP клієнти для запитів до мікросервісів (окремий пул на кожен сервіс)
+upstreams = create_upstream_registry()
+
+# Кеш відповідей для ідемпотентних GET запитів (вмикається через settings)
+response_cache = create_response_cache()
 
 # Додаємо роутери
 from .routers import mvp_router
@@ -108,7 +111,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Подія зупинки API Gateway"""
-    await http_client.aclose()
+    await upstreams.aclose()
     logger.info("🛑 API Gateway зупинено")
 
 
@@ -136,7 +139,9 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "api-gateway",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "upstreams": upstreams.get_stats(),
+        "cache": response_cache.get_stats()
     }
 
 
@@ -144,7 +149,7 @@ async def health_check():
 async def test_auth_service():
     """Тест підключення до Auth Service"""
     try:
-        response = await http_client.get(f"{settings.AUTH_SERVICE_URL}/health")
+        response = await upstreams.client(settings.AUTH_SERVICE_URL).get(f"{settings.AUTH_SERVICE_URL}/health")
         return {
             "status": "success",
             "auth_service_url": settings.AUTH_SERVICE_URL,
@@ -164,32 +169,7 @@ async def test_auth_service():
 async def auth_service_route(request: Request, path: str):
     """Маршрутизація запитів до Auth Service"""
     try:
-        # Формуємо URL для Auth Service
-        url = f"{settings.AUTH_SERVICE_URL}/auth/{path}"
-        
-        # Отримуємо тіло запиту
-        body = await request.body()
-        
-        # Формуємо заголовки
-        headers = dict(request.headers)
-        headers.pop("host", None)  # Видаляємо host заголовок
-        
-        # Виконуємо запит до Auth Service
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        # Повертаємо відповідь
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.AUTH_SERVICE_URL), request, f"{settings.AUTH_SERVICE_URL}/auth/{path}")
     except Exception as e:
         logger.error(f"Помилка маршрутизації до Auth Service: {e}")
         logger.error(f"URL: {settings.AUTH_SERVICE_URL}/auth/{path}")
@@ -226,31 +206,7 @@ async def analytics_overview():
 async def upwork_service_route(request: Request, path: str):
     """Маршрутизація запитів до Upwork Service"""
     try:
-        # Формуємо URL для Upwork Service
-        url = f"{settings.UPWORK_SERVICE_URL}/upwork/{path}"
-        
-        # Отримуємо тіло запиту
-        body = await request.body()
-        
-        # Формуємо заголовки
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        # Виконуємо запит до Upwork Service
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.UPWORK_SERVICE_URL), request, f"{settings.UPWORK_SERVICE_URL}/upwork/{path}")
     except Exception as e:
         logger.error(f"Помилка маршрутизації до Upwork Service: {e}")
         raise HTTPException(status_code=500, detail="Помилка Upwork Service")
@@ -262,31 +218,7 @@ async def upwork_service_route(request: Request, path: str):
 async def ai_service_route(request: Request, path: str):
     """Маршрутизація запитів до AI Service"""
     try:
-        # Формуємо URL для AI Service
-        url = f"{settings.AI_SERVICE_URL}/ai/{path}"
-        
-        # Отримуємо тіло запиту
-        body = await request.body()
-        
-        # Формуємо заголовки
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        # Виконуємо запит до AI Service
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.AI_SERVICE_URL), request, f"{settings.AI_SERVICE_URL}/ai/{path}")
     except Exception as e:
         logger.error(f"Помилка маршрутизації до AI Service: {e}")
         raise HTTPException(status_code=500, detail="Помилка AI Service")
@@ -298,31 +230,7 @@ async def ai_service_route(request: Request, path: str):
 async def analytics_service_route(request: Request, path: str):
     """Маршрутизація запитів до Analytics Service"""
     try:
-        # Формуємо URL для Analytics Service
-        url = f"{settings.ANALYTICS_SERVICE_URL}/analytics/{path}"
-        
-        # Отримуємо тіло запиту
-        body = await request.body()
-        
-        # Формуємо заголовки
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        # Виконуємо запит до Analytics Service
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.ANALYTICS_SERVICE_URL), request, f"{settings.ANALYTICS_SERVICE_URL}/analytics/{path}")
     except Exception as e:
         logger.error(f"Помилка маршрутизації до Analytics Service: {e}")
         raise HTTPException(status_code=500, detail="Помилка Analytics Service")
@@ -334,31 +242,7 @@ async def analytics_service_route(request: Request, path: str):
 async def notification_service_route(request: Request, path: str):
     """Маршрутизація запитів до Notification Service"""
     try:
-        # Формуємо URL для Notification Service
-        url = f"{settings.NOTIFICATION_SERVICE_URL}/notifications/{path}"
-        
-        # Отримуємо тіло запиту
-        body = await request.body()
-        
-        # Формуємо заголовки
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        # Виконуємо запит до Notification Service
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.NOTIFICATION_SERVICE_URL), request, f"{settings.NOTIFICATION_SERVICE_URL}/notifications/{path}")
     except Exception as e:
         logger.error(f"Помилка маршрутизації до Notification Service: {e}")
         raise HTTPException(status_code=500, detail="Помилка Notification Service")
@@ -370,25 +254,7 @@ async def notification_service_route(request: Request, path: str):
 async def jobs_legacy_route(request: Request, path: str):
     """Legacy маршрути для вакансій (перенаправляємо на Upwork Service)"""
     try:
-        url = f"{settings.UPWORK_SERVICE_URL}/upwork/jobs/{path}"
-        body = await request.body()
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.UPWORK_SERVICE_URL), request, f"{settings.UPWORK_SERVICE_URL}/upwork/jobs/{path}")
     except Exception as e:
         logger.error(f"Помилка legacy маршрутизації jobs: {e}")
         raise HTTPException(status_code=500, detail="Помилка Upwork Service")
@@ -398,25 +264,7 @@ async def jobs_legacy_route(request: Request, path: str):
 async def applications_legacy_route(request: Request, path: str):
     """Legacy маршрути для заявок (перенаправляємо на Upwork Service)"""
     try:
-        url = f"{settings.UPWORK_SERVICE_URL}/upwork/applications/{path}"
-        body = await request.body()
-        headers = dict(request.headers)
-        headers.pop("host", None)
-        
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            content=body,
-            params=request.query_params
-        )
-        
-        return JSONResponse(
-            content=response.json(),
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
-        
+        return await response_cache.proxy(upstreams.client(settings.UPWORK_SERVICE_URL), request, f"{settings.UPWORK_SERVICE_URL}/upwork/applications/{path}")
     except Exception as e:
         logger.error(f"Помилка legacy маршрутизації applications: {e}")
         raise HTTPException(status_code=500, detail="Помилка Upwork Service")
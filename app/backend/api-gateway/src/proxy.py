@@ -0,0 +1,110 @@
+"""
+Streaming reverse-proxy для API Gateway
+
+Тіла запиту та відповіді передаються між клієнтом і мікросервісом
+частинами (chunk-by-chunk), без буферизації та повторного JSON-парсингу.
+Тому затримка і пам'ять gateway не залежать від розміру payload,
+а не-JSON відповіді (файли, текст, SSE) проксуються без змін.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import httpx
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+
+# Hop-by-hop заголовки (RFC 7230, 6.1) не передаються через проксі
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+})
+
+
+def filter_request_headers(headers: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Підготовка заголовків запиту для мікросервісу
+
+    Args:
+        headers: Заголовки вхідного запиту
+
+    Returns:
+        Заголовки без host та hop-by-hop
+    """
+    return {
+        key: value
+        for key, value in headers
+        if key.lower() != "host" and key.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+
+def filter_response_headers(headers: httpx.Headers) -> List[Tuple[bytes, bytes]]:
+    """
+    Підготовка заголовків відповіді для клієнта
+
+    Args:
+        headers: Заголовки відповіді мікросервісу
+
+    Returns:
+        Сирі заголовки без hop-by-hop (повтори на кшталт set-cookie зберігаються)
+    """
+    return [
+        (key, value)
+        for key, value in headers.raw
+        if key.lower().decode("latin-1") not in HOP_BY_HOP_HEADERS
+    ]
+
+
+def _has_body(request: Request) -> bool:
+    """Перевірка чи запит містить тіло"""
+    if "transfer-encoding" in request.headers:
+        return True
+    return request.headers.get("content-length", "0") not in ("", "0")
+
+
+async def proxy_request(
+    client: httpx.AsyncClient,
+    request: Request,
+    url: str
+) -> StreamingResponse:
+    """
+    Потокове проксування запиту до мікросервісу
+
+    Args:
+        client: Спільний HTTP клієнт
+        request: FastAPI запит
+        url: Повний URL мікросервісу
+
+    Returns:
+        Потокова відповідь мікросервісу
+
+    Raises:
+        httpx.HTTPError: Якщо мікросервіс недоступний
+    """
+    upstream_request = client.build_request(
+        method=request.method,
+        url=url,
+        headers=filter_request_headers(request.headers.items()),
+        params=request.query_params,
+        content=request.stream() if _has_body(request) else None
+    )
+
+    upstream_response = await client.send(upstream_request, stream=True)
+
+    # aiter_raw() не декомпресує тіло, тому content-encoding і
+    # content-length мікросервісу залишаються коректними
+    response = StreamingResponse(
+        upstream_response.aiter_raw(),
+        status_code=upstream_response.status_code,
+        background=BackgroundTask(upstream_response.aclose)
+    )
+    response.raw_headers.extend(filter_response_headers(upstream_response.headers))
+    return response
@@ -0,0 +1,440 @@
+"""
+Кеш відповідей API Gateway для ідемпотентних GET запитів
+
+Кешування вмикається явно (GATEWAY_CACHE_ENABLED) і лише для маршрутів
+з правилами. Ключ кешу будується з шляху, нормалізованого query та
+(за замовчуванням) користувача. Підтримуються stale-while-revalidate
+та ETag / 304 Not Modified.
+
+Конкурентні однакові GET запити (метод, шлях, query, користувач,
+Accept / Accept-Language) до маршрутів з правилами кешування або зі
+списку GATEWAY_COALESCE_ROUTES об'єднуються в один запит до мікросервісу
+(single-flight). Решта GET запитів проксується потоково, без буферизації.
+"""
+
+import asyncio
+import base64
+import fnmatch
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+from fastapi import Request
+from fastapi.responses import Response
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+from shared.utils.single_flight import SingleFlight
+from .proxy import HOP_BY_HOP_HEADERS, filter_request_headers, proxy_request
+
+logger = get_logger("api-gateway-cache")
+
+# Заголовки, що не зберігаються в кеші (тіло зберігається розпакованим)
+UNCACHED_HEADERS = HOP_BY_HOP_HEADERS | {"content-length", "content-encoding", "date", "etag"}
+
+# Заголовки запиту, від яких залежить вміст відповіді (входять у ключі кешу та об'єднання)
+VARY_HEADERS = ("accept", "accept-language")
+
+
+@dataclass
+class CacheRule:
+    """Правило кешування для маршруту"""
+    pattern: str
+    ttl: float
+    stale_while_revalidate: float = 0.0
+    vary_on_user: bool = True
+
+    def matches(self, path: str) -> bool:
+        """Перевірка чи шлях відповідає правилу"""
+        return fnmatch.fnmatchcase(path, self.pattern)
+
+
+# Read-mostly маршрути, що кешуються за замовчуванням
+DEFAULT_CACHE_RULES: List[CacheRule] = [
+    CacheRule("/analytics/*", ttl=30, stale_while_revalidate=60),
+    CacheRule("/upwork/categories", ttl=3600, stale_while_revalidate=3600, vary_on_user=False),
+    CacheRule("/upwork/skills", ttl=3600, stale_while_revalidate=3600, vary_on_user=False),
+]
+
+
+@dataclass
+class CachedResponse:
+    """Збережена відповідь мікросервісу"""
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    etag: str
+    stored_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        """Вік запису в секундах"""
+        return time.time() - self.stored_at
+
+    def to_json(self) -> str:
+        """Серіалізація для Redis"""
+        return json.dumps({
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode("ascii"),
+            "etag": self.etag,
+            "stored_at": self.stored_at
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "CachedResponse":
+        """Десеріалізація з Redis"""
+        raw = json.loads(data)
+        return cls(
+            status_code=raw["status_code"],
+            headers=[tuple(header) for header in raw["headers"]],
+            body=base64.b64decode(raw["body"]),
+            etag=raw["etag"],
+            stored_at=raw["stored_at"]
+        )
+
+
+class MemoryCacheBackend:
+    """In-process LRU backend"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[CachedResponse, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        entry, expires_at = item
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl: float):
+        self._entries[key] = (entry, time.time() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis backend (синхронний клієнт викликається поза event loop)"""
+
+    def __init__(self, redis_client, prefix: str = "gateway_cache:"):
+        self.redis_client = redis_client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await asyncio.to_thread(self.redis_client.get, self.prefix + key)
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка читання кешу з Redis: {e}")
+            return None
+        return CachedResponse.from_json(data) if data else None
+
+    async def set(self, key: str, entry: CachedResponse, ttl: float):
+        try:
+            await asyncio.to_thread(
+                self.redis_client.set, self.prefix + key, entry.to_json(), ex=max(1, int(ttl))
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка запису кешу в Redis: {e}")
+
+
+def compute_etag(body: bytes) -> str:
+    """Сильний ETag з вмісту відповіді"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def normalize_query(request: Request) -> str:
+    """Нормалізований query string (відсортовані параметри)"""
+    return urlencode(sorted(request.query_params.multi_items()))
+
+
+def get_principal(request: Request) -> str:
+    """Ідентифікатор користувача для ключа кешу"""
+    user_id = getattr(request.state, "user_id", None)
+    if user_id:
+        return f"user:{user_id}"
+
+    credentials = request.headers.get("authorization") or request.headers.get("cookie")
+    if credentials:
+        return "auth:" + hashlib.sha256(credentials.encode()).hexdigest()[:32]
+    return "anonymous"
+
+
+def vary_values(request: Request) -> str:
+    """Значення заголовків VARY_HEADERS для ключа"""
+    return "|".join(request.headers.get(name, "") for name in VARY_HEADERS)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Перевірка If-None-Match"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    """Кеш відповідей мікросервісів"""
+
+    def __init__(
+        self,
+        backend,
+        rules: Optional[List[CacheRule]] = None,
+        enabled: bool = True,
+        coalesce: bool = True,
+        coalesce_routes: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            backend: MemoryCacheBackend / RedisCacheBackend
+            rules: Правила кешування
+            enabled: Чи кешуються відповіді
+            coalesce: Чи об'єднуються конкурентні однакові GET запити
+            coalesce_routes: Шаблони шляхів без правил кешування, для яких
+                також об'єднуються запити
+        """
+        self.backend = backend
+        self.rules = rules if rules is not None else list(DEFAULT_CACHE_RULES)
+        self.enabled = enabled
+        self.coalesce = coalesce
+        self.coalesce_routes = list(coalesce_routes or [])
+        self.single_flight = SingleFlight()
+        # Фонові оновлення за ключем: цикл подій тримає на задачі лише слабке посилання
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "not_modified": 0,
+            "revalidations": 0,
+            "uncacheable": 0
+        }
+
+    def find_rule(self, request: Request) -> Optional[CacheRule]:
+        """Пошук правила для запиту"""
+        if not self.enabled or request.method != "GET":
+            return None
+        for rule in self.rules:
+            if rule.matches(request.url.path):
+                return rule
+        return None
+
+    def should_coalesce(self, request: Request) -> bool:
+        """
+        Чи об'єднувати запит з конкурентними однаковими
+
+        Лише GET до маршрутів з правилами кешування (навіть якщо кеш вимкнено)
+        або зі списку coalesce_routes: об'єднана відповідь буферизується.
+        """
+        if not self.coalesce or request.method != "GET":
+            return False
+        path = request.url.path
+        return (
+            any(rule.matches(path) for rule in self.rules)
+            or any(fnmatch.fnmatchcase(path, pattern) for pattern in self.coalesce_routes)
+        )
+
+    def build_key(self, request: Request, rule: CacheRule) -> str:
+        """Ключ кешу: шлях + нормалізований query + Accept / Accept-Language (+ користувач)"""
+        principal = get_principal(request) if rule.vary_on_user else "*"
+        raw_key = f"{request.url.path}?{normalize_query(request)}|{vary_values(request)}|{principal}"
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    def build_flight_key(self, request: Request, rule: Optional[CacheRule]) -> Tuple[str, ...]:
+        """Ключ об'єднання запитів: метод, шлях, нормалізований query, Accept / Accept-Language, користувач"""
+        principal = "*" if rule is not None and not rule.vary_on_user else get_principal(request)
+        return (request.method, request.url.path, normalize_query(request), vary_values(request), principal)
+
+    async def _fetch(self, client: httpx.AsyncClient, request: Request, url: str) -> Tuple[CachedResponse, bool]:
+        """
+        Запит до мікросервісу з буферизацією відповіді
+
+        Returns:
+            (відповідь, чи можна її кешувати)
+        """
+        headers = filter_request_headers(request.headers.items())
+        # Умовні заголовки клієнта стосуються кешу gateway, а не мікросервісу
+        headers.pop("if-none-match", None)
+        headers.pop("if-modified-since", None)
+        # Тіло зберігається розпакованим, тому стиснення обирає сам httpx
+        headers.pop("accept-encoding", None)
+
+        response = await client.get(url, headers=headers, params=request.query_params)
+
+        cache_control = response.headers.get("cache-control", "").lower()
+        cacheable = not (
+            response.status_code != 200
+            or "no-store" in cache_control
+            or "private" in cache_control
+            or "set-cookie" in response.headers
+        )
+
+        body = response.content
+        entry = CachedResponse(
+            status_code=response.status_code,
+            headers=[
+                (key, value)
+                for key, value in response.headers.multi_items()
+                if key.lower() not in UNCACHED_HEADERS
+            ],
+            body=body,
+            etag=response.headers.get("etag") or compute_etag(body)
+        )
+        return entry, cacheable
+
+    async def _fetch_coalesced(
+        self,
+        client: httpx.AsyncClient,
+        request: Request,
+        url: str,
+        rule: Optional[CacheRule]
+    ) -> Tuple[CachedResponse, bool]:
+        """Запит до мікросервісу, спільний для конкурентних однакових запитів"""
+        if not self.should_coalesce(request):
+            return await self._fetch(client, request, url)
+        return await self.single_flight.do(
+            self.build_flight_key(request, rule),
+            lambda: self._fetch(client, request, url)
+        )
+
+    async def _revalidate(self, key: str, rule: CacheRule, client: httpx.AsyncClient, request: Request, url: str):
+        """Фонове оновлення застарілого запису"""
+        try:
+            entry, cacheable = await self._fetch_coalesced(client, request, url, rule)
+            if cacheable:
+                await self.backend.set(key, entry, rule.ttl + rule.stale_while_revalidate)
+            self.stats["revalidations"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка оновлення кешу {request.url.path}: {e}")
+
+    def _build_response(self, request: Request, entry: CachedResponse, cache_status: str) -> Response:
+        """Відповідь з кешу (або 304)"""
+        headers = {"ETag": entry.etag, "Age": str(int(entry.age())), "X-Cache": cache_status}
+
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+
+        response = Response(content=entry.body, status_code=entry.status_code, headers=headers)
+        response.raw_headers.extend(
+            (key.encode("latin-1"), value.encode("latin-1")) for key, value in entry.headers
+        )
+        return response
+
+    @staticmethod
+    def _build_passthrough_response(entry: CachedResponse) -> Response:
+        """Некешована відповідь мікросервісу"""
+        headers = {"ETag": entry.etag} if entry.status_code == 200 else None
+        response = Response(content=entry.body, status_code=entry.status_code, headers=headers)
+        response.raw_headers.extend(
+            (key.encode("latin-1"), value.encode("latin-1")) for key, value in entry.headers
+        )
+        return response
+
+    async def proxy(self, client: httpx.AsyncClient, request: Request, url: str) -> Response:
+        """
+        Проксування запиту з кешуванням та об'єднанням однакових GET
+
+        Args:
+            client: HTTP клієнт мікросервісу
+            request: FastAPI запит
+            url: Повний URL мікросервісу
+
+        Returns:
+            Відповідь з кешу або від мікросервісу
+        """
+        rule = self.find_rule(request)
+        if rule is None:
+            if self.should_coalesce(request):
+                entry, _ = await self._fetch_coalesced(client, request, url, None)
+                return self._build_passthrough_response(entry)
+            # Потокове проксування (великі файли, NDJSON/SSE) без буферизації
+            return await proxy_request(client, request, url)
+
+        key = self.build_key(request, rule)
+        entry = await self.backend.get(key)
+
+        if entry is not None:
+            if entry.age() < rule.ttl:
+                self.stats["hits"] += 1
+                return self._build_response(request, entry, "HIT")
+
+            # Запис застарів, але ще в межах stale-while-revalidate
+            self.stats["stale_hits"] += 1
+            if key not in self._revalidating:
+                task = asyncio.create_task(self._revalidate(key, rule, client, request, url))
+                self._revalidating[key] = task
+                task.add_done_callback(lambda done, key=key: self._revalidating.pop(key, None))
+            return self._build_response(request, entry, "STALE")
+
+        self.stats["misses"] += 1
+        entry, cacheable = await self._fetch_coalesced(client, request, url, rule)
+        if not cacheable:
+            self.stats["uncacheable"] += 1
+            return self._build_passthrough_response(entry)
+
+        await self.backend.set(key, entry, rule.ttl + rule.stale_while_revalidate)
+        return self._build_response(request, entry, "MISS")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу"""
+        lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] + self.stats["stale_hits"]) / lookups if lookups else 0.0
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hit_rate": round(hit_rate, 4),
+            "coalescing": {"enabled": self.coalesce, **self.single_flight.get_stats()},
+            **self.stats
+        }
+
+
+def build_cache_rules() -> List[CacheRule]:
+    """
+    Правила кешування з settings
+
+    GATEWAY_CACHE_RULES доповнює або перевизначає правила за замовчуванням,
+    наприклад: {"/upwork/jobs/*": {"ttl": 15, "stale_while_revalidate": 30}}
+    """
+    rules = {rule.pattern: rule for rule in DEFAULT_CACHE_RULES}
+    for pattern, options in settings.GATEWAY_CACHE_RULES.items():
+        rules[pattern] = CacheRule(pattern=pattern, **options)
+    return list(rules.values())
+
+
+def create_response_cache() -> ResponseCache:
+    """Створення кешу відповідно до settings"""
+    if settings.GATEWAY_CACHE_BACKEND == "redis":
+        from shared.database.connection import db_manager
+
+        if db_manager.redis_client is not None:
+            backend = RedisCacheBackend(db_manager.redis_client)
+        else:
+            logger.warning("⚠️ Redis недоступний, кеш gateway працює в пам'яті")
+            backend = MemoryCacheBackend(settings.GATEWAY_CACHE_MAX_ENTRIES)
+    else:
+        backend = MemoryCacheBackend(settings.GATEWAY_CACHE_MAX_ENTRIES)
+
+    return ResponseCache(
+        backend,
+        build_cache_rules(),
+        enabled=settings.GATEWAY_CACHE_ENABLED,
+        coalesce=settings.GATEWAY_COALESCE_ENABLED,
+        coalesce_routes=settings.GATEWAY_COALESCE_ROUTES
+    )
@@ -2,8 +2,9 @@
 API Router для MVP компонентів
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 import sys
@@ -12,12 +13,13 @@ import os
 # Додаємо шлях до спільних компонентів
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'shared'))
 
-from shared.database.connection import get_db
+from shared.database.connection import get_async_db
 from shared.database.mvp_models import (
     FilterProfile, ProposalTemplate, ProposalDraft, 
     AIInstruction, JobMatch, ABTest, UserAnalytics
 )
 from shared.utils.encryption import encrypt_data, decrypt_data
+from shared.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_filter
 from .auth_router import get_current_user
 from .models import User
 
@@ -45,14 +47,16 @@ async def create_filter_profile(
     working_hours: Optional[dict] = None,
     timezone: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Створення профілю фільтрів"""
     try:
         # Перевіряємо ліміт (до 10 профілів на користувача)
-        existing_profiles = db.query(FilterProfile).filter(
-            FilterProfile.user_id == current_user.id
-        ).count()
+        existing_profiles = await db.scalar(
+            select(func.count()).select_from(FilterProfile).where(
+                FilterProfile.user_id == current_user.id
+            )
+        )
         
         if existing_profiles >= 10:
             raise HTTPException(
@@ -81,8 +85,8 @@ async def create_filter_profile(
         )
         
         db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
         
         return {
             "message": "Профіль фільтрів створено",
@@ -93,7 +97,7 @@ async def create_filter_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка створення профілю: {str(e)}"
@@ -103,13 +107,15 @@ async def create_filter_profile(
 @router.get("/filter-profiles", response_model=List[dict])
 async def get_filter_profiles(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання профілів фільтрів користувача"""
     try:
-        profiles = db.query(FilterProfile).filter(
-            FilterProfile.user_id == current_user.id
-        ).all()
+        profiles = (await db.scalars(
+            select(FilterProfile).where(
+                FilterProfile.user_id == current_user.id
+            )
+        )).all()
         
         return [{
             "id": profile.id,
@@ -160,14 +166,16 @@ async def update_filter_profile(
     is_active: Optional[bool] = None,
     is_paused: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Оновлення профілю фільтрів"""
     try:
-        profile = db.query(FilterProfile).filter(
-            FilterProfile.id == profile_id,
-            FilterProfile.user_id == current_user.id
-        ).first()
+        profile = await db.scalar(
+            select(FilterProfile).where(
+                FilterProfile.id == profile_id,
+                FilterProfile.user_id == current_user.id
+            ).limit(1)
+        )
         
         if not profile:
             raise HTTPException(
@@ -210,7 +218,7 @@ async def update_filter_profile(
             profile.is_paused = is_paused
         
         profile.updated_at = datetime.utcnow()
-        db.commit()
+        await db.commit()
         
         return {
             "message": "Профіль фільтрів оновлено",
@@ -220,7 +228,7 @@ async def update_filter_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка оновлення профілю: {str(e)}"
@@ -231,14 +239,16 @@ async def update_filter_profile(
 async def delete_filter_profile(
     profile_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Видалення профілю фільтрів"""
     try:
-        profile = db.query(FilterProfile).filter(
-            FilterProfile.id == profile_id,
-            FilterProfile.user_id == current_user.id
-        ).first()
+        profile = await db.scalar(
+            select(FilterProfile).where(
+                FilterProfile.id == profile_id,
+                FilterProfile.user_id == current_user.id
+            ).limit(1)
+        )
         
         if not profile:
             raise HTTPException(
@@ -246,8 +256,8 @@ async def delete_filter_profile(
                 detail="Профіль не знайдено"
             )
         
-        db.delete(profile)
-        db.commit()
+        await db.delete(profile)
+        await db.commit()
         
         return {
             "message": "Профіль фільтрів видалено",
@@ -257,7 +267,7 @@ async def delete_filter_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка видалення профілю: {str(e)}"
@@ -277,14 +287,16 @@ async def create_proposal_template(
     style: str = "formal",
     is_default: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Створення шаблону відгуку"""
     try:
         # Перевіряємо ліміт (до 10 шаблонів на користувача)
-        existing_templates = db.query(ProposalTemplate).filter(
-            ProposalTemplate.user_id == current_user.id
-        ).count()
+        existing_templates = await db.scalar(
+            select(func.count()).select_from(ProposalTemplate).where(
+                ProposalTemplate.user_id == current_user.id
+            )
+        )
         
         if existing_templates >= 10:
             raise HTTPException(
@@ -305,8 +317,8 @@ async def create_proposal_template(
         )
         
         db.add(template)
-        db.commit()
-        db.refresh(template)
+        await db.commit()
+        await db.refresh(template)
         
         return {
             "message": "Шаблон відгуку створено",
@@ -317,7 +329,7 @@ async def create_proposal_template(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка створення шаблону: {str(e)}"
@@ -327,13 +339,15 @@ async def create_proposal_template(
 @router.get("/proposal-templates", response_model=List[dict])
 async def get_proposal_templates(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання шаблонів відгуків користувача"""
     try:
-        templates = db.query(ProposalTemplate).filter(
-            ProposalTemplate.user_id == current_user.id
-        ).all()
+        templates = (await db.scalars(
+            select(ProposalTemplate).where(
+                ProposalTemplate.user_id == current_user.id
+            )
+        )).all()
         
         return [{
             "id": template.id,
@@ -373,23 +387,27 @@ async def create_proposal_draft(
     ai_generated: bool = True,
     notes: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Створення чернетки відгуку"""
     try:
         # Перевіряємо ліміт (100 останніх чернеток)
-        existing_drafts = db.query(ProposalDraft).filter(
-            ProposalDraft.user_id == current_user.id
-        ).count()
+        existing_drafts = await db.scalar(
+            select(func.count()).select_from(ProposalDraft).where(
+                ProposalDraft.user_id == current_user.id
+            )
+        )
         
         if existing_drafts >= 100:
             # Видаляємо найстарішу чернетку
-            oldest_draft = db.query(ProposalDraft).filter(
-                ProposalDraft.user_id == current_user.id
-            ).order_by(ProposalDraft.created_at.asc()).first()
+            oldest_draft = await db.scalar(
+                select(ProposalDraft).where(
+                    ProposalDraft.user_id == current_user.id
+                ).order_by(ProposalDraft.created_at.asc()).limit(1)
+            )
             
             if oldest_draft:
-                db.delete(oldest_draft)
+                await db.delete(oldest_draft)
         
         # Створюємо чернетку
         draft = ProposalDraft(
@@ -407,8 +425,8 @@ async def create_proposal_draft(
         )
         
         db.add(draft)
-        db.commit()
-        db.refresh(draft)
+        await db.commit()
+        await db.refresh(draft)
         
         return {
             "message": "Чернетку відгуку створено",
@@ -419,7 +437,7 @@ async def create_proposal_draft(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка створення чернетки: {str(e)}"
@@ -428,21 +446,41 @@ async def create_proposal_draft(
 
 @router.get("/proposal-drafts", response_model=List[dict])
 async def get_proposal_drafts(
+    response: Response,
     status: Optional[str] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Отримання чернеток відгуків користувача"""
+    """
+    Отримання чернеток відгуків користувача (нові першими)
+    
+    Keyset-пагінація за (created_at, id): курсор наступної сторінки
+    повертається в заголовку X-Next-Cursor, тіло відповіді - список, як і раніше.
+    """
     try:
-        query = db.query(ProposalDraft).filter(
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        # Параметр status перекриває модуль fastapi.status
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        query = select(ProposalDraft).where(
             ProposalDraft.user_id == current_user.id
         )
         
         if status:
-            query = query.filter(ProposalDraft.status == status)
+            query = query.where(ProposalDraft.status == status)
+        if after is not None:
+            query = query.where(keyset_filter((ProposalDraft.created_at, ProposalDraft.id), after))
+        
+        drafts = (await db.scalars(
+            query.order_by(ProposalDraft.created_at.desc(), ProposalDraft.id.desc()).limit(limit)
+        )).all()
         
-        drafts = query.order_by(ProposalDraft.created_at.desc()).limit(limit).all()
+        if drafts and len(drafts) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(drafts[-1].created_at, drafts[-1].id)
         
         return [{
             "id": draft.id,
@@ -481,7 +519,7 @@ async def create_ai_instruction(
     instruction_type: str,
     is_default: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Створення AI інструкції"""
     try:
@@ -495,8 +533,8 @@ async def create_ai_instruction(
         )
         
         db.add(instruction)
-        db.commit()
-        db.refresh(instruction)
+        await db.commit()
+        await db.refresh(instruction)
         
         return {
             "message": "AI інструкцію створено",
@@ -507,7 +545,7 @@ async def create_ai_instruction(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Помилка створення AI інструкції: {str(e)}"
@@ -518,18 +556,18 @@ async def create_ai_instruction(
 async def get_ai_instructions(
     instruction_type: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання AI інструкцій користувача"""
     try:
-        query = db.query(AIInstruction).filter(
+        query = select(AIInstruction).where(
             AIInstruction.user_id == current_user.id
         )
         
         if instruction_type:
-            query = query.filter(AIInstruction.instruction_type == instruction_type)
+            query = query.where(AIInstruction.instruction_type == instruction_type)
         
-        instructions = query.all()
+        instructions = (await db.scalars(query)).all()
         
         return [{
             "id": instruction.id,
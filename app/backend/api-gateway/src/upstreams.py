@@ -0,0 +1,389 @@
+"""
+Реєстр HTTP клієнтів для мікросервісів (upstreams) API Gateway
+
+Кожен мікросервіс отримує власний httpx.AsyncClient з окремим пулом
+з'єднань, keep-alive, таймаутами та опціональним HTTP/2. Повільний
+AI Service більше не забирає з'єднання, потрібні Auth чи Upwork Service.
+Кожен пул має власний circuit breaker з адаптивним таймаутом; довгі та
+потокові маршрути (adaptive_timeout_exclude, NDJSON/SSE) зберігають
+налаштований read_timeout.
+"""
+
+import asyncio
+import fnmatch
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+from .circuit_breaker import BreakerConfig, CircuitBreaker, route_class
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = get_logger("api-gateway-upstreams")
+
+
+@dataclass
+class UpstreamConfig:
+    """Налаштування пулу з'єднань для одного мікросервісу"""
+    name: str
+    base_url: str
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 5.0
+    http2: bool = False
+    circuit_breaker: bool = True
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+    breaker_half_open_max_calls: int = 1
+    adaptive_timeout_min: float = 1.0
+    adaptive_timeout_multiplier: float = 3.0
+    # Шаблони шляхів, для яких діє лише read_timeout (без адаптивного обмеження)
+    adaptive_timeout_exclude: List[str] = field(default_factory=list)
+
+    def breaker_config(self) -> BreakerConfig:
+        """Налаштування circuit breaker (максимальний таймаут = read_timeout)"""
+        return BreakerConfig(
+            failure_threshold=self.breaker_failure_threshold,
+            recovery_timeout=self.breaker_recovery_timeout,
+            half_open_max_calls=self.breaker_half_open_max_calls,
+            timeout_multiplier=self.adaptive_timeout_multiplier,
+            min_timeout=self.adaptive_timeout_min,
+            max_timeout=self.read_timeout
+        )
+
+
+# Значення за замовчуванням для окремих сервісів
+DEFAULT_UPSTREAM_OVERRIDES: Dict[str, Dict[str, Any]] = {
+    "ai": {
+        "max_connections": 50,
+        "read_timeout": 120.0,
+        # Потокові відповіді: паузи між подіями не пов'язані з часом до заголовків
+        "adaptive_timeout_exclude": ["/ai/analyze/multiple", "/ai/generate/proposal/stream"]
+    },
+}
+
+# Типи відповідей, що передаються потоком (паузи між частинами довші за час до заголовків)
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+@dataclass
+class PoolStats:
+    """Статистика використання пулу з'єднань"""
+    in_use: int = 0
+    waiting: int = 0
+    total_requests: int = 0
+    pool_timeouts: int = 0
+    wait_times: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record_wait(self, seconds: float):
+        """Запис часу очікування вільного з'єднання"""
+        self.wait_times.append(seconds)
+
+    def summary(self) -> Dict[str, Any]:
+        """Зведена статистика"""
+        waits = sorted(self.wait_times)
+        if waits:
+            avg_wait_ms = sum(waits) / len(waits) * 1000
+            p95_wait_ms = waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000
+            max_wait_ms = waits[-1] * 1000
+        else:
+            avg_wait_ms = p95_wait_ms = max_wait_ms = 0.0
+
+        return {
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "total_requests": self.total_requests,
+            "pool_timeouts": self.pool_timeouts,
+            "avg_wait_ms": round(avg_wait_ms, 3),
+            "p95_wait_ms": round(p95_wait_ms, 3),
+            "max_wait_ms": round(max_wait_ms, 3)
+        }
+
+
+class _BytesStream(httpx.AsyncByteStream):
+    """Потік із готового тіла (для відповідей, сформованих самим gateway)"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        yield self._body
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Потік тіла відповіді, що звільняє слот пулу після закриття"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    Транспорт з обмеженням кількості з'єднань та метриками пулу
+
+    Слот займається до закриття тіла відповіді, тому потокові
+    відповіді враховуються в in_use весь час передачі даних.
+    Поки circuit breaker розімкнений, запити отримують 503 одразу.
+    """
+
+    def __init__(self, config: UpstreamConfig, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.config = config
+        self.stats = PoolStats()
+        self.breaker = CircuitBreaker(config.name, config.breaker_config()) if config.circuit_breaker else None
+        self._slots = asyncio.Semaphore(config.max_connections)
+        self._transport = transport or httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            http2=config.http2 and HTTP2_AVAILABLE
+        )
+
+    def _release(self):
+        """Звільнення слоту"""
+        self.stats.in_use -= 1
+        self._slots.release()
+
+    def _circuit_open_response(self, request: httpx.Request) -> httpx.Response:
+        """Швидка відмова, поки breaker розімкнений"""
+        body = json.dumps({
+            "error": "Service unavailable",
+            "message": f"Сервіс {self.config.name} тимчасово недоступний",
+            "circuit_breaker": self.breaker.state.value
+        }).encode()
+        return httpx.Response(
+            status_code=503,
+            headers={"Content-Type": "application/json", "Retry-After": str(self.breaker.retry_after())},
+            stream=_BytesStream(body),
+            request=request
+        )
+
+    def _route(self, request: httpx.Request) -> str:
+        """Клас маршруту запиту для вимірювань затримки"""
+        return route_class(request.url.path, self.breaker.config.route_depth)
+
+    def _uses_adaptive_timeout(self, request: httpx.Request) -> bool:
+        """Чи обмежувати таймаут читання (не для виключених та потокових маршрутів)"""
+        path = request.url.path
+        if any(fnmatch.fnmatchcase(path, pattern) for pattern in self.config.adaptive_timeout_exclude):
+            return False
+        accept = request.headers.get("accept", "")
+        return not any(media_type in accept for media_type in STREAMING_MEDIA_TYPES)
+
+    def _apply_adaptive_timeout(self, request: httpx.Request):
+        """Обмеження таймауту читання адаптивним значенням breaker для класу маршруту"""
+        if not self._uses_adaptive_timeout(request):
+            return
+        timeouts = dict(request.extensions.get("timeout", {}))
+        adaptive = self.breaker.current_timeout(self._route(request))
+        read_timeout = timeouts.get("read")
+        timeouts["read"] = adaptive if read_timeout is None else min(read_timeout, adaptive)
+        request.extensions["timeout"] = timeouts
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.breaker is not None:
+            if not self.breaker.allow_request():
+                return self._circuit_open_response(request)
+            self._apply_adaptive_timeout(request)
+
+        try:
+            response = await self._send(request)
+        except httpx.PoolTimeout:
+            # Вичерпано пул шлюзу, а не відмова сервісу - стан breaker не змінюється
+            if self.breaker is not None:
+                self.breaker.record_ignored()
+            raise
+        except httpx.HTTPError:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.record_ignored()
+            raise
+
+        if self.breaker is not None:
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success(response.extensions["gateway_latency"], self._route(request))
+        return response
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Надсилання запиту через обмежений пул"""
+        started = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.config.pool_timeout)
+        except asyncio.TimeoutError:
+            self.stats.pool_timeouts += 1
+            raise httpx.PoolTimeout(
+                f"Немає вільних з'єднань до {self.config.name}", request=request
+            )
+        finally:
+            self.stats.waiting -= 1
+
+        self.stats.record_wait(time.perf_counter() - started)
+        self.stats.in_use += 1
+        self.stats.total_requests += 1
+
+        released = False
+
+        def release_once():
+            nonlocal released
+            if not released:
+                released = True
+                self._release()
+
+        sent_at = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release_once()
+            raise
+
+        # Затримка до отримання заголовків (без часу очікування в пулі)
+        extensions = {**response.extensions, "gateway_latency": time.perf_counter() - sent_at}
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, release_once),
+            extensions=extensions
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class UpstreamClientRegistry:
+    """Реєстр HTTP клієнтів, ключем є базовий URL мікросервісу"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, InstrumentedTransport] = {}
+        self._configs: Dict[str, UpstreamConfig] = {}
+
+    def register(self, config: UpstreamConfig, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+        """
+        Реєстрація мікросервісу
+
+        Args:
+            config: Налаштування пулу
+            transport: Базовий транспорт (для тестів)
+
+        Returns:
+            HTTP клієнт мікросервісу
+        """
+        if config.http2 and not HTTP2_AVAILABLE:
+            logger.warning(f"⚠️ HTTP/2 для {config.name} недоступний (пакет h2 не встановлено)")
+
+        instrumented = InstrumentedTransport(config, transport)
+        client = httpx.AsyncClient(
+            transport=instrumented,
+            timeout=httpx.Timeout(
+                connect=config.connect_timeout,
+                read=config.read_timeout,
+                write=config.write_timeout,
+                pool=config.pool_timeout
+            )
+        )
+
+        self._clients[config.base_url] = client
+        self._transports[config.base_url] = instrumented
+        self._configs[config.base_url] = config
+        return client
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """
+        Отримання клієнта мікросервісу
+
+        Args:
+            base_url: Базовий URL (settings.*_SERVICE_URL)
+
+        Returns:
+            HTTP клієнт мікросервісу
+        """
+        if base_url not in self._clients:
+            self.register(UpstreamConfig(name=base_url, base_url=base_url))
+        return self._clients[base_url]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Метрики пулів усіх мікросервісів"""
+        stats = {}
+        for base_url, transport in self._transports.items():
+            config = self._configs[base_url]
+            stats[config.name] = {
+                "base_url": base_url,
+                "max_connections": config.max_connections,
+                "http2": config.http2 and HTTP2_AVAILABLE,
+                **transport.stats.summary(),
+                "circuit_breaker": transport.breaker.get_stats() if transport.breaker else None
+            }
+        return stats
+
+    async def aclose(self):
+        """Закриття всіх клієнтів"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+        self._configs.clear()
+
+
+def build_upstream_configs() -> Dict[str, UpstreamConfig]:
+    """
+    Налаштування пулів з settings
+
+    Пер-сервісні параметри задаються через GATEWAY_UPSTREAM_POOLS,
+    наприклад: {"ai": {"max_connections": 20, "read_timeout": 90}}
+    """
+    services = {
+        "auth": settings.AUTH_SERVICE_URL,
+        "upwork": settings.UPWORK_SERVICE_URL,
+        "ai": settings.AI_SERVICE_URL,
+        "analytics": settings.ANALYTICS_SERVICE_URL,
+        "notification": settings.NOTIFICATION_SERVICE_URL,
+    }
+
+    configs = {}
+    for name, base_url in services.items():
+        overrides = {
+            **DEFAULT_UPSTREAM_OVERRIDES.get(name, {}),
+            **settings.GATEWAY_UPSTREAM_POOLS.get(name, {})
+        }
+        configs[name] = UpstreamConfig(name=name, base_url=base_url, **overrides)
+    return configs
+
+
+def create_upstream_registry() -> UpstreamClientRegistry:
+    """Створення реєстру для всіх мікросервісів"""
+    registry = UpstreamClientRegistry()
+    for config in build_upstream_configs().values():
+        registry.register(config)
+    return registry
@@ -1,9 +1,12 @@
 """
 AI Service - Основний сервіс для AI функціональності з fallback
+
+Запити йдуть через ProviderRouter: найшвидший здоровий провайдер,
+failover при помилці та hedging повільних викликів.
 """
 
-import asyncio
-from typing import Dict, List, Optional, Any
+import time
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import sys
 import os
@@ -11,9 +14,13 @@ import os
 # Додаємо шлях до спільних компонентів
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'shared'))
 
+from shared.config.settings import settings
 from shared.config.logging import get_logger
 from .openai_client import OpenAIClient
 from .claude_client import ClaudeClient
+from .batch_analyzer import BatchAnalyzer, budgets_from_settings
+from .prompt_cache import get_prompt_cache
+from .provider_router import ProviderRouter, router_config_from_settings
 
 logger = get_logger("ai-service")
 
@@ -24,6 +31,18 @@ class AIService:
     def __init__(self):
         self.openai_client = OpenAIClient()
         self.claude_client = ClaudeClient()
+        self.router = ProviderRouter(
+            [("openai", self.openai_client), ("claude", self.claude_client)],
+            router_config_from_settings()
+        )
+        # Спільний для всіх запитів: паралельність і бюджети діють на весь процес,
+        # ліміт провайдера - спільний з роутером
+        self.batch_analyzer = BatchAnalyzer(
+            self.router,
+            concurrency=settings.AI_BATCH_CONCURRENCY,
+            max_attempts=settings.AI_BATCH_MAX_ATTEMPTS,
+            budgets=budgets_from_settings()
+        )
         self._setup_clients()
     
     def _setup_clients(self):
@@ -43,39 +62,37 @@ class AIService:
         if not self.openai_client.is_available() and not self.claude_client.is_available():
             logger.error("❌ Жоден AI клієнт не доступний!")
     
+    async def _route(self, operation: str, action: str, *args) -> Dict[str, Any]:
+        """
+        Виклик операції клієнта через роутер провайдерів
+        
+        Args:
+            operation: Назва методу клієнта
+            action: Опис дії для логів
+            *args: Аргументи методу
+        
+        Returns:
+            Успішний результат провайдера або помилка, якщо жоден не впорався
+        """
+        result = await self.router.call(operation, *args)
+        if result is not None and result["success"]:
+            logger.info(f"✅ {action} через {result.get('model', 'unknown')}")
+            return result
+        if result is not None:
+            logger.warning(f"{action} не вдалося: {result.get('error', 'Unknown error')}")
+        
+        return {
+            "success": False,
+            "error": "Жоден AI сервіс не доступний",
+            "model": "none",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
     async def generate_proposal(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
                               template: Optional[str] = None) -> Dict[str, Any]:
-        """Генерація пропозиції з fallback"""
+        """Генерація пропозиції з вибором провайдера та fallback"""
         try:
-            # Спочатку пробуємо OpenAI
-            if self.openai_client.is_available():
-                logger.info("Спроба генерації пропозиції через OpenAI...")
-                result = await self.openai_client.generate_proposal(job_data, user_profile, template)
-                
-                if result["success"]:
-                    logger.info("✅ Пропозицію згенеровано через OpenAI")
-                    return result
-                else:
-                    logger.warning(f"OpenAI не вдався: {result.get('error', 'Unknown error')}")
-            
-            # Fallback до Claude
-            if self.claude_client.is_available():
-                logger.info("Fallback до Claude для генерації пропозиції...")
-                result = await self.claude_client.generate_proposal(job_data, user_profile, template)
-                
-                if result["success"]:
-                    logger.info("✅ Пропозицію згенеровано через Claude (fallback)")
-                    return result
-                else:
-                    logger.warning(f"Claude не вдався: {result.get('error', 'Unknown error')}")
-            
-            # Якщо обидва не працюють, повертаємо помилку
-            return {
-                "success": False,
-                "error": "Жоден AI сервіс не доступний",
-                "model": "none",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return await self._route("generate_proposal", "Генерація пропозиції", job_data, user_profile, template)
             
         except Exception as e:
             logger.error(f"Помилка генерації пропозиції: {e}")
@@ -87,37 +104,9 @@ class AIService:
             }
     
     async def analyze_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Аналіз вакансії з fallback"""
+        """Аналіз вакансії з вибором провайдера та fallback"""
         try:
-            # Спочатку пробуємо OpenAI
-            if self.openai_client.is_available():
-                logger.info("Спроба аналізу вакансії через OpenAI...")
-                result = await self.openai_client.analyze_job(job_data)
-                
-                if result["success"]:
-                    logger.info("✅ Вакансію проаналізовано через OpenAI")
-                    return result
-                else:
-                    logger.warning(f"OpenAI аналіз не вдався: {result.get('error', 'Unknown error')}")
-            
-            # Fallback до Claude
-            if self.claude_client.is_available():
-                logger.info("Fallback до Claude для аналізу вакансії...")
-                result = await self.claude_client.analyze_job(job_data)
-                
-                if result["success"]:
-                    logger.info("✅ Вакансію проаналізовано через Claude (fallback)")
-                    return result
-                else:
-                    logger.warning(f"Claude аналіз не вдався: {result.get('error', 'Unknown error')}")
-            
-            # Якщо обидва не працюють, повертаємо помилку
-            return {
-                "success": False,
-                "error": "Жоден AI сервіс не доступний",
-                "model": "none",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return await self._route("analyze_job", "Аналіз вакансії", job_data)
             
         except Exception as e:
             logger.error(f"Помилка аналізу вакансії: {e}")
@@ -130,37 +119,9 @@ class AIService:
     
     async def filter_jobs(self, jobs: List[Dict[str, Any]], user_profile: Dict[str, Any], 
                          filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Фільтрація вакансій з fallback"""
+        """Фільтрація вакансій з вибором провайдера та fallback"""
         try:
-            # Спочатку пробуємо OpenAI
-            if self.openai_client.is_available():
-                logger.info("Спроба фільтрації вакансій через OpenAI...")
-                result = await self.openai_client.filter_jobs(jobs, user_profile, filters)
-                
-                if result["success"]:
-                    logger.info("✅ Вакансії відфільтровано через OpenAI")
-                    return result
-                else:
-                    logger.warning(f"OpenAI фільтрація не вдалася: {result.get('error', 'Unknown error')}")
-            
-            # Fallback до Claude
-            if self.claude_client.is_available():
-                logger.info("Fallback до Claude для фільтрації вакансій...")
-                result = await self.claude_client.filter_jobs(jobs, user_profile, filters)
-                
-                if result["success"]:
-                    logger.info("✅ Вакансії відфільтровано через Claude (fallback)")
-                    return result
-                else:
-                    logger.warning(f"Claude фільтрація не вдалася: {result.get('error', 'Unknown error')}")
-            
-            # Якщо обидва не працюють, повертаємо помилку
-            return {
-                "success": False,
-                "error": "Жоден AI сервіс не доступний",
-                "model": "none",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return await self._route("filter_jobs", "Фільтрація вакансій", jobs, user_profile, filters)
             
         except Exception as e:
             logger.error(f"Помилка фільтрації вакансій: {e}")
@@ -171,6 +132,29 @@ class AIService:
                 "timestamp": datetime.utcnow().isoformat()
             }
     
+    async def stream_proposal(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
+                              template: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Потокова генерація пропозиції через роутер провайдерів
+        
+        Args:
+            job_data: Дані вакансії
+            user_profile: Профіль фрілансера
+            template: Тип шаблону
+        
+        Yields:
+            {"event": "token", "text": ..., "model": ...} по мірі генерації;
+            {"event": "error", "error": ..., "partial": чи були токени} при помилці
+        """
+        emitted = False
+        try:
+            async for provider, text in self.router.stream("stream_proposal", job_data, user_profile, template):
+                emitted = True
+                yield {"event": "token", "text": text, "model": provider.client.MODEL_NAME}
+        except Exception as e:
+            logger.error(f"Помилка потокової генерації пропозиції: {e}")
+            yield {"event": "error", "error": str(e), "partial": emitted}
+    
     async def generate_proposal_with_template(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
                                             template_content: str) -> Dict[str, Any]:
         """Генерація пропозиції з використанням шаблону"""
@@ -191,21 +175,10 @@ class AIService:
             }
     
     async def analyze_multiple_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Аналіз кількох вакансій"""
+        """Аналіз кількох вакансій (результати в порядку вхідного списку)"""
         try:
-            results = []
-            
-            for i, job in enumerate(jobs):
-                logger.info(f"Аналіз вакансії {i+1}/{len(jobs)}: {job.get('title', 'Unknown')}")
-                
-                result = await self.analyze_job(job)
-                result['job_id'] = job.get('id', f'job_{i}')
-                result['job_title'] = job.get('title', 'Unknown')
-                
-                results.append(result)
-                
-                # Невелика затримка між запитами
-                await asyncio.sleep(0.5)
+            logger.info(f"Аналіз {len(jobs)} вакансій")
+            results = [result async for result in self.batch_analyzer.stream(jobs, ordered=True)]
             
             return {
                 "success": True,
@@ -222,12 +195,46 @@ class AIService:
                 "timestamp": datetime.utcnow().isoformat()
             }
     
+    async def stream_multiple_jobs(self, jobs: List[Dict[str, Any]],
+                                   ordered: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Потоковий аналіз кількох вакансій
+        
+        Args:
+            jobs: Вакансії
+            ordered: Віддавати в порядку вхідного списку замість порядку готовності
+        
+        Yields:
+            Події "result" для кожної вакансії та підсумкова подія "done"
+        """
+        started = time.perf_counter()
+        succeeded = 0
+        try:
+            async for result in self.batch_analyzer.stream(jobs, ordered=ordered):
+                succeeded += bool(result["success"])
+                yield {"event": "result", **result}
+        except Exception as e:
+            logger.error(f"Помилка потокового аналізу вакансій: {e}")
+            yield {"event": "error", "error": str(e), "timestamp": datetime.utcnow().isoformat()}
+            return
+        
+        yield {
+            "event": "done",
+            "total_jobs": len(jobs),
+            "succeeded": succeeded,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
     def get_service_status(self) -> Dict[str, Any]:
         """Отримання статусу AI сервісів"""
         return {
             "openai_available": self.openai_client.is_available(),
             "claude_available": self.claude_client.is_available(),
             "any_available": self.openai_client.is_available() or self.claude_client.is_available(),
+            "router": self.router.get_stats(),
+            "batch": self.batch_analyzer.get_stats(),
+            "prompt_cache": get_prompt_cache().get_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -247,11 +254,12 @@ class AIService:
                 "hourly_rate": "$50"
             }
             
+            # Кеш промптів оминаємо: перевіряється саме доступність моделі
             # Тестуємо OpenAI
             openai_test = None
             if self.openai_client.is_available():
                 try:
-                    openai_test = await self.openai_client.analyze_job(test_job)
+                    openai_test = await self.openai_client.analyze_job(test_job, use_cache=False)
                 except Exception as e:
                     openai_test = {"success": False, "error": str(e)}
             else:
@@ -261,7 +269,7 @@ class AIService:
             claude_test = None
             if self.claude_client.is_available():
                 try:
-                    claude_test = await self.claude_client.analyze_job(test_job)
+                    claude_test = await self.claude_client.analyze_job(test_job, use_cache=False)
                 except Exception as e:
                     claude_test = {"success": False, "error": str(e)}
             else:
@@ -0,0 +1,268 @@
+"""
+Пакетний аналіз вакансій з обмеженою паралельністю
+
+BatchAnalyzer запускає аналізи одночасно (не більше concurrency на процес).
+Для кожного LLM провайдера ведеться бюджет токенів за хвилину та
+адаптивний backoff: 429 від моделі призупиняє провайдера на Retry-After або
+експоненційно зростаючу паузу, успішні відповіді її зменшують. Поки
+провайдер на паузі, вакансії йдуть до іншого доступного провайдера.
+Відповіді з кешу промптів бюджет не витрачають, а backoff зменшують лише
+успішні відповіді.
+Виклики йдуть через ProviderRouter: діє той самий ліміт паралельності
+провайдера, а затримки та помилки потрапляють у його вікно вимірювань.
+Результати віддаються по мірі готовності або в порядку вхідного списку.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+from .provider_router import ProviderHealth, ProviderRouter
+
+logger = get_logger("ai-batch-analyzer")
+
+# Відповідає max_tokens у _call_gpt4 / _call_claude
+OUTPUT_TOKENS = 2000
+
+
+def estimate_tokens(client: Any, job: Dict[str, Any]) -> int:
+    """Оцінка токенів виклику: ~4 символи промпту на токен плюс ліміт відповіді"""
+    return len(client._create_job_analysis_prompt(job)) // 4 + OUTPUT_TOKENS
+
+
+class ProviderBudget:
+    """
+    Бюджет токенів та адаптивний backoff одного LLM провайдера
+
+    Токени поповнюються зі швидкістю tokens_per_minute / 60 за секунду
+    (0 - без обмеження). on_rate_limit() подвоює паузу (від backoff_base до
+    backoff_max) і блокує провайдера, on_success() зменшує її вдвічі.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tokens_per_minute: int = 0,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        self.name = name
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60
+        self.tokens = self.capacity
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.backoff = 0.0
+        self.paused_until = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self.stats = {
+            "calls": 0,
+            "throttled": 0,
+            "rate_limited": 0
+        }
+
+    def pause_remaining(self) -> float:
+        """Секунди до кінця паузи backoff"""
+        return max(0.0, self.paused_until - self._clock())
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Спроба взяти токени для виклику
+
+        Args:
+            tokens: Оцінка токенів виклику
+
+        Returns:
+            0, якщо токени взято, інакше секунди до наступної спроби
+        """
+        now = self._clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if not self.capacity:
+            return 0.0
+
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        # Виклик більший за весь бюджет чекає на повний бюджет
+        tokens = min(tokens, self.capacity)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens: int):
+        """Очікування бюджету та кінця паузи"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                self.stats["calls"] += 1
+                return
+            self.stats["throttled"] += 1
+            await self._sleep(wait)
+
+    def on_rate_limit(self, retry_after: Optional[float] = None) -> float:
+        """
+        Реакція на 429: збільшення паузи провайдера
+
+        Args:
+            retry_after: Retry-After з відповіді (секунди)
+
+        Returns:
+            Тривалість паузи в секундах
+        """
+        self.backoff = min(self.backoff_max, self.backoff * 2 if self.backoff else self.backoff_base)
+        delay = max(self.backoff, retry_after or 0.0)
+        self.paused_until = max(self.paused_until, self._clock() + delay)
+        self.stats["rate_limited"] += 1
+        logger.warning(f"⏳ {self.name}: 429, пауза {delay:.1f}с")
+        return delay
+
+    def on_success(self):
+        """Успішна відповідь: зменшення паузи"""
+        self.backoff = self.backoff / 2 if self.backoff > self.backoff_base else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика провайдера"""
+        return {
+            "backoff": self.backoff,
+            "paused_for": round(self.pause_remaining(), 3),
+            "tokens_per_minute": int(self.capacity),
+            **self.stats
+        }
+
+
+class BatchAnalyzer:
+    """Паралельний аналіз вакансій з fallback між провайдерами"""
+
+    def __init__(
+        self,
+        router: ProviderRouter,
+        concurrency: int = 5,
+        max_attempts: int = 4,
+        budgets: Optional[Dict[str, ProviderBudget]] = None
+    ):
+        """
+        Args:
+            router: Роутер провайдерів (спільні ліміти паралельності та вимірювання)
+            concurrency: Максимум одночасних аналізів
+            max_attempts: Максимум проходів по провайдерах при 429
+            budgets: Бюджети провайдерів (за замовчуванням без обмеження токенів)
+        """
+        self.router = router
+        self.max_attempts = max_attempts
+        self.budgets = budgets or {}
+        for provider in router.providers:
+            self.budgets.setdefault(provider.name, ProviderBudget(provider.name))
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _ready_providers(self) -> List[ProviderHealth]:
+        """Доступні провайдери в порядку пріоритету; ті, що на паузі, - в кінці"""
+        available = [provider for provider in self.router.providers if provider.is_available()]
+        return sorted(available, key=lambda provider: self.budgets[provider.name].pause_remaining())
+
+    async def analyze(self, index: int, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Аналіз однієї вакансії
+
+        Провайдери пробуються по черзі; новий прохід робиться лише якщо
+        хоча б один провайдер відповів 429.
+
+        Args:
+            index: Позиція вакансії у вхідному списку
+            job: Дані вакансії
+
+        Returns:
+            Результат аналізу з index, job_id, job_title та attempts
+        """
+        async with self._semaphore:
+            result = None
+            attempts = 0
+            for _ in range(self.max_attempts):
+                rate_limited = False
+                for provider in self._ready_providers():
+                    budget = self.budgets[provider.name]
+                    # Відповідь з кешу промптів не витрачає токени провайдера
+                    if not await provider.client.is_analysis_cached(job):
+                        await budget.acquire(estimate_tokens(provider.client, job))
+                    attempts += 1
+                    result = await self.router.invoke(provider, "analyze_job", job)
+                    if result.get("rate_limited"):
+                        budget.on_rate_limit(result.get("retry_after"))
+                        rate_limited = True
+                        continue
+                    if result["success"]:
+                        budget.on_success()
+                        break
+                    logger.warning(f"{provider.name} аналіз не вдався: {result.get('error', 'Unknown error')}")
+                if not rate_limited or (result and result["success"]):
+                    break
+
+        if result is None:
+            result = {
+                "success": False,
+                "error": "Жоден AI сервіс не доступний",
+                "model": "none",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        result["index"] = index
+        result["job_id"] = job.get("id", f"job_{index}")
+        result["job_title"] = job.get("title", "Unknown")
+        result["attempts"] = attempts
+        return result
+
+    async def stream(self, jobs: List[Dict[str, Any]], ordered: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Результати аналізу по мірі готовності
+
+        Args:
+            jobs: Вакансії
+            ordered: Віддавати в порядку вхідного списку
+
+        Yields:
+            Результати аналізу
+        """
+        tasks = [asyncio.create_task(self.analyze(index, job)) for index, job in enumerate(jobs)]
+        try:
+            for future in (tasks if ordered else asyncio.as_completed(tasks)):
+                yield await future
+        finally:
+            # Клієнт відключився або сталася помилка - незавершені аналізи не потрібні
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика провайдерів"""
+        return {name: budget.get_stats() for name, budget in self.budgets.items()}
+
+
+def budgets_from_settings() -> Dict[str, ProviderBudget]:
+    """Бюджети провайдерів за налаштуваннями"""
+    return {
+        name: ProviderBudget(
+            name,
+            tokens_per_minute=tokens_per_minute,
+            backoff_base=settings.AI_BATCH_BACKOFF_BASE,
+            backoff_max=settings.AI_BATCH_BACKOFF_MAX
+        )
+        for name, tokens_per_minute in (
+            ("openai", settings.OPENAI_TOKENS_PER_MINUTE),
+            ("claude", settings.CLAUDE_TOKENS_PER_MINUTE)
+        )
+    }
+
+
+def format_event(event: Dict[str, Any], media_type: str) -> str:
+    """Подія потоку у форматі NDJSON або SSE"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if media_type == "text/event-stream":
+        return f"event: {event.get('event', 'message')}\ndata: {data}\n\n"
+    return data + "\n"
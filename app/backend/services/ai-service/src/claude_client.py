@@ -1,11 +1,15 @@
 """
 Claude Client для fallback інтеграції з Anthropic Claude
+
+Виклики йдуть через AsyncAnthropic: очікування відповіді не блокує
+event loop, а всі екземпляри ClaudeClient ділять один клієнт і пул
+з'єднань. Скасування задачі перериває HTTP запит.
 """
 
 import anthropic
 import json
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import sys
 import os
@@ -15,13 +19,54 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'share
 
 from shared.config.settings import settings
 from shared.config.logging import get_logger
+from .prompt_cache import get_prompt_cache
 
 logger = get_logger("claude-client")
 
+SYSTEM_PROMPT = "Ти - експерт з Upwork та фрілансингу. Надавай корисні та практичні поради."
+
+# Спільний async клієнт Anthropic (один пул з'єднань на процес)
+_async_client: Optional[anthropic.AsyncAnthropic] = None
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Async клієнт Anthropic (створюється при першому зверненні)"""
+    global _async_client
+    if _async_client is None:
+        _async_client = anthropic.AsyncAnthropic(
+            api_key=settings.CLAUDE_API_KEY,
+            base_url=settings.CLAUDE_BASE_URL,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+    return _async_client
+
+
+async def close_anthropic_client():
+    """Закриття спільного клієнта Anthropic"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def rate_limit_details(error: Exception) -> Dict[str, Any]:
+    """Поля результату для 429 від Anthropic: rate_limited та retry_after (секунди або None)"""
+    if not isinstance(error, anthropic.RateLimitError):
+        return {}
+    try:
+        retry_after = float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    return {"rate_limited": True, "retry_after": retry_after}
+
 
 class ClaudeClient:
     """Клієнт для роботи з Anthropic Claude API"""
     
+    # Назва моделі в результатах
+    MODEL_NAME = "claude-3-sonnet"
+    
     def __init__(self):
         self.client = None
         self._setup_client()
@@ -34,7 +79,7 @@ class ClaudeClient:
                 logger.warning("Claude API ключ не налаштований")
                 return
             
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = get_anthropic_client()
             logger.info("Claude клієнт успішно налаштований")
             
         except Exception as e:
@@ -70,11 +115,18 @@ class ClaudeClient:
                 "success": False,
                 "error": str(e),
                 "model": "claude-3-sonnet",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
-    async def analyze_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Аналіз вакансії за допомогою Claude"""
+    async def analyze_job(self, job_data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Аналіз вакансії за допомогою Claude
+
+        Args:
+            job_data: Дані вакансії
+            use_cache: False - завжди звертатися до моделі (перевірка з'єднання)
+        """
         try:
             if not self.client:
                 raise Exception("Claude клієнт не налаштований")
@@ -83,7 +135,7 @@ class ClaudeClient:
             prompt = self._create_job_analysis_prompt(job_data)
             
             # Викликаємо Claude
-            response = await self._call_claude(prompt)
+            response = await self._call_claude_cached(prompt, use_cache)
             
             # Парсимо відповідь
             analysis = self._parse_analysis_response(response)
@@ -101,7 +153,8 @@ class ClaudeClient:
                 "success": False,
                 "error": str(e),
                 "model": "claude-3-sonnet",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
     async def filter_jobs(self, jobs: List[Dict[str, Any]], user_profile: Dict[str, Any], 
@@ -115,7 +168,7 @@ class ClaudeClient:
             prompt = self._create_filtering_prompt(jobs, user_profile, filters)
             
             # Викликаємо Claude
-            response = await self._call_claude(prompt)
+            response = await self._call_claude_cached(prompt)
             
             # Парсимо відповідь
             filtered_jobs = self._parse_filtering_response(response, jobs)
@@ -133,9 +186,50 @@ class ClaudeClient:
                 "success": False,
                 "error": str(e),
                 "model": "claude-3-sonnet",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
+    async def stream_proposal(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
+                              template: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Потокова генерація пропозиції за допомогою Claude
+        
+        Args:
+            job_data: Дані вакансії
+            user_profile: Профіль фрілансера
+            template: Тип шаблону
+        
+        Yields:
+            Фрагменти тексту відповіді по мірі генерації
+        
+        Raises:
+            Exception: Клієнт не налаштований або помилка API
+        """
+        if not self.client:
+            raise Exception("Claude клієнт не налаштований")
+        
+        prompt = self._create_proposal_prompt(job_data, user_profile, template)
+        stream = await self.client.messages.create(
+            model="claude-3-sonnet-20240229",
+            max_tokens=2000,
+            temperature=0.7,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"{SYSTEM_PROMPT}\n\n{prompt}"
+                }
+            ],
+            stream=True,
+            timeout=settings.LLM_REQUEST_TIMEOUT
+        )
+        try:
+            async for event in stream:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
+        finally:
+            await stream.close()
+    
     def _create_proposal_prompt(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
                                template: Optional[str] = None) -> str:
         """Створення промпту для генерації пропозиції"""
@@ -269,23 +363,59 @@ class ClaudeClient:
 """
         return prompt
     
-    async def _call_claude(self, prompt: str) -> str:
-        """Виклик Claude API"""
+    async def is_analysis_cached(self, job_data: Dict[str, Any]) -> bool:
+        """Чи є аналіз вакансії в кеші промптів (виклик моделі не знадобиться)"""
+        return await get_prompt_cache().contains(
+            "claude-3-sonnet-20240229",
+            self._create_job_analysis_prompt(job_data),
+            settings.LLM_ANALYSIS_TEMPERATURE,
+            system=SYSTEM_PROMPT
+        )
+    
+    async def _call_claude_cached(self, prompt: str, use_cache: bool = True) -> str:
+        """Детермінований виклик Claude (аналіз, фільтрація) через кеш промптів"""
+        temperature = settings.LLM_ANALYSIS_TEMPERATURE
+        if not use_cache:
+            return await self._call_claude(prompt, temperature=temperature)
+        return await get_prompt_cache().get_or_call(
+            "claude-3-sonnet-20240229",
+            prompt,
+            temperature,
+            lambda: self._call_claude(prompt, temperature=temperature),
+            system=SYSTEM_PROMPT
+        )
+    
+    async def _call_claude(self, prompt: str, timeout: Optional[float] = None, temperature: float = 0.7) -> str:
+        """
+        Виклик Claude API
+        
+        Args:
+            prompt: Промпт
+            timeout: Таймаут виклику в секундах (за замовчуванням LLM_REQUEST_TIMEOUT)
+            temperature: Температура генерації
+        
+        Returns:
+            Текст відповіді
+        """
         try:
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-3-sonnet-20240229",
                 max_tokens=2000,
-                temperature=0.7,
+                temperature=temperature,
                 messages=[
                     {
                         "role": "user",
-                        "content": f"Ти - експерт з Upwork та фрілансингу. Надавай корисні та практичні поради.\n\n{prompt}"
+                        "content": f"{SYSTEM_PROMPT}\n\n{prompt}"
                     }
-                ]
+                ],
+                timeout=timeout or settings.LLM_REQUEST_TIMEOUT
             )
             
             return response.content[0].text
             
+        except asyncio.CancelledError:
+            logger.info("Виклик Claude скасовано")
+            raise
         except Exception as e:
             logger.error(f"Помилка виклику Claude: {e}")
             raise
@@ -11,8 +11,9 @@ import os
 # Додаємо шлях до спільних компонентів
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'shared'))
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from shared.config.logging import get_logger
 
@@ -21,6 +22,10 @@ from .ai_service import AIService
 from .proposal_generator import ProposalGenerator
 from .job_analyzer import JobAnalyzer
 from .smart_filter import SmartFilter
+from .openai_client import close_openai_client
+from .claude_client import close_anthropic_client
+from .batch_analyzer import format_event
+from .prompt_cache import close_prompt_cache
 
 logger = get_logger("ai-service-main")
 
@@ -88,6 +93,14 @@ class ProposalOptimizationRequest(BaseModel):
     user_profile: Optional[UserProfile] = None
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Подія зупинки сервісу: закриття пулів з'єднань LLM та кешу промптів"""
+    await close_openai_client()
+    await close_anthropic_client()
+    close_prompt_cache()
+
+
 @app.get("/")
 async def root():
     """Кореневий endpoint"""
@@ -140,6 +153,33 @@ async def generate_proposal(request: ProposalRequest):
         )
 
 
+@app.post("/ai/generate/proposal/stream")
+async def generate_proposal_stream(request: ProposalRequest):
+    """
+    Потокова генерація пропозиції (Server-Sent Events)
+    
+    Події: start (одразу), delta з текстом полів та section із завершеними
+    полями по мірі генерації, analysis, done з тим самим результатом, що й
+    /ai/generate/proposal, або error.
+    """
+    job_data = request.job_data.dict()
+    user_profile = request.user_profile.dict() if request.user_profile else {}
+    
+    async def events():
+        try:
+            async for event in proposal_generator.stream_proposal(job_data, user_profile, request.template):
+                yield format_event(event, "text/event-stream")
+        except Exception as e:
+            logger.error(f"❌ Помилка потокової генерації пропозиції: {e}")
+            yield format_event({"event": "error", "error": "Помилка генерації пропозиції"}, "text/event-stream")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/ai/analyze/job")
 async def analyze_job(request: JobAnalysisRequest):
     """Аналіз вакансії з покращеним JobAnalyzer"""
@@ -252,9 +292,49 @@ async def test_ai_connection():
         )
 
 
+# Формати потокової відповіді /ai/analyze/multiple
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+
 @app.post("/ai/analyze/multiple")
-async def analyze_multiple_jobs(jobs: list):
-    """Аналіз кількох вакансій"""
+async def analyze_multiple_jobs(
+    jobs: List[Dict[str, Any]],
+    request: Request,
+    stream: Optional[str] = None,
+    ordered: bool = False
+):
+    """
+    Аналіз кількох вакансій
+    
+    Без stream повертає JSON з усіма результатами в порядку вхідного списку.
+    stream=ndjson / stream=sse (або Accept: application/x-ndjson /
+    text/event-stream) віддає кожен результат одразу після готовності;
+    ordered=true зберігає порядок вхідного списку.
+    """
+    if stream and stream not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Невідомий формат потоку: {stream}"
+        )
+    accept = request.headers.get("accept", "")
+    media_type = STREAM_MEDIA_TYPES.get(stream) if stream else next(
+        (media for media in STREAM_MEDIA_TYPES.values() if media in accept), None
+    )
+    
+    if media_type:
+        async def events():
+            async for event in ai_service.stream_multiple_jobs(jobs, ordered=ordered):
+                yield format_event(event, media_type)
+        
+        return StreamingResponse(
+            events(),
+            media_type=media_type,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
     try:
         result = await ai_service.analyze_multiple_jobs(jobs)
         return result
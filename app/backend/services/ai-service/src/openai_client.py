@@ -1,11 +1,15 @@
 """
 OpenAI Client для інтеграції з GPT-4
+
+Виклики йдуть через AsyncOpenAI: очікування відповіді не блокує
+event loop, а всі екземпляри OpenAIClient ділять один клієнт і пул
+з'єднань. Скасування задачі перериває HTTP запит.
 """
 
 import openai
 import json
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import sys
 import os
@@ -15,13 +19,54 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'share
 
 from shared.config.settings import settings
 from shared.config.logging import get_logger
+from .prompt_cache import get_prompt_cache
 
 logger = get_logger("openai-client")
 
+SYSTEM_PROMPT = "Ти - експерт з Upwork та фрілансингу. Надавай корисні та практичні поради."
+
+# Спільний async клієнт OpenAI (один пул з'єднань на процес)
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    """Async клієнт OpenAI (створюється при першому зверненні)"""
+    global _async_client
+    if _async_client is None:
+        _async_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+    return _async_client
+
+
+async def close_openai_client():
+    """Закриття спільного клієнта OpenAI"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def rate_limit_details(error: Exception) -> Dict[str, Any]:
+    """Поля результату для 429 від OpenAI: rate_limited та retry_after (секунди або None)"""
+    if not isinstance(error, openai.RateLimitError):
+        return {}
+    try:
+        retry_after = float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    return {"rate_limited": True, "retry_after": retry_after}
+
 
 class OpenAIClient:
     """Клієнт для роботи з OpenAI API"""
     
+    # Назва моделі в результатах
+    MODEL_NAME = "gpt-4"
+    
     def __init__(self):
         self.client = None
         self._setup_client()
@@ -34,7 +79,7 @@ class OpenAIClient:
                 logger.warning("OpenAI API ключ не налаштований")
                 return
             
-            self.client = openai.OpenAI(api_key=api_key)
+            self.client = get_openai_client()
             logger.info("OpenAI клієнт успішно налаштований")
             
         except Exception as e:
@@ -70,11 +115,18 @@ class OpenAIClient:
                 "success": False,
                 "error": str(e),
                 "model": "gpt-4",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
-    async def analyze_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Аналіз вакансії за допомогою GPT-4"""
+    async def analyze_job(self, job_data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Аналіз вакансії за допомогою GPT-4
+
+        Args:
+            job_data: Дані вакансії
+            use_cache: False - завжди звертатися до моделі (перевірка з'єднання)
+        """
         try:
             if not self.client:
                 raise Exception("OpenAI клієнт не налаштований")
@@ -83,7 +135,7 @@ class OpenAIClient:
             prompt = self._create_job_analysis_prompt(job_data)
             
             # Викликаємо GPT-4
-            response = await self._call_gpt4(prompt)
+            response = await self._call_gpt4_cached(prompt, use_cache)
             
             # Парсимо відповідь
             analysis = self._parse_analysis_response(response)
@@ -101,7 +153,8 @@ class OpenAIClient:
                 "success": False,
                 "error": str(e),
                 "model": "gpt-4",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
     async def filter_jobs(self, jobs: List[Dict[str, Any]], user_profile: Dict[str, Any], 
@@ -115,7 +168,7 @@ class OpenAIClient:
             prompt = self._create_filtering_prompt(jobs, user_profile, filters)
             
             # Викликаємо GPT-4
-            response = await self._call_gpt4(prompt)
+            response = await self._call_gpt4_cached(prompt)
             
             # Парсимо відповідь
             filtered_jobs = self._parse_filtering_response(response, jobs)
@@ -133,9 +186,48 @@ class OpenAIClient:
                 "success": False,
                 "error": str(e),
                 "model": "gpt-4",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow().isoformat(),
+                **rate_limit_details(e)
             }
     
+    async def stream_proposal(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
+                              template: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Потокова генерація пропозиції за допомогою GPT-4
+        
+        Args:
+            job_data: Дані вакансії
+            user_profile: Профіль фрілансера
+            template: Тип шаблону
+        
+        Yields:
+            Фрагменти тексту відповіді по мірі генерації
+        
+        Raises:
+            Exception: Клієнт не налаштований або помилка API
+        """
+        if not self.client:
+            raise Exception("OpenAI клієнт не налаштований")
+        
+        prompt = self._create_proposal_prompt(job_data, user_profile, template)
+        stream = await self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=2000,
+            temperature=0.7,
+            stream=True,
+            timeout=settings.LLM_REQUEST_TIMEOUT
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+    
     def _create_proposal_prompt(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
                                template: Optional[str] = None) -> str:
         """Створення промпту для генерації пропозиції"""
@@ -269,22 +361,57 @@ class OpenAIClient:
 """
         return prompt
     
-    async def _call_gpt4(self, prompt: str) -> str:
-        """Виклик GPT-4 API"""
+    async def is_analysis_cached(self, job_data: Dict[str, Any]) -> bool:
+        """Чи є аналіз вакансії в кеші промптів (виклик моделі не знадобиться)"""
+        return await get_prompt_cache().contains(
+            "gpt-4",
+            self._create_job_analysis_prompt(job_data),
+            settings.LLM_ANALYSIS_TEMPERATURE,
+            system=SYSTEM_PROMPT
+        )
+    
+    async def _call_gpt4_cached(self, prompt: str, use_cache: bool = True) -> str:
+        """Детермінований виклик GPT-4 (аналіз, фільтрація) через кеш промптів"""
+        temperature = settings.LLM_ANALYSIS_TEMPERATURE
+        if not use_cache:
+            return await self._call_gpt4(prompt, temperature=temperature)
+        return await get_prompt_cache().get_or_call(
+            "gpt-4",
+            prompt,
+            temperature,
+            lambda: self._call_gpt4(prompt, temperature=temperature),
+            system=SYSTEM_PROMPT
+        )
+    
+    async def _call_gpt4(self, prompt: str, timeout: Optional[float] = None, temperature: float = 0.7) -> str:
+        """
+        Виклик GPT-4 API
+        
+        Args:
+            prompt: Промпт
+            timeout: Таймаут виклику в секундах (за замовчуванням LLM_REQUEST_TIMEOUT)
+            temperature: Температура генерації
+        
+        Returns:
+            Текст відповіді
+        """
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4",
                 messages=[
-                    {"role": "system", "content": "Ти - експерт з Upwork та фрілансингу. Надавай корисні та практичні поради."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=2000,
-                temperature=0.7,
-                timeout=30
+                temperature=temperature,
+                timeout=timeout or settings.LLM_REQUEST_TIMEOUT
             )
             
             return response.choices[0].message.content
             
+        except asyncio.CancelledError:
+            logger.info("Виклик GPT-4 скасовано")
+            raise
         except Exception as e:
             logger.error(f"Помилка виклику GPT-4: {e}")
             raise
@@ -0,0 +1,347 @@
+"""
+Кеш відповідей LLM за хешем промпту
+
+Ключ - SHA-256 від моделі, температури, системного промпту та
+нормалізованого промпту (NFC, без зайвих пробілів), тому перепощені
+вакансії та та сама вакансія у різних користувачів дають один ключ.
+Два рівні: LRU у пам'яті процесу (влучання - мікросекунди) та
+персистентний SQLite або Redis, що переживає перезапуск і (для Redis)
+спільний для всіх екземплярів ai-service. Конкурентні промахи з тим самим
+ключем об'єднуються в один виклик моделі.
+
+Кешуються лише детерміновані виклики (аналіз і фільтрація вакансій),
+генерація пропозицій завжди йде до моделі.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+from shared.utils.single_flight import SingleFlight
+
+logger = get_logger("ai-prompt-cache")
+
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Нормалізація промпту: NFC, пробіли в рядках та порожні рядки схлопуються"""
+    text = unicodedata.normalize("NFC", prompt)
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n", "\n".join(lines)).strip()
+
+
+def prompt_key(model: str, prompt: str, temperature: float, system: str = "") -> str:
+    """
+    Ключ кешу для виклику моделі
+
+    Args:
+        model: Назва моделі
+        prompt: Промпт користувача
+        temperature: Температура генерації
+        system: Системний промпт
+
+    Returns:
+        SHA-256 у hex
+    """
+    raw = json.dumps(
+        [model, round(float(temperature), 4), normalize_prompt(system), normalize_prompt(prompt)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class MemoryTier:
+    """LRU з TTL у пам'яті процесу"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+
+        value, expires_at = item
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteTier:
+    """Персистентний рівень у файлі SQLite (виклики виконуються поза event loop)"""
+
+    # Прострочені записи видаляються кожні N записів
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prompt_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM prompt_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM prompt_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        try:
+            return await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Помилка читання кешу промптів з SQLite: {e}")
+            return None
+
+    async def set(self, key: str, value: str, expires_at: float):
+        try:
+            await asyncio.to_thread(self._set, key, value, expires_at)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Помилка запису кешу промптів у SQLite: {e}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisTier:
+    """Персистентний рівень у Redis (синхронний клієнт викликається поза event loop)"""
+
+    def __init__(self, redis_client, prefix: str = "llm_prompt_cache:"):
+        self.redis_client = redis_client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        try:
+            data = await asyncio.to_thread(self.redis_client.get, self.prefix + key)
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка читання кешу промптів з Redis: {e}")
+            return None
+        if not data:
+            return None
+        raw = json.loads(data)
+        return raw["value"], raw["expires_at"]
+
+    async def set(self, key: str, value: str, expires_at: float):
+        data = json.dumps({"value": value, "expires_at": expires_at}, ensure_ascii=False)
+        try:
+            await asyncio.to_thread(
+                self.redis_client.set, self.prefix + key, data, ex=max(1, int(expires_at - time.time()))
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка запису кешу промптів у Redis: {e}")
+
+    def close(self):
+        pass
+
+
+class PromptCache:
+    """Дворівневий кеш відповідей LLM"""
+
+    def __init__(
+        self,
+        memory: Optional[MemoryTier] = None,
+        persistent=None,
+        ttl: float = 86400.0,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            memory: LRU рівень у пам'яті
+            persistent: SQLiteTier / RedisTier або None
+            ttl: Час життя запису в секундах
+            enabled: Якщо False - усі виклики йдуть до моделі
+        """
+        self.memory = memory if memory is not None else MemoryTier()
+        self.persistent = persistent
+        self.ttl = ttl
+        self.enabled = enabled
+        self.single_flight = SingleFlight()
+        self.stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0
+        }
+
+    async def get(self, key: str) -> Optional[str]:
+        """Відповідь з кешу (запис з персистентного рівня піднімається в пам'ять)"""
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        if self.persistent is not None:
+            item = await self.persistent.get(key)
+            if item is not None:
+                value, expires_at = item
+                self.memory.set(key, value, expires_at)
+                self.stats["persistent_hits"] += 1
+                return value
+        return None
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Збереження відповіді в обох рівнях"""
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        self.memory.set(key, value, expires_at)
+        if self.persistent is not None:
+            await self.persistent.set(key, value, expires_at)
+        self.stats["stores"] += 1
+
+    async def contains(self, model: str, prompt: str, temperature: float, system: str = "") -> bool:
+        """Чи є відповідь у кеші (без впливу на статистику влучань)"""
+        if not self.enabled:
+            return False
+        key = prompt_key(model, prompt, temperature, system)
+        if self.memory.get(key) is not None:
+            return True
+        return self.persistent is not None and await self.persistent.get(key) is not None
+
+    async def get_or_call(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        call: Callable[[], Awaitable[str]],
+        system: str = "",
+        ttl: Optional[float] = None
+    ) -> str:
+        """
+        Відповідь моделі з кешу або через виклик
+
+        Помилки виклику не кешуються.
+
+        Args:
+            model: Назва моделі
+            prompt: Промпт
+            temperature: Температура генерації
+            call: Фабрика корутини виклику моделі
+            system: Системний промпт
+            ttl: Час життя запису (за замовчуванням ttl кешу)
+
+        Returns:
+            Текст відповіді
+        """
+        if not self.enabled:
+            return await call()
+
+        key = prompt_key(model, prompt, temperature, system)
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        async def fill() -> str:
+            result = await call()
+            await self.set(key, result, ttl)
+            return result
+
+        self.stats["misses"] += 1
+        return await self.single_flight.do(key, fill)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу з часткою влучань"""
+        hits = self.stats["memory_hits"] + self.stats["persistent_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.persistent).__name__ if self.persistent is not None else "memory",
+            "memory_entries": len(self.memory),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            # Промахи, що дочекалися вже запущеного виклику з тим самим ключем
+            "coalesced": self.single_flight.stats["coalesced"],
+            **self.stats
+        }
+
+    def close(self):
+        """Закриття персистентного рівня"""
+        if self.persistent is not None:
+            self.persistent.close()
+
+
+def _create_persistent_tier():
+    """Персистентний рівень відповідно до LLM_CACHE_BACKEND"""
+    backend = settings.LLM_CACHE_BACKEND
+    if backend == "redis":
+        from shared.database.connection import db_manager
+
+        if db_manager.redis_client is not None:
+            return RedisTier(db_manager.redis_client)
+        logger.warning("⚠️ Redis недоступний, кеш промптів працює лише в пам'яті")
+        return None
+    if backend == "sqlite":
+        try:
+            return SQLiteTier(settings.LLM_CACHE_SQLITE_PATH)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"⚠️ Не вдалося відкрити кеш промптів SQLite: {e}")
+    return None
+
+
+# Глобальний кеш промптів
+_prompt_cache: Optional[PromptCache] = None
+
+
+def get_prompt_cache() -> PromptCache:
+    """Кеш промптів (створюється при першому зверненні)"""
+    global _prompt_cache
+    if _prompt_cache is None:
+        _prompt_cache = PromptCache(
+            MemoryTier(settings.LLM_CACHE_MAX_ENTRIES),
+            _create_persistent_tier() if settings.LLM_CACHE_ENABLED else None,
+            ttl=settings.LLM_CACHE_TTL,
+            enabled=settings.LLM_CACHE_ENABLED
+        )
+    return _prompt_cache
+
+
+def close_prompt_cache():
+    """Закриття глобального кешу промптів"""
+    global _prompt_cache
+    if _prompt_cache is not None:
+        _prompt_cache.close()
+        _prompt_cache = None
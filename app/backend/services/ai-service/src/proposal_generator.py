@@ -2,9 +2,10 @@
 Покращений ProposalGenerator з AI інтеграцією
 """
 
+import asyncio
 import json
 import re
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import sys
 import os
@@ -14,6 +15,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'share
 
 from shared.config.logging import get_logger
 from .ai_service import AIService
+from .proposal_stream import ProposalStreamParser
 
 logger = get_logger("proposal-generator")
 
@@ -188,6 +190,72 @@ class ProposalGenerator:
                 "timestamp": datetime.utcnow().isoformat()
             }
     
+    async def stream_proposal(self, job_data: Dict[str, Any], user_profile: Dict[str, Any], 
+                              template_name: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Потокова генерація пропозиції
+        
+        Тип шаблону визначається з опису вакансії без очікування аналізу,
+        аналіз виконується паралельно з генерацією. Якщо модель не віддала
+        жодного токена або тексту пропозиції, використовується fallback генератор.
+        
+        Args:
+            job_data: Дані вакансії
+            user_profile: Профіль фрілансера
+            template_name: Тип шаблону
+        
+        Yields:
+            Події start, delta / section (по мірі генерації), analysis, done або error
+        """
+        template_type = template_name or self._determine_template_type(job_data, {})
+        yield {"event": "start", "template_type": template_type, "timestamp": datetime.utcnow().isoformat()}
+        
+        analysis_task = asyncio.create_task(self._analyze_job(job_data))
+        parser = ProposalStreamParser()
+        model = None
+        analysis_sent = False
+        try:
+            async for event in self.ai_service.stream_proposal(job_data, user_profile, template_type):
+                if event["event"] == "error":
+                    if event["partial"]:
+                        yield {"event": "error", "error": event["error"], "timestamp": datetime.utcnow().isoformat()}
+                        return
+                    logger.warning(f"AI генерація не вдалася: {event['error']}, використовуємо fallback")
+                    result = await self._generate_fallback_proposal(job_data, user_profile, template_type)
+                    yield {"event": "done", **result}
+                    return
+                
+                model = event["model"]
+                for section_event in parser.feed(event["text"]):
+                    yield section_event
+                if not analysis_sent and analysis_task.done():
+                    analysis_sent = True
+                    yield {"event": "analysis", "analysis": analysis_task.result()}
+            
+            proposal = parser.result()
+            if not str(proposal.get("proposal_text") or "").strip():
+                # Модель завершила потік без тексту пропозиції
+                logger.warning("AI генерація повернула порожню пропозицію, використовуємо fallback")
+                result = await self._generate_fallback_proposal(job_data, user_profile, template_type)
+                yield {"event": "done", **result}
+                return
+            
+            analysis = await analysis_task
+            if not analysis_sent:
+                yield {"event": "analysis", "analysis": analysis}
+            
+            yield {
+                "event": "done",
+                "success": True,
+                "proposal": self._process_ai_proposal(proposal, job_data, user_profile),
+                "template_type": template_type,
+                "analysis": analysis,
+                "model": model,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        finally:
+            analysis_task.cancel()
+    
     async def _analyze_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Аналіз вакансії"""
         try:
@@ -0,0 +1,219 @@
+"""
+Інкрементальний розбір потокової відповіді моделі з пропозицією
+
+Модель повертає JSON з полями proposal_text, estimated_hours, key_points
+тощо. ProposalStreamParser отримує фрагменти тексту по мірі генерації і
+одразу віддає вміст рядкових полів (насамперед proposal_text), а кожне
+завершене поле - окремою подією. Відповідь, що не починається з JSON,
+вважається текстом пропозиції.
+"""
+
+import json
+from typing import Any, Dict, List
+
+# Значення за замовчуванням, як у _parse_proposal_response клієнтів
+PROPOSAL_DEFAULTS = {
+    "proposal_text": "",
+    "estimated_hours": "Не вказано",
+    "proposed_rate": "Не вказано",
+    "timeline": "Не вказано",
+    "key_points": [],
+    "questions": []
+}
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class ProposalStreamParser:
+    """
+    Парсер JSON об'єкта верхнього рівня, що надходить частинами
+
+    feed() повертає події:
+        {"event": "delta", "section": поле, "text": фрагмент} - новий текст рядкового поля;
+        {"event": "section", "section": поле, "value": значення} - поле завершене.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self.mode = None  # "json" або "text", визначається першим непробільним символом
+        self.state = "start"
+        self.sections: Dict[str, Any] = {}
+        self._key: List[str] = []
+        self._value: List[str] = []
+        self._pending: List[str] = []
+        self._escape = None
+        self._raw: List[str] = []
+        self._depth = 0
+        self._raw_in_string = False
+        self._raw_escape = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Обробка наступного фрагмента відповіді
+
+        Args:
+            chunk: Фрагмент тексту моделі
+
+        Returns:
+            Події, що стали відомі з цим фрагментом
+        """
+        self._chunks.append(chunk)
+        events: List[Dict[str, Any]] = []
+
+        if self.mode is None:
+            stripped = "".join(self._chunks).lstrip()
+            if not stripped:
+                return events
+            self.mode = "json" if stripped[0] in "{`" else "text"
+            if self.mode == "text":
+                chunk = stripped
+
+        if self.mode == "text":
+            events.append({"event": "delta", "section": "proposal_text", "text": chunk})
+            return events
+
+        for char in chunk:
+            self._step(char, events)
+        self._flush_delta(events)
+        return events
+
+    def _flush_delta(self, events: List[Dict[str, Any]]):
+        """Подія з накопиченим текстом поточного рядкового поля"""
+        if self._pending:
+            events.append({"event": "delta", "section": "".join(self._key), "text": "".join(self._pending)})
+            self._pending = []
+
+    def _finish_value(self, value: Any, events: List[Dict[str, Any]]):
+        """Завершення поля"""
+        key = "".join(self._key)
+        self.sections[key] = value
+        events.append({"event": "section", "section": key, "value": value})
+
+    def _finish_raw(self, events: List[Dict[str, Any]]):
+        """Завершення нерядкового значення (число, масив, об'єкт, літерал)"""
+        raw = "".join(self._raw).strip()
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        self._finish_value(value, events)
+
+    def _step(self, char: str, events: List[Dict[str, Any]]):
+        """Один символ скінченного автомата"""
+        state = self.state
+        if state == "start":
+            if char == "{":
+                self.state = "key_start"
+        elif state == "key_start":
+            if char == '"':
+                self._key = []
+                self.state = "key"
+            elif char == "}":
+                self.state = "end"
+        elif state == "key":
+            if char == '"':
+                self.state = "colon"
+            else:
+                self._key.append(char)
+        elif state == "colon":
+            if char == ":":
+                self.state = "value_start"
+        elif state == "value_start":
+            if char == '"':
+                self._value = []
+                self.state = "string"
+            elif not char.isspace():
+                self._raw = [char]
+                self._depth = 1 if char in "[{" else 0
+                self._raw_in_string = False
+                self._raw_escape = False
+                self.state = "raw"
+        elif state == "string":
+            self._step_string(char, events)
+        elif state == "raw":
+            self._step_raw(char, events)
+        elif state == "after_value":
+            if char == ",":
+                self.state = "key_start"
+            elif char == "}":
+                self.state = "end"
+
+    def _step_string(self, char: str, events: List[Dict[str, Any]]):
+        """Символ рядкового значення: текст віддається одразу, escape-послідовності декодуються"""
+        if self._escape is not None:
+            self._escape += char
+            if self._escape[0] == "u":
+                if len(self._escape) < 5:
+                    return
+                try:
+                    decoded = chr(int(self._escape[1:], 16))
+                except ValueError:
+                    decoded = ""
+            else:
+                decoded = _ESCAPES.get(self._escape, self._escape)
+            self._escape = None
+            self._value.append(decoded)
+            self._pending.append(decoded)
+        elif char == "\\":
+            self._escape = ""
+        elif char == '"':
+            self._flush_delta(events)
+            self._finish_value("".join(self._value), events)
+            self.state = "after_value"
+        else:
+            self._value.append(char)
+            self._pending.append(char)
+
+    def _step_raw(self, char: str, events: List[Dict[str, Any]]):
+        """Символ нерядкового значення: накопичення до кінця значення"""
+        if self._raw_in_string:
+            self._raw.append(char)
+            if self._raw_escape:
+                self._raw_escape = False
+            elif char == "\\":
+                self._raw_escape = True
+            elif char == '"':
+                self._raw_in_string = False
+            return
+
+        if char == '"':
+            self._raw_in_string = True
+            self._raw.append(char)
+        elif char in "[{":
+            self._depth += 1
+            self._raw.append(char)
+        elif char in "]}":
+            if self._depth == 0:
+                # Кінець скалярного значення і всього об'єкта
+                self._finish_raw(events)
+                self.state = "end"
+                return
+            self._depth -= 1
+            self._raw.append(char)
+            if self._depth == 0:
+                self._finish_raw(events)
+                self.state = "after_value"
+        elif char == "," and self._depth == 0:
+            self._finish_raw(events)
+            self.state = "key_start"
+        else:
+            self._raw.append(char)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Пропозиція з повної відповіді
+
+        Returns:
+            Розібраний JSON; для обірваної відповіді - завершені поля;
+            для тексту без JSON - текст як proposal_text
+        """
+        text = "".join(self._chunks)
+        start, end = text.find("{"), text.rfind("}") + 1
+        if start != -1 and end > start:
+            try:
+                return json.loads(text[start:end])
+            except json.JSONDecodeError:
+                pass
+        if self.sections:
+            return {**PROPOSAL_DEFAULTS, **self.sections}
+        return {**PROPOSAL_DEFAULTS, "proposal_text": text.strip()}
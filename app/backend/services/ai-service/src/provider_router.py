@@ -0,0 +1,321 @@
+"""
+Роутер запитів між LLM провайдерами (OpenAI, Claude)
+
+Для кожного провайдера ведеться ковзне вікно вимірювань: затримка та
+успішність останніх викликів. Запит іде до найшвидшого (за p50) здорового
+провайдера з вільною ємністю; провайдер без свіжих вимірювань вважається
+невідомим і пробується першим, тож відновлений провайдер знову отримує
+трафік. Якщо основний виклик не відповів за поріг (p95 провайдера в межах
+hedge_min_delay..hedge_delay), паралельно запускається наступний провайдер
+і береться перша успішна відповідь, інший виклик скасовується. Помилка
+основного провайдера одразу переводить запит на наступний.
+
+Потокові виклики (stream) йдуть до першого провайдера за тим самим
+порядком; перейти на наступний можна лише до першого фрагмента відповіді
+(потік без жодного фрагмента теж вважається помилкою), hedging для них не
+застосовується.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+
+logger = get_logger("ai-provider-router")
+
+
+@dataclass
+class RouterConfig:
+    """Налаштування роутера провайдерів"""
+    window_size: int = 100
+    min_samples: int = 5
+    max_error_rate: float = 0.5
+    max_sample_age: float = 300.0
+    max_concurrency: int = 10
+    hedge_enabled: bool = True
+    hedge_delay: float = 5.0
+    hedge_min_delay: float = 1.0
+
+
+class ProviderHealth:
+    """Вимірювання та обмеження паралельності одного провайдера"""
+
+    def __init__(self, name: str, client: Any, config: RouterConfig, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.client = client
+        self.config = config
+        self._clock = clock
+        # (час завершення, затримка, успіх)
+        self.samples: Deque[Tuple[float, float, bool]] = deque(maxlen=config.window_size)
+        self.in_flight = 0
+        self.semaphore = asyncio.Semaphore(config.max_concurrency)
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "cancelled": 0,
+            "hedged": 0,
+            "hedge_wins": 0
+        }
+
+    def record(self, latency: float, success: bool):
+        """Додавання вимірювання"""
+        self.samples.append((self._clock(), latency, success))
+
+    def _recent(self) -> List[Tuple[float, float, bool]]:
+        """Вимірювання, не старші за max_sample_age"""
+        horizon = self._clock() - self.config.max_sample_age
+        return [sample for sample in self.samples if sample[0] >= horizon]
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Перцентиль затримки (None, поки не набрано min_samples)"""
+        recent = self._recent()
+        if len(recent) < self.config.min_samples:
+            return None
+        ordered = sorted(sample[1] for sample in recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def error_rate(self) -> float:
+        """Частка помилок серед свіжих вимірювань"""
+        recent = self._recent()
+        if not recent:
+            return 0.0
+        return sum(1 for sample in recent if not sample[2]) / len(recent)
+
+    def is_healthy(self) -> bool:
+        """Провайдер здоровий, поки частка помилок не перевищує max_error_rate"""
+        if len(self._recent()) < self.config.min_samples:
+            return True
+        return self.error_rate() <= self.config.max_error_rate
+
+    def is_available(self) -> bool:
+        return self.client.is_available()
+
+    def hedge_delay(self) -> float:
+        """Поріг, після якого запускається паралельний виклик іншого провайдера"""
+        p95 = self.percentile(95)
+        if p95 is None:
+            return self.config.hedge_delay
+        return min(self.config.hedge_delay, max(self.config.hedge_min_delay, p95))
+
+    def rank_key(self) -> Tuple[bool, bool, float]:
+        """Ключ сортування: здорові, з вільною ємністю, найменший p50"""
+        p50 = self.percentile(50)
+        return (
+            not self.is_healthy(),
+            self.in_flight >= self.config.max_concurrency,
+            p50 if p50 is not None else 0.0
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика провайдера"""
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "available": self.is_available(),
+            "healthy": self.is_healthy(),
+            "in_flight": self.in_flight,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 4),
+            "samples": len(self._recent()),
+            **self.stats
+        }
+
+
+class ProviderRouter:
+    """Роутер з вибором найшвидшого провайдера, failover та hedging"""
+
+    def __init__(
+        self,
+        providers: List[Tuple[str, Any]],
+        config: Optional[RouterConfig] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            providers: Пари (назва, клієнт) в порядку пріоритету при рівних вимірюваннях
+            config: Налаштування роутера
+            clock: Джерело часу (для тестів)
+        """
+        self.config = config or RouterConfig()
+        self._clock = clock
+        self.providers = [ProviderHealth(name, client, self.config, clock) for name, client in providers]
+
+    def rank(self) -> List[ProviderHealth]:
+        """Доступні провайдери в порядку вибору"""
+        available = [provider for provider in self.providers if provider.is_available()]
+        return sorted(available, key=lambda provider: provider.rank_key())
+
+    async def _invoke(self, provider: ProviderHealth, operation: str, args: tuple, kwargs: dict) -> Dict[str, Any]:
+        """Виклик операції клієнта з вимірюванням (очікування ємності не враховується)"""
+        async with provider.semaphore:
+            provider.in_flight += 1
+            provider.stats["calls"] += 1
+            started = self._clock()
+            try:
+                result = await getattr(provider.client, operation)(*args, **kwargs)
+            except asyncio.CancelledError:
+                # Затримка скасованого виклику - нижня межа, але не помилка
+                provider.stats["cancelled"] += 1
+                provider.record(self._clock() - started, True)
+                raise
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            finally:
+                provider.in_flight -= 1
+
+        success = bool(result.get("success"))
+        provider.record(self._clock() - started, success)
+        if not success:
+            provider.stats["errors"] += 1
+        return result
+
+    async def invoke(self, provider: ProviderHealth, operation: str, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Виклик операції конкретного провайдера в межах його ліміту паралельності
+
+        Для викликачів зі своїм вибором провайдера (пакетний аналіз): виклик
+        враховується у вимірюваннях так само, як через call().
+
+        Args:
+            provider: Провайдер роутера
+            operation: Назва методу клієнта
+
+        Returns:
+            Результат операції ({"success": False, "error": ...} при винятку)
+        """
+        return await self._invoke(provider, operation, args, kwargs)
+
+    async def call(self, operation: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Виклик операції через найкращого провайдера
+
+        Args:
+            operation: Назва методу клієнта (generate_proposal, analyze_job, ...)
+            *args, **kwargs: Аргументи методу
+
+        Returns:
+            Перша успішна відповідь, остання помилка, якщо всі провайдери
+            не впоралися, або None, якщо жоден провайдер не доступний
+        """
+        ranked = self.rank()
+        if not ranked:
+            return None
+
+        primary, fallbacks = ranked[0], ranked[1:]
+        tasks: Dict[asyncio.Task, ProviderHealth] = {
+            asyncio.create_task(self._invoke(primary, operation, args, kwargs)): primary
+        }
+        hedge_at = self._clock() + primary.hedge_delay() if self.config.hedge_enabled else None
+        hedged = False
+        last_result = None
+        try:
+            while tasks:
+                timeout = None
+                if hedge_at is not None and fallbacks:
+                    timeout = max(0.0, hedge_at - self._clock())
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Основний провайдер повільний - запускаємо наступний паралельно
+                    provider = fallbacks.pop(0)
+                    primary.stats["hedged"] += 1
+                    logger.info(f"🔀 {operation}: {primary.name} повільний, паралельний виклик {provider.name}")
+                    tasks[asyncio.create_task(self._invoke(provider, operation, args, kwargs))] = provider
+                    hedge_at = None
+                    hedged = True
+                    continue
+
+                for task in done:
+                    provider = tasks.pop(task)
+                    result = task.result()
+                    if result.get("success"):
+                        if hedged and provider is not primary:
+                            provider.stats["hedge_wins"] += 1
+                        return result
+                    last_result = result
+                    logger.warning(f"{provider.name} {operation} не вдався: {result.get('error', 'Unknown error')}")
+
+                if not tasks and fallbacks:
+                    # Failover без очікування порогу hedging
+                    provider = fallbacks.pop(0)
+                    tasks[asyncio.create_task(self._invoke(provider, operation, args, kwargs))] = provider
+            return last_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(self, operation: str, *args, **kwargs) -> AsyncIterator[Tuple[ProviderHealth, Any]]:
+        """
+        Потоковий виклик операції через найкращого провайдера
+
+        Args:
+            operation: Назва методу клієнта, що повертає async iterator
+            *args, **kwargs: Аргументи методу
+
+        Yields:
+            (провайдер, фрагмент відповіді)
+
+        Raises:
+            RuntimeError: Жоден провайдер не доступний
+            Exception: Помилка провайдера після першого фрагмента або помилка останнього провайдера
+        """
+        last_error: Exception = RuntimeError("Жоден AI сервіс не доступний")
+        for provider in self.rank():
+            emitted = False
+            async with provider.semaphore:
+                provider.in_flight += 1
+                provider.stats["calls"] += 1
+                started = self._clock()
+                try:
+                    async for chunk in getattr(provider.client, operation)(*args, **kwargs):
+                        emitted = True
+                        yield provider, chunk
+                except (asyncio.CancelledError, GeneratorExit):
+                    provider.stats["cancelled"] += 1
+                    provider.record(self._clock() - started, True)
+                    raise
+                except Exception as e:
+                    provider.stats["errors"] += 1
+                    provider.record(self._clock() - started, False)
+                    if emitted:
+                        raise
+                    logger.warning(f"{provider.name} {operation} не вдався: {e}")
+                    last_error = e
+                    continue
+                else:
+                    if emitted:
+                        provider.record(self._clock() - started, True)
+                        return
+                    # Порожня відповідь (наприклад, спрацював фільтр контенту) - помилка провайдера
+                    provider.stats["errors"] += 1
+                    provider.record(self._clock() - started, False)
+                    logger.warning(f"{provider.name} {operation} повернув порожню відповідь")
+                    last_error = RuntimeError(f"{provider.name}: порожня відповідь")
+                finally:
+                    provider.in_flight -= 1
+        raise last_error
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика провайдерів та поточний порядок вибору"""
+        return {
+            "order": [provider.name for provider in self.rank()],
+            "providers": {provider.name: provider.get_stats() for provider in self.providers}
+        }
+
+
+def router_config_from_settings() -> RouterConfig:
+    """Налаштування роутера з settings"""
+    return RouterConfig(
+        window_size=settings.AI_ROUTER_WINDOW,
+        min_samples=settings.AI_ROUTER_MIN_SAMPLES,
+        max_error_rate=settings.AI_ROUTER_MAX_ERROR_RATE,
+        max_sample_age=settings.AI_ROUTER_MAX_SAMPLE_AGE,
+        max_concurrency=settings.AI_PROVIDER_MAX_CONCURRENCY,
+        hedge_enabled=settings.AI_HEDGE_ENABLED,
+        hedge_delay=settings.AI_HEDGE_DELAY,
+        hedge_min_delay=settings.AI_HEDGE_MIN_DELAY
+    )
@@ -24,6 +24,7 @@ from shared.utils.encryption import (
     encrypt_sensitive_data, decrypt_sensitive_data,
     generate_secure_token, hash_token, verify_token_hash
 )
+from shared.utils.auth_cache import invalidate_user_auth_cache
 from .models import User, Session as UserSession
 
 # Налаштування логування
@@ -329,6 +330,7 @@ async def logout(
             session.is_active = False
         
         db.commit()
+        invalidate_user_auth_cache(current_user.id)
         
         logger.info(f"Користувач {current_user.id} вийшов з системи")
         
@@ -364,6 +366,7 @@ async def logout_all_devices(
             session.is_active = False
         
         db.commit()
+        invalidate_user_auth_cache(current_user.id)
         
         logger.info(f"Користувач {current_user.id} вийшов з усіх пристроїв")
         
@@ -5,6 +5,7 @@ OAuth модуль для інтеграції з Upwork
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import asyncio
 import requests
 import sys
 import os
@@ -21,6 +22,9 @@ from shared.config.logging import get_logger
 from shared.database.connection import get_db
 from shared.utils.encryption import encrypt_data, decrypt_data
 from shared.utils.rate_limiter import rate_limiter
+from shared.utils.oauth_manager import (
+    UPWORK_OAUTH2_TOKEN_URL, OAuthTokenError, oauth_manager, refresh_connection_tokens
+)
 from .models import User, OAuthConnection
 from .jwt_manager import get_current_user
 
@@ -193,7 +197,7 @@ async def upwork_callback(
             )
         
         # Обмінюємо код на токени
-        token_url = "https://api.upwork.com/api/v3/oauth2/token"
+        token_url = UPWORK_OAUTH2_TOKEN_URL
         data = {
             "grant_type": "authorization_code",
             "code": code,
@@ -304,6 +308,26 @@ async def get_oauth_connections(
         )
 
 
+async def revoke_upwork_token(connection: OAuthConnection):
+    """
+    Відкликання access token Upwork після відключення
+
+    upwork-service кешує токени в пам'яті свого процесу. Після відкликання
+    кешований токен отримує 401 і видаляється з кешу, а повторне
+    завантаження бачить неактивне з'єднання.
+
+    Args:
+        connection: Відключене OAuth з'єднання
+    """
+    if not settings.UPWORK_CLIENT_SECRET:
+        # Тестовий режим - токени не видані Upwork
+        return
+    try:
+        await asyncio.to_thread(oauth_manager.revoke_token, decrypt_data(connection.access_token))
+    except Exception as e:
+        logger.warning(f"⚠️ Не вдалося відкликати Upwork токен користувача {connection.user_id}: {e}")
+
+
 @router.delete("/connections/{provider}")
 async def disconnect_oauth(
     provider: str,
@@ -332,6 +356,9 @@ async def disconnect_oauth(
             
             logger.info(f"OAuth {provider} відключено для користувача {current_user.id}")
             
+            if provider == "upwork":
+                await revoke_upwork_token(connection)
+            
         return {"message": f"{provider} відключено", "status": "success"}
         
     except HTTPException:
@@ -382,44 +409,13 @@ async def refresh_upwork_token(
             }
         
         # Оновлюємо токен
-        refresh_token = decrypt_data(connection.refresh_token)
-        
-        if not settings.UPWORK_CLIENT_SECRET:
-            # Тестовий режим
-            new_token_data = {
-                "access_token": "test_access_token_" + secrets.token_urlsafe(16),
-                "refresh_token": "test_refresh_token_" + secrets.token_urlsafe(16),
-                "expires_in": 3600
-            }
-        else:
-            # Реальний режим
-            token_url = "https://api.upwork.com/api/v3/oauth2/token"
-            data = {
-                "grant_type": "refresh_token",
-                "refresh_token": refresh_token,
-                "client_id": settings.UPWORK_CLIENT_ID,
-                "client_secret": settings.UPWORK_CLIENT_SECRET
-            }
-            
-            response = requests.post(token_url, data=data, timeout=30)
-            
-            if response.status_code != 200:
-                logger.error(f"Помилка оновлення токена: {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Помилка оновлення токена"
-                )
-            
-            new_token_data = response.json()
-        
-        # Оновлюємо з'єднання
-        connection.access_token = encrypt_data(new_token_data["access_token"])
-        if new_token_data.get("refresh_token"):
-            connection.refresh_token = encrypt_data(new_token_data["refresh_token"])
-        connection.expires_at = datetime.utcnow() + timedelta(seconds=new_token_data.get("expires_in", 3600))
-        connection.updated_at = datetime.utcnow()
-        
-        db.commit()
+        try:
+            refresh_connection_tokens(db, connection)
+        except OAuthTokenError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Помилка оновлення токена"
+            )
         
         logger.info(f"Upwork токен оновлено для користувача {current_user.id} з IP {client_ip}")
         
@@ -4,8 +4,8 @@ SECURITY-008: Логування безпеки та моніторинг
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, delete, desc, func, select
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import sys
@@ -16,7 +16,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'share
 
 from shared.config.settings import settings
 from shared.config.logging import get_logger
-from shared.database.connection import get_db
+from shared.database.connection import get_async_db
 from shared.utils.security_logger import SecurityLogger, SecurityEventType, SecurityLevel
 from .models import SecurityLog, User
 from .jwt_manager import get_current_user
@@ -39,7 +39,7 @@ async def get_security_logs(
     limit: int = Query(100, ge=1, le=1000, description="Кількість записів"),
     offset: int = Query(0, ge=0, description="Зміщення"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Отримання логів безпеки з фільтрацією
@@ -60,34 +60,36 @@ async def get_security_logs(
         Список логів безпеки
     """
     try:
-        # Базовий запит
-        query = db.query(SecurityLog)
-        
         # Застосовуємо фільтри
+        filters = []
         if user_id:
-            query = query.filter(SecurityLog.user_id == user_id)
+            filters.append(SecurityLog.user_id == user_id)
         
         if event_type:
-            query = query.filter(SecurityLog.event_type == event_type)
+            filters.append(SecurityLog.event_type == event_type)
         
         if level:
-            query = query.filter(SecurityLog.level == level)
+            filters.append(SecurityLog.level == level)
         
         if ip_address:
-            query = query.filter(SecurityLog.ip_address == ip_address)
+            filters.append(SecurityLog.ip_address == ip_address)
         
         if start_date:
-            query = query.filter(SecurityLog.created_at >= start_date)
+            filters.append(SecurityLog.created_at >= start_date)
         
         if end_date:
-            query = query.filter(SecurityLog.created_at <= end_date)
-        
-        # Сортуємо за датою (новіші спочатку)
-        query = query.order_by(desc(SecurityLog.created_at))
+            filters.append(SecurityLog.created_at <= end_date)
         
         # Додаємо пагінацію
-        total = query.count()
-        logs = query.offset(offset).limit(limit).all()
+        total = await db.scalar(select(func.count(SecurityLog.id)).where(*filters))
+        
+        # Сортуємо за датою (новіші спочатку)
+        result = await db.scalars(
+            select(SecurityLog).where(*filters)
+            .order_by(desc(SecurityLog.created_at))
+            .offset(offset).limit(limit)
+        )
+        logs = result.all()
         
         # Конвертуємо в словники
         logs_data = []
@@ -123,7 +125,7 @@ async def get_security_logs(
 async def get_security_statistics(
     days: int = Query(7, ge=1, le=365, description="Кількість днів"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Отримання статистики безпеки
@@ -140,42 +142,52 @@ async def get_security_statistics(
         start_date = datetime.utcnow() - timedelta(days=days)
         
         # Статистика по типах подій
-        event_stats = db.query(
-            SecurityLog.event_type,
-            func.count(SecurityLog.id).label('count'),
-            func.sum(func.case([(SecurityLog.success == True, 1)], else_=0)).label('success_count')
-        ).filter(
-            SecurityLog.created_at >= start_date
-        ).group_by(SecurityLog.event_type).all()
+        event_stats = (await db.execute(
+            select(
+                SecurityLog.event_type,
+                func.count(SecurityLog.id).label('count'),
+                func.sum(case((SecurityLog.success == True, 1), else_=0)).label('success_count')
+            ).where(
+                SecurityLog.created_at >= start_date
+            ).group_by(SecurityLog.event_type)
+        )).all()
         
         # Статистика по рівнях безпеки
-        level_stats = db.query(
-            SecurityLog.level,
-            func.count(SecurityLog.id).label('count')
-        ).filter(
-            SecurityLog.created_at >= start_date
-        ).group_by(SecurityLog.level).all()
+        level_stats = (await db.execute(
+            select(
+                SecurityLog.level,
+                func.count(SecurityLog.id).label('count')
+            ).where(
+                SecurityLog.created_at >= start_date
+            ).group_by(SecurityLog.level)
+        )).all()
         
         # Статистика по IP адресах
-        ip_stats = db.query(
-            SecurityLog.ip_address,
-            func.count(SecurityLog.id).label('count')
-        ).filter(
-            SecurityLog.created_at >= start_date,
-            SecurityLog.ip_address.isnot(None)
-        ).group_by(SecurityLog.ip_address).order_by(
-            desc(func.count(SecurityLog.id))
-        ).limit(10).all()
+        ip_stats = (await db.execute(
+            select(
+                SecurityLog.ip_address,
+                func.count(SecurityLog.id).label('count')
+            ).where(
+                SecurityLog.created_at >= start_date,
+                SecurityLog.ip_address.isnot(None)
+            ).group_by(SecurityLog.ip_address).order_by(
+                desc(func.count(SecurityLog.id))
+            ).limit(10)
+        )).all()
         
         # Загальна статистика
-        total_events = db.query(func.count(SecurityLog.id)).filter(
-            SecurityLog.created_at >= start_date
-        ).scalar()
+        total_events = await db.scalar(
+            select(func.count(SecurityLog.id)).where(
+                SecurityLog.created_at >= start_date
+            )
+        )
         
-        failed_events = db.query(func.count(SecurityLog.id)).filter(
-            SecurityLog.created_at >= start_date,
-            SecurityLog.success == False
-        ).scalar()
+        failed_events = await db.scalar(
+            select(func.count(SecurityLog.id)).where(
+                SecurityLog.created_at >= start_date,
+                SecurityLog.success == False
+            )
+        )
         
         return {
             "period_days": days,
@@ -220,7 +232,7 @@ async def get_security_anomalies(
     days: int = Query(1, ge=1, le=30, description="Кількість днів"),
     threshold: float = Query(0.7, ge=0.0, le=1.0, description="Поріг аномалії"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Отримання аномалій безпеки
@@ -238,22 +250,28 @@ async def get_security_anomalies(
         start_date = datetime.utcnow() - timedelta(days=days)
         
         # Знаходимо підозрілу активність
-        suspicious_activity = db.query(SecurityLog).filter(
-            SecurityLog.created_at >= start_date,
-            SecurityLog.event_type == SecurityEventType.SUSPICIOUS_ACTIVITY.value
-        ).order_by(desc(SecurityLog.created_at)).all()
+        suspicious_activity = (await db.scalars(
+            select(SecurityLog).where(
+                SecurityLog.created_at >= start_date,
+                SecurityLog.event_type == SecurityEventType.SUSPICIOUS_ACTIVITY.value
+            ).order_by(desc(SecurityLog.created_at))
+        )).all()
         
         # Знаходимо невдалі спроби входу
-        failed_logins = db.query(SecurityLog).filter(
-            SecurityLog.created_at >= start_date,
-            SecurityLog.event_type == SecurityEventType.LOGIN_FAILED.value
-        ).order_by(desc(SecurityLog.created_at)).all()
+        failed_logins = (await db.scalars(
+            select(SecurityLog).where(
+                SecurityLog.created_at >= start_date,
+                SecurityLog.event_type == SecurityEventType.LOGIN_FAILED.value
+            ).order_by(desc(SecurityLog.created_at))
+        )).all()
         
         # Знаходимо перевищення rate limit
-        rate_limit_violations = db.query(SecurityLog).filter(
-            SecurityLog.created_at >= start_date,
-            SecurityLog.event_type == SecurityEventType.API_RATE_LIMIT.value
-        ).order_by(desc(SecurityLog.created_at)).all()
+        rate_limit_violations = (await db.scalars(
+            select(SecurityLog).where(
+                SecurityLog.created_at >= start_date,
+                SecurityLog.event_type == SecurityEventType.API_RATE_LIMIT.value
+            ).order_by(desc(SecurityLog.created_at))
+        )).all()
         
         return {
             "period_days": days,
@@ -303,7 +321,7 @@ async def export_security_logs(
     start_date: Optional[datetime] = Query(None, description="Початкова дата"),
     end_date: Optional[datetime] = Query(None, description="Кінцева дата"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Експорт логів безпеки
@@ -320,17 +338,17 @@ async def export_security_logs(
     """
     try:
         # Базовий запит
-        query = db.query(SecurityLog)
+        query = select(SecurityLog)
         
         # Застосовуємо фільтри по даті
         if start_date:
-            query = query.filter(SecurityLog.created_at >= start_date)
+            query = query.where(SecurityLog.created_at >= start_date)
         
         if end_date:
-            query = query.filter(SecurityLog.created_at <= end_date)
+            query = query.where(SecurityLog.created_at <= end_date)
         
         # Отримуємо всі записи
-        logs = query.order_by(desc(SecurityLog.created_at)).all()
+        logs = (await db.scalars(query.order_by(desc(SecurityLog.created_at)))).all()
         
         # Конвертуємо в словники
         logs_data = []
@@ -387,7 +405,7 @@ async def export_security_logs(
 async def cleanup_old_logs(
     days: int = Query(90, ge=1, le=365, description="Видалити логи старіше N днів"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Очищення старих логів безпеки
@@ -404,16 +422,19 @@ async def cleanup_old_logs(
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
         # Підраховуємо кількість записів для видалення
-        count_to_delete = db.query(func.count(SecurityLog.id)).filter(
-            SecurityLog.created_at < cutoff_date
-        ).scalar()
+        count_to_delete = await db.scalar(
+            select(func.count(SecurityLog.id)).where(
+                SecurityLog.created_at < cutoff_date
+            )
+        )
         
         # Видаляємо старі записи
-        deleted = db.query(SecurityLog).filter(
-            SecurityLog.created_at < cutoff_date
-        ).delete()
+        result = await db.execute(
+            delete(SecurityLog).where(SecurityLog.created_at < cutoff_date)
+        )
+        deleted = result.rowcount
         
-        db.commit()
+        await db.commit()
         
         logger.info(f"Видалено {deleted} старих логів безпеки (старіше {days} днів)")
         
@@ -426,7 +447,7 @@ async def cleanup_old_logs(
         
     except Exception as e:
         logger.error(f"Помилка очищення логів безпеки: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Помилка очищення логів безпеки"
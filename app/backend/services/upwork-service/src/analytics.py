@@ -0,0 +1,140 @@
+"""
+Матеріалізована аналітика вакансій Upwork
+
+Агрегати (сума та кількість бюджетів, частоти навичок, top-K навичок)
+оновлюються інкрементально, коли вакансії надходять з ingestion,
+а /upwork/analytics/overview віддає готовий знімок без обходу вакансій.
+Повторне надходження тієї самої вакансії замінює її внесок, а не
+додає його вдруге.
+"""
+
+import heapq
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TOP_SKILLS = 5
+RECENT_JOBS = 3
+
+
+def budget_bounds(budget: Any) -> Tuple[float, int]:
+    """
+    Внесок бюджету вакансії в середнє: (сума меж, кількість меж)
+
+    Підтримує формат API ({"min", "max"}) та рядок з БД ("100-500").
+    """
+    if isinstance(budget, dict):
+        values = [budget.get("min", 0), budget.get("max", 0)]
+        if all(isinstance(value, (int, float)) for value in values):
+            return float(sum(values)), 2
+        return 0.0, 0
+    if isinstance(budget, str) and budget:
+        try:
+            values = [float(part) for part in budget.split("-")]
+        except ValueError:
+            return 0.0, 0
+        return float(sum(values)), len(values)
+    return 0.0, 0
+
+
+class JobAnalyticsView:
+    """Інкрементальні агрегати по вакансіях з готовим оглядом"""
+
+    def __init__(self, top_k: int = TOP_SKILLS):
+        self.top_k = top_k
+        self._jobs: Dict[str, Tuple[float, int, Tuple[str, ...]]] = {}
+        self.budget_sum = 0.0
+        self.budget_count = 0
+        self.skill_counts: Counter = Counter()
+        self.recent_jobs: List[Dict[str, Any]] = []
+        self.updated_at: Optional[float] = None
+        self._overview: Dict[str, Any] = self._build_overview()
+
+    def _apply(self, contribution: Tuple[float, int, Tuple[str, ...]], sign: int):
+        """Додавання (sign=1) або віднімання (sign=-1) внеску вакансії"""
+        budget_sum, budget_count, skills = contribution
+        self.budget_sum += sign * budget_sum
+        self.budget_count += sign * budget_count
+        for skill in skills:
+            self.skill_counts[skill] += sign
+            if self.skill_counts[skill] <= 0:
+                del self.skill_counts[skill]
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Врахування нових або оновлених вакансій
+
+        Args:
+            jobs: Вакансії у форматі Upwork API
+
+        Returns:
+            Кількість оброблених вакансій
+        """
+        processed = 0
+        recent = {job["id"]: job for job in self.recent_jobs}
+        for job in jobs:
+            job_id = job.get("id")
+            if job_id is None:
+                continue
+            budget_sum, budget_count = budget_bounds(job.get("budget"))
+            contribution = (budget_sum, budget_count, tuple(dict.fromkeys(job.get("skills") or [])))
+
+            previous = self._jobs.get(job_id)
+            if previous is not None:
+                self._apply(previous, -1)
+            self._apply(contribution, 1)
+            self._jobs[job_id] = contribution
+            recent[job_id] = job
+            processed += 1
+
+        self.updated_at = time.time()
+        if processed:
+            self.recent_jobs = heapq.nlargest(
+                RECENT_JOBS, recent.values(), key=lambda job: str(job.get("posted_time") or "")
+            )
+            self._overview = self._build_overview()
+        return processed
+
+    def _build_overview(self) -> Dict[str, Any]:
+        """Матеріалізація огляду (виконується при записі, а не при читанні)"""
+        average = self.budget_sum / self.budget_count if self.budget_count > 0 else 0
+        top_skills = heapq.nlargest(self.top_k, self.skill_counts.items(), key=lambda item: item[1])
+        return {
+            "total_jobs": len(self._jobs),
+            "total_proposals": 0,
+            "average_budget": round(average, 2),
+            "top_skills": top_skills
+        }
+
+    def overview(self) -> Dict[str, Any]:
+        """
+        Готовий огляд зі штампом актуальності
+
+        Returns:
+            Агрегати, час останнього оновлення та його давність у секундах
+        """
+        return {
+            **self._overview,
+            "as_of": datetime.utcfromtimestamp(self.updated_at).isoformat() if self.updated_at else None,
+            "staleness_s": round(time.time() - self.updated_at, 3) if self.updated_at else None
+        }
+
+    def clear(self):
+        """Очищення агрегатів"""
+        self._jobs.clear()
+        self.budget_sum = 0.0
+        self.budget_count = 0
+        self.skill_counts.clear()
+        self.recent_jobs = []
+        self.updated_at = None
+        self._overview = self._build_overview()
+
+
+# Глобальний екземпляр
+analytics_view = JobAnalyticsView()
+
+
+def get_analytics_view() -> JobAnalyticsView:
+    """Отримання матеріалізованої аналітики"""
+    return analytics_view
@@ -0,0 +1,267 @@
+"""
+Запис і відтворення викликів Upwork API для офлайн навантажувальних тестів
+
+RecordingTransport обгортає httpx-транспорт і зберігає пари запит/відповідь
+разом з часом виконання у стислий файл (gzip JSON Lines, заголовки
+авторизації не записуються). ReplayTransport віддає записані відповіді без
+мережі із заданим розподілом затримки, часткою помилок 5xx та 429.
+
+Випадковість детермінована: кожен запит отримує власний генератор з seed,
+ключа запиту та порядкового номера звернення до цього ключа, тому ті самі
+тести дають той самий результат на будь-якій машині.
+"""
+
+import asyncio
+import gzip
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+
+logger = get_logger("upwork-api-replay")
+
+# Заголовки відповіді, які потрібні клієнту при відтворенні
+RECORDED_HEADERS = ("content-type", "retry-after")
+
+LatencyModel = Callable[[random.Random, float], float]
+
+
+def request_key(method: str, url: httpx.URL) -> str:
+    """Ключ запиту: метод, шлях та відсортовані параметри (без хоста)"""
+    query = urlencode(sorted(url.params.multi_items()))
+    return f"{method.upper()} {url.path}" + (f"?{query}" if query else "")
+
+
+def parse_latency(spec: str) -> LatencyModel:
+    """
+    Розподіл затримки відтворення
+
+    Формати: "recorded[:множник]", "none", "constant:с", "uniform:мін:макс",
+    "lognormal:медіана:sigma".
+
+    Args:
+        spec: Опис розподілу
+
+    Returns:
+        Функція (генератор, записана затримка) -> затримка в секундах
+
+    Raises:
+        ValueError: Невідомий формат
+    """
+    name, *params = spec.strip().lower().split(":")
+    try:
+        values = [float(param) for param in params]
+    except ValueError:
+        raise ValueError(f"Невалідний розподіл затримки: {spec!r}")
+
+    if name == "recorded" and len(values) <= 1:
+        scale = values[0] if values else 1.0
+        return lambda rng, recorded: recorded * scale
+    if name == "none" and not values:
+        return lambda rng, recorded: 0.0
+    if name == "constant" and len(values) == 1:
+        return lambda rng, recorded: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda rng, recorded: rng.uniform(values[0], values[1])
+    if name == "lognormal" and len(values) == 2 and values[0] > 0:
+        mu = math.log(values[0])
+        return lambda rng, recorded: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Невалідний розподіл затримки: {spec!r}")
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Записані виклики з файлу (.gz - стиснутий)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_recording(path: str, entries: List[Dict[str, Any]]):
+    """Атомарний запис викликів у файл (тимчасовий файл + rename)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if path.endswith(".gz") else raw
+            for entry in entries:
+                stream.write((json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            if stream is not raw:
+                stream.close()
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class CallRecorder:
+    """Накопичувач записаних викликів (спільний для транспортів одного процесу)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict[str, Any]] = []
+
+    def add(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float):
+        self.entries.append({
+            "key": request_key(request.method, request.url),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": body.decode("utf-8", errors="replace"),
+            "elapsed_ms": round(elapsed * 1000, 2)
+        })
+
+    def save(self):
+        """Запис усіх накопичених викликів"""
+        if not self.entries:
+            return
+        try:
+            save_recording(self.path, self.entries)
+            logger.info(f"💾 Записано {len(self.entries)} викликів Upwork API у {self.path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Не вдалося записати виклики Upwork API: {e}")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Транспорт, що пропускає запити далі та записує відповіді"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, recorder: CallRecorder):
+        self.inner = inner
+        self.recorder = recorder
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        elapsed = time.perf_counter() - started
+        self.recorder.add(request, response, body, elapsed)
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=body,
+            request=request,
+            extensions=response.extensions
+        )
+
+    async def aclose(self):
+        self.recorder.save()
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Транспорт, що відтворює записані відповіді без мережі"""
+
+    def __init__(
+        self,
+        entries: List[Dict[str, Any]],
+        latency: str = "recorded",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        Args:
+            entries: Записані виклики
+            latency: Розподіл затримки (див. parse_latency)
+            error_rate: Частка відповідей 503
+            rate_limit_rate: Частка відповідей 429
+            retry_after: Retry-After для 429 (секунди)
+            seed: Seed генератора
+            sleep: Функція очікування (для тестів)
+        """
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.seed = seed
+        self.sleep = sleep
+        # Точний ключ та запасний без параметрів запиту
+        self._exact: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_path: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            self._exact[entry["key"]].append(entry)
+            self._by_path[entry["key"].split("?", 1)[0]].append(entry)
+        self._seen: Dict[str, int] = defaultdict(int)
+        self.stats = {
+            "requests": 0,
+            "replayed": 0,
+            "misses": 0,
+            "injected_429": 0,
+            "injected_errors": 0
+        }
+
+    def _choose(self, key: str, occurrence: int) -> Optional[Dict[str, Any]]:
+        """Запис для ключа (кілька записів віддаються по колу)"""
+        entries = self._exact.get(key) or self._by_path.get(key.split("?", 1)[0])
+        if not entries:
+            return None
+        return entries[occurrence % len(entries)]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, request.url)
+        occurrence = self._seen[key]
+        self._seen[key] += 1
+        self.stats["requests"] += 1
+
+        entry = self._choose(key, occurrence)
+        if entry is None:
+            self.stats["misses"] += 1
+            return httpx.Response(404, json={"error": "not recorded", "key": key}, request=request)
+
+        rng = random.Random(f"{self.seed}|{key}|{occurrence}")
+        await self.sleep(max(0.0, self.latency(rng, entry.get("elapsed_ms", 0) / 1000)))
+
+        draw = rng.random()
+        if draw < self.rate_limit_rate:
+            self.stats["injected_429"] += 1
+            return httpx.Response(
+                429, headers={"Retry-After": f"{self.retry_after:g}"}, json={"error": "rate limited"}, request=request
+            )
+        if draw < self.rate_limit_rate + self.error_rate:
+            self.stats["injected_errors"] += 1
+            return httpx.Response(503, json={"error": "service unavailable"}, request=request)
+
+        self.stats["replayed"] += 1
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers", {}), content=entry["body"].encode("utf-8"), request=request
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика відтворення"""
+        return {"recorded_keys": len(self._exact), **self.stats}
+
+
+def transport_wrapper_from_settings() -> Tuple[Optional[Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]], str]:
+    """
+    Обгортка транспорту Upwork API за налаштуваннями
+
+    UPWORK_API_REPLAY_PATH має пріоритет над UPWORK_API_RECORD_PATH.
+
+    Returns:
+        (обгортка або None, режим: "replay" / "record" / "live")
+    """
+    if settings.UPWORK_API_REPLAY_PATH:
+        replay = ReplayTransport(
+            load_recording(settings.UPWORK_API_REPLAY_PATH),
+            latency=settings.UPWORK_API_REPLAY_LATENCY,
+            error_rate=settings.UPWORK_API_REPLAY_ERROR_RATE,
+            rate_limit_rate=settings.UPWORK_API_REPLAY_RATE_LIMIT_RATE,
+            seed=settings.UPWORK_API_REPLAY_SEED
+        )
+        return (lambda inner: replay), "replay"
+    if settings.UPWORK_API_RECORD_PATH:
+        recorder = CallRecorder(settings.UPWORK_API_RECORD_PATH)
+        return (lambda inner: RecordingTransport(inner, recorder)), "record"
+    return None, "live"
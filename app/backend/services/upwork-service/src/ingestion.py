@@ -0,0 +1,370 @@
+"""
+Інкрементальне завантаження вакансій Upwork у локальне сховище
+
+Фоновий worker періодично опитує search_jobs для кожного активного
+FilterProfile. Курсор (high-water mark) - найпізніший posted_date,
+вже збережений для профілю: сторінки, відсортовані за новизною,
+читаються лише до нього. Вакансії дедуплікуються за job_id і
+записуються в JobMatch пакетним upsert, а /upwork/jobs читає їх з БД
+замість запиту до Upwork API на кожен запит.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, cast, func, or_, select, String
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+from shared.utils.pagination import keyset_filter
+from shared.database.mvp_models import FilterProfile, JobMatch, async_bulk_upsert_job_matches
+
+logger = get_logger("upwork-ingestion")
+
+job_matches = JobMatch.__table__
+filter_profiles = FilterProfile.__table__
+
+
+def parse_posted_date(value: Any) -> Optional[datetime]:
+    """Розбір дати публікації (ISO 8601, 'Z' = UTC)"""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Дата з БД як aware UTC (SQLite повертає naive)"""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def job_to_row(job: Dict[str, Any], user_id: int, filter_profile_id: Optional[int]) -> Dict[str, Any]:
+    """
+    Перетворення вакансії Upwork API на рядок JobMatch
+
+    Args:
+        job: Вакансія з search_jobs
+        user_id: Власник профілю
+        filter_profile_id: Профіль фільтрів
+
+    Returns:
+        Значення колонок job_matches
+    """
+    budget = job.get("budget") or {}
+    client = job.get("client") or {}
+    if isinstance(budget, dict):
+        budget_text = "-".join(str(budget[key]) for key in ("min", "max") if budget.get(key) is not None) or None
+    else:
+        budget_text = str(budget)
+
+    return {
+        "user_id": user_id,
+        "filter_profile_id": filter_profile_id,
+        "job_id": str(job["id"]),
+        "job_title": (job.get("title") or "")[:255],
+        "job_description": job.get("description"),
+        "client_name": client.get("name"),
+        "client_rating": client.get("rating"),
+        "budget": budget_text[:100] if budget_text else None,
+        "hourly_rate": job.get("hourly_rate"),
+        "job_type": job.get("job_type") or (budget.get("type") if isinstance(budget, dict) else None),
+        "experience_level": job.get("experience_level"),
+        "skills": job.get("skills") or [],
+        "country": client.get("location"),
+        "posted_date": parse_posted_date(job.get("posted_time") or job.get("posted_date")),
+    }
+
+
+def row_to_job(row) -> Dict[str, Any]:
+    """Рядок JobMatch у форматі вакансії Upwork API"""
+    posted_date = _as_utc(row.posted_date)
+    return {
+        "id": row.job_id,
+        "title": row.job_title,
+        "description": row.job_description,
+        "budget": row.budget,
+        "hourly_rate": float(row.hourly_rate) if row.hourly_rate is not None else None,
+        "client": {
+            "name": row.client_name,
+            "rating": float(row.client_rating) if row.client_rating is not None else None,
+            "location": row.country
+        },
+        "skills": row.skills or [],
+        "posted_time": posted_date.isoformat().replace("+00:00", "Z") if posted_date else None,
+        "experience_level": row.experience_level,
+        "job_type": row.job_type,
+        "url": f"https://www.upwork.com/jobs/{row.job_id}"
+    }
+
+
+async def load_cursor(session: AsyncSession, filter_profile_id: int) -> Optional[datetime]:
+    """High-water mark профілю: найпізніший збережений posted_date"""
+    result = await session.execute(
+        select(func.max(job_matches.c.posted_date)).where(job_matches.c.filter_profile_id == filter_profile_id)
+    )
+    return _as_utc(result.scalar())
+
+
+async def query_jobs(
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    query: Optional[str] = None,
+    skills: Optional[str] = None,
+    location: Optional[str] = None,
+    after: Optional[Tuple[datetime, str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Вакансії з локального сховища (нові першими)
+
+    Вакансія, знайдена кількома профілями, повертається один раз.
+    Для глибоких сторінок краще after (keyset), ніж skip (OFFSET).
+
+    Args:
+        session: Асинхронна сесія
+        skip: Зсув
+        limit: Кількість
+        query: Текст у назві або описі
+        skills: Навички через кому (усі мають бути у вакансії)
+        location: Країна клієнта
+        after: Ключ (posted_date, job_id) останньої вакансії попередньої сторінки
+
+    Returns:
+        Вакансії у форматі Upwork API
+    """
+    first_rows = select(func.min(job_matches.c.id)).group_by(job_matches.c.job_id)
+    conditions = [job_matches.c.id.in_(first_rows)]
+
+    if query:
+        pattern = f"%{query}%"
+        conditions.append(or_(job_matches.c.job_title.ilike(pattern), job_matches.c.job_description.ilike(pattern)))
+    if location:
+        conditions.append(job_matches.c.country.ilike(f"%{location}%"))
+    if after is not None:
+        conditions.append(keyset_filter((job_matches.c.posted_date, job_matches.c.job_id), after))
+    if skills:
+        is_postgres = session.get_bind().dialect.name == "postgresql"
+        for skill in (item.strip().lower() for item in skills.split(",")):
+            if not skill:
+                continue
+            if is_postgres:
+                conditions.append(job_matches.c.skills.any(skill))
+            else:
+                conditions.append(func.lower(cast(job_matches.c.skills, String)).like(f'%"{skill}"%'))
+
+    result = await session.execute(
+        select(job_matches)
+        .where(and_(*conditions))
+        .order_by(job_matches.c.posted_date.desc(), job_matches.c.job_id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row_to_job(row) for row in result.all()]
+
+
+class JobIngestionWorker:
+    """Фоновий worker інкрементального завантаження вакансій"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        client_factory: Callable[[int], Any],
+        interval: float = None,
+        page_size: int = None,
+        max_pages: int = None,
+        on_jobs: Optional[Callable[[List[Dict[str, Any]]], Any]] = None
+    ):
+        """
+        Args:
+            session_factory: Фабрика асинхронних сесій
+            client_factory: user_id -> клієнт з async search_jobs(query, filters)
+            interval: Секунди між опитуваннями
+            page_size: Вакансій на сторінку
+            max_pages: Максимум сторінок за одне опитування профілю
+            on_jobs: Виклик із записаними вакансіями (напр. оновлення аналітики)
+        """
+        self.session_factory = session_factory
+        self.client_factory = client_factory
+        self.on_jobs = on_jobs
+        self.interval = interval or settings.UPWORK_INGESTION_INTERVAL
+        self.page_size = page_size or settings.UPWORK_INGESTION_PAGE_SIZE
+        self.max_pages = max_pages or settings.UPWORK_INGESTION_MAX_PAGES
+        self._cursors: Dict[int, Optional[datetime]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_run_at: Optional[datetime] = None
+        self.stats = {
+            "runs": 0,
+            "profiles_polled": 0,
+            "pages_fetched": 0,
+            "jobs_seen": 0,
+            "upserted": 0,
+            "errors": 0
+        }
+
+    @staticmethod
+    def _search_params(profile) -> Tuple[str, Dict[str, Any]]:
+        """Запит та фільтри search_jobs з профілю"""
+        query = " ".join(profile.keywords or [])
+        filters = {"sort": "recency"}
+        for column in ("budget_min", "budget_max", "hourly_rate_min", "hourly_rate_max", "experience_level", "job_type"):
+            value = getattr(profile, column)
+            if value is not None:
+                filters[column] = float(value) if column.startswith(("budget", "hourly")) else value
+        if profile.categories:
+            filters["category"] = ",".join(profile.categories)
+        if profile.countries:
+            filters["location"] = ",".join(profile.countries)
+        return query, filters
+
+    @staticmethod
+    def _excluded(job: Dict[str, Any], exclude_keywords: Optional[List[str]]) -> bool:
+        """Перевірка мінус-слів у назві та описі"""
+        if not exclude_keywords:
+            return False
+        text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+        return any(keyword.lower() in text for keyword in exclude_keywords)
+
+    async def _fetch_new_jobs(self, client, profile, cursor: Optional[datetime]) -> List[Dict[str, Any]]:
+        """
+        Сторінки search_jobs до курсора
+
+        Returns:
+            Вакансії, опубліковані не раніше курсора (дублікати можливі)
+        """
+        query, filters = self._search_params(profile)
+        jobs = []
+        for page in range(self.max_pages):
+            result = await client.search_jobs(query, {**filters, "offset": page * self.page_size, "count": self.page_size})
+            page_jobs = result.get("jobs", [])
+            self.stats["pages_fetched"] += 1
+
+            reached_cursor = False
+            for job in page_jobs:
+                posted_date = parse_posted_date(job.get("posted_time") or job.get("posted_date"))
+                # Рівні курсору теж беремо: вакансії з тією ж датою могли не потрапити в минуле опитування
+                if cursor is not None and posted_date is not None and posted_date < cursor:
+                    reached_cursor = True
+                    continue
+                jobs.append(job)
+
+            if reached_cursor or len(page_jobs) < self.page_size:
+                break
+        return jobs
+
+    async def ingest_profile(self, session: AsyncSession, profile) -> int:
+        """
+        Завантаження нових вакансій одного профілю
+
+        Args:
+            session: Асинхронна сесія
+            profile: Рядок filter_profiles
+
+        Returns:
+            Кількість записаних (нових або оновлених) вакансій
+        """
+        if profile.id not in self._cursors:
+            self._cursors[profile.id] = await load_cursor(session, profile.id)
+        cursor = self._cursors[profile.id]
+
+        client = self.client_factory(profile.user_id)
+        jobs = await self._fetch_new_jobs(client, profile, cursor)
+        self.stats["jobs_seen"] += len(jobs)
+
+        rows: Dict[str, Dict[str, Any]] = {}
+        accepted: Dict[str, Dict[str, Any]] = {}
+        for job in jobs:
+            if job.get("id") is None or self._excluded(job, profile.exclude_keywords):
+                continue
+            rows[str(job["id"])] = job_to_row(job, profile.user_id, profile.id)
+            accepted[str(job["id"])] = job
+
+        upserted = await async_bulk_upsert_job_matches(session, list(rows.values()))
+        if self.on_jobs and accepted:
+            self.on_jobs(list(accepted.values()))
+
+        posted_dates = [row["posted_date"] for row in rows.values() if row["posted_date"] is not None]
+        if posted_dates:
+            self._cursors[profile.id] = max([cursor, *posted_dates] if cursor else posted_dates)
+        return upserted
+
+    async def run_once(self) -> Dict[str, int]:
+        """Одне опитування всіх активних профілів"""
+        started = time.perf_counter()
+        totals = {"profiles": 0, "upserted": 0}
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(filter_profiles).where(
+                    filter_profiles.c.is_active.is_(True),
+                    or_(filter_profiles.c.is_paused.is_(False), filter_profiles.c.is_paused.is_(None))
+                )
+            )
+            profiles = result.all()
+
+            for profile in profiles:
+                try:
+                    upserted = await self.ingest_profile(session, profile)
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    self.stats["errors"] += 1
+                    logger.error(f"❌ Помилка завантаження вакансій профілю {profile.id}: {e}")
+                    continue
+                totals["profiles"] += 1
+                totals["upserted"] += upserted
+
+        self.stats["runs"] += 1
+        self.stats["profiles_polled"] += totals["profiles"]
+        self.stats["upserted"] += totals["upserted"]
+        self.last_run_at = datetime.utcnow()
+        logger.info(
+            f"✅ Завантаження вакансій: {totals['profiles']} профілів, {totals['upserted']} записано "
+            f"за {time.perf_counter() - started:.2f}с"
+        )
+        return totals
+
+    async def _run_loop(self):
+        """Цикл опитування"""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"❌ Помилка циклу завантаження вакансій: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Запуск фонового опитування"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"🚀 Worker завантаження вакансій запущено (кожні {self.interval}с)")
+
+    async def stop(self):
+        """Зупинка фонового опитування"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика worker"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_s": self.interval,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "profiles_tracked": len(self._cursors),
+            **self.stats
+        }
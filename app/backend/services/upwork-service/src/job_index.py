@@ -0,0 +1,374 @@
+"""
+Індекс вакансій у пам'яті для локального пошуку
+
+Замість лінійного перебору всіх вакансій:
+- навичка / країна -> множина job_id (postings);
+- токени назви та опису -> множина job_id (інвертований індекс);
+- відсортовані масиви (значення, job_id) для діапазонів бюджету та
+  погодинної ставки (bisect);
+- відсортований за часом публікації масив для видачі нових першими.
+
+Додавання та видалення інкрементальні, тож індекс оновлюється разом
+з ingestion. Масиви досортовуються ліниво перед першим запитом.
+Курсор (posted, job_id) знаходить початок сторінки bisect-ом, тож
+глибока сторінка коштує стільки ж, скільки перша.
+"""
+
+import bisect
+import heapq
+import re
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[\w+#]+")
+
+# Пакет, починаючи з якого масиви сортуються один раз у кінці, а не вставкою
+BULK_THRESHOLD = 64
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """Токени тексту (нижній регістр, без односимвольних)"""
+    if not text:
+        return set()
+    return {token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1}
+
+
+def _parse_skills(skills: Any) -> List[str]:
+    """Навички зі списку або рядка через кому"""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return [skill.strip().lower() for skill in skills if skill and skill.strip()]
+
+
+def budget_range(budget: Any) -> Optional[Tuple[float, float]]:
+    """
+    Межі бюджету вакансії (min, max)
+
+    Підтримує формат API ({"min", "max"}), рядок з БД ("100-500") та число.
+    """
+    if isinstance(budget, dict):
+        values = [budget.get(key) for key in ("min", "max") if isinstance(budget.get(key), (int, float))]
+    elif isinstance(budget, (int, float)):
+        values = [budget]
+    elif isinstance(budget, str) and budget:
+        try:
+            values = [float(part) for part in budget.split("-")]
+        except ValueError:
+            return None
+    else:
+        return None
+    if not values:
+        return None
+    return float(min(values)), float(max(values))
+
+
+class _SortedValues:
+    """Відсортований масив (значення, job_id) з лінивим досортуванням"""
+
+    def __init__(self):
+        self.items: List[Tuple[Any, str]] = []
+        self._sorted = True
+
+    def add(self, value: Any, job_id: str, bulk: bool = False):
+        item = (value, job_id)
+        if not self._sorted or not self.items or item >= self.items[-1]:
+            self.items.append(item)
+        elif bulk:
+            self.items.append(item)
+            self._sorted = False
+        else:
+            bisect.insort(self.items, item)
+
+    def ensure_sorted(self):
+        if not self._sorted:
+            self.items.sort()
+            self._sorted = True
+
+    def remove(self, value: Any, job_id: str):
+        self.ensure_sorted()
+        position = bisect.bisect_left(self.items, (value, job_id))
+        if position < len(self.items) and self.items[position] == (value, job_id):
+            del self.items[position]
+
+    def range_bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """Індекси [start, end) значень у діапазоні [low, high]"""
+        self.ensure_sorted()
+        start = 0 if low is None else bisect.bisect_left(self.items, (low,))
+        end = len(self.items) if high is None else bisect.bisect_left(self.items, (high, chr(0x10FFFF)))
+        return start, max(start, end)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class _JobKeys(NamedTuple):
+    """Значення вакансії, за якими вона проіндексована"""
+    location: str
+    budget: Optional[Tuple[float, float]]
+    hourly: Optional[float]
+    posted: str
+
+
+def _postings_keys(job: Dict[str, Any]) -> Tuple[Set[str], Set[str]]:
+    """Навички та токени вакансії (не зберігаються, а перераховуються при видаленні)"""
+    return (
+        set(_parse_skills(job.get("skills"))),
+        tokenize(job.get("title")) | tokenize(job.get("description"))
+    )
+
+
+class JobIndex:
+    """Інкрементальний індекс вакансій для пошуку за навичками, словами та діапазонами"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, _JobKeys] = {}
+        self._skills: Dict[str, Set[str]] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._locations: Dict[str, Set[str]] = {}
+        self._budget_min = _SortedValues()
+        self._budget_max = _SortedValues()
+        self._hourly = _SortedValues()
+        self._recency = _SortedValues()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    @staticmethod
+    def _post(postings: Dict[str, Set[str]], keys: Iterable[str], job_id: str):
+        for key in keys:
+            postings.setdefault(key, set()).add(job_id)
+
+    @staticmethod
+    def _unpost(postings: Dict[str, Set[str]], keys: Iterable[str], job_id: str):
+        for key in keys:
+            ids = postings.get(key)
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del postings[key]
+
+    def add_job(self, job: Dict[str, Any], bulk: bool = False):
+        """
+        Додавання або оновлення вакансії
+
+        Словник вакансії зберігається в індексі і не має змінюватися ззовні.
+
+        Args:
+            job: Вакансія у форматі Upwork API
+            bulk: Частина великого пакета (масиви досортовуються пізніше)
+        """
+        job_id = str(job["id"])
+        if job_id in self._jobs:
+            self.remove_job(job_id)
+
+        hourly_rate = job.get("hourly_rate")
+        keys = _JobKeys(
+            location=((job.get("client") or {}).get("location") or "").strip().lower(),
+            budget=budget_range(job.get("budget")),
+            hourly=float(hourly_rate) if isinstance(hourly_rate, (int, float)) else None,
+            posted=str(job.get("posted_time") or job.get("posted_date") or "")
+        )
+        skills, terms = _postings_keys(job)
+
+        self._post(self._skills, skills, job_id)
+        self._post(self._terms, terms, job_id)
+        if keys.location:
+            self._post(self._locations, [keys.location], job_id)
+        if keys.budget is not None:
+            self._budget_min.add(keys.budget[0], job_id, bulk)
+            self._budget_max.add(keys.budget[1], job_id, bulk)
+        if keys.hourly is not None:
+            self._hourly.add(keys.hourly, job_id, bulk)
+        self._recency.add(keys.posted, job_id, bulk)
+
+        self._jobs[job_id] = job
+        self._keys[job_id] = keys
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Додавання пакета вакансій
+
+        Returns:
+            Кількість доданих вакансій
+        """
+        jobs = [job for job in jobs if job.get("id") is not None]
+        bulk = len(jobs) >= BULK_THRESHOLD
+        if bulk:
+            # Старі версії видаляються, поки масиви ще відсортовані
+            for job in jobs:
+                self.remove_job(str(job["id"]))
+        for job in jobs:
+            self.add_job(job, bulk)
+        return len(jobs)
+
+    def remove_job(self, job_id: str) -> bool:
+        """
+        Видалення вакансії з індексу
+
+        Returns:
+            True, якщо вакансія була в індексі
+        """
+        keys = self._keys.pop(job_id, None)
+        if keys is None:
+            return False
+        skills, terms = _postings_keys(self._jobs.pop(job_id))
+
+        self._unpost(self._skills, skills, job_id)
+        self._unpost(self._terms, terms, job_id)
+        if keys.location:
+            self._unpost(self._locations, [keys.location], job_id)
+        if keys.budget is not None:
+            self._budget_min.remove(keys.budget[0], job_id)
+            self._budget_max.remove(keys.budget[1], job_id)
+        if keys.hourly is not None:
+            self._hourly.remove(keys.hourly, job_id)
+        self._recency.remove(keys.posted, job_id)
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Вакансія за ID"""
+        return self._jobs.get(job_id)
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        skills: Any = None,
+        location: Optional[str] = None,
+        budget_min: Optional[float] = None,
+        budget_max: Optional[float] = None,
+        hourly_rate_min: Optional[float] = None,
+        hourly_rate_max: Optional[float] = None,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Пошук вакансій (нові першими)
+
+        Args:
+            query: Слова в назві або описі (усі мають бути присутні)
+            skills: Навички, список або через кому (усі мають бути у вакансії)
+            location: Країна клієнта
+            budget_min: Верхня межа бюджету вакансії не менша за значення
+            budget_max: Нижня межа бюджету вакансії не більша за значення
+            hourly_rate_min: Мінімальна погодинна ставка
+            hourly_rate_max: Максимальна погодинна ставка
+            skip: Зсув
+            limit: Кількість
+            after: Ключ (posted, job_id) останньої вакансії попередньої сторінки
+
+        Returns:
+            Вакансії у форматі Upwork API
+        """
+        wanted = skip + limit
+        total = len(self._jobs)
+
+        # Postings: перетин множин (у C, від найменшої)
+        postings = [self._skills.get(skill, set()) for skill in _parse_skills(skills)]
+        postings += [self._terms.get(term, set()) for term in tokenize(query)]
+        if location:
+            postings.append(self._locations.get(location.strip().lower(), set()))
+
+        candidates: Optional[Set[str]] = None
+        if postings:
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+            if not candidates:
+                return []
+
+        # Діапазони: (кількість у діапазоні, job_id у діапазоні, перевірка значень вакансії)
+        ranges: List[Tuple[int, Callable[[], Iterable[str]], Callable[[str], bool]]] = []
+
+        def add_range(values: _SortedValues, low, high, check: Callable[[_JobKeys], bool]):
+            start, end = values.range_bounds(low, high)
+            ranges.append((
+                end - start,
+                lambda: [job_id for _, job_id in values.items[start:end]],
+                lambda job_id: check(self._keys[job_id])
+            ))
+
+        if budget_min is not None:
+            add_range(self._budget_max, budget_min, None,
+                      lambda keys: keys.budget is not None and keys.budget[1] >= budget_min)
+        if budget_max is not None:
+            add_range(self._budget_min, None, budget_max,
+                      lambda keys: keys.budget is not None and keys.budget[0] <= budget_max)
+        if hourly_rate_min is not None or hourly_rate_max is not None:
+            low = hourly_rate_min if hourly_rate_min is not None else float("-inf")
+            high = hourly_rate_max if hourly_rate_max is not None else float("inf")
+            add_range(self._hourly, hourly_rate_min, hourly_rate_max,
+                      lambda keys: keys.hourly is not None and low <= keys.hourly <= high)
+        ranges.sort(key=lambda item: item[0])
+
+        # Оцінка збігів (фільтри вважаються незалежними) і довжини проходу за новизною
+        matches = float(len(candidates) if candidates is not None else total)
+        for size, _, _ in ranges:
+            matches *= size / total if total else 0
+        scan_cost = total if matches < 1 else min(total, wanted * total / matches)
+
+        # Джерело кандидатів: менше з postings та найвужчого діапазону, якщо дешевше за прохід
+        checks = [check for _, _, check in ranges]
+        if after is not None:
+            after = (str(after[0]), str(after[1]))
+        source: Optional[Iterable[str]] = None
+        if ranges and ranges[0][0] <= scan_cost and (candidates is None or ranges[0][0] < len(candidates)):
+            source = ranges[0][1]()
+            if candidates is not None:
+                source = candidates.intersection(source)
+            checks = checks[1:]
+        elif candidates is not None and len(candidates) <= scan_cost:
+            source = candidates
+
+        if source is not None:
+            if after is not None:
+                checks.append(lambda job_id: (self._keys[job_id].posted, job_id) < after)
+            selected = [job_id for job_id in source if all(check(job_id) for check in checks)] if checks else source
+            ordered = heapq.nlargest(wanted, selected, key=lambda job_id: (self._keys[job_id].posted, job_id))
+        else:
+            # Широкий запит: прохід за новизною з раннім виходом після першої сторінки
+            self._recency.ensure_sorted()
+            if candidates is not None:
+                checks.append(candidates.__contains__)
+            items = self._recency.items
+            end = len(items) if after is None else bisect.bisect_left(items, after)
+            ordered = []
+            for position in range(end - 1, -1, -1):
+                job_id = items[position][1]
+                if all(check(job_id) for check in checks):
+                    ordered.append(job_id)
+                    if len(ordered) >= wanted:
+                        break
+
+        return [self._jobs[job_id] for job_id in ordered[skip:wanted]]
+
+    def sort_key(self, job_id: str) -> Optional[Tuple[str, str]]:
+        """Ключ сортування вакансії (posted, job_id) для курсора наступної сторінки"""
+        keys = self._keys.get(job_id)
+        return (keys.posted, job_id) if keys is not None else None
+
+    def clear(self):
+        """Очищення індексу"""
+        self.__init__()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика індексу"""
+        return {
+            "jobs": len(self._jobs),
+            "skills": len(self._skills),
+            "terms": len(self._terms),
+            "locations": len(self._locations)
+        }
+
+
+# Глобальний екземпляр
+job_index = JobIndex()
+
+
+def get_job_index() -> JobIndex:
+    """Отримання індексу вакансій"""
+    return job_index
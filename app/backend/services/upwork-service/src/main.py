@@ -4,7 +4,7 @@ Upwork Service - Мікросервіс для роботи з Upwork API
 
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import sys
 import os
@@ -15,12 +15,85 @@ sys.path.insert(0, shared_path)
 
 from shared.config.settings import settings
 from shared.config.logging import setup_logging, get_logger
-from shared.database.connection import get_db, db_manager
+from shared.database.connection import get_async_db, db_manager
+from shared.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_slice
 
 # Налаштування логування
 setup_logging(service_name="upwork-service")
 logger = get_logger("upwork-service")
 
+# Фоновий worker завантаження вакансій (UPWORK_INGESTION_ENABLED)
+ingestion_worker = None
+
+# Кеш довідкових даних (категорії, навички, секції профілю)
+reference_cache = None
+
+# Чи заповнені аналітика та індекс вакансій
+local_views_seeded = False
+
+
+def get_reference_cache():
+    """Кеш довідкових даних (створюється при першому зверненні)"""
+    global reference_cache
+    if reference_cache is None:
+        from src.reference_data import ReferenceDataCache, default_loaders
+        from src.upwork_client import MockUpworkAPIClient
+        
+        reference_cache = ReferenceDataCache(
+            default_loaders(MockUpworkAPIClient),
+            snapshot_path=settings.UPWORK_REFERENCE_SNAPSHOT_PATH
+        )
+    return reference_cache
+
+
+def on_ingested_jobs(jobs):
+    """Оновлення аналітики та індексу вакансій записаними вакансіями"""
+    from src.analytics import get_analytics_view
+    from src.job_index import get_job_index
+    
+    get_analytics_view().add_jobs(jobs)
+    get_job_index().add_jobs(jobs)
+
+
+async def seed_local_views(db):
+    """Одноразове заповнення аналітики та індексу з локального сховища або Upwork API"""
+    global local_views_seeded
+    if local_views_seeded:
+        return
+    
+    if settings.UPWORK_INGESTION_ENABLED:
+        from src.ingestion import query_jobs
+        
+        jobs = await query_jobs(db, limit=None)
+    else:
+        from src.upwork_client import MockUpworkAPIClient
+        
+        result = await MockUpworkAPIClient().search_jobs("")
+        jobs = result.get("jobs", [])
+    
+    on_ingested_jobs(jobs)
+    local_views_seeded = True
+
+
+def parse_cursor(cursor):
+    """Ключ останнього елемента попередньої сторінки (None - перша сторінка)"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def jobs_next_cursor(jobs, limit):
+    """Курсор наступної сторінки вакансій (None - сторінка остання)"""
+    from src.job_index import get_job_index
+    
+    if not jobs or len(jobs) < limit:
+        return None
+    return encode_cursor(*get_job_index().sort_key(str(jobs[-1]["id"])))
+
+
 # Створюємо FastAPI додаток
 app = FastAPI(
     title="Upwork Service",
@@ -50,6 +123,50 @@ async def startup_event():
         logger.warning("⚠️ Попередження: Проблеми з підключенням до БД")
     else:
         logger.info("✅ Підключення до БД успішне")
+    
+    # Запис / відтворення викликів Upwork API (UPWORK_API_RECORD_PATH / UPWORK_API_REPLAY_PATH)
+    from src.api_replay import transport_wrapper_from_settings
+    from src.upwork_client import set_transport_wrapper
+    
+    wrapper, mode = transport_wrapper_from_settings()
+    if wrapper is not None:
+        await set_transport_wrapper(wrapper)
+        logger.info(f"🎬 Upwork API у режимі {mode}")
+    
+    # Запускаємо завантаження вакансій у локальне сховище
+    global ingestion_worker
+    if settings.UPWORK_INGESTION_ENABLED and db_manager.AsyncSessionLocal:
+        from src.ingestion import JobIngestionWorker
+        from src.upwork_client import MockUpworkAPIClient
+        
+        # Аналітика та індекс стартують з уже збережених вакансій, далі їх оновлює worker
+        async with db_manager.AsyncSessionLocal() as session:
+            await seed_local_views(session)
+        
+        ingestion_worker = JobIngestionWorker(
+            db_manager.AsyncSessionLocal,
+            client_factory=lambda user_id: MockUpworkAPIClient(),
+            on_jobs=on_ingested_jobs
+        )
+        ingestion_worker.start()
+    
+    # Довідкові дані: знімок з диска або Upwork API, далі - оновлення у фоні
+    cache = get_reference_cache()
+    await cache.warm()
+    cache.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Подія зупинки сервісу"""
+    from src.upwork_client import close_http_client
+    
+    if ingestion_worker:
+        await ingestion_worker.stop()
+    if reference_cache:
+        await reference_cache.stop()
+    await close_http_client()
+    await db_manager.dispose_async()
 
 
 @app.get("/")
@@ -78,6 +195,30 @@ async def health_check():
     }
 
 
+@app.get("/upwork/api-stats")
+async def get_upwork_api_stats():
+    """Статистика клієнта Upwork API (rate limiter, гістограми затримок)"""
+    from src.upwork_client import get_api_stats
+    
+    return get_api_stats()
+
+
+@app.get("/upwork/reference/status")
+async def get_reference_status():
+    """Стан кешу довідкових даних"""
+    return get_reference_cache().get_stats()
+
+
+@app.get("/upwork/ingestion/status")
+async def get_ingestion_status():
+    """Стан фонового завантаження вакансій"""
+    from src.job_index import get_job_index
+    
+    if not ingestion_worker:
+        return {"enabled": False, "index": get_job_index().get_stats()}
+    return {"enabled": True, "index": get_job_index().get_stats(), **ingestion_worker.get_stats()}
+
+
 @app.get("/upwork/jobs")
 async def get_jobs(
     skip: int = 0,
@@ -86,16 +227,11 @@ async def get_jobs(
     budget_min: float = None,
     budget_max: float = None,
     location: str = None,
-    db: Session = Depends(get_db)
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Отримання списку вакансій"""
+    """Отримання списку вакансій (cursor - keyset-пагінація за (posted_date, id))"""
     try:
-        # Імпортуємо UpworkAPIClient
-        from src.upwork_client import MockUpworkAPIClient
-        
-        # Використовуємо mock клієнт для тестування
-        client = MockUpworkAPIClient()
-        
         # Формуємо фільтри
         filters = {}
         if skills:
@@ -107,12 +243,20 @@ async def get_jobs(
         if location:
             filters["location"] = location
         
-        # Отримуємо вакансії
-        result = client.search_jobs("", filters)
-        jobs = result.get("jobs", [])
-        
-        # Застосовуємо пагінацію
-        jobs = jobs[skip:skip + limit]
+        # Пошук в індексі вакансій (заповнюється з локального сховища та ingestion)
+        from src.job_index import get_job_index
+        
+        after = parse_cursor(cursor)
+        await seed_local_views(db)
+        jobs = get_job_index().search(
+            skills=skills,
+            location=location,
+            budget_min=budget_min,
+            budget_max=budget_max,
+            skip=skip,
+            limit=limit,
+            after=after
+        )
         
         logger.info(f"✅ Отримано {len(jobs)} вакансій")
         
@@ -121,9 +265,12 @@ async def get_jobs(
             "total": len(jobs),
             "skip": skip,
             "limit": limit,
+            "next_cursor": jobs_next_cursor(jobs, limit),
             "filters_applied": filters
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Помилка отримання вакансій: {e}")
         raise HTTPException(
@@ -137,22 +284,17 @@ async def search_jobs(
     query: str,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Пошук вакансій"""
+    """Пошук вакансій (cursor - keyset-пагінація за (posted_date, id))"""
     try:
-        # Імпортуємо UpworkAPIClient
-        from src.upwork_client import MockUpworkAPIClient
+        # Пошук в індексі вакансій
+        from src.job_index import get_job_index
         
-        # Використовуємо mock клієнт для тестування
-        client = MockUpworkAPIClient()
-        
-        # Шукаємо вакансії
-        result = client.search_jobs(query)
-        jobs = result.get("jobs", [])
-        
-        # Застосовуємо пагінацію
-        jobs = jobs[skip:skip + limit]
+        after = parse_cursor(cursor)
+        await seed_local_views(db)
+        jobs = get_job_index().search(query=query, skip=skip, limit=limit, after=after)
         
         logger.info(f"✅ Знайдено {len(jobs)} вакансій для запиту: {query}")
         
@@ -161,9 +303,12 @@ async def search_jobs(
             "total": len(jobs),
             "query": query,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": jobs_next_cursor(jobs, limit)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Помилка пошуку вакансій: {e}")
         raise HTTPException(
@@ -172,10 +317,40 @@ async def search_jobs(
         )
 
 
+@app.get("/upwork/jobs/details")
+async def get_jobs_details(
+    ids: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Деталі кількох вакансій одним запитом (ids через кому)"""
+    try:
+        from src.upwork_client import MockUpworkAPIClient, fetch_many
+
+        # Використовуємо mock клієнт
+        client = MockUpworkAPIClient()
+
+        # Отримуємо деталі паралельно, помилки - окремо для кожної вакансії
+        batch = await fetch_many(ids.split(","), client.get_job_details)
+
+        logger.info(f"✅ Отримано деталі {len(batch['results'])} вакансій, помилок: {len(batch['errors'])}")
+
+        return {
+            "jobs": batch["results"],
+            "errors": batch["errors"]
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Помилка отримання вакансій: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Помилка отримання вакансій"
+        )
+
+
 @app.get("/upwork/jobs/{job_id}")
 async def get_job(
     job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання деталей вакансії"""
     try:
@@ -185,7 +360,7 @@ async def get_job(
         client = MockUpworkAPIClient()
         
         # Отримуємо деталі вакансії
-        job = client.get_job_details(job_id)
+        job = await client.get_job_details(job_id)
         
         logger.info(f"✅ Отримано деталі вакансії: {job_id}")
         
@@ -208,10 +383,13 @@ async def get_applications(
     skip: int = 0,
     limit: int = 50,
     job_id: str = None,
-    db: Session = Depends(get_db)
+    cursor: str = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Отримання пропозицій користувача"""
+    """Отримання пропозицій користувача (cursor - keyset-пагінація за (submitted_at, id))"""
     try:
+        after = parse_cursor(cursor)
+        
         from src.upwork_client import MockUpworkAPIClient
         
         # Використовуємо mock клієнт
@@ -243,8 +421,14 @@ async def get_applications(
         if job_id:
             mock_proposals = [p for p in mock_proposals if p["job_id"] == job_id]
         
-        # Застосовуємо пагінацію
-        proposals = mock_proposals[skip:skip + limit]
+        # Застосовуємо пагінацію: курсор - bisect по ключу, skip - зворотна сумісність
+        sort_key = lambda p: (p["submitted_at"], p["id"])
+        mock_proposals.sort(key=sort_key)
+        if after is not None or not skip:
+            proposals = keyset_slice(mock_proposals, sort_key, after, limit)
+        else:
+            proposals = mock_proposals[::-1][skip:skip + limit]
+        next_cursor = encode_cursor(*sort_key(proposals[-1])) if proposals and len(proposals) == limit else None
         
         logger.info(f"✅ Отримано {len(proposals)} пропозицій")
         
@@ -252,9 +436,12 @@ async def get_applications(
             "applications": proposals,
             "total": len(mock_proposals),
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Помилка отримання пропозицій: {e}")
         raise HTTPException(
@@ -269,7 +456,7 @@ async def create_application(
     proposal_text: str,
     bid_amount: float,
     delivery_time: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Створення нової пропозиції"""
     try:
@@ -279,7 +466,7 @@ async def create_application(
         client = MockUpworkAPIClient()
         
         # Перевіряємо чи існує вакансія
-        job = client.get_job_details(job_id)
+        job = await client.get_job_details(job_id)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -318,14 +505,14 @@ async def create_application(
 @app.get("/upwork/clients/{client_id}")
 async def get_client(
     client_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання інформації про клієнта"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        client_data = client.get_client_info(client_id)
+        client_data = await client.get_client_info(client_id)
         if not client_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -351,14 +538,14 @@ async def get_client(
 @app.get("/upwork/freelancers/{freelancer_id}")
 async def get_freelancer(
     freelancer_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання інформації про фрілансера"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        freelancer = client.get_freelancer_profile(freelancer_id)
+        freelancer = await client.get_freelancer_profile(freelancer_id)
         if not freelancer:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -383,54 +570,22 @@ async def get_freelancer(
 
 @app.get("/upwork/analytics/overview")
 async def get_analytics_overview(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання аналітики по Upwork"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        jobs = client.search_jobs("")
-        
-        # Розраховуємо статистику
-        total_jobs = len(jobs)
-        total_proposals = 0  # Mock клієнт не повертає пропозиції
-        
-        # Безпечний розрахунок середнього бюджету
-        total_budget = 0
-        budget_count = 0
-        for job in jobs:
-            if isinstance(job.get("budget"), dict):
-                min_budget = job["budget"].get("min", 0)
-                max_budget = job["budget"].get("max", 0)
-                if isinstance(min_budget, (int, float)) and isinstance(max_budget, (int, float)):
-                    total_budget += min_budget + max_budget
-                    budget_count += 2
-        
-        avg_budget = total_budget / budget_count if budget_count > 0 else 0
+        from src.analytics import get_analytics_view
         
-        # Топ навички
-        all_skills = []
-        for job in jobs:
-            all_skills.extend(job["skills"])
-        
-        skill_counts = {}
-        for skill in all_skills:
-            skill_counts[skill] = skill_counts.get(skill, 0) + 1
-        
-        top_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Початкове заповнення; далі агрегати оновлює ingestion
+        await seed_local_views(db)
+        view = get_analytics_view()
         
         logger.info("✅ Отримано аналітику Upwork")
         
         return {
-            "overview": {
-                "total_jobs": total_jobs,
-                "total_proposals": total_proposals,
-                "average_budget": round(avg_budget, 2),
-                "top_skills": top_skills
-            },
-            "recent_jobs": MOCK_JOBS[:3],
-            "recent_proposals": MOCK_PROPOSALS[:3]
+            "overview": view.overview(),
+            "recent_jobs": view.recent_jobs,
+            "recent_proposals": []  # Mock клієнт не повертає пропозиції
         }
         
     except Exception as e:
@@ -445,14 +600,14 @@ async def get_analytics_overview(
 
 @app.get("/upwork/profile")
 async def get_user_profile(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання профілю користувача"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        profile = client.get_user_profile()
+        profile = await client.get_user_profile()
         
         logger.info("✅ Отримано профіль користувача")
         
@@ -472,14 +627,14 @@ async def get_user_profile(
 async def submit_proposal(
     job_id: str,
     proposal_data: dict,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Відправка відгуку на вакансію"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        result = client.submit_proposal(job_id, proposal_data)
+        result = await client.submit_proposal(job_id, proposal_data)
         
         logger.info(f"✅ Відправлено відгук на вакансію: {job_id}")
         
@@ -500,14 +655,14 @@ async def submit_proposal(
 @app.get("/upwork/messages")
 async def get_messages(
     thread_id: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання повідомлень"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        messages = client.get_messages(thread_id)
+        messages = await client.get_messages(thread_id)
         
         logger.info("✅ Отримано повідомлення")
         
@@ -527,14 +682,14 @@ async def get_messages(
 async def send_message(
     thread_id: str,
     message: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Відправка повідомлення"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        result = client.send_message(thread_id, message)
+        result = await client.send_message(thread_id, message)
         
         logger.info(f"✅ Відправлено повідомлення в thread: {thread_id}")
         
@@ -552,13 +707,10 @@ async def send_message(
 
 
 @app.get("/upwork/categories")
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
     """Отримання категорій вакансій"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        result = client.get_categories()
+        result = await get_reference_cache().get("categories")
         
         logger.info("✅ Категорії вакансій отримано успішно")
         return {
@@ -575,13 +727,10 @@ async def get_categories(db: Session = Depends(get_db)):
 
 
 @app.get("/upwork/skills")
-async def get_skills(db: Session = Depends(get_db)):
+async def get_skills(db: AsyncSession = Depends(get_async_db)):
     """Отримання навичок"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        result = client.get_skills()
+        result = await get_reference_cache().get("skills")
         
         logger.info("✅ Навички отримано успішно")
         return {
@@ -598,13 +747,13 @@ async def get_skills(db: Session = Depends(get_db)):
 
 
 @app.get("/upwork/contracts")
-async def get_contracts(db: Session = Depends(get_db)):
+async def get_contracts(db: AsyncSession = Depends(get_async_db)):
     """Отримання контрактів"""
     try:
         from src.upwork_client import MockUpworkAPIClient
         
         client = MockUpworkAPIClient()
-        result = client.get_contracts()
+        result = await client.get_contracts()
         
         logger.info("✅ Контракти отримано успішно")
         return {
@@ -624,7 +773,7 @@ async def get_contracts(db: Session = Depends(get_db)):
 async def get_earnings(
     from_date: str = None,
     to_date: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання заробітку"""
     try:
@@ -633,7 +782,7 @@ async def get_earnings(
         client = MockUpworkAPIClient()
         # Використовуємо ID поточного користувача (в реальному API це буде з токена)
         freelancer_id = "~0123456789012345"
-        result = client.get_earnings(freelancer_id, from_date, to_date)
+        result = await client.get_earnings(freelancer_id, from_date, to_date)
         
         logger.info("✅ Заробіток отримано успішно")
         return {
@@ -652,7 +801,7 @@ async def get_earnings(
 @app.get("/upwork/workdiary")
 async def get_workdiary(
     date: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Отримання робочого щоденника"""
     try:
@@ -661,7 +810,7 @@ async def get_workdiary(
         client = MockUpworkAPIClient()
         # Використовуємо ID поточного користувача
         freelancer_id = "~0123456789012345"
-        result = client.get_workdiary(freelancer_id, date)
+        result = await client.get_workdiary(freelancer_id, date)
         
         logger.info("✅ Робочий щоденник отримано успішно")
         return {
@@ -678,16 +827,13 @@ async def get_workdiary(
 
 
 @app.get("/upwork/portfolio")
-async def get_portfolio(db: Session = Depends(get_db)):
+async def get_portfolio(db: AsyncSession = Depends(get_async_db)):
     """Отримання портфоліо користувача"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        profile = client.get_user_profile()
+        sections = await get_reference_cache().get("profile_sections")
         
         # Виділяємо портфоліо з профілю
-        portfolio = profile.get("portfolio_items", [])
+        portfolio = sections.get("portfolio_items", [])
         
         logger.info("✅ Портфоліо отримано успішно")
         return {
@@ -706,16 +852,13 @@ async def get_portfolio(db: Session = Depends(get_db)):
 
 
 @app.get("/upwork/certifications")
-async def get_certifications(db: Session = Depends(get_db)):
+async def get_certifications(db: AsyncSession = Depends(get_async_db)):
     """Отримання сертифікатів користувача"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        profile = client.get_user_profile()
+        sections = await get_reference_cache().get("profile_sections")
         
         # Виділяємо сертифікати з профілю
-        certifications = profile.get("certifications", [])
+        certifications = sections.get("certifications", [])
         
         logger.info("✅ Сертифікати отримано успішно")
         return {
@@ -734,16 +877,13 @@ async def get_certifications(db: Session = Depends(get_db)):
 
 
 @app.get("/upwork/education")
-async def get_education(db: Session = Depends(get_db)):
+async def get_education(db: AsyncSession = Depends(get_async_db)):
     """Отримання освіти користувача"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        profile = client.get_user_profile()
+        sections = await get_reference_cache().get("profile_sections")
         
         # Виділяємо освіту з профілю
-        education = profile.get("education", [])
+        education = sections.get("education", [])
         
         logger.info("✅ Освіта отримано успішно")
         return {
@@ -762,16 +902,13 @@ async def get_education(db: Session = Depends(get_db)):
 
 
 @app.get("/upwork/languages")
-async def get_languages(db: Session = Depends(get_db)):
+async def get_languages(db: AsyncSession = Depends(get_async_db)):
     """Отримання мов користувача"""
     try:
-        from src.upwork_client import MockUpworkAPIClient
-        
-        client = MockUpworkAPIClient()
-        profile = client.get_user_profile()
+        sections = await get_reference_cache().get("profile_sections")
         
         # Виділяємо мови з профілю
-        languages = profile.get("languages", [])
+        languages = sections.get("languages", [])
         
         logger.info("✅ Мови отримано успішно")
         return {
@@ -0,0 +1,244 @@
+"""
+Кеш довідкових даних Upwork (категорії, навички, статичні секції профілю)
+
+Дані майже не змінюються, тому читаються з пам'яті, а не з Upwork API
+на кожен запит. Під час запуску кеш підхоплює останній успішний знімок
+з диска (швидкий холодний старт), далі оновлюється у фоні за розкладом.
+Помилка оновлення не затирає попередні дані.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+
+logger = get_logger("upwork-reference-data")
+
+# Секції профілю, які віддаються окремими endpoints
+PROFILE_SECTIONS = ("portfolio_items", "certifications", "education", "languages")
+
+
+def default_loaders(client_factory: Callable[[], Any]) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """
+    Завантажувачі довідкових даних через клієнт Upwork API
+
+    Args:
+        client_factory: Фабрика клієнта з async get_categories/get_skills/get_user_profile
+
+    Returns:
+        Назва набору даних -> корутина завантаження
+    """
+    async def categories():
+        return await client_factory().get_categories()
+
+    async def skills():
+        return await client_factory().get_skills()
+
+    async def profile_sections():
+        profile = await client_factory().get_user_profile()
+        return {section: profile.get(section, []) for section in PROFILE_SECTIONS}
+
+    return {
+        "categories": categories,
+        "skills": skills,
+        "profile_sections": profile_sections
+    }
+
+
+class ReferenceDataCache:
+    """Кеш довідкових даних у пам'яті зі знімком на диску та фоновим оновленням"""
+
+    def __init__(
+        self,
+        loaders: Dict[str, Callable[[], Awaitable[Any]]],
+        snapshot_path: Optional[str] = None,
+        refresh_interval: float = None
+    ):
+        """
+        Args:
+            loaders: Назва набору даних -> корутина завантаження
+            snapshot_path: Файл знімка (None - без знімка)
+            refresh_interval: Секунди між фоновими оновленнями
+        """
+        self.loaders = loaders
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval or settings.UPWORK_REFERENCE_REFRESH_INTERVAL
+        self._data: Dict[str, Any] = {}
+        self._refreshed_at: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in loaders}
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot_stale = False
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "snapshot_loads": 0,
+            "snapshot_writes": 0
+        }
+
+    async def get(self, name: str) -> Any:
+        """
+        Отримання набору даних
+
+        Args:
+            name: Назва набору даних
+
+        Returns:
+            Дані з пам'яті (при промаху - завантажені з API)
+        """
+        if name in self._data:
+            self.stats["hits"] += 1
+            return self._data[name]
+
+        self.stats["misses"] += 1
+        await self.refresh_one(name)
+        if name not in self._data:
+            raise LookupError(f"Довідкові дані '{name}' недоступні")
+        return self._data[name]
+
+    async def refresh_one(self, name: str, force: bool = False) -> bool:
+        """
+        Оновлення одного набору даних (single-flight)
+
+        Args:
+            name: Назва набору даних
+            force: Оновити, навіть якщо дані вже є
+
+        Returns:
+            True, якщо дані оновлено
+        """
+        async with self._locks[name]:
+            # Поки чекали, дані міг завантажити інший запит
+            if not force and name in self._data:
+                return False
+            try:
+                data = await self.loaders[name]()
+            except Exception as e:
+                self.stats["refresh_errors"] += 1
+                logger.error(f"❌ Помилка оновлення довідкових даних '{name}': {e}")
+                return False
+
+            self._data[name] = data
+            self._refreshed_at[name] = datetime.utcnow().isoformat()
+            self.stats["refreshes"] += 1
+            return True
+
+    async def refresh(self) -> int:
+        """
+        Оновлення всіх наборів даних та знімка
+
+        Returns:
+            Кількість оновлених наборів
+        """
+        results = await asyncio.gather(*(self.refresh_one(name, force=True) for name in self.loaders))
+        updated = sum(results)
+        if updated:
+            await asyncio.to_thread(self.save_snapshot)
+        logger.info(f"✅ Довідкові дані оновлено: {updated}/{len(self.loaders)}")
+        return updated
+
+    def load_snapshot(self) -> int:
+        """
+        Завантаження останнього успішного знімка з диска
+
+        Returns:
+            Кількість завантажених наборів
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Не вдалося прочитати знімок довідкових даних: {e}")
+            return 0
+
+        loaded = 0
+        for name, entry in snapshot.get("entries", {}).items():
+            if name in self.loaders and name not in self._data:
+                self._data[name] = entry["data"]
+                self._refreshed_at[name] = entry.get("refreshed_at")
+                loaded += 1
+        self.stats["snapshot_loads"] += 1
+        return loaded
+
+    def save_snapshot(self):
+        """Атомарний запис знімка (тимчасовий файл + rename)"""
+        if not self.snapshot_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        snapshot = {
+            "saved_at": datetime.utcnow().isoformat(),
+            "entries": {
+                name: {"data": data, "refreshed_at": self._refreshed_at.get(name)}
+                for name, data in self._data.items()
+            }
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Не вдалося записати знімок довідкових даних: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.stats["snapshot_writes"] += 1
+
+    async def warm(self):
+        """Прогрів при запуску: знімок з диска, а чого немає - з API"""
+        started = time.perf_counter()
+        loaded = self.load_snapshot()
+        self._snapshot_stale = loaded > 0
+        if len(self._data) < len(self.loaders):
+            await self.refresh()
+        logger.info(
+            f"🔥 Довідкові дані прогріто за {time.perf_counter() - started:.3f}с "
+            f"(зі знімка: {loaded}, всього: {len(self._data)}/{len(self.loaders)})"
+        )
+
+    async def _run_loop(self):
+        """Цикл фонового оновлення"""
+        # Дані зі знімка могли застаріти - оновлюємо одразу, не блокуючи запуск
+        delay = 0 if self._snapshot_stale else self.refresh_interval
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.refresh_interval
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Помилка циклу оновлення довідкових даних: {e}")
+
+    def start(self):
+        """Запуск фонового оновлення"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"🚀 Оновлення довідкових даних запущено (кожні {self.refresh_interval}с)")
+
+    async def stop(self):
+        """Зупинка фонового оновлення"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "refresh_interval_s": self.refresh_interval,
+            "entries": dict(self._refreshed_at),
+            **self.stats
+        }
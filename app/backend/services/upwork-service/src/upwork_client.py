@@ -1,247 +1,915 @@
 """
 Upwork API Client для роботи з Upwork API
+
+Асинхронний клієнт на httpx зі спільним пулом з'єднань. Запити
+обмежуються token bucket (поповнюється з часом), 429/5xx повторюються
+з експоненційною затримкою з jitter, а Retry-After від Upwork
+призупиняє всі запити процесу на вказаний час.
 """
 
-import requests
+import asyncio
 import json
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+import random
+import time
+from collections import OrderedDict, defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
 import sys
 import os
 
+import httpx
+
 # Додаємо шлях до спільних компонентів
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'shared'))
 
 try:
+    from shared.config.settings import settings
     from shared.config.logging import get_logger
     from shared.utils.encryption import decrypt_data
 except ImportError:
     # Fallback для тестування
     import logging
+    settings = None
+
     def get_logger(name):
         return logging.getLogger(name)
-    
+
     def decrypt_data(data):
         return data  # Простий fallback
 
 logger = get_logger("upwork-client")
 
 
+def _setting(name: str, default: Any) -> Any:
+    """Значення з settings (або значення за замовчуванням без shared)"""
+    return getattr(settings, name, default)
+
+
+# Статуси, після яких запит варто повторити
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+# Методи, які безпечно повторювати після помилки сервера
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Межі бакетів гістограми затримок (мс)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class UpworkAPIError(Exception):
+    """Помилка Upwork API"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UpworkAuthError(UpworkAPIError):
+    """Токен недійсний або закінчився"""
+
+
+class UpworkRateLimitError(UpworkAPIError):
+    """Rate limit Upwork API вичерпано"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket для запитів до Upwork API
+
+    Токени поповнюються зі швидкістю rate за секунду до capacity.
+    pause() блокує всі запити до вказаного часу (Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated_at = clock()
+        self.paused_until = 0.0
+        self.stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "pauses": 0
+        }
+
+    def _refill(self, now: float):
+        """Поповнення токенів за час, що минув"""
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Спроба взяти токен
+
+        Returns:
+            0, якщо токен взято, інакше секунди до наступної спроби
+        """
+        now = self._clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.stats["acquired"] += 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """Очікування токена"""
+        throttled = False
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if not throttled:
+                throttled = True
+                self.stats["throttled"] += 1
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Призупинення запитів (Retry-After від Upwork)"""
+        now = self._clock()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+        self._updated_at = self.paused_until
+        self.stats["pauses"] += 1
+
+    def is_idle(self) -> bool:
+        """Бакет поповнився до capacity і не на паузі - не відрізняється від нового"""
+        now = self._clock()
+        if now < self.paused_until:
+            return False
+        return self.tokens + (now - self._updated_at) * self.rate >= self.capacity
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Стан та статистика"""
+        now = self._clock()
+        self._refill(max(now, self._updated_at))
+        return {
+            "tokens": round(self.tokens, 3),
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "paused_for_s": round(max(0.0, self.paused_until - now), 3),
+            **self.stats
+        }
+
+
+class LatencyHistogram:
+    """Гістограма затримок викликів (кумулятивні бакети, як у Prometheus)"""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds: float):
+        """Запис затримки"""
+        value_ms = seconds * 1000
+        self.count += 1
+        self.sum_ms += value_ms
+        for index, bound in enumerate(self.buckets_ms):
+            if value_ms <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """Оцінка квантиля (верхня межа бакета)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, bound in enumerate(self.buckets_ms):
+            seen += self.counts[index]
+            if seen >= target:
+                return float(bound)
+        return float("inf")
+
+    def summary(self) -> Dict[str, Any]:
+        """Зведена статистика"""
+        cumulative = 0
+        buckets = {}
+        for index, bound in enumerate(self.buckets_ms):
+            cumulative += self.counts[index]
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = self.count
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": buckets
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Розбір заголовка Retry-After
+
+    Args:
+        value: Кількість секунд або HTTP-дата
+
+    Returns:
+        Секунди очікування або None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Експоненційна затримка з повним jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Unix-час для datetime з БД (naive вважається UTC)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class AccessTokenCache:
+    """
+    Кеш розшифрованих access token Upwork по користувачах
+
+    Токен зберігається лише в пам'яті процесу і вважається придатним до
+    expires_at мінус refresh_margin. Завантаження (запит до БД та, за
+    потреби, оновлення через refresh_token) виконується поза event loop і
+    single-flight: паралельні запити одного користувача чекають на один
+    виклик loader. Якщо передано refresher, токен оновлюється у фоні до
+    настання refresh_margin, тож запити не чекають на оновлення.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = 300.0,
+        max_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.refresh_margin = refresh_margin
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_handles: Dict[str, asyncio.TimerHandle] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "background_refreshes": 0,
+            "refresh_errors": 0,
+            "invalidations": 0
+        }
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """Токен з кешу, якщо до оновлення ще є час"""
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() < entry[1]:
+            return entry[0]
+        return None
+
+    async def get_token(
+        self,
+        user_id: Any,
+        loader: Callable[[], Tuple[str, Optional[datetime]]],
+        refresher: Optional[Callable[[], Tuple[str, Optional[datetime]]]] = None
+    ) -> str:
+        """
+        Отримання access token користувача
+
+        Args:
+            user_id: ID користувача
+            loader: Синхронне завантаження (та оновлення) токена, повертає (token, expires_at)
+            refresher: Синхронне оновлення токена для фонового виклику (з власною сесією БД)
+
+        Returns:
+            Розшифрований access token
+        """
+        key = str(user_id)
+        token = self._lookup(key)
+        if token is not None:
+            self.stats["hits"] += 1
+            return token
+
+        task = self._inflight.get(key)
+        if task is not None:
+            # Токен уже завантажує інший запит (або фонове оновлення)
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = self._start_load(key, loader, refresher)
+        # shield: скасування одного запиту не перериває спільне завантаження
+        return await asyncio.shield(task)
+
+    def _start_load(
+        self,
+        key: str,
+        loader: Callable[[], Tuple[str, Optional[datetime]]],
+        refresher: Optional[Callable[[], Tuple[str, Optional[datetime]]]]
+    ) -> asyncio.Task:
+        """Запуск завантаження токена (одного на користувача)"""
+        task = asyncio.get_running_loop().create_task(self._load(key, loader, refresher))
+        # Помилку отримують ті, хто чекає; без очікувачів вона не логується як забута
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Tuple[str, Optional[datetime]]],
+        refresher: Optional[Callable[[], Tuple[str, Optional[datetime]]]]
+    ) -> str:
+        """Виклик loader поза event loop та збереження токена"""
+        try:
+            token, expires_at = await asyncio.to_thread(loader)
+            self.stats["loads"] += 1
+            self._store(key, token, expires_at, refresher)
+            return token
+        finally:
+            self._inflight.pop(key, None)
+
+    def _store(
+        self,
+        key: str,
+        token: str,
+        expires_at: Optional[datetime],
+        refresher: Optional[Callable[[], Tuple[str, Optional[datetime]]]]
+    ):
+        """Збереження токена та планування фонового оновлення"""
+        now = self._clock()
+        valid_until = now + self.max_ttl
+        expires_ts = _timestamp(expires_at)
+        if expires_ts is not None:
+            valid_until = min(valid_until, expires_ts - self.refresh_margin)
+        if valid_until <= now:
+            return
+
+        self._entries[key] = (token, valid_until)
+        self._cancel_refresh(key)
+        if refresher is not None and expires_ts is not None:
+            # Оновлення трохи раніше, ніж запис перестане видаватися з кешу
+            delay = max(0.0, valid_until - now - min(60.0, self.refresh_margin / 2))
+            self._refresh_handles[key] = asyncio.get_running_loop().call_later(
+                delay, self._refresh_in_background, key, refresher
+            )
+
+    def _refresh_in_background(self, key: str, refresher: Callable[[], Tuple[str, Optional[datetime]]]):
+        """Фонове оновлення токена (запити під час оновлення чекають на нього)"""
+        self._refresh_handles.pop(key, None)
+        if key in self._inflight or key not in self._entries:
+            return
+        self.stats["background_refreshes"] += 1
+        task = self._start_load(key, refresher, refresher)
+
+        def report(done: asyncio.Task):
+            if not done.cancelled() and done.exception() is not None:
+                self.stats["refresh_errors"] += 1
+                logger.warning(f"⚠️ Фонове оновлення Upwork токена не вдалося: {done.exception()}")
+
+        task.add_done_callback(report)
+
+    def _cancel_refresh(self, key: str):
+        handle = self._refresh_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def invalidate(self, user_id: Any):
+        """Видалення токена користувача (401, відключення Upwork)"""
+        key = str(user_id)
+        self._cancel_refresh(key)
+        if self._entries.pop(key, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Очищення кешу"""
+        for key in list(self._refresh_handles):
+            self._cancel_refresh(key)
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу"""
+        return {"entries": len(self._entries), "scheduled_refreshes": len(self._refresh_handles), **self.stats}
+
+
+def refresh_connection_token(db_session, connection) -> None:
+    """
+    Оновлення access token через refresh_token (OAuth2) зі збереженням у БД
+
+    Args:
+        db_session: Сесія БД
+        connection: OAuthConnection користувача
+
+    Raises:
+        UpworkAuthError: Upwork відхилив оновлення
+    """
+    from shared.utils.oauth_manager import OAuthTokenError, refresh_connection_tokens
+
+    try:
+        refresh_connection_tokens(db_session, connection)
+    except OAuthTokenError as e:
+        raise UpworkAuthError(str(e), status_code=e.status_code) from e
+
+    logger.info(f"🔄 Upwork токен оновлено для користувача {connection.user_id}")
+
+
+# Спільний пул з'єднань, rate limiter та гістограми для всіх клієнтів процесу
+_http_client: Optional[httpx.AsyncClient] = None
+# Обгортка транспорту (запис / відтворення викликів), див. api_replay
+_transport_wrapper: Optional[Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]] = None
+rate_limiter = TokenBucket(
+    rate=_setting("UPWORK_API_RATE_PER_SECOND", 5.0),
+    capacity=_setting("UPWORK_API_BURST", 10)
+)
+latency_histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+access_token_cache = AccessTokenCache(refresh_margin=_setting("UPWORK_TOKEN_REFRESH_MARGIN", 300.0))
+# Окремий бюджет запитів для кожного користувача (токени Upwork обмежуються окремо),
+# від найдавніше використаного до останнього
+user_rate_limiters: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Спільний HTTP клієнт (пул з'єднань) для Upwork API"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=_setting("UPWORK_API_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_setting("UPWORK_API_MAX_KEEPALIVE", 10)
+        )
+        transport = None
+        if _transport_wrapper is not None:
+            transport = _transport_wrapper(httpx.AsyncHTTPTransport(limits=limits))
+        _http_client = httpx.AsyncClient(
+            limits=limits,
+            transport=transport,
+            timeout=httpx.Timeout(_setting("UPWORK_API_TIMEOUT", 30.0), connect=5.0),
+            headers={'User-Agent': 'Upwork-AI-Assistant/1.0'}
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Закриття спільного HTTP клієнта"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def set_transport_wrapper(
+    wrapper: Optional[Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]]
+):
+    """
+    Обгортка транспорту спільного HTTP клієнта
+
+    Поточний клієнт закривається, наступний виклик get_http_client
+    створює новий з обгорнутим транспортом.
+
+    Args:
+        wrapper: Функція транспорт -> транспорт (None - без обгортки)
+    """
+    global _transport_wrapper
+    _transport_wrapper = wrapper
+    await close_http_client()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Отримання спільного rate limiter"""
+    return rate_limiter
+
+
+def get_access_token_cache() -> AccessTokenCache:
+    """Отримання кешу access token"""
+    return access_token_cache
+
+
+def _evict_user_rate_limiters():
+    """
+    Обмеження кількості rate limiter користувачів
+
+    Бакети, що поповнилися до capacity, видаляються без втрати стану (новий
+    бакет буде таким самим). Якщо ліміт усе одно перевищено, видаляються
+    найдавніше використані.
+    """
+    while user_rate_limiters:
+        user_id, limiter = next(iter(user_rate_limiters.items()))
+        if not limiter.is_idle():
+            break
+        del user_rate_limiters[user_id]
+
+    max_limiters = _setting("UPWORK_API_MAX_USER_LIMITERS", 10000)
+    while len(user_rate_limiters) >= max_limiters:
+        user_rate_limiters.popitem(last=False)
+
+
+def get_user_rate_limiter(user_id: str) -> TokenBucket:
+    """Rate limiter користувача (створюється при першому зверненні)"""
+    limiter = user_rate_limiters.get(user_id)
+    if limiter is not None:
+        user_rate_limiters.move_to_end(user_id)
+        return limiter
+
+    _evict_user_rate_limiters()
+    limiter = user_rate_limiters[user_id] = TokenBucket(
+        rate=_setting("UPWORK_API_RATE_PER_SECOND", 5.0),
+        capacity=_setting("UPWORK_API_BURST", 10)
+    )
+    return limiter
+
+
+async def fetch_many(
+    ids: List[str],
+    fetch: Callable[[str], Any],
+    concurrency: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Паралельне отримання даних за списком ID
+
+    Дублікати та порожні ID відкидаються, одночасно виконується не більше
+    concurrency запитів. Помилка одного запиту не перериває інші.
+
+    Args:
+        ids: Список ID
+        fetch: Асинхронна функція отримання одного елемента
+        concurrency: Максимум одночасних запитів
+
+    Returns:
+        {"results": {id: дані}, "errors": {id: {"error", "status_code"}}}
+    """
+    unique_ids = list(dict.fromkeys(item_id for item_id in ids if item_id))
+    semaphore = asyncio.Semaphore(concurrency or _setting("UPWORK_API_BATCH_CONCURRENCY", 10))
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Dict[str, Any]] = {}
+
+    async def fetch_one(item_id: str):
+        async with semaphore:
+            try:
+                results[item_id] = await fetch(item_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Не вдалося отримати {item_id}: {e}")
+                errors[item_id] = {"error": str(e), "status_code": getattr(e, "status_code", None)}
+
+    await asyncio.gather(*(fetch_one(item_id) for item_id in unique_ids))
+
+    # Порядок результатів - як у вхідному списку
+    return {
+        "results": {item_id: results[item_id] for item_id in unique_ids if item_id in results},
+        "errors": {item_id: errors[item_id] for item_id in unique_ids if item_id in errors}
+    }
+
+
+def get_api_stats() -> Dict[str, Any]:
+    """Статистика викликів Upwork API"""
+    return {
+        "rate_limiter": rate_limiter.get_stats(),
+        "user_rate_limiters": len(user_rate_limiters),
+        "access_tokens": access_token_cache.get_stats(),
+        "latency": {name: histogram.summary() for name, histogram in latency_histograms.items()}
+    }
+
+
 class UpworkAPIClient:
     """Клієнт для роботи з Upwork API"""
-    
-    def __init__(self, access_token: str, base_url: str = "https://api.upwork.com/api/v3"):
+
+    def __init__(
+        self,
+        access_token: str,
+        base_url: str = "https://api.upwork.com/api/v3",
+        http_client: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[TokenBucket] = None,
+        max_retries: Optional[int] = None,
+        max_retry_after: Optional[float] = None,
+        on_auth_error: Optional[Callable[[], None]] = None
+    ):
         self.access_token = access_token
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'User-Agent': 'Upwork-AI-Assistant/1.0'
-        })
-        
-        # Rate limiting
+            'Content-Type': 'application/json'
+        }
+        self._http_client = http_client
+        self.rate_limiter = limiter or get_rate_limiter()
+        self.max_retries = _setting("UPWORK_API_MAX_RETRIES", 3) if max_retries is None else max_retries
+        # Довший Retry-After не чекаємо - помилка повертається викликачу
+        self.max_retry_after = _setting("UPWORK_API_MAX_RETRY_AFTER", 60.0) if max_retry_after is None else max_retry_after
+        # Викликається на 401 (наприклад, для скидання кешованого токена)
+        self.on_auth_error = on_auth_error
+
         self.request_count = 0
         self.last_request_time = None
-        self.rate_limit = 100  # requests per hour
-    
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
-        """Виконання запиту з обробкою помилок та rate limiting"""
-        try:
-            # Rate limiting
-            if self.request_count >= self.rate_limit:
-                logger.warning("Rate limit досягнуто")
-                raise Exception("Rate limit exceeded")
-            
-            url = f"{self.base_url}{endpoint}"
-            response = self.session.request(method, url, **kwargs)
-            
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP клієнт (спільний пул, якщо не передано власний)"""
+        return self._http_client or get_http_client()
+
+    async def _make_request(self, method: str, endpoint: str, operation: Optional[str] = None, **kwargs) -> Dict:
+        """
+        Виконання запиту з rate limiting та повторами
+
+        Args:
+            method: HTTP метод
+            endpoint: Шлях відносно base_url
+            operation: Назва виклику для гістограми затримок
+            **kwargs: Параметри httpx (params, json, ...)
+
+        Returns:
+            JSON відповіді
+        """
+        url = f"{self.base_url}{endpoint}"
+        histogram = latency_histograms[operation or endpoint]
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+
+            started = time.perf_counter()
+            try:
+                response = await self.http_client.request(method, url, headers=self.headers, **kwargs)
+            except httpx.TransportError as e:
+                histogram.observe(time.perf_counter() - started)
+                # Неідемпотентні запити повторюємо, лише якщо з'єднання не встановлено
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.max_retries:
+                    logger.error(f"Помилка запиту до Upwork API: {e}")
+                    raise UpworkAPIError(f"Помилка запиту до Upwork API: {e}") from e
+                delay = backoff_delay(attempt)
+                logger.warning(f"⚠️ {method} {endpoint}: {e}, повтор через {delay:.2f}с")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            histogram.observe(time.perf_counter() - started)
             self.request_count += 1
             self.last_request_time = datetime.utcnow()
-            
+
             if response.status_code == 401:
                 logger.error("Unauthorized - можливо токен закінчився")
-                raise Exception("Token expired or invalid")
-            
-            if response.status_code == 429:
-                logger.warning("Rate limit exceeded")
-                raise Exception("Rate limit exceeded")
-            
-            response.raise_for_status()
-            
+                if self.on_auth_error is not None:
+                    self.on_auth_error()
+                raise UpworkAuthError("Token expired or invalid", status_code=401)
+
+            if response.status_code in RETRYABLE_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    logger.warning(f"Rate limit exceeded (Retry-After: {retry_after})")
+                    if retry_after is not None:
+                        # Пауза для всіх запитів процесу, а не лише цього
+                        self.rate_limiter.pause(min(retry_after, self.max_retry_after))
+
+                give_up = (
+                    attempt >= self.max_retries
+                    or (response.status_code != 429 and not idempotent)
+                    or (retry_after is not None and retry_after > self.max_retry_after)
+                )
+                if give_up:
+                    if response.status_code == 429:
+                        raise UpworkRateLimitError("Rate limit exceeded", retry_after=retry_after)
+                    raise UpworkAPIError(f"Upwork API error {response.status_code}", status_code=response.status_code)
+
+                if response.status_code != 429 or retry_after is None:
+                    delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                    logger.warning(f"⚠️ {method} {endpoint}: {response.status_code}, повтор через {delay:.2f}с")
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                logger.error(f"Помилка запиту до Upwork API: {response.status_code} {endpoint}")
+                raise UpworkAPIError(f"Upwork API error {response.status_code}", status_code=response.status_code)
+
             return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Помилка запиту до Upwork API: {e}")
-            raise
-    
-    def get_user_profile(self) -> Dict:
+
+    async def get_user_profile(self) -> Dict:
         """Отримання профілю користувача"""
         logger.info("Отримання профілю користувача")
-        return self._make_request('GET', '/freelancers/me')
-    
-    def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
+        return await self._make_request('GET', '/freelancers/me', operation='get_user_profile')
+
+    async def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
         """Пошук вакансій"""
         logger.info(f"Пошук вакансій: {query}")
-        
+
         params = {'q': query}
         if filters:
             params.update(filters)
-        
-        return self._make_request('GET', '/jobs/search', params=params)
-    
-    def get_job_details(self, job_id: str) -> Dict:
+
+        return await self._make_request('GET', '/jobs/search', operation='search_jobs', params=params)
+
+    async def get_job_details(self, job_id: str) -> Dict:
         """Деталі вакансії"""
         logger.info(f"Отримання деталей вакансії: {job_id}")
-        return self._make_request('GET', f'/jobs/{job_id}')
-    
-    def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
+        return await self._make_request('GET', f'/jobs/{job_id}', operation='get_job_details')
+
+    async def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
         """Відправка відгуку"""
         logger.info(f"Відправка відгуку на вакансію: {job_id}")
-        return self._make_request('POST', f'/jobs/{job_id}/proposals', json=proposal_data)
-    
-    def get_messages(self, thread_id: Optional[str] = None) -> Dict:
+        return await self._make_request(
+            'POST', f'/jobs/{job_id}/proposals', operation='submit_proposal', json=proposal_data
+        )
+
+    async def get_messages(self, thread_id: Optional[str] = None) -> Dict:
         """Отримання повідомлень"""
         logger.info("Отримання повідомлень")
-        
+
         params = {}
         if thread_id:
             params['thread_id'] = thread_id
-        
-        return self._make_request('GET', '/messages', params=params)
-    
-    def send_message(self, thread_id: str, message: str) -> Dict:
+
+        return await self._make_request('GET', '/messages', operation='get_messages', params=params)
+
+    async def send_message(self, thread_id: str, message: str) -> Dict:
         """Відправка повідомлення"""
         logger.info(f"Відправка повідомлення в thread: {thread_id}")
-        
+
         data = {
             'thread_id': thread_id,
             'message': message
         }
-        
-        return self._make_request('POST', '/messages', json=data)
-    
-    def get_client_info(self, client_id: str) -> Dict:
+
+        return await self._make_request('POST', '/messages', operation='send_message', json=data)
+
+    async def get_client_info(self, client_id: str) -> Dict:
         """Інформація про клієнта"""
         logger.info(f"Отримання інформації про клієнта: {client_id}")
-        return self._make_request('GET', f'/clients/{client_id}')
-    
-    def get_freelancer_profile(self, freelancer_id: str) -> Dict:
+        return await self._make_request('GET', f'/clients/{client_id}', operation='get_client_info')
+
+    async def get_freelancer_profile(self, freelancer_id: str) -> Dict:
         """Профіль фрілансера"""
         logger.info(f"Отримання профілю фрілансера: {freelancer_id}")
-        return self._make_request('GET', f'/freelancers/{freelancer_id}')
-    
-    def get_categories(self) -> Dict:
+        return await self._make_request('GET', f'/freelancers/{freelancer_id}', operation='get_freelancer_profile')
+
+    async def get_categories(self) -> Dict:
         """Список категорій"""
         logger.info("Отримання списку категорій")
-        return self._make_request('GET', '/categories')
-    
-    def get_skills(self) -> Dict:
+        return await self._make_request('GET', '/categories', operation='get_categories')
+
+    async def get_skills(self) -> Dict:
         """Список навичок"""
         logger.info("Отримання списку навичок")
-        return self._make_request('GET', '/skills')
-    
-    def get_workdiary(self, freelancer_id: str, date: Optional[str] = None) -> Dict:
+        return await self._make_request('GET', '/skills', operation='get_skills')
+
+    async def get_workdiary(self, freelancer_id: str, date: Optional[str] = None) -> Dict:
         """Отримання work diary"""
         logger.info(f"Отримання work diary для фрілансера: {freelancer_id}")
-        
+
         params = {}
         if date:
             params['date'] = date
-        
-        return self._make_request('GET', f'/workdiaries/{freelancer_id}', params=params)
-    
-    def get_contracts(self) -> Dict:
+
+        return await self._make_request(
+            'GET', f'/workdiaries/{freelancer_id}', operation='get_workdiary', params=params
+        )
+
+    async def get_contracts(self) -> Dict:
         """Отримання контрактів"""
         logger.info("Отримання контрактів")
-        return self._make_request('GET', '/contracts')
-    
-    def get_earnings(self, freelancer_id: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Dict:
+        return await self._make_request('GET', '/contracts', operation='get_contracts')
+
+    async def get_earnings(self, freelancer_id: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Dict:
         """Отримання заробітку"""
         logger.info(f"Отримання заробітку для фрілансера: {freelancer_id}")
-        
+
         params = {}
         if from_date:
             params['from'] = from_date
         if to_date:
             params['to'] = to_date
-        
-        return self._make_request('GET', f'/earnings/{freelancer_id}', params=params)
+
+        return await self._make_request('GET', f'/earnings/{freelancer_id}', operation='get_earnings', params=params)
 
 
 class UpworkAPIManager:
     """Менеджер для роботи з Upwork API через OAuth токени"""
-    
+
     def __init__(self, db_session, user_id: str):
         self.db = db_session
         self.user_id = user_id
         self.client = None
-    
-    def _get_valid_access_token(self) -> str:
-        """Отримання дійсного access token"""
+
+    async def _get_valid_access_token(self) -> str:
+        """Отримання дійсного access token (з кешу, без запиту до БД)"""
+        return await access_token_cache.get_token(
+            self.user_id, self._load_access_token, self._refresh_access_token
+        )
+
+    def _query_connection(self, db):
+        """Активне підключення Upwork користувача"""
         from app.backend.services.auth_service.src.models import OAuthConnection
-        
-        connection = self.db.query(OAuthConnection).filter(
+
+        connection = db.query(OAuthConnection).filter(
             OAuthConnection.user_id == self.user_id,
             OAuthConnection.provider == "upwork",
             OAuthConnection.is_active == True
         ).first()
-        
+
         if not connection:
-            raise Exception("Upwork не підключено")
-        
-        # Перевіряємо чи не закінчився термін дії
-        if connection.expires_at <= datetime.utcnow():
-            # Оновлюємо токен
-            from app.backend.services.auth_service.src.oauth import refresh_upwork_token
-            refresh_upwork_token()
-            
-            # Отримуємо оновлений токен
-            connection = self.db.query(OAuthConnection).filter(
-                OAuthConnection.user_id == self.user_id,
-                OAuthConnection.provider == "upwork",
-                OAuthConnection.is_active == True
-            ).first()
-        
-        return decrypt_data(connection.access_token)
-    
-    def get_client(self) -> UpworkAPIClient:
+            raise UpworkAuthError("Upwork не підключено")
+        return connection
+
+    def _load_access_token(self) -> Tuple[str, Optional[datetime]]:
+        """Завантаження токена з БД з оновленням, якщо він скоро закінчиться"""
+        connection = self._query_connection(self.db)
+
+        # Оновлюємо завчасно, а не після закінчення терміну дії
+        expires_at = _timestamp(connection.expires_at)
+        if expires_at is not None and expires_at - access_token_cache.refresh_margin <= time.time():
+            refresh_connection_token(self.db, connection)
+
+        return decrypt_data(connection.access_token), connection.expires_at
+
+    def _refresh_access_token(self) -> Tuple[str, Optional[datetime]]:
+        """Фонове оновлення токена (у власній сесії - сесія запиту вже може бути закрита)"""
+        from sqlalchemy.orm import Session
+
+        with Session(bind=self.db.get_bind()) as db:
+            connection = self._query_connection(db)
+            refresh_connection_token(db, connection)
+            return decrypt_data(connection.access_token), connection.expires_at
+
+    def _on_auth_error(self):
+        """401 від Upwork: токен відкликано або змінено - прибираємо його з кешу"""
+        access_token_cache.invalidate(self.user_id)
+        self.client = None
+
+    async def get_client(self) -> UpworkAPIClient:
         """Отримання API клієнта"""
         if not self.client:
-            access_token = self._get_valid_access_token()
-            self.client = UpworkAPIClient(access_token)
-        
+            access_token = await self._get_valid_access_token()
+            self.client = UpworkAPIClient(
+                access_token,
+                limiter=get_user_rate_limiter(self.user_id),
+                on_auth_error=self._on_auth_error
+            )
+
         return self.client
-    
-    def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
+
+    async def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
         """Пошук вакансій"""
-        client = self.get_client()
-        return client.search_jobs(query, filters)
-    
-    def get_job_details(self, job_id: str) -> Dict:
+        client = await self.get_client()
+        return await client.search_jobs(query, filters)
+
+    async def get_job_details(self, job_id: str) -> Dict:
         """Деталі вакансії"""
-        client = self.get_client()
-        return client.get_job_details(job_id)
-    
-    def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
+        client = await self.get_client()
+        return await client.get_job_details(job_id)
+
+    async def get_job_details_many(self, job_ids: List[str], concurrency: Optional[int] = None) -> Dict:
+        """Деталі кількох вакансій (паралельно, в межах бюджету користувача)"""
+        client = await self.get_client()
+        return await fetch_many(job_ids, client.get_job_details, concurrency)
+
+    async def get_client_info(self, client_id: str) -> Dict:
+        """Інформація про клієнта"""
+        client = await self.get_client()
+        return await client.get_client_info(client_id)
+
+    async def get_client_info_many(self, client_ids: List[str], concurrency: Optional[int] = None) -> Dict:
+        """Інформація про кількох клієнтів (паралельно, в межах бюджету користувача)"""
+        client = await self.get_client()
+        return await fetch_many(client_ids, client.get_client_info, concurrency)
+
+    async def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
         """Відправка відгуку"""
-        client = self.get_client()
-        return client.submit_proposal(job_id, proposal_data)
-    
-    def get_user_profile(self) -> Dict:
+        client = await self.get_client()
+        return await client.submit_proposal(job_id, proposal_data)
+
+    async def get_user_profile(self) -> Dict:
         """Профіль користувача"""
-        client = self.get_client()
-        return client.get_user_profile()
-    
-    def get_messages(self, thread_id: Optional[str] = None) -> Dict:
+        client = await self.get_client()
+        return await client.get_user_profile()
+
+    async def get_messages(self, thread_id: Optional[str] = None) -> Dict:
         """Повідомлення"""
-        client = self.get_client()
-        return client.get_messages(thread_id)
-    
-    def send_message(self, thread_id: str, message: str) -> Dict:
+        client = await self.get_client()
+        return await client.get_messages(thread_id)
+
+    async def send_message(self, thread_id: str, message: str) -> Dict:
         """Відправка повідомлення"""
-        client = self.get_client()
-        return client.send_message(thread_id, message)
+        client = await self.get_client()
+        return await client.send_message(thread_id, message)
 
 
 # Тестові дані для розробки
@@ -252,7 +920,7 @@ class MockUpworkAPIClient:
         self.access_token = access_token
         logger.info("Використовується MockUpworkAPIClient")
     
-    def get_user_profile(self) -> Dict:
+    async def get_user_profile(self) -> Dict:
         """Mock профіль користувача - відповідає реальному Upwork API"""
         return {
             "id": "~0123456789012345",
@@ -319,7 +987,7 @@ class MockUpworkAPIClient:
             "reviews_count": 18
         }
     
-    def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
+    async def search_jobs(self, query: str, filters: Optional[Dict] = None) -> Dict:
         """Mock пошук вакансій - відповідає реальному Upwork API"""
         return {
             "jobs": [
@@ -433,7 +1101,7 @@ class MockUpworkAPIClient:
             }
         }
     
-    def get_job_details(self, job_id: str) -> Dict:
+    async def get_job_details(self, job_id: str) -> Dict:
         """Mock деталі вакансії - відповідає реальному Upwork API"""
         # Симулюємо різні вакансії на основі ID
         job_templates = {
@@ -522,7 +1190,7 @@ class MockUpworkAPIClient:
                 "job_status": "open"
             }
     
-    def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
+    async def submit_proposal(self, job_id: str, proposal_data: Dict) -> Dict:
         """Mock відправка відгуку"""
         logger.info(f"Mock відправка відгуку на вакансію {job_id}")
         return {
@@ -531,7 +1199,7 @@ class MockUpworkAPIClient:
             "message": "Proposal submitted successfully"
         }
     
-    def get_messages(self, thread_id: Optional[str] = None) -> Dict:
+    async def get_messages(self, thread_id: Optional[str] = None) -> Dict:
         """Mock повідомлення"""
         return {
             "messages": [
@@ -545,7 +1213,7 @@ class MockUpworkAPIClient:
             ]
         }
     
-    def send_message(self, thread_id: str, message: str) -> Dict:
+    async def send_message(self, thread_id: str, message: str) -> Dict:
         """Mock відправка повідомлення"""
         logger.info(f"Mock відправка повідомлення в thread {thread_id}")
         return {
@@ -554,7 +1222,7 @@ class MockUpworkAPIClient:
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def get_client_info(self, client_id: str) -> Dict:
+    async def get_client_info(self, client_id: str) -> Dict:
         """Mock інформація про клієнта - відповідає реальному Upwork API"""
         client_templates = {
             "~0123456789012346": {
@@ -627,7 +1295,7 @@ class MockUpworkAPIClient:
                 "total_hired": 8
             }
     
-    def get_freelancer_profile(self, freelancer_id: str) -> Dict:
+    async def get_freelancer_profile(self, freelancer_id: str) -> Dict:
         """Mock профіль фрілансера - відповідає реальному Upwork API"""
         freelancer_templates = {
             "~0123456789012345": {
@@ -708,7 +1376,7 @@ class MockUpworkAPIClient:
                 "reviews_count": 8
             }
     
-    def get_categories(self) -> Dict:
+    async def get_categories(self) -> Dict:
         """Mock категорії вакансій - відповідає реальному Upwork API"""
         return {
             "categories": [
@@ -760,7 +1428,7 @@ class MockUpworkAPIClient:
             ]
         }
     
-    def get_skills(self) -> Dict:
+    async def get_skills(self) -> Dict:
         """Mock навички - відповідає реальному Upwork API"""
         return {
             "skills": [
@@ -782,7 +1450,7 @@ class MockUpworkAPIClient:
             ]
         }
     
-    def get_workdiary(self, freelancer_id: str, date: Optional[str] = None) -> Dict:
+    async def get_workdiary(self, freelancer_id: str, date: Optional[str] = None) -> Dict:
         """Mock робочий щоденник - відповідає реальному Upwork API"""
         if not date:
             date = datetime.utcnow().strftime("%Y-%m-%d")
@@ -821,7 +1489,7 @@ class MockUpworkAPIClient:
             }
         }
     
-    def get_contracts(self) -> Dict:
+    async def get_contracts(self) -> Dict:
         """Mock контракти - відповідає реальному Upwork API"""
         return {
             "contracts": [
@@ -912,7 +1580,7 @@ class MockUpworkAPIClient:
             ]
         }
     
-    def get_earnings(self, freelancer_id: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Dict:
+    async def get_earnings(self, freelancer_id: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Dict:
         """Mock заробіток - відповідає реальному Upwork API"""
         if not from_date:
             from_date = (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%d")
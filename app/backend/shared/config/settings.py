@@ -21,6 +21,15 @@ class Settings(BaseSettings):
         default="sqlite:///./test.db",
         env="DATABASE_URL"
     )
+    # URL з асинхронним драйвером; за замовчуванням виводиться з DATABASE_URL
+    DATABASE_ASYNC_URL: Optional[str] = Field(default=None, env="DATABASE_ASYNC_URL")
+    DB_POOL_SIZE: int = Field(default=10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(default=300, env="DB_POOL_RECYCLE")
+    # Автопідбір розміру пулу: off, recommend (лог рекомендації), adjust (збільшення до DB_POOL_MAX_SIZE)
+    DB_POOL_AUTOTUNE: str = Field(default="off", env="DB_POOL_AUTOTUNE")
+    DB_POOL_MAX_SIZE: int = Field(default=50, env="DB_POOL_MAX_SIZE")
     
     # Redis
     REDIS_URL: str = Field(
@@ -36,6 +45,9 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = Field(default="HS256", env="JWT_ALGORITHM")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, env="JWT_ACCESS_TOKEN_EXPIRE_MINUTES")
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7, env="JWT_REFRESH_TOKEN_EXPIRE_DAYS")
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10000, env="AUTH_TOKEN_CACHE_MAX_ENTRIES")
+    AUTH_USER_CACHE_TTL: float = Field(default=30.0, env="AUTH_USER_CACHE_TTL")
+    AUTH_USER_CACHE_MAX_ENTRIES: int = Field(default=10000, env="AUTH_USER_CACHE_MAX_ENTRIES")
     
     # Шифрування
     ENCRYPTION_KEY: str = Field(
@@ -64,6 +76,32 @@ class Settings(BaseSettings):
         default="https://www.upwork.com/api/v2",
         env="UPWORK_API_BASE_URL"
     )
+    # Клієнт Upwork API: пул з'єднань, token bucket та повтори
+    UPWORK_API_RATE_PER_SECOND: float = Field(default=5.0, env="UPWORK_API_RATE_PER_SECOND")
+    UPWORK_API_BURST: int = Field(default=10, env="UPWORK_API_BURST")
+    UPWORK_API_MAX_CONNECTIONS: int = Field(default=20, env="UPWORK_API_MAX_CONNECTIONS")
+    UPWORK_API_MAX_KEEPALIVE: int = Field(default=10, env="UPWORK_API_MAX_KEEPALIVE")
+    UPWORK_API_TIMEOUT: float = Field(default=30.0, env="UPWORK_API_TIMEOUT")
+    UPWORK_API_MAX_RETRIES: int = Field(default=3, env="UPWORK_API_MAX_RETRIES")
+    UPWORK_API_MAX_RETRY_AFTER: float = Field(default=60.0, env="UPWORK_API_MAX_RETRY_AFTER")
+    UPWORK_API_BATCH_CONCURRENCY: int = Field(default=10, env="UPWORK_API_BATCH_CONCURRENCY")
+    UPWORK_API_MAX_USER_LIMITERS: int = Field(default=10000, env="UPWORK_API_MAX_USER_LIMITERS")
+    UPWORK_TOKEN_REFRESH_MARGIN: float = Field(default=300.0, env="UPWORK_TOKEN_REFRESH_MARGIN")
+    # Запис / відтворення викликів Upwork API (офлайн навантажувальні тести)
+    UPWORK_API_RECORD_PATH: Optional[str] = Field(default=None, env="UPWORK_API_RECORD_PATH")
+    UPWORK_API_REPLAY_PATH: Optional[str] = Field(default=None, env="UPWORK_API_REPLAY_PATH")
+    UPWORK_API_REPLAY_LATENCY: str = Field(default="recorded", env="UPWORK_API_REPLAY_LATENCY")
+    UPWORK_API_REPLAY_ERROR_RATE: float = Field(default=0.0, env="UPWORK_API_REPLAY_ERROR_RATE")
+    UPWORK_API_REPLAY_RATE_LIMIT_RATE: float = Field(default=0.0, env="UPWORK_API_REPLAY_RATE_LIMIT_RATE")
+    UPWORK_API_REPLAY_SEED: int = Field(default=0, env="UPWORK_API_REPLAY_SEED")
+    # Фонове завантаження вакансій у JobMatch; /upwork/jobs читає з БД
+    UPWORK_INGESTION_ENABLED: bool = Field(default=False, env="UPWORK_INGESTION_ENABLED")
+    UPWORK_INGESTION_INTERVAL: float = Field(default=300.0, env="UPWORK_INGESTION_INTERVAL")
+    UPWORK_INGESTION_PAGE_SIZE: int = Field(default=50, env="UPWORK_INGESTION_PAGE_SIZE")
+    UPWORK_INGESTION_MAX_PAGES: int = Field(default=10, env="UPWORK_INGESTION_MAX_PAGES")
+    UPWORK_REFERENCE_REFRESH_INTERVAL: float = Field(default=21600.0, env="UPWORK_REFERENCE_REFRESH_INTERVAL")
+    # Знімок довідкових даних для холодного старту (None - без знімка; абсолютний шлях у deployment)
+    UPWORK_REFERENCE_SNAPSHOT_PATH: Optional[str] = Field(default=None, env="UPWORK_REFERENCE_SNAPSHOT_PATH")
     
     # React App URL (додано для виправлення помилки)
     REACT_APP_API_URL: str = Field(
@@ -74,6 +112,35 @@ class Settings(BaseSettings):
     # OpenAI API
     OPENAI_API_KEY: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     CLAUDE_API_KEY: Optional[str] = Field(default=None, env="CLAUDE_API_KEY")
+    # Async клієнти LLM: один пул з'єднань на процес, таймаут кожного виклику
+    OPENAI_BASE_URL: Optional[str] = Field(default=None, env="OPENAI_BASE_URL")
+    CLAUDE_BASE_URL: Optional[str] = Field(default=None, env="CLAUDE_BASE_URL")
+    LLM_REQUEST_TIMEOUT: float = Field(default=60.0, env="LLM_REQUEST_TIMEOUT")
+    LLM_MAX_RETRIES: int = Field(default=2, env="LLM_MAX_RETRIES")
+    # Пакетний аналіз: паралельність, бюджет токенів за хвилину (0 - без обмеження), backoff при 429
+    AI_BATCH_CONCURRENCY: int = Field(default=5, env="AI_BATCH_CONCURRENCY")
+    AI_BATCH_MAX_ATTEMPTS: int = Field(default=4, env="AI_BATCH_MAX_ATTEMPTS")
+    AI_BATCH_BACKOFF_BASE: float = Field(default=1.0, env="AI_BATCH_BACKOFF_BASE")
+    AI_BATCH_BACKOFF_MAX: float = Field(default=60.0, env="AI_BATCH_BACKOFF_MAX")
+    OPENAI_TOKENS_PER_MINUTE: int = Field(default=0, env="OPENAI_TOKENS_PER_MINUTE")
+    CLAUDE_TOKENS_PER_MINUTE: int = Field(default=0, env="CLAUDE_TOKENS_PER_MINUTE")
+    # Роутер провайдерів: ковзне вікно затримки/помилок, ліміт паралельності, hedging повільних викликів
+    AI_ROUTER_WINDOW: int = Field(default=100, env="AI_ROUTER_WINDOW")
+    AI_ROUTER_MIN_SAMPLES: int = Field(default=5, env="AI_ROUTER_MIN_SAMPLES")
+    AI_ROUTER_MAX_ERROR_RATE: float = Field(default=0.5, env="AI_ROUTER_MAX_ERROR_RATE")
+    AI_ROUTER_MAX_SAMPLE_AGE: float = Field(default=300.0, env="AI_ROUTER_MAX_SAMPLE_AGE")
+    AI_PROVIDER_MAX_CONCURRENCY: int = Field(default=10, env="AI_PROVIDER_MAX_CONCURRENCY")
+    AI_HEDGE_ENABLED: bool = Field(default=True, env="AI_HEDGE_ENABLED")
+    AI_HEDGE_DELAY: float = Field(default=5.0, env="AI_HEDGE_DELAY")
+    AI_HEDGE_MIN_DELAY: float = Field(default=1.0, env="AI_HEDGE_MIN_DELAY")
+    # Кеш відповідей LLM для детермінованих викликів (аналіз, фільтрація): memory, sqlite або redis.
+    # Персистентний рівень вмикається явно, LLM_CACHE_SQLITE_PATH - абсолютний шлях у deployment
+    LLM_ANALYSIS_TEMPERATURE: float = Field(default=0.0, env="LLM_ANALYSIS_TEMPERATURE")
+    LLM_CACHE_ENABLED: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    LLM_CACHE_BACKEND: str = Field(default="memory", env="LLM_CACHE_BACKEND")
+    LLM_CACHE_TTL: float = Field(default=86400.0, env="LLM_CACHE_TTL")
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=5000, env="LLM_CACHE_MAX_ENTRIES")
+    LLM_CACHE_SQLITE_PATH: str = Field(default="data/llm_prompt_cache.sqlite3", env="LLM_CACHE_SQLITE_PATH")
     
     # Telegram
     TELEGRAM_BOT_TOKEN: Optional[str] = Field(default=None, env="TELEGRAM_BOT_TOKEN")
@@ -87,6 +154,10 @@ class Settings(BaseSettings):
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = Field(default=60, env="RATE_LIMIT_PER_MINUTE")
     RATE_LIMIT_PER_HOUR: int = Field(default=1000, env="RATE_LIMIT_PER_HOUR")
+    RATE_LIMIT_LOCAL_ENABLED: bool = Field(default=True, env="RATE_LIMIT_LOCAL_ENABLED")
+    RATE_LIMIT_LOCAL_BATCH_MAX: int = Field(default=50, env="RATE_LIMIT_LOCAL_BATCH_MAX")
+    RATE_LIMIT_LOCAL_LEASE_SECONDS: float = Field(default=1.0, env="RATE_LIMIT_LOCAL_LEASE_SECONDS")
+    RATE_LIMIT_LOCAL_MAX_CLIENTS: int = Field(default=10000, env="RATE_LIMIT_LOCAL_MAX_CLIENTS")
     
     # Логування
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
@@ -129,6 +200,18 @@ class Settings(BaseSettings):
         env="NOTIFICATION_SERVICE_URL"
     )
     
+    # Пули з'єднань API Gateway до сервісів (JSON: {"ai": {"max_connections": 20}})
+    GATEWAY_UPSTREAM_POOLS: dict = Field(default={}, env="GATEWAY_UPSTREAM_POOLS")
+    
+    # Кеш відповідей API Gateway (memory або redis)
+    GATEWAY_CACHE_ENABLED: bool = Field(default=False, env="GATEWAY_CACHE_ENABLED")
+    GATEWAY_CACHE_BACKEND: str = Field(default="memory", env="GATEWAY_CACHE_BACKEND")
+    GATEWAY_CACHE_MAX_ENTRIES: int = Field(default=1000, env="GATEWAY_CACHE_MAX_ENTRIES")
+    GATEWAY_CACHE_RULES: dict = Field(default={}, env="GATEWAY_CACHE_RULES")
+    GATEWAY_COALESCE_ENABLED: bool = Field(default=True, env="GATEWAY_COALESCE_ENABLED")
+    # Маршрути без правил кешування, для яких теж об'єднуються GET (JSON: ["/upwork/jobs*"])
+    GATEWAY_COALESCE_ROUTES: list = Field(default=[], env="GATEWAY_COALESCE_ROUTES")
+    
     class Config:
         env_file = "../../../.env"
         case_sensitive = False
@@ -3,12 +3,60 @@
 """
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 import redis
 from ..config.settings import settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics
+
+
+# Асинхронні драйвери для синхронних URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def build_async_database_url(database_url: str) -> str:
+    """
+    Перетворення URL бази даних на URL з асинхронним драйвером
+    
+    Args:
+        database_url: URL (напр. postgresql://... або sqlite:///...)
+        
+    Returns:
+        URL з asyncpg/aiosqlite драйвером
+    """
+    scheme, separator, rest = database_url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme)
+    if driver is None:
+        return database_url
+    return f"{driver}{separator}{rest}"
+
+
+def is_sqlite_memory(database_url: str) -> bool:
+    """
+    Чи є URL базою SQLite в пам'яті
+    
+    Кожне нове з'єднання з такою базою бачить власну порожню базу,
+    тому для неї потрібен StaticPool (одне спільне з'єднання).
+    
+    Args:
+        database_url: URL бази даних
+        
+    Returns:
+        True для sqlite:// та sqlite:///:memory:
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
 
 
 class DatabaseManager:
@@ -17,22 +65,38 @@ class DatabaseManager:
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.AsyncSessionLocal: Optional[async_sessionmaker] = None
         self.redis_client = None
+        self.pool_metrics: Dict[str, PoolMetrics] = {}
         self._setup_database()
+        self._setup_async_database()
         self._setup_redis()
     
     def _setup_database(self):
         """Налаштування підключення до PostgreSQL"""
         try:
             # Створюємо engine
-            self.engine = create_engine(
-                settings.DATABASE_URL,
-                pool_pre_ping=True,
-                pool_recycle=300,
-                pool_size=10,
-                max_overflow=20,
-                echo=settings.DEBUG
-            )
+            if is_sqlite_memory(settings.DATABASE_URL):
+                # In-memory SQLite: одне спільне з'єднання, інакше кожне бачить порожню базу
+                self.engine = create_engine(
+                    settings.DATABASE_URL,
+                    connect_args={"check_same_thread": False},
+                    poolclass=StaticPool,
+                    echo=settings.DEBUG
+                )
+            else:
+                self.engine = create_engine(
+                    settings.DATABASE_URL,
+                    poolclass=InstrumentedQueuePool,
+                    pool_pre_ping=True,
+                    pool_recycle=settings.DB_POOL_RECYCLE,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    echo=settings.DEBUG
+                )
+            self._attach_pool_metrics("sync", self.engine)
             
             # Створюємо SessionLocal
             self.SessionLocal = sessionmaker(
@@ -50,12 +114,68 @@ class DatabaseManager:
                 poolclass=StaticPool,
                 echo=settings.DEBUG
             )
+            self._attach_pool_metrics("sync", self.engine)
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
                 bind=self.engine
             )
     
+    def _setup_async_database(self):
+        """Налаштування асинхронного підключення (asyncpg для PostgreSQL, aiosqlite для SQLite)"""
+        try:
+            async_url = settings.DATABASE_ASYNC_URL or build_async_database_url(settings.DATABASE_URL)
+            
+            if is_sqlite_memory(async_url):
+                # In-memory SQLite: одне спільне з'єднання (і одна транзакція) на всі сесії
+                self.async_engine = create_async_engine(
+                    async_url,
+                    connect_args={"check_same_thread": False},
+                    poolclass=StaticPool,
+                    echo=settings.DEBUG
+                )
+            else:
+                # Кожна сесія отримує власне з'єднання, тож rollback однієї
+                # не скасовує записи інших (для файлу SQLite також)
+                self.async_engine = create_async_engine(
+                    async_url,
+                    poolclass=InstrumentedAsyncQueuePool,
+                    pool_pre_ping=True,
+                    pool_recycle=settings.DB_POOL_RECYCLE,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    echo=settings.DEBUG
+                )
+            self._attach_pool_metrics("async", self.async_engine.sync_engine)
+            
+            self.AsyncSessionLocal = async_sessionmaker(
+                bind=self.async_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            
+        except Exception as e:
+            # Асинхронний драйвер не встановлено - працює лише синхронний шлях
+            print(f"Асинхронне підключення до БД недоступне: {e}")
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+    
+    def _attach_pool_metrics(self, name: str, engine):
+        """Підключення метрик пулу з'єднань"""
+        metrics = PoolMetrics(name, max_size=settings.DB_POOL_MAX_SIZE)
+        metrics.attach(engine, autotune=settings.DB_POOL_AUTOTUNE)
+        self.pool_metrics[name] = metrics
+    
+    def get_pool_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Метрики пулів з'єднань
+        
+        Returns:
+            Словник {"sync": {...}, "async": {...}} для ініціалізованих пулів
+        """
+        return {name: metrics.summary() for name, metrics in self.pool_metrics.items()}
+    
     def _setup_redis(self):
         """Налаштування підключення до Redis"""
         try:
@@ -83,6 +203,14 @@ class DatabaseManager:
         finally:
             db.close()
     
+    async def get_async_db(self) -> AsyncGenerator[AsyncSession, None]:
+        """Отримання асинхронної сесії бази даних"""
+        if not self.AsyncSessionLocal:
+            raise Exception("Асинхронна база даних не ініціалізована")
+        
+        async with self.AsyncSessionLocal() as db:
+            yield db
+    
     def get_redis(self):
         """Отримання клієнта Redis"""
         if not self.redis_client:
@@ -100,6 +228,24 @@ class DatabaseManager:
             print(f"Database connection test failed: {e}")
             return False
     
+    async def test_async_connection(self) -> bool:
+        """Тестування асинхронного підключення до БД"""
+        if not self.async_engine:
+            return False
+        try:
+            async with self.async_engine.connect() as conn:
+                result = await conn.execute(text("SELECT 1"))
+                result.fetchone()
+            return True
+        except Exception as e:
+            print(f"Async database connection test failed: {e}")
+            return False
+    
+    async def dispose_async(self):
+        """Закриття пулу асинхронних з'єднань"""
+        if self.async_engine:
+            await self.async_engine.dispose()
+    
     def test_redis_connection(self) -> bool:
         """Тестування підключення до Redis"""
         try:
@@ -138,7 +284,13 @@ db_manager = DatabaseManager()
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency для FastAPI"""
-    return db_manager.get_db()
+    yield from db_manager.get_db()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async dependency для FastAPI (запити не блокують event loop)"""
+    async for db in db_manager.get_async_db():
+        yield db
 
 
 def get_redis():
@@ -0,0 +1,12 @@
+-- Міграція 002: Унікальний індекс (user_id, job_id) для upsert вакансій
+-- Дата: 2026-10-16
+
+-- Видаляємо дублікати, залишаючи найновіший запис
+DELETE FROM job_matches a
+USING job_matches b
+WHERE a.user_id = b.user_id
+  AND a.job_id = b.job_id
+  AND a.id < b.id;
+
+-- Ключ INSERT ... ON CONFLICT (user_id, job_id) DO UPDATE
+CREATE UNIQUE INDEX IF NOT EXISTS uq_job_matches_user_job ON job_matches(user_id, job_id);
@@ -0,0 +1,8 @@
+-- Міграція 003: Індекси для keyset-пагінації
+-- Дата: 2026-10-16
+
+-- Вакансії: ORDER BY posted_date DESC, job_id DESC з умовою (posted_date, job_id) < курсор
+CREATE INDEX IF NOT EXISTS ix_job_matches_posted_job ON job_matches(posted_date, job_id);
+
+-- Чернетки відгуків користувача: ORDER BY created_at DESC, id DESC з умовою (created_at, id) < курсор
+CREATE INDEX IF NOT EXISTS ix_proposal_drafts_user_created ON proposal_drafts(user_id, created_at, id);
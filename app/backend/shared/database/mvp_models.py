@@ -2,13 +2,19 @@
 Моделі бази даних для MVP компонентів
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, DECIMAL, ARRAY
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, DECIMAL, ARRAY, Index
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
+from typing import Any, Dict, Iterator, List
 from .connection import Base
 
 
+# Масив рядків: ARRAY у PostgreSQL, JSON у SQLite (локальна розробка та тести)
+StringArray = ARRAY(String).with_variant(JSON(), "sqlite")
+
+
 class FilterProfile(Base):
     """Модель профілів фільтрів"""
     
@@ -17,8 +23,8 @@ class FilterProfile(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String(100), nullable=False)
-    keywords = Column(ARRAY(String), nullable=True)  # ключові слова для пошуку
-    exclude_keywords = Column(ARRAY(String), nullable=True)  # мінус-слова
+    keywords = Column(StringArray, nullable=True)  # ключові слова для пошуку
+    exclude_keywords = Column(StringArray, nullable=True)  # мінус-слова
     ai_instructions = Column(Text, nullable=True)  # AI інструкції природною мовою
     budget_min = Column(DECIMAL(10, 2), nullable=True)
     budget_max = Column(DECIMAL(10, 2), nullable=True)
@@ -26,8 +32,8 @@ class FilterProfile(Base):
     hourly_rate_max = Column(DECIMAL(10, 2), nullable=True)
     experience_level = Column(String(50), nullable=True)  # 'entry', 'intermediate', 'expert'
     job_type = Column(String(50), nullable=True)  # 'fixed', 'hourly'
-    categories = Column(ARRAY(String), nullable=True)  # категорії роботи
-    countries = Column(ARRAY(String), nullable=True)  # країни
+    categories = Column(StringArray, nullable=True)  # категорії роботи
+    countries = Column(StringArray, nullable=True)  # країни
     working_hours = Column(JSON, nullable=True)  # години роботи
     timezone = Column(String(50), nullable=True)
     is_active = Column(Boolean, default=True)
@@ -74,6 +80,10 @@ class ProposalDraft(Base):
     """Модель чернеток відгуків"""
     
     __tablename__ = "proposal_drafts"
+    __table_args__ = (
+        # Keyset-пагінація чернеток користувача: (created_at, id) за спаданням
+        Index("ix_proposal_drafts_user_created", "user_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -129,6 +139,12 @@ class JobMatch(Base):
     """Модель знайдених вакансій"""
     
     __tablename__ = "job_matches"
+    __table_args__ = (
+        # Ключ upsert: одна вакансія Upwork на користувача
+        Index("uq_job_matches_user_job", "user_id", "job_id", unique=True),
+        # Keyset-пагінація вакансій: (posted_date, job_id) за спаданням
+        Index("ix_job_matches_posted_job", "posted_date", "job_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -142,7 +158,7 @@ class JobMatch(Base):
     hourly_rate = Column(DECIMAL(10, 2), nullable=True)
     job_type = Column(String(50), nullable=True)  # 'fixed', 'hourly'
     experience_level = Column(String(50), nullable=True)
-    skills = Column(ARRAY(String), nullable=True)
+    skills = Column(StringArray, nullable=True)
     country = Column(String(100), nullable=True)
     posted_date = Column(DateTime(timezone=True), nullable=True)
     match_score = Column(DECIMAL(5, 2), nullable=True)  # оцінка підходящості
@@ -160,6 +176,108 @@ class JobMatch(Base):
         return f"<JobMatch(id={self.id}, job_title='{self.job_title}', user_id={self.user_id})>"
 
 
+# Колонки вакансії, що оновлюються при повторному upsert (статус користувача не змінюється)
+JOB_MATCH_UPSERT_COLUMNS = (
+    "filter_profile_id", "job_title", "job_description", "client_name", "client_rating", "budget",
+    "hourly_rate", "job_type", "experience_level", "skills", "country", "posted_date", "match_score"
+)
+
+JOB_MATCH_UPSERT_CHUNK_SIZE = 1000
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def job_match_upsert_statement(dialect_name: str, columns=JOB_MATCH_UPSERT_COLUMNS):
+    """
+    INSERT ... ON CONFLICT (user_id, job_id) DO UPDATE для job_matches
+    
+    Args:
+        dialect_name: postgresql або sqlite
+        columns: Колонки, що оновлюються для існуючих рядків
+        
+    Returns:
+        Insert для виконання з параметрами рядків (executemany)
+    """
+    insert_factory = _UPSERT_INSERTS.get(dialect_name)
+    if insert_factory is None:
+        raise NotImplementedError(f"Upsert JobMatch не підтримується для {dialect_name}")
+    
+    table = JobMatch.__table__
+    statement = insert_factory(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.job_id],
+        set_={
+            **{column: statement.excluded[column] for column in columns},
+            "updated_at": func.now()
+        }
+    )
+
+
+def _upsert_chunks(rows: List[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Дедуплікація за (user_id, job_id) та розбиття на пакети"""
+    unique_rows = {}
+    for row in rows:
+        unique_rows[(row["user_id"], row["job_id"])] = row
+    values = list(unique_rows.values())
+    for start in range(0, len(values), chunk_size):
+        yield values[start:start + chunk_size]
+
+
+def _upsert_columns(rows: List[Dict[str, Any]]):
+    """Колонки для оновлення - лише ті, що передані в рядках"""
+    keys = rows[0].keys() if rows else ()
+    return tuple(column for column in JOB_MATCH_UPSERT_COLUMNS if column in keys)
+
+
+def bulk_upsert_job_matches(session, rows: List[Dict[str, Any]], chunk_size: int = JOB_MATCH_UPSERT_CHUNK_SIZE) -> int:
+    """
+    Пакетний upsert вакансій (один запит на пакет замість запиту на рядок)
+    
+    Args:
+        session: Сесія SQLAlchemy
+        rows: Значення колонок job_matches (однаковий набір ключів у всіх рядках)
+        chunk_size: Рядків на пакет
+        
+    Returns:
+        Кількість записаних рядків (після дедуплікації)
+    """
+    if not rows:
+        return 0
+    
+    statement = job_match_upsert_statement(session.get_bind().dialect.name, _upsert_columns(rows))
+    written = 0
+    for chunk in _upsert_chunks(rows, chunk_size):
+        session.execute(statement, chunk)
+        written += len(chunk)
+    return written
+
+
+async def async_bulk_upsert_job_matches(session, rows: List[Dict[str, Any]], chunk_size: int = JOB_MATCH_UPSERT_CHUNK_SIZE) -> int:
+    """
+    Пакетний upsert вакансій для AsyncSession
+    
+    Args:
+        session: Асинхронна сесія SQLAlchemy
+        rows: Значення колонок job_matches (однаковий набір ключів у всіх рядках)
+        chunk_size: Рядків на пакет
+        
+    Returns:
+        Кількість записаних рядків (після дедуплікації)
+    """
+    if not rows:
+        return 0
+    
+    statement = job_match_upsert_statement(session.get_bind().dialect.name, _upsert_columns(rows))
+    written = 0
+    for chunk in _upsert_chunks(rows, chunk_size):
+        await session.execute(statement, chunk)
+        written += len(chunk)
+    return written
+
+
 class ABTest(Base):
     """Модель A/B тестування шаблонів"""
     
@@ -0,0 +1,283 @@
+"""
+Метрики та автопідбір розміру пулу з'єднань SQLAlchemy
+
+Пул записує час очікування з'єднання (checkout), кількість зайнятих
+з'єднань, overflow та таймаути. За спостережуваною конкурентністю
+рекомендується розмір пулу; в режимі "adjust" пул збільшується
+автоматично (до DB_POOL_MAX_SIZE).
+
+Для інших пулів (StaticPool in-memory SQLite, NullPool) доступні лише
+лічильники checkout/checkin та кількість зайнятих з'єднань.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..config.logging import get_logger
+
+logger = get_logger("database-pool")
+
+# Режими автопідбору
+AUTOTUNE_OFF = "off"
+AUTOTUNE_RECOMMEND = "recommend"
+AUTOTUNE_ADJUST = "adjust"
+
+# Запас над p95 конкурентності при рекомендації розміру
+AUTOTUNE_HEADROOM = 1.25
+
+# Як часто (в checkout-ах) переоцінювати розмір пулу
+AUTOTUNE_INTERVAL = 200
+
+# Очікування з'єднання, довше за це, вважається ознакою замалого пулу
+SLOW_CHECKOUT_SECONDS = 0.05
+
+
+def _percentile(values, percent: float) -> float:
+    """Перцентиль"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class PoolMetrics:
+    """Метрики одного пулу з'єднань"""
+
+    def __init__(self, name: str, max_size: int = 50, window_size: int = 1000):
+        self.name = name
+        self.max_size = max_size
+        self.autotune = AUTOTUNE_OFF
+        self.engine: Optional[Engine] = None
+        self.pool: Optional[QueuePool] = None
+        self.waiting = 0
+        # Записи з'єднань, видані з пулу без власного лічильника (StaticPool, NullPool)
+        self._checked_out_records = set()
+        self.peak_in_use = 0
+        self.checkout_waits: Deque[float] = deque(maxlen=window_size)
+        self.demand_samples: Deque[int] = deque(maxlen=window_size)
+        self.recommendation: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self._samples_since_tune = 0
+        self._stalls_since_tune = 0
+        self.stats = {
+            "checkouts": 0,
+            "checkins": 0,
+            "timeouts": 0,
+            "slow_checkouts": 0,
+            "resizes": 0
+        }
+
+    def attach(self, engine: Engine, autotune: str = AUTOTUNE_OFF):
+        """
+        Підключення до engine
+
+        Args:
+            engine: Engine (для AsyncEngine - sync_engine); час очікування
+                вимірюється лише для Instrumented*QueuePool
+            autotune: off, recommend (лише лог рекомендації) або adjust (збільшення пулу)
+        """
+        self.engine = engine
+        self.autotune = autotune
+        self.pool = engine.pool
+        engine.pool.metrics = self
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _is_queue_pool(self) -> bool:
+        return isinstance(self.pool, QueuePool)
+
+    def in_use(self) -> int:
+        """Кількість зайнятих з'єднань"""
+        if self._is_queue_pool():
+            return self.pool.checkedout()
+        return len(self._checked_out_records)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.stats["checkouts"] += 1
+        self._checked_out_records.add(id(connection_record))
+        self.peak_in_use = max(self.peak_in_use, self.in_use())
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        self.stats["checkins"] += 1
+        self._checked_out_records.discard(id(connection_record))
+
+    def wait_started(self):
+        """Початок очікування з'єднання"""
+        with self._lock:
+            self.waiting += 1
+            # Попит у момент запиту = зайняті з'єднання + ті, хто чекає (включно з поточним)
+            self.demand_samples.append(self.in_use() + self.waiting)
+
+    def wait_finished(self, seconds: float, timed_out: bool = False):
+        """Завершення очікування з'єднання"""
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_waits.append(seconds)
+            if timed_out:
+                self.stats["timeouts"] += 1
+                self._stalls_since_tune += 1
+            elif seconds > SLOW_CHECKOUT_SECONDS:
+                self.stats["slow_checkouts"] += 1
+                self._stalls_since_tune += 1
+            self._samples_since_tune += 1
+            evaluate = self._samples_since_tune >= AUTOTUNE_INTERVAL or timed_out
+            if evaluate:
+                self._samples_since_tune = 0
+
+        if evaluate and self.autotune != AUTOTUNE_OFF:
+            self.autotune_pool()
+
+    def recommend(self) -> Dict[str, int]:
+        """
+        Рекомендований розмір пулу за спостережуваною конкурентністю
+
+        Returns:
+            pool_size (p95 попиту із запасом, не більше max_size)
+            та max_overflow (до піку попиту)
+        """
+        current_size = self.pool.size() if self._is_queue_pool() else 0
+        p95_demand = _percentile(self.demand_samples, 95)
+        peak_demand = max(self.demand_samples, default=0)
+
+        pool_size = math.ceil(p95_demand * AUTOTUNE_HEADROOM)
+        if self._stalls_since_tune:
+            # Були зупинки на очікуванні - пул не менший за поточний
+            pool_size = max(pool_size, current_size + 1)
+        pool_size = max(1, min(self.max_size, pool_size))
+        max_overflow = max(0, math.ceil(peak_demand * AUTOTUNE_HEADROOM) - pool_size)
+        max_overflow = min(self.max_size, max_overflow)
+
+        self.recommendation = {"pool_size": pool_size, "max_overflow": max_overflow}
+        return self.recommendation
+
+    def autotune_pool(self):
+        """Рекомендація розміру та, в режимі adjust, збільшення пулу"""
+        if not self._is_queue_pool():
+            return
+        previous = self.recommendation
+        recommendation = self.recommend()
+        self._stalls_since_tune = 0
+        pool = self.pool
+        if recommendation["pool_size"] == pool.size() and recommendation["max_overflow"] == pool._max_overflow:
+            return
+
+        if self.autotune != AUTOTUNE_ADJUST:
+            if recommendation != previous:
+                logger.info(
+                    f"💡 Пул {self.name}: рекомендовано pool_size={recommendation['pool_size']}, "
+                    f"max_overflow={recommendation['max_overflow']} (зараз {pool.size()}/{pool._max_overflow})"
+                )
+            return
+
+        # Пул лише збільшується: зменшення під навантаженням спричинить нові очікування
+        pool_size = max(pool.size(), recommendation["pool_size"])
+        max_overflow = max(pool._max_overflow, recommendation["max_overflow"])
+        if pool_size == pool.size() and max_overflow == pool._max_overflow:
+            return
+
+        logger.info(f"📈 Пул {self.name}: {pool.size()}/{pool._max_overflow} → {pool_size}/{max_overflow}")
+        resize_pool(self.engine, pool_size, max_overflow)
+        # Рекомендації для нового розміру - лише за новими вимірюваннями
+        self.demand_samples.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Зведені метрики пулу"""
+        pool = self.pool if self._is_queue_pool() else None
+        waits = list(self.checkout_waits)
+        return {
+            "name": self.name,
+            "pool_class": type(self.pool).__name__ if self.pool is not None else None,
+            "pool_size": pool.size() if pool is not None else 0,
+            "max_overflow": pool._max_overflow if pool is not None else 0,
+            "in_use": self.in_use() if self.pool is not None else 0,
+            "idle": pool.checkedin() if pool is not None else 0,
+            "overflow": max(0, pool.overflow()) if pool is not None else 0,
+            "waiting": self.waiting,
+            "peak_in_use": self.peak_in_use,
+            "avg_checkout_ms": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+            "p95_checkout_ms": round(_percentile(waits, 95) * 1000, 3),
+            "max_checkout_ms": round(max(waits, default=0.0) * 1000, 3),
+            "recommendation": self.recommendation,
+            **self.stats
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Вимірювання очікування з'єднання для QueuePool"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        metrics = self.metrics
+        if metrics is None:
+            return super()._do_get()
+
+        metrics.wait_started()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            metrics.wait_finished(time.perf_counter() - started, timed_out=True)
+            raise
+        except BaseException:
+            metrics.wait_finished(time.perf_counter() - started)
+            raise
+        metrics.wait_finished(time.perf_counter() - started)
+        return connection
+
+    def recreate(self, pool_size: Optional[int] = None, max_overflow: Optional[int] = None):
+        """Новий пул з тими ж параметрами (або іншим розміром) і тими ж метриками"""
+        self.logger.info("Pool recreating")
+        pool = self.__class__(
+            self._creator,
+            pool_size=self._pool.maxsize if pool_size is None else pool_size,
+            max_overflow=self._max_overflow if max_overflow is None else max_overflow,
+            pre_ping=self._pre_ping,
+            use_lifo=self._pool.use_lifo,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool з метриками"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool з метриками"""
+
+
+def resize_pool(engine: Engine, pool_size: int, max_overflow: int):
+    """
+    Зміна розміру пулу engine
+
+    Нові з'єднання беруться з нового пулу; з'єднання, що зараз
+    використовуються, повертаються в старий пул і закриваються разом з ним.
+    Для AsyncEngine викликається в контексті greenlet (з checkout пулу).
+
+    Args:
+        engine: Engine (для AsyncEngine - його sync_engine)
+        pool_size: Новий pool_size
+        max_overflow: Новий max_overflow
+    """
+    old_pool = engine.pool
+    engine.pool = old_pool.recreate(pool_size=pool_size, max_overflow=max_overflow)
+    old_pool.dispose()
+    if engine.pool.metrics is not None:
+        engine.pool.metrics.stats["resizes"] += 1
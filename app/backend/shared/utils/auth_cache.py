@@ -0,0 +1,264 @@
+"""
+Кеші автентифікації - верифіковані JWT токени та користувачі
+
+Повна перевірка підпису JWT та завантаження користувача з БД
+виконуються один раз; наступні запити з тим самим токеном
+обходяться пошуком у словнику.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from shared.config.settings import settings
+from shared.config.logging import get_logger
+
+logger = get_logger("auth-cache")
+
+
+def token_digest(token: str) -> str:
+    """Ключ кешу для токена (сам токен у пам'яті не зберігається)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenVerificationCache:
+    """
+    Кеш розкодованих claims верифікованих токенів
+
+    Запис живе до `exp` токена (або max_ttl, якщо exp відсутній).
+    Кешуються лише успішно верифіковані токени.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0
+        }
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Отримання claims з кешу
+
+        Args:
+            token: JWT токен
+
+        Returns:
+            Claims або None, якщо токена немає в кеші чи він застарів
+        """
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        claims, expires_at = entry
+        if self._clock() >= expires_at:
+            self._remove(digest)
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.stats["hits"] += 1
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        """
+        Збереження claims верифікованого токена
+
+        Args:
+            token: JWT токен
+            claims: Розкодовані claims
+        """
+        now = self._clock()
+        expires_at = now + self.max_ttl
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, float(claims["exp"]))
+        if expires_at <= now:
+            return
+
+        digest = token_digest(token)
+        self._entries[digest] = (claims, expires_at)
+        self._entries.move_to_end(digest)
+        self._by_user.setdefault(str(claims.get("sub")), set()).add(digest)
+
+        while len(self._entries) > self.max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._remove(oldest)
+
+    def invalidate_user(self, user_id: Any) -> int:
+        """
+        Видалення всіх токенів користувача
+
+        Args:
+            user_id: ID користувача (claim sub)
+
+        Returns:
+            Кількість видалених записів
+        """
+        digests = self._by_user.pop(str(user_id), set())
+        for digest in digests:
+            self._entries.pop(digest, None)
+        self.stats["invalidations"] += len(digests)
+        return len(digests)
+
+    def _remove(self, digest: str):
+        """Видалення одного запису"""
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = str(entry[0].get("sub"))
+        digests = self._by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[user_id]
+
+    def clear(self):
+        """Очищення кешу"""
+        self._entries.clear()
+        self._by_user.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу"""
+        return {"entries": len(self._entries), **self.stats}
+
+
+class UserCache:
+    """
+    Короткоживучий кеш користувачів (разом з ролями та дозволами)
+
+    Зберігаються значення колонок, а не об'єкт сесії: при влученні
+    відновлюється detached екземпляр і приєднується до поточної сесії
+    через merge(load=False), без запиту до БД. Зв'язки (роль тощо)
+    довантажуються ліниво, як і для звичайного об'єкта.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[type, str], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0
+        }
+
+    def get(self, db: Session, model: type, user_id: Any):
+        """
+        Отримання користувача з кешу
+
+        Args:
+            db: Сесія БД поточного запиту
+            model: ORM модель користувача
+            user_id: ID користувача
+
+        Returns:
+            Екземпляр, приєднаний до сесії, або None
+        """
+        key = (model, str(user_id))
+        entry = self._entries.get(key)
+        if entry is None or self._clock() >= entry[1]:
+            self._entries.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+
+        instance = model(**entry[0])
+        make_transient_to_detached(instance)
+        return db.merge(instance, load=False)
+
+    def put(self, user):
+        """
+        Збереження користувача
+
+        Args:
+            user: Завантажений ORM об'єкт
+        """
+        state = sqlalchemy_inspect(user)
+        values = {attr.key: getattr(user, attr.key) for attr in state.mapper.column_attrs}
+        key = (type(user), str(state.identity[0]))
+
+        self._entries[key] = (values, self._clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> int:
+        """
+        Видалення користувача з кешу
+
+        Args:
+            user_id: ID користувача
+
+        Returns:
+            Кількість видалених записів
+        """
+        keys = [key for key in self._entries if key[1] == str(user_id)]
+        for key in keys:
+            del self._entries[key]
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Очищення кешу"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика кешу"""
+        return {"entries": len(self._entries), **self.stats}
+
+
+# Глобальні екземпляри кешів
+token_cache = TokenVerificationCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+user_cache = UserCache(
+    ttl=settings.AUTH_USER_CACHE_TTL,
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES
+)
+
+
+def invalidate_user_auth_cache(user_id: Any):
+    """
+    Інвалідація кешів автентифікації користувача (logout, блокування, зміна ролі)
+
+    Args:
+        user_id: ID користувача
+    """
+    tokens = token_cache.invalidate_user(user_id)
+    users = user_cache.invalidate_user(user_id)
+    logger.info(f"Кеш автентифікації користувача {user_id} очищено ({tokens} токенів, {users} записів)")
+
+
+def get_token_cache() -> TokenVerificationCache:
+    """Отримання кешу верифікованих токенів"""
+    return token_cache
+
+
+def get_user_cache() -> UserCache:
+    """Отримання кешу користувачів"""
+    return user_cache
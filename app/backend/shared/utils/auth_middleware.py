@@ -6,7 +6,9 @@ from typing import Optional, List
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from functools import lru_cache
 import jwt
+from jwt.algorithms import get_default_algorithms
 import sys
 import os
 
@@ -16,6 +18,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from shared.config.settings import settings
 from shared.config.logging import get_logger
 from shared.database.connection import get_db
+from shared.utils.auth_cache import token_cache, user_cache
 
 logger = get_logger("auth-middleware")
 
@@ -23,6 +26,12 @@ logger = get_logger("auth-middleware")
 security = HTTPBearer(auto_error=False)
 
 
+@lru_cache(maxsize=8)
+def _get_verification_key(secret: str, algorithm: str):
+    """Підготовлений ключ перевірки підпису (розбирається один раз)"""
+    return get_default_algorithms()[algorithm].prepare_key(secret)
+
+
 class AuthMiddleware:
     """Клас для авторизації та аутентифікації"""
     
@@ -96,6 +105,9 @@ class AuthMiddleware:
         """
         Верифікація JWT токена
         
+        Claims успішно верифікованих токенів кешуються до їх exp,
+        тому повна перевірка підпису виконується один раз на токен.
+        
         Args:
             token: JWT токен
             
@@ -105,10 +117,14 @@ class AuthMiddleware:
         Raises:
             HTTPException: Якщо токен невірний
         """
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+        
         try:
             payload = jwt.decode(
                 token,
-                settings.JWT_SECRET_KEY,
+                _get_verification_key(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM),
                 algorithms=[settings.JWT_ALGORITHM]
             )
             
@@ -119,6 +135,7 @@ class AuthMiddleware:
                     detail="Невірний токен"
                 )
             
+            token_cache.put(token, payload)
             return payload
             
         except jwt.ExpiredSignatureError:
@@ -169,6 +186,11 @@ class AuthMiddleware:
             # Імпортуємо модель користувача
             from app.backend.services.auth_service.src.models import User
             
+            # Активні користувачі кешуються на AUTH_USER_CACHE_TTL секунд
+            user = user_cache.get(db, User, user_id)
+            if user is not None:
+                return user
+            
             user = db.query(User).filter(User.id == int(user_id)).first()
             if user is None:
                 raise HTTPException(
@@ -182,6 +204,7 @@ class AuthMiddleware:
                     detail="Користувач заблокований"
                 )
             
+            user_cache.put(user)
             return user
             
         except HTTPException:
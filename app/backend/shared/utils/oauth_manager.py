@@ -2,14 +2,30 @@
 OAuth 2.0 Manager для Upwork API
 """
 import os
+import secrets
 import requests
+from datetime import datetime, timedelta
 from urllib.parse import urlencode
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
+from shared.config.settings import settings
 from shared.config.logging import get_logger
+from shared.utils.encryption import encrypt_data, decrypt_data
 
 logger = get_logger("oauth-manager")
 
+# Token endpoint OAuth2 Upwork (обмін коду авторизації та refresh_token)
+UPWORK_OAUTH2_TOKEN_URL = "https://api.upwork.com/api/v3/oauth2/token"
+
+
+class OAuthTokenError(Exception):
+    """Помилка обміну токенів з Upwork"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class UpworkOAuthManager:
     """Менеджер OAuth 2.0 авторизації для Upwork API"""
     
@@ -209,4 +225,63 @@ class UpworkOAuthManager:
             return False
 
 # Глобальний екземпляр менеджера
-oauth_manager = UpworkOAuthManager() 
\ No newline at end of file
+oauth_manager = UpworkOAuthManager()
+
+
+def refresh_upwork_tokens(refresh_token: str) -> Dict[str, Any]:
+    """
+    Обмін refresh_token на нові токени Upwork
+    
+    Без UPWORK_CLIENT_SECRET (тестовий режим) повертаються тестові токени.
+    
+    Args:
+        refresh_token: Розшифрований refresh token
+        
+    Returns:
+        Відповідь token endpoint (access_token, refresh_token, expires_in)
+        
+    Raises:
+        OAuthTokenError: Upwork відхилив оновлення
+    """
+    if not settings.UPWORK_CLIENT_SECRET:
+        return {
+            "access_token": "test_access_token_" + secrets.token_urlsafe(16),
+            "refresh_token": "test_refresh_token_" + secrets.token_urlsafe(16),
+            "expires_in": 3600
+        }
+    
+    data = {
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+        "client_id": settings.UPWORK_CLIENT_ID,
+        "client_secret": settings.UPWORK_CLIENT_SECRET
+    }
+    response = requests.post(UPWORK_OAUTH2_TOKEN_URL, data=data, timeout=30)
+    
+    if response.status_code != 200:
+        logger.error(f"Помилка оновлення токена: {response.text}")
+        raise OAuthTokenError("Помилка оновлення токена", status_code=response.status_code)
+    
+    return response.json()
+
+
+def refresh_connection_tokens(db_session, connection) -> None:
+    """
+    Оновлення токенів OAuthConnection через refresh_token зі збереженням у БД
+    
+    Args:
+        db_session: Сесія БД
+        connection: Активне OAuth з'єднання Upwork
+        
+    Raises:
+        OAuthTokenError: Upwork відхилив оновлення
+    """
+    token_data = refresh_upwork_tokens(decrypt_data(connection.refresh_token))
+    
+    connection.access_token = encrypt_data(token_data["access_token"])
+    if token_data.get("refresh_token"):
+        connection.refresh_token = encrypt_data(token_data["refresh_token"])
+    connection.expires_at = datetime.utcnow() + timedelta(seconds=token_data.get("expires_in", 3600))
+    connection.updated_at = datetime.utcnow()
+    
+    db_session.commit()
@@ -0,0 +1,112 @@
+"""
+Keyset-пагінація (курсори)
+
+Замість OFFSET наступна сторінка починається одразу після останнього
+рядка попередньої: WHERE (sort_value, id) < (курсор) ORDER BY sort_value
+DESC, id DESC. Глибина сторінки не впливає на вартість запиту.
+Курсор для клієнта непрозорий (base64url від JSON).
+"""
+
+import base64
+import bisect
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+
+# Маркер datetime у курсорі (щоб після декодування порівнювати з колонкою того ж типу)
+_DATETIME_KEY = "$dt"
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пошкоджений або створений не цим сервісом"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value[_DATETIME_KEY])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Кодування позиції останнього рядка сторінки
+
+    Args:
+        values: Значення ключа сортування, останнім - ID
+
+    Returns:
+        Непрозорий курсор
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> Tuple[Any, ...]:
+    """
+    Декодування курсора
+
+    Args:
+        cursor: Курсор з попередньої відповіді
+        size: Очікувана кількість значень ключа
+
+    Returns:
+        Значення ключа сортування
+
+    Raises:
+        InvalidCursorError: Курсор неможливо розібрати
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("wrong size")
+        return tuple(_decode_value(value) for value in values)
+    except (ValueError, TypeError, KeyError, UnicodeError) as e:
+        raise InvalidCursorError(f"Невалідний курсор: {cursor!r}") from e
+
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    Умова "після курсора" для сортування за спаданням
+
+    Порівняння кортежів (row value) використовує складений індекс
+    (sort_value, id) в PostgreSQL та SQLite.
+
+    Args:
+        columns: Колонки ключа сортування, останньою - ID
+        values: Значення з курсора
+
+    Returns:
+        SQLAlchemy-умова для WHERE
+    """
+    return tuple_(*columns) < tuple_(*values)
+
+
+def keyset_slice(
+    items: Sequence[Any],
+    key: Callable[[Any], Tuple],
+    after: Optional[Tuple] = None,
+    limit: int = 100
+) -> List[Any]:
+    """
+    Сторінка з відсортованого за зростанням списку у порядку спадання
+
+    Args:
+        items: Елементи, відсортовані за key за зростанням
+        key: Ключ сортування (значення, ID)
+        after: Ключ останнього елемента попередньої сторінки
+        limit: Розмір сторінки
+
+    Returns:
+        До limit елементів з ключем, меншим за after (нові першими)
+    """
+    end = len(items) if after is None else bisect.bisect_left(items, tuple(after), key=key)
+    return items[max(0, end - limit):end][::-1]
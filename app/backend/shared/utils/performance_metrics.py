@@ -241,6 +241,7 @@ class DatabaseMetrics:
         self.logger = logger
         self.query_times = deque(maxlen=1000)
         self.connection_pool_stats = {}
+        self.pool_stats_source: Optional[Callable[[], Dict[str, Any]]] = None
     
     def log_query(self, query: str, duration: float, rows_affected: int = None):
         """Логування запиту до БД"""
@@ -269,17 +270,23 @@ class DatabaseMetrics:
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Отримання статистики продуктивності БД"""
+        stats = {}
+        if self.pool_stats_source is not None:
+            self.connection_pool_stats = self.pool_stats_source()
+            stats["connection_pool"] = self.connection_pool_stats
+        
         if not self.query_times:
-            return {}
+            return stats
         
         times = list(self.query_times)
-        return {
+        stats.update({
             "total_queries": len(times),
             "avg_query_time_ms": sum(times) / len(times) * 1000,
             "max_query_time_ms": max(times) * 1000,
             "min_query_time_ms": min(times) * 1000,
             "slow_queries_count": len([t for t in times if t > 1.0])  # > 1 секунди
-        }
+        })
+        return stats
 
 
 class APIMetrics:
@@ -366,6 +373,29 @@ api_metrics = None
 security_metrics = None
 
 
+def register_pool_metrics(collector: PerformanceMetricsCollector, pool_metrics: Dict[str, Any]):
+    """
+    Реєстрація метрик пулів з'єднань БД як кастомних метрик збірника
+    
+    Args:
+        collector: Збірник метрик
+        pool_metrics: Словник {назва пулу: PoolMetrics} (DatabaseManager.pool_metrics)
+    """
+    fields = {
+        "in_use": "in_use",
+        "overflow": "overflow",
+        "waiting": "waiting",
+        "checkout_p95_ms": "p95_checkout_ms",
+        "timeouts": "timeouts"
+    }
+    for pool_name, metrics in pool_metrics.items():
+        for metric_name, field in fields.items():
+            collector.add_custom_metric(
+                f"db_pool_{pool_name}_{metric_name}",
+                lambda metrics=metrics, field=field: float(metrics.summary()[field])
+            )
+
+
 def initialize_metrics(service_name: str):
     """Ініціалізація метрик"""
     global performance_collector, database_metrics, api_metrics, security_metrics
@@ -381,6 +411,14 @@ def initialize_metrics(service_name: str):
     api_metrics = APIMetrics(logger)
     security_metrics = SecurityMetrics(logger)
     
+    # Метрики пулів з'єднань БД
+    try:
+        from shared.database.connection import db_manager
+        register_pool_metrics(performance_collector, db_manager.pool_metrics)
+        database_metrics.pool_stats_source = db_manager.get_pool_metrics
+    except Exception as e:
+        logger.warning(f"Метрики пулу з'єднань недоступні: {e}")
+    
     logger.info("Метрики продуктивності ініціалізовані", extra={
         "service_name": service_name,
         "components": ["performance_collector", "database_metrics", "api_metrics", "security_metrics"]
@@ -3,11 +3,15 @@ Rate Limiter - Middleware для обмеження частоти запиті
 """
 
 import time
+import uuid
 import hashlib
-from typing import Dict, Tuple, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
 import redis
+import redis.asyncio as aioredis
 import sys
 import os
 
@@ -16,9 +20,126 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from shared.config.settings import settings
 from shared.config.logging import get_logger
+from shared.utils.single_flight import SingleFlight
 
 logger = get_logger("rate-limiter")
 
+# Тривалість вікон у секундах
+WINDOW_SECONDS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400
+}
+
+# Пауза перед повторною спробою підключення до Redis після помилки
+REDIS_RETRY_INTERVAL = 30
+
+# Максимальна частка найменшого ліміту, яку можна зарезервувати одним пакетом
+LOCAL_BATCH_LIMIT_FRACTION = 0.1
+
+# Sliding-window-log для кількох вікон за один атомарний виклик.
+# KEYS: ключі вікон; ARGV: now_ms, member, cost, далі пари (window_ms, limit).
+# Виділяється до cost запитів (скільки дозволяє найзаповненіше вікно),
+# і всі виділені запити записуються в усі вікна одразу.
+# Повертає: granted, індекс вікна що заблокувало (0 якщо немає),
+# далі для кожного вікна пару (count, retry_after_ms).
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+local granted = tonumber(ARGV[3])
+local counts = {}
+local blocked = 0
+
+for i = 1, #KEYS do
+    local window = tonumber(ARGV[2 + i * 2])
+    local limit = tonumber(ARGV[3 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now - window)
+    counts[i] = redis.call('ZCARD', KEYS[i])
+    local free = math.max(0, limit - counts[i])
+    if free < granted then
+        granted = free
+    end
+    if blocked == 0 and free == 0 then
+        blocked = i
+    end
+end
+
+local result = {granted, blocked}
+for i = 1, #KEYS do
+    local window = tonumber(ARGV[2 + i * 2])
+    local limit = tonumber(ARGV[3 + i * 2])
+    local retry_after = 0
+    if granted > 0 then
+        for j = 1, granted do
+            redis.call('ZADD', KEYS[i], now, member .. ':' .. j)
+        end
+        redis.call('PEXPIRE', KEYS[i], window)
+        counts[i] = counts[i] + granted
+    elseif counts[i] >= limit then
+        local index = counts[i] - limit
+        local oldest = redis.call('ZRANGE', KEYS[i], index, index, 'WITHSCORES')
+        retry_after = math.max(0, tonumber(oldest[2]) + window - now)
+    end
+    table.insert(result, counts[i])
+    table.insert(result, retry_after)
+end
+
+return result
+"""
+
+
+@dataclass
+class WindowResult:
+    """Результат перевірки одного вікна"""
+    window: str
+    limit: int
+    current: int
+    remaining: int
+    retry_after: int
+
+
+@dataclass
+class LocalTokenBucket:
+    """
+    Локальний запас запитів одного клієнта, вже зарезервованих у Redis
+
+    Розмір пакета подвоюється, якщо запас вичерпано до завершення lease,
+    і зменшується вдвічі, якщо lease минув з невикористаними токенами.
+    Тому активний клієнт звертається до Redis приблизно раз на lease,
+    незалежно від частоти запитів.
+    """
+    tokens: int = 0
+    expires_at: float = 0.0
+    batch_size: int = 1
+    results: List[WindowResult] = field(default_factory=list)
+    
+    def take(self, now: float) -> bool:
+        """Використання одного локального токена"""
+        if self.tokens > 0 and now < self.expires_at:
+            self.tokens -= 1
+            return True
+        return False
+    
+    def next_batch(self, now: float, max_batch: int) -> int:
+        """Розмір наступного пакета резервування"""
+        if self.expires_at:
+            if now < self.expires_at:
+                self.batch_size = self.batch_size * 2
+            elif self.tokens > 0:
+                self.batch_size = self.batch_size // 2
+        self.batch_size = max(1, min(max_batch, self.batch_size))
+        return self.batch_size
+    
+    def refill(self, granted: int, results: List[WindowResult], now: float, lease_seconds: float):
+        """Поповнення запасу після резервування в Redis"""
+        self.tokens = granted
+        self.expires_at = now + lease_seconds
+        self.results = results
+    
+    def remaining(self) -> Dict[str, int]:
+        """Залишок по вікнах з урахуванням невикористаних токенів"""
+        return {f"remaining_{result.window}": result.remaining + self.tokens for result in self.results}
+
 
 class RateLimiter:
     """Клас для обмеження частоти запитів"""
@@ -26,18 +147,54 @@ class RateLimiter:
     def __init__(self):
         """Ініціалізація rate limiter"""
         self.redis_client = None
+        self.async_redis_client = None
+        self._script = None
+        self._async_script = None
+        self._async_retry_at = 0.0
+        self._buckets: "OrderedDict[str, LocalTokenBucket]" = OrderedDict()
+        self._reservations = SingleFlight()
+        self.stats = {
+            "local_hits": 0,
+            "redis_reservations": 0
+        }
         self._init_redis()
     
     def _init_redis(self):
         """Ініціалізація Redis підключення"""
         try:
-            self.redis_client = redis.from_url(settings.REDIS_URL)
+            client = redis.from_url(settings.REDIS_URL)
             # Тестуємо підключення
-            self.redis_client.ping()
+            client.ping()
+            self.use_redis(client)
             logger.info("✅ Redis підключення успішне")
         except Exception as e:
             logger.warning(f"⚠️ Redis недоступний: {e}")
             self.redis_client = None
+            return
+        
+        # Асинхронний клієнт для middleware (підключається при першому запиті)
+        self.use_async_redis(aioredis.from_url(settings.REDIS_URL))
+    
+    def use_redis(self, client):
+        """
+        Встановлення синхронного Redis клієнта (для allow_request)
+        
+        Args:
+            client: redis клієнт (або сумісний, напр. fakeredis)
+        """
+        self.redis_client = client
+        self._script = client.register_script(SLIDING_WINDOW_SCRIPT) if client else None
+    
+    def use_async_redis(self, client):
+        """
+        Встановлення асинхронного Redis клієнта
+        
+        Args:
+            client: redis.asyncio клієнт (або сумісний, напр. fakeredis)
+        """
+        self.async_redis_client = client
+        self._async_script = client.register_script(SLIDING_WINDOW_SCRIPT) if client else None
+        self._async_retry_at = 0.0
     
     def _get_client_identifier(self, request: Request) -> str:
         """
@@ -80,77 +237,71 @@ class RateLimiter:
         Returns:
             Ключ для Redis
         """
-        current_time = int(time.time())
-        
-        if window == "minute":
-            window_time = current_time - (current_time % 60)
-        elif window == "hour":
-            window_time = current_time - (current_time % 3600)
-        elif window == "day":
-            window_time = current_time - (current_time % 86400)
-        else:
-            window_time = current_time
-        
-        return f"rate_limit:{identifier}:{window}:{window_time}"
+        return f"rate_limit:{identifier}:{window}"
+    
+    @staticmethod
+    def _build_script_args(windows: List[Tuple[str, int, int]], cost: int = 1) -> List:
+        """Аргументи Lua скрипта: now_ms, унікальний member, cost, пари (window_ms, limit)"""
+        now_ms = int(time.time() * 1000)
+        args = [now_ms, f"{now_ms}:{uuid.uuid4().hex}", cost]
+        for _, window_seconds, limit in windows:
+            args.extend([window_seconds * 1000, limit])
+        return args
     
-    def _check_rate_limit(
+    @staticmethod
+    def _parse_script_result(
+        raw: List,
+        windows: List[Tuple[str, int, int]]
+    ) -> Tuple[int, List[WindowResult]]:
+        """Розбір результату Lua скрипта"""
+        granted = int(raw[0])
+        results = []
+        for index, (window, _, limit) in enumerate(windows):
+            current = int(raw[2 + index * 2])
+            retry_after_ms = int(raw[3 + index * 2])
+            results.append(WindowResult(
+                window=window,
+                limit=limit,
+                current=current,
+                remaining=max(0, limit - current),
+                retry_after=(retry_after_ms + 999) // 1000
+            ))
+        return granted, results
+    
+    async def _check_rate_limits(
         self, 
         identifier: str, 
-        limit: int, 
-        window: str
-    ) -> Tuple[bool, int, int]:
+        windows: List[Tuple[str, int]],
+        cost: int = 1
+    ) -> Tuple[int, List[WindowResult]]:
         """
-        Перевірка rate limit
+        Перевірка rate limit для всіх вікон одним атомарним викликом
         
         Args:
             identifier: Ідентифікатор клієнта
-            limit: Ліміт запитів
-            window: Вікно часу
+            windows: Пари (вікно, ліміт)
+            cost: Скільки запитів зарезервувати
             
         Returns:
-            (is_allowed, current_count, remaining)
+            (кількість виділених запитів, 0 якщо ліміт вичерпано; результати по вікнах)
         """
-        if not self.redis_client:
+        resolved = [(window, WINDOW_SECONDS.get(window, 60), limit) for window, limit in windows]
+        allow_all = (cost, [WindowResult(window, limit, 0, limit, 0) for window, _, limit in resolved])
+        
+        if not self._async_script or time.monotonic() < self._async_retry_at:
             # Якщо Redis недоступний, дозволяємо всі запити
-            return True, 0, limit
+            return allow_all
         
-        key = self._get_rate_limit_key(identifier, window)
+        keys = [self._get_rate_limit_key(identifier, window) for window, _, _ in resolved]
         
         try:
-            # Отримуємо поточну кількість запитів
-            current_count = self.redis_client.get(key)
-            current_count = int(current_count) if current_count else 0
-            
-            # Перевіряємо чи не перевищено ліміт
-            if current_count >= limit:
-                return False, current_count, 0
-            
-            # Збільшуємо лічильник
-            pipe = self.redis_client.pipeline()
-            pipe.incr(key)
-            
-            # Встановлюємо TTL для ключа
-            if window == "minute":
-                pipe.expire(key, 60)
-            elif window == "hour":
-                pipe.expire(key, 3600)
-            elif window == "day":
-                pipe.expire(key, 86400)
-            
-            pipe.execute()
-            
-            # Отримуємо оновлену кількість
-            new_count = self.redis_client.get(key)
-            new_count = int(new_count) if new_count else 1
-            
-            remaining = max(0, limit - new_count)
-            
-            return True, new_count, remaining
-            
+            raw = await self._async_script(keys=keys, args=self._build_script_args(resolved, cost))
+            return self._parse_script_result(raw, resolved)
         except Exception as e:
             logger.error(f"Помилка rate limiting: {e}")
+            self._async_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
             # У випадку помилки дозволяємо запит
-            return True, 0, limit
+            return allow_all
     
     async def check_request_rate_limit(self, request: Request) -> None:
         """
@@ -170,43 +321,101 @@ class RateLimiter:
             ("hour", settings.RATE_LIMIT_PER_HOUR)
         ]
         
-        for window, limit in windows:
-            is_allowed, current_count, remaining = self._check_rate_limit(
-                identifier, limit, window
-            )
-            
-            if not is_allowed:
-                logger.warning(
-                    f"Rate limit exceeded: {identifier} - {current_count}/{limit} "
-                    f"requests per {window}"
-                )
-                
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "error": "Rate limit exceeded",
-                        "window": window,
-                        "limit": limit,
-                        "current": current_count,
-                        "retry_after": self._get_retry_after(window)
-                    }
-                )
+        if not settings.RATE_LIMIT_LOCAL_ENABLED:
+            granted, results = await self._check_rate_limits(identifier, windows)
+            if not granted:
+                raise self._rate_limit_exceeded(identifier, results)
+            remaining = {f"remaining_{result.window}": result.remaining for result in results}
+        else:
+            bucket = await self._take_local_token(identifier, windows)
+            remaining = bucket.remaining()
         
         # Додаємо заголовки з інформацією про rate limit
         request.state.rate_limit_info = {
             "identifier": identifier,
-            "remaining_minute": remaining,
-            "remaining_hour": remaining
+            **remaining
         }
     
-    def _get_retry_after(self, window: str) -> int:
-        """Отримання часу очікування для retry"""
-        if window == "minute":
-            return 60
-        elif window == "hour":
-            return 3600
+    def _rate_limit_exceeded(self, identifier: str, results: List[WindowResult]) -> HTTPException:
+        """Формування відповіді 429 для вікна, що заблокувало запит"""
+        blocked = next(result for result in results if result.current >= result.limit)
+        logger.warning(
+            f"Rate limit exceeded: {identifier} - {blocked.current}/{blocked.limit} "
+            f"requests per {blocked.window}"
+        )
+        
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": "Rate limit exceeded",
+                "window": blocked.window,
+                "limit": blocked.limit,
+                "current": blocked.current,
+                "retry_after": max(1, blocked.retry_after)
+            }
+        )
+    
+    def _get_bucket(self, identifier: str) -> LocalTokenBucket:
+        """Локальний запас клієнта (LRU, обмежений RATE_LIMIT_LOCAL_MAX_CLIENTS)"""
+        bucket = self._buckets.get(identifier)
+        if bucket is None:
+            bucket = LocalTokenBucket()
+            self._buckets[identifier] = bucket
+            while len(self._buckets) > settings.RATE_LIMIT_LOCAL_MAX_CLIENTS:
+                self._buckets.popitem(last=False)
         else:
-            return 60
+            self._buckets.move_to_end(identifier)
+        return bucket
+    
+    async def _take_local_token(self, identifier: str, windows: List[Tuple[str, int]]) -> LocalTokenBucket:
+        """
+        Дозвіл запиту з локального запасу, з резервуванням у Redis за потреби
+        
+        Конкурентні запити одного клієнта чекають на одне спільне
+        резервування. Кожен токен перед видачею вже записаний у Redis,
+        тому глобальні ліміти дотримуються для всіх реплік gateway.
+        
+        Args:
+            identifier: Ідентифікатор клієнта
+            windows: Пари (вікно, ліміт)
+            
+        Returns:
+            Локальний запас клієнта
+            
+        Raises:
+            HTTPException: Якщо перевищено ліміт
+        """
+        while True:
+            bucket = self._get_bucket(identifier)
+            if bucket.take(time.monotonic()):
+                self.stats["local_hits"] += 1
+                return bucket
+            
+            granted, results = await self._reservations.do(
+                identifier, lambda: self._reserve(identifier, windows)
+            )
+            if not granted:
+                raise self._rate_limit_exceeded(identifier, results)
+    
+    async def _reserve(self, identifier: str, windows: List[Tuple[str, int]]) -> Tuple[int, List[WindowResult]]:
+        """Резервування пакета токенів у Redis"""
+        bucket = self._get_bucket(identifier)
+        smallest_limit = min(limit for _, limit in windows)
+        max_batch = min(
+            settings.RATE_LIMIT_LOCAL_BATCH_MAX,
+            max(1, int(smallest_limit * LOCAL_BATCH_LIMIT_FRACTION))
+        )
+        cost = bucket.next_batch(time.monotonic(), max_batch)
+        
+        self.stats["redis_reservations"] += 1
+        granted, results = await self._check_rate_limits(identifier, windows, cost)
+        if granted:
+            bucket.refill(granted, results, time.monotonic(), settings.RATE_LIMIT_LOCAL_LEASE_SECONDS)
+        return granted, results
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика локального рівня rate limiter"""
+        return {"local_clients": len(self._buckets), **self.stats}
     
     def allow_request(self, key: str, max_requests: int, window: int) -> bool:
         """
@@ -220,30 +429,16 @@ class RateLimiter:
         Returns:
             True якщо запит дозволений, False якщо перевищено ліміт
         """
-        if not self.redis_client:
+        if not self._script:
             # Якщо Redis недоступний, дозволяємо всі запити
             return True
         
-        current_time = int(time.time())
-        window_time = current_time - (current_time % window)
-        redis_key = f"rate_limit:{key}:{window_time}"
+        redis_key = f"rate_limit:{key}:{window}"
+        windows = [(str(window), window, max_requests)]
         
         try:
-            # Отримуємо поточну кількість запитів
-            current_count = self.redis_client.get(redis_key)
-            current_count = int(current_count) if current_count else 0
-            
-            # Перевіряємо чи не перевищено ліміт
-            if current_count >= max_requests:
-                return False
-            
-            # Збільшуємо лічильник
-            pipe = self.redis_client.pipeline()
-            pipe.incr(redis_key)
-            pipe.expire(redis_key, window)
-            pipe.execute()
-            
-            return True
+            raw = self._script(keys=[redis_key], args=self._build_script_args(windows))
+            return int(raw[0]) > 0
             
         except Exception as e:
             logger.error(f"Помилка rate limiting: {e}")
@@ -0,0 +1,64 @@
+"""
+Single-flight - об'єднання конкурентних однакових викликів
+
+Поки виклик з певним ключем виконується, інші виклики з тим самим
+ключем не запускають нову операцію, а чекають на результат першого.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Група викликів, що виконуються не більше одного разу на ключ одночасно"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {
+            "calls": 0,
+            "coalesced": 0
+        }
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Виконання виклику з об'єднанням за ключем
+
+        Операція виконується в окремій задачі, тому скасування одного
+        з очікувачів (наприклад, клієнт розірвав з'єднання) не скасовує
+        її для решти.
+
+        Args:
+            key: Ключ виклику
+            func: Фабрика корутини
+
+        Returns:
+            Результат (спільний для всіх об'єднаних викликів)
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        self.stats["calls"] += 1
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Видалення завершеного виклику"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Позначаємо виняток як оброблений, якщо всі очікувачі скасовані
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Кількість активних викликів"""
+        return len(self._calls)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика об'єднання викликів"""
+        return {"in_flight": self.in_flight(), **self.stats}
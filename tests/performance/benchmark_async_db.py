@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: синхронна сесія (get_db) vs асинхронна (get_async_db) в async endpoint-ах
+
+Змішане навантаження: частина запитів чекає на БД ~10 мс,
+решта - легкий endpoint без БД. Синхронна сесія в `async def` блокує
+event loop на час кожного запиту до БД, тому затримка легких запитів
+зростає; асинхронна сесія віддає керування циклу під час очікування.
+
+Запуск:
+    python tests/performance/benchmark_async_db.py [--requests 400] [--database-url postgresql://...]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'backend'))
+
+from shared.database.connection import build_async_database_url
+
+# Запит з очікуванням ~10 мс (імітація мережевої затримки та роботи сервера БД).
+# Для SQLite pg_sleep реєструється як функція, що відпускає GIL на час очікування.
+SLOW_QUERY = "SELECT pg_sleep(0.01)"
+
+
+def _register_sqlite_sleep(engine, is_async: bool):
+    """Реєстрація pg_sleep для SQLite з'єднань"""
+    @event.listens_for(engine.sync_engine if is_async else engine, "connect")
+    def on_connect(dbapi_connection, _):
+        if is_async:
+            dbapi_connection.run_async(lambda conn: conn.create_function("pg_sleep", 1, time.sleep))
+        else:
+            dbapi_connection.create_function("pg_sleep", 1, time.sleep)
+
+
+def build_app(database_url: str, pool_size: int) -> FastAPI:
+    """Додаток з однаковими endpoint-ами на sync та async сесіях"""
+    query = text(SLOW_QUERY)
+
+    engine = create_engine(database_url, pool_size=pool_size, max_overflow=0)
+    SessionLocal = sessionmaker(bind=engine)
+    async_engine = create_async_engine(build_async_database_url(database_url), pool_size=pool_size, max_overflow=0)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine)
+    if database_url.startswith("sqlite"):
+        _register_sqlite_sleep(engine, is_async=False)
+        _register_sqlite_sleep(async_engine, is_async=True)
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/query")
+    async def sync_query():
+        # Сесія закривається в самому endpoint: при залежності get_db з'єднання
+        # повертається в пул у threadpool, і блокуючий checkout на event loop
+        # може чекати на нього без кінця (ще один наслідок синхронного шляху)
+        with SessionLocal() as db:
+            return {"value": db.execute(query).scalar()}
+
+    @app.get("/async/query")
+    async def async_query(db: AsyncSession = Depends(get_async_db)):
+        return {"value": (await db.execute(query)).scalar()}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.state.engines = (engine, async_engine)
+    return app
+
+
+async def run_mode(app: FastAPI, mode: str, requests: int, concurrency: int, db_ratio: float) -> dict:
+    """Змішане навантаження для одного режиму"""
+    transport = httpx.ASGITransport(app=app)
+    ping_latencies, db_latencies = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+    db_every = max(1, round(1 / db_ratio))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(index: int):
+            path, latencies = (f"/{mode}/query", db_latencies) if index % db_every == 0 else ("/ping", ping_latencies)
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path)
+                assert response.status_code == 200
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    def p99(values):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    return {
+        "rps": requests / elapsed,
+        "ping_p50_ms": statistics.median(ping_latencies),
+        "ping_p99_ms": p99(ping_latencies),
+        "db_p50_ms": statistics.median(db_latencies),
+    }
+
+
+async def main_async(args):
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+    app = build_app(database_url, args.concurrency)
+    print(f"database: {database_url.split('@')[-1]}, requests: {args.requests}, "
+          f"concurrency: {args.concurrency}, db share: {args.db_ratio:.0%}")
+    print(f"{'mode':>6} {'req/s':>8} {'ping p50 ms':>12} {'ping p99 ms':>12} {'db p50 ms':>10}")
+    for mode in ("sync", "async"):
+        result = await run_mode(app, mode, args.requests, args.concurrency, args.db_ratio)
+        print(f"{mode:>6} {result['rps']:>8.0f} {result['ping_p50_ms']:>12.2f} "
+              f"{result['ping_p99_ms']:>12.2f} {result['db_p50_ms']:>10.2f}")
+
+    engine, async_engine = app.state.engines
+    engine.dispose()
+    await async_engine.dispose()
+
+
+def main():
+    """Головна функція"""
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB sessions")
+    parser.add_argument("--database-url", default=None, help="Синхронний URL БД (за замовчуванням тимчасовий SQLite)")
+    parser.add_argument("--requests", type=int, default=400, help="Кількість запитів на режим")
+    parser.add_argument("--concurrency", type=int, default=20, help="Кількість паралельних запитів")
+    parser.add_argument("--db-ratio", type=float, default=0.25, help="Частка запитів до БД")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
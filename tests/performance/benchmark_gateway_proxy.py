@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming proxy vs buffer-and-reparse у API Gateway
+
+Порівнює p50/p99 затримку та пікове RSS процесу gateway для тіл
+1 KB, 1 MB і 20 MB. Для кожного сценарію запускаються окремі процеси
+upstream та gateway, тому пікове RSS не накопичується між сценаріями.
+
+Запуск:
+    python tests/performance/benchmark_gateway_proxy.py [--requests 50]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+
+import httpx
+
+GATEWAY_SRC = os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'backend', 'api-gateway', 'src')
+
+SIZES = [
+    ("1KB", 1024),
+    ("1MB", 1024 * 1024),
+    ("20MB", 20 * 1024 * 1024),
+]
+
+
+def _free_port() -> int:
+    """Пошук вільного порту"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _json_payload(size: int) -> bytes:
+    """JSON документ заданого розміру"""
+    overhead = len(b'{"data": ""}')
+    return json.dumps({"data": "x" * max(0, size - overhead)}).encode()
+
+
+def run_upstream(port: int):
+    """Мікросервіс, що повертає JSON того ж розміру, що й тіло запиту"""
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+
+    app = FastAPI()
+    cache = {}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+        if size not in cache:
+            cache[size] = _json_payload(size)
+        return Response(content=cache[size], media_type="application/json")
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def run_gateway(port: int, upstream_port: int, mode: str):
+    """Gateway у режимі legacy (буферизація) або streaming"""
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    sys.path.insert(0, GATEWAY_SRC)
+    from proxy import proxy_request
+
+    app = FastAPI()
+    http_client = httpx.AsyncClient(timeout=60.0)
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+
+    if mode == "legacy":
+        @app.post("/svc/{path:path}")
+        async def legacy_route(request: Request, path: str):
+            body = await request.body()
+            headers = dict(request.headers)
+            headers.pop("host", None)
+            response = await http_client.request(
+                method=request.method,
+                url=f"{upstream_url}/{path}",
+                headers=headers,
+                content=body,
+                params=request.query_params
+            )
+            headers = dict(response.headers)
+            headers.pop("content-length", None)
+            return JSONResponse(
+                content=response.json(),
+                status_code=response.status_code,
+                headers=headers
+            )
+    else:
+        @app.post("/svc/{path:path}")
+        async def streaming_route(request: Request, path: str):
+            return await proxy_request(http_client, request, f"{upstream_url}/{path}")
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def _peak_rss_mb(pid: int) -> float:
+    """Пікове RSS процесу (VmHWM) в MB"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+async def _wait_ready(url: str, timeout: float = 15.0):
+    """Очікування запуску сервера"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Сервер {url} не запустився")
+
+
+async def _measure(gateway_port: int, size: int, requests: int, concurrency: int) -> list:
+    """Вимірювання затримок запитів через gateway"""
+    payload = _json_payload(size)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                async with client.stream(
+                    "POST",
+                    f"http://127.0.0.1:{gateway_port}/svc/echo",
+                    content=payload,
+                    headers={"Content-Type": "application/json"}
+                ) as response:
+                    async for _ in response.aiter_raw():
+                        pass
+                    assert response.status_code == 200
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+
+    return latencies
+
+
+def _percentile(values: list, percent: float) -> float:
+    """Перцентиль"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(mode: str, size: int, requests: int, concurrency: int) -> dict:
+    """Запуск одного сценарію з окремими процесами"""
+    upstream_port, gateway_port = _free_port(), _free_port()
+    upstream = multiprocessing.Process(target=run_upstream, args=(upstream_port,), daemon=True)
+    gateway = multiprocessing.Process(target=run_gateway, args=(gateway_port, upstream_port, mode), daemon=True)
+    upstream.start()
+    gateway.start()
+
+    try:
+        asyncio.run(_wait_ready(f"http://127.0.0.1:{upstream_port}/docs"))
+        asyncio.run(_wait_ready(f"http://127.0.0.1:{gateway_port}/docs"))
+        baseline_rss = _peak_rss_mb(gateway.pid)
+        latencies = asyncio.run(_measure(gateway_port, size, requests, concurrency))
+        return {
+            "p50_ms": statistics.median(latencies),
+            "p99_ms": _percentile(latencies, 99),
+            "peak_rss_mb": _peak_rss_mb(gateway.pid),
+            "rss_growth_mb": _peak_rss_mb(gateway.pid) - baseline_rss,
+        }
+    finally:
+        gateway.terminate()
+        upstream.terminate()
+        gateway.join()
+        upstream.join()
+
+
+def main():
+    """Головна функція"""
+    parser = argparse.ArgumentParser(description="Benchmark streaming proxy API Gateway")
+    parser.add_argument("--requests", type=int, default=50, help="Кількість запитів на сценарій")
+    parser.add_argument("--concurrency", type=int, default=8, help="Кількість паралельних запитів")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'mode':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak RSS MB':>12} {'RSS growth MB':>14}")
+    for label, size in SIZES:
+        # Для 20 MB зменшуємо кількість запитів, щоб benchmark не тривав хвилинами
+        requests = args.requests if size < 10 * 1024 * 1024 else max(5, args.requests // 5)
+        for mode in ("legacy", "streaming"):
+            result = run_scenario(mode, size, requests, args.concurrency)
+            print(
+                f"{label:>6} {mode:>10} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+                f"{result['peak_rss_mb']:>12.1f} {result['rss_growth_mb']:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
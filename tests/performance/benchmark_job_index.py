@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark: пошук вакансій - лінійний перебір vs JobIndex
+
+Генерує синтетичні вакансії (за замовчуванням 100k), будує індекс та
+порівнює затримку типових запитів (навички, слова, діапазони бюджету
+та ставки, їх комбінації) з лінійним перебором. Ціль - p95 < 10 мс.
+Окремо порівнює глибоку сторінку через skip та через курсор.
+
+Запуск:
+    python tests/performance/benchmark_job_index.py [--jobs 100000] [--runs 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from job_index import JobIndex, budget_range, tokenize
+
+SKILLS = [
+    "python", "django", "fastapi", "flask", "react", "vue", "angular", "typescript", "node.js", "go",
+    "rust", "java", "kotlin", "swift", "php", "laravel", "wordpress", "shopify", "aws", "docker",
+    "kubernetes", "postgresql", "mongodb", "redis", "graphql", "pandas", "pytorch", "tensorflow",
+    "scrapy", "selenium", "figma", "seo", "copywriting", "excel", "tableau", "power bi"
+]
+WORDS = [
+    "developer", "senior", "junior", "backend", "frontend", "full", "stack", "api", "integration",
+    "dashboard", "mobile", "app", "website", "ecommerce", "store", "automation", "scraper", "bot",
+    "migration", "refactoring", "bug", "fix", "design", "landing", "page", "analytics", "pipeline",
+    "machine", "learning", "model", "chatbot", "payment", "stripe", "crm", "erp", "saas", "startup"
+]
+COUNTRIES = ["United States", "Canada", "United Kingdom", "Germany", "Ukraine", "Australia", "India"]
+TARGET_MS = 10.0
+
+QUERIES = {
+    "skill": dict(skills="python"),
+    "rare skill": dict(skills="tableau"),
+    "2 skills": dict(skills="python,django"),
+    "keyword": dict(query="dashboard"),
+    "2 keywords": dict(query="senior backend"),
+    "budget range": dict(budget_min=4000, budget_max=6000),
+    "hourly range": dict(hourly_rate_min=80),
+    "skill + budget": dict(skills="react", budget_min=5000),
+    "keyword + hourly + country": dict(query="api", hourly_rate_min=40, hourly_rate_max=60, location="canada"),
+    "no filters": dict(),
+}
+
+
+def make_jobs(count: int, seed: int = 42):
+    """Синтетичні вакансії у форматі Upwork API"""
+    rng = random.Random(seed)
+    jobs = []
+    for number in range(count):
+        hourly = rng.random() < 0.4
+        low = rng.randrange(50, 10000, 50)
+        jobs.append({
+            "id": f"~{number:012d}",
+            "title": " ".join(rng.sample(WORDS, 4)).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=25)),
+            "skills": rng.sample(SKILLS, rng.randint(2, 6)),
+            "budget": None if hourly else {"min": low, "max": low + rng.randrange(0, 5000, 50)},
+            "hourly_rate": round(rng.uniform(10, 150), 2) if hourly else None,
+            "client": {"location": rng.choice(COUNTRIES)},
+            "posted_time": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+        })
+    return jobs
+
+
+def linear_search(jobs, query=None, skills=None, location=None, budget_min=None, budget_max=None,
+                  hourly_rate_min=None, hourly_rate_max=None, skip=0, limit=100):
+    """Перебір усіх вакансій з перевіркою кожного фільтра (поточний підхід)"""
+    wanted_skills = [skill.strip() for skill in skills.split(",")] if skills else []
+    terms = tokenize(query)
+    selected = []
+    for job in jobs:
+        if wanted_skills and not all(skill in job["skills"] for skill in wanted_skills):
+            continue
+        if terms and not terms <= (tokenize(job["title"]) | tokenize(job["description"])):
+            continue
+        if location and job["client"]["location"].lower() != location:
+            continue
+        bounds = budget_range(job["budget"])
+        if budget_min is not None and (bounds is None or bounds[1] < budget_min):
+            continue
+        if budget_max is not None and (bounds is None or bounds[0] > budget_max):
+            continue
+        rate = job["hourly_rate"]
+        if hourly_rate_min is not None and (rate is None or rate < hourly_rate_min):
+            continue
+        if hourly_rate_max is not None and (rate is None or rate > hourly_rate_max):
+            continue
+        selected.append(job)
+    selected.sort(key=lambda job: (job["posted_time"], job["id"]), reverse=True)
+    return selected[skip:skip + limit]
+
+
+def ids_of(jobs):
+    return [job["id"] for job in jobs]
+
+
+def measure(function, runs: int):
+    """Затримки виклику в мс"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark індексу вакансій")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--linear-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+
+    started = time.perf_counter()
+    index = JobIndex()
+    index.add_jobs(jobs)
+    index.search()  # досортування масивів
+    print(f"Індекс {args.jobs} вакансій побудовано за {time.perf_counter() - started:.2f}с: {index.get_stats()}\n")
+
+    print(f"{'запит':<28} {'linear p50':>11} {'index p50':>10} {'index p95':>10} {'×':>7}")
+    worst_p95 = 0.0
+    for name, params in QUERIES.items():
+        expected, linear_timings = measure(lambda: linear_search(jobs, **params), args.linear_runs)
+        result, index_timings = measure(lambda: index.search(**params), args.runs)
+        assert ids_of(result) == ids_of(expected), name
+
+        linear_p50 = statistics.median(linear_timings)
+        index_p50 = statistics.median(index_timings)
+        index_p95 = sorted(index_timings)[int(len(index_timings) * 0.95) - 1]
+        worst_p95 = max(worst_p95, index_p95)
+        print(f"{name:<28} {linear_p50:>9.1f}мс {index_p50:>8.2f}мс {index_p95:>8.2f}мс {linear_p50 / index_p50:>6.0f}×")
+
+    # Глибокі сторінки: skip (O(skip)) vs курсор (O(log n) пошук позиції)
+    page_size, depth = 20, min(500, args.jobs // 20 - 1)
+    after = index.sort_key(index.search(skip=depth * page_size - 1, limit=1)[0]["id"])
+    for name, function in (
+        ("page 1", lambda: index.search(limit=page_size)),
+        (f"page {depth + 1} skip", lambda: index.search(skip=depth * page_size, limit=page_size)),
+        (f"page {depth + 1} cursor", lambda: index.search(after=after, limit=page_size)),
+    ):
+        _, timings = measure(function, args.runs)
+        print(f"{name:<28} p50 {statistics.median(timings):>8.3f}мс")
+    assert ids_of(index.search(skip=depth * page_size, limit=page_size)) == ids_of(index.search(after=after, limit=page_size))
+
+    # Інкрементальне оновлення
+    started = time.perf_counter()
+    for job in jobs[:1000]:
+        index.add_job({**job, "title": job["title"] + " updated"})
+    index.search()
+    print(f"\nОновлення 1000 вакансій: {(time.perf_counter() - started) * 1000:.1f}мс")
+
+    status = "✅" if worst_p95 < TARGET_MS else "❌"
+    print(f"{status} найгірший p95 індексу: {worst_p95:.2f}мс (ціль < {TARGET_MS:.0f}мс)")
+
+
+if __name__ == "__main__":
+    main()
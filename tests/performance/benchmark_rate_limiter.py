@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fixed-window rate limiter (синхронний redis) vs sliding-window Lua скрипт (redis.asyncio)
+
+Legacy-реалізація робить 3 мережеві виклики на кожне вікно (GET,
+pipeline INCR+EXPIRE, GET) синхронним клієнтом, блокуючи event loop.
+Нова реалізація перевіряє всі вікна одним EVALSHA через redis.asyncio,
+а локальний token bucket резервує запити в Redis пакетами.
+
+Без --redis-url використовується fakeredis (in-process, без мережевої
+затримки), тому різниця показує лише кількість викликів; реальний
+ефект блокування event loop видно тільки на справжньому Redis.
+
+Запуск:
+    python tests/performance/benchmark_rate_limiter.py [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'backend'))
+
+from shared.utils.rate_limiter import RateLimiter, WINDOW_SECONDS
+
+WINDOWS = [("minute", 10 ** 9), ("hour", 10 ** 9)]
+
+
+class LegacyFixedWindowLimiter:
+    """Копія попередньої реалізації (_check_rate_limit до переходу на Lua)"""
+
+    def __init__(self, client):
+        self.redis_client = client
+
+    def _check_rate_limit(self, identifier: str, limit: int, window: str):
+        current_time = int(time.time())
+        window_seconds = WINDOW_SECONDS[window]
+        key = f"legacy_rate_limit:{identifier}:{window}:{current_time - current_time % window_seconds}"
+
+        current_count = self.redis_client.get(key)
+        current_count = int(current_count) if current_count else 0
+        if current_count >= limit:
+            return False, current_count, 0
+
+        pipe = self.redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, window_seconds)
+        pipe.execute()
+
+        new_count = int(self.redis_client.get(key) or 1)
+        return True, new_count, max(0, limit - new_count)
+
+    async def check(self, identifier: str):
+        for window, limit in WINDOWS:
+            is_allowed, _, _ = self._check_rate_limit(identifier, limit, window)
+            if not is_allowed:
+                return False
+        return True
+
+
+def _make_clients(redis_url: str):
+    """Синхронний та асинхронний клієнти до одного сервера"""
+    if redis_url:
+        import redis
+        import redis.asyncio as aioredis
+        return redis.from_url(redis_url), aioredis.from_url(redis_url)
+
+    import fakeredis
+    from fakeredis import aioredis as fake_aioredis
+    server = fakeredis.FakeServer()
+    return fakeredis.FakeRedis(server=server), fake_aioredis.FakeRedis(server=server)
+
+
+async def _run(check, requests: int, concurrency: int, clients: int) -> dict:
+    """Виконання перевірок з заданою паралельністю"""
+    latencies = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for index in queue:
+            start = time.perf_counter()
+            await check(f"client-{index % clients}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(ordered),
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
+
+
+async def main_async(args):
+    sync_client, async_client = _make_clients(args.redis_url)
+
+    legacy = LegacyFixedWindowLimiter(sync_client)
+
+    limiter = RateLimiter()
+    limiter.use_redis(sync_client)
+    limiter.use_async_redis(async_client)
+
+    async def lua_check(identifier: str):
+        allowed, _ = await limiter._check_rate_limits(identifier, WINDOWS)
+        return allowed
+
+    async def local_check(identifier: str):
+        return await limiter._take_local_token(identifier, WINDOWS)
+
+    print(f"backend: {args.redis_url or 'fakeredis'}, requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"{'mode':>22} {'checks/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'redis calls':>12}")
+    modes = (
+        ("legacy fixed-window", legacy.check, lambda: args.requests * len(WINDOWS) * 3),
+        ("lua sliding-window", lua_check, lambda: args.requests),
+        ("lua + local bucket", local_check, lambda: limiter.stats["redis_reservations"]),
+    )
+    for name, check, redis_calls in modes:
+        result = await _run(check, args.requests, args.concurrency, args.clients)
+        print(
+            f"{name:>22} {result['rps']:>10.0f} {result['p50_ms']:>10.3f} "
+            f"{result['p99_ms']:>10.3f} {redis_calls():>12}"
+        )
+
+    if args.redis_url:
+        for pattern in ("legacy_rate_limit:client-*", "rate_limit:client-*"):
+            for key in sync_client.scan_iter(pattern):
+                sync_client.delete(key)
+
+
+def main():
+    """Головна функція"""
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter")
+    parser.add_argument("--redis-url", default=None, help="Справжній Redis (за замовчуванням fakeredis)")
+    parser.add_argument("--requests", type=int, default=5000, help="Кількість перевірок")
+    parser.add_argument("--concurrency", type=int, default=50, help="Кількість паралельних перевірок")
+    parser.add_argument("--clients", type=int, default=100, help="Кількість різних клієнтів")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
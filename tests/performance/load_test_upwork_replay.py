@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Навантажувальний тест клієнта Upwork API на записаних викликах (без мережі)
+
+Відтворює запис (UPWORK_API_RECORD_PATH) через ReplayTransport з
+налаштовуваною затримкою, часткою 5xx та 429. Без --recording генерує
+синтетичний запис з payload-ів MockUpworkAPIClient і лог-нормальною
+затримкою. Кожен користувач звертається до власних ключів, тож при тому
+самому seed результати (коди відповідей, повтори) однакові між запусками -
+друкується їх дайджест.
+
+Запуск:
+    python tests/performance/load_test_upwork_replay.py [--recording calls.jsonl.gz]
+        [--users 50] [--calls 20] [--latency recorded:0.1] [--error-rate 0.02]
+        [--rate-limit-rate 0.02] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'app', 'backend'))
+sys.path.insert(0, os.path.join(
+    os.path.dirname(__file__), '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from api_replay import ReplayTransport, load_recording
+from upwork_client import MockUpworkAPIClient, TokenBucket, UpworkAPIClient, UpworkAPIError
+
+BASE_URL = "https://api.upwork.com/api/v3"
+
+
+def job_id(user: int, call: int) -> str:
+    return f"~{user:06d}{call:06d}"
+
+
+async def synthesize(users: int, calls: int, seed: int):
+    """Синтетичний запис: деталі вакансій та сторінки пошуку з реалістичним розміром"""
+    rng = random.Random(seed)
+    mock = MockUpworkAPIClient()
+    details = await mock.get_job_details("~0123456789012345")
+    search = await mock.search_jobs("")
+    entries = []
+    for user in range(users):
+        entries.append({
+            "key": f"GET /api/v3/jobs/search?q=user{user}",
+            "status": 200,
+            "headers": {"content-type": "application/json"},
+            "body": json.dumps(search),
+            "elapsed_ms": round(rng.lognormvariate(6.2, 0.4), 2)
+        })
+        for call in range(calls):
+            entries.append({
+                "key": f"GET /api/v3/jobs/{job_id(user, call)}",
+                "status": 200,
+                "headers": {"content-type": "application/json"},
+                "body": json.dumps({**details, "id": job_id(user, call)}),
+                "elapsed_ms": round(rng.lognormvariate(5.5, 0.5), 2)
+            })
+    return entries
+
+
+async def run_user(client: UpworkAPIClient, user: int, calls: int, timings, outcomes):
+    """Послідовні виклики одного користувача: пошук кожні 5 викликів, інакше деталі"""
+    for call in range(calls):
+        started = time.perf_counter()
+        try:
+            if call % 5 == 0:
+                await client.search_jobs(f"user{user}")
+            else:
+                await client.get_job_details(job_id(user, call))
+            outcome = "ok"
+        except UpworkAPIError as e:
+            outcome = type(e).__name__
+        timings.append((time.perf_counter() - started) * 1000)
+        outcomes.append((user, call, outcome))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест Upwork API на записаних викликах")
+    parser.add_argument("--recording", help="Файл запису (gzip JSON Lines)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency", default="recorded:0.1")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02)
+    parser.add_argument("--retry-after", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=200.0, help="Token bucket: запитів за секунду")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    entries = load_recording(args.recording) if args.recording else await synthesize(args.users, args.calls, args.seed)
+    transport = ReplayTransport(
+        entries,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    client = UpworkAPIClient(
+        "load-test",
+        base_url=BASE_URL,
+        http_client=httpx.AsyncClient(transport=transport),
+        limiter=TokenBucket(rate=args.rate, capacity=args.rate)
+    )
+
+    timings, outcomes = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_user(client, user, args.calls, timings, outcomes) for user in range(args.users)))
+    elapsed = time.perf_counter() - started
+    await client.http_client.aclose()
+
+    failed = [outcome for outcome in outcomes if outcome[2] != "ok"]
+    digest = hashlib.sha256(json.dumps(sorted(outcomes)).encode()).hexdigest()[:16]
+    print(f"Викликів: {len(outcomes)} за {elapsed:.2f}с ({len(outcomes) / elapsed:.0f}/с), помилок: {len(failed)}")
+    print(f"Затримка: p50 {statistics.median(timings):.1f}мс, "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}мс, max {max(timings):.1f}мс")
+    print(f"Replay: {transport.get_stats()}")
+    print(f"Дайджест результатів (seed={args.seed}): {digest}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+"""
+Тести для async LLM клієнтів ai-service на локальному fake LLM сервері
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import importlib
+import json
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.config.settings import settings
+
+AI_SERVICE_SRC = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'ai-service', 'src'
+))
+PACKAGE = "ai_service_src"
+
+# Відповідь моделі: підходить і для аналізу вакансії, і для пропозиції
+LLM_TEXT = json.dumps({
+    "proposal_text": "I can build this FastAPI service.",
+    "estimated_hours": "40",
+    "complexity_score": 6,
+    "success_probability": 0.8
+})
+
+PROPOSAL_REQUEST = {
+    "job_data": {"title": "FastAPI backend", "description": "Build a REST API", "skills": ["python"]},
+    "user_profile": {"skills": ["python", "fastapi"], "experience": "5 years"}
+}
+
+
+class FakeLLMServer:
+    """Локальний HTTP сервер з відповідями у форматі OpenAI та Anthropic і штучною затримкою"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                time.sleep(server.delay)
+                with server._lock:
+                    server.in_flight -= 1
+
+                if self.path.endswith("/chat/completions"):
+                    body = {
+                        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": LLM_TEXT}}],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+                    }
+                else:
+                    body = {
+                        "id": "msg_1", "type": "message", "role": "assistant", "model": "claude-3-sonnet-20240229",
+                        "content": [{"type": "text", "text": LLM_TEXT}],
+                        "stop_reason": "end_turn", "stop_sequence": None,
+                        "usage": {"input_tokens": 1, "output_tokens": 1}
+                    }
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Fake LLM сервер, на який налаштовано обидва клієнти"""
+    server = FakeLLMServer(delay=0.3)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-openai-key")
+    monkeypatch.setattr(settings, "CLAUDE_API_KEY", "test-claude-key")
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", f"{server.url}/v1")
+    monkeypatch.setattr(settings, "CLAUDE_BASE_URL", server.url)
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    # Однакові промпти мають доходити до сервера
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    yield server
+    server.close()
+
+
+def load_ai_service(module: str):
+    """Завантаження модуля ai-service як пакета (src використовується й іншими сервісами)"""
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [AI_SERVICE_SRC]
+    sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+class TestAsyncLLMClients:
+    """Тести що виклики LLM не блокують event loop"""
+
+    async def close_clients(self):
+        for module, close in (("openai_client", "close_openai_client"), ("claude_client", "close_anthropic_client")):
+            if f"{PACKAGE}.{module}" in sys.modules:
+                await getattr(sys.modules[f"{PACKAGE}.{module}"], close)()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_proposal_requests(self, fake_llm):
+        """Тест що N одночасних /ai/generate/proposal тривають приблизно як один запит, а не N"""
+        main = load_ai_service("main")
+        concurrency = 10
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://ai") as client:
+                started = time.perf_counter()
+                single = await client.post("/ai/generate/proposal", json=PROPOSAL_REQUEST)
+                single_latency = time.perf_counter() - started
+
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(
+                    client.post("/ai/generate/proposal", json=PROPOSAL_REQUEST) for _ in range(concurrency)
+                ))
+                concurrent_latency = time.perf_counter() - started
+        finally:
+            await self.close_clients()
+
+        assert single.json()["success"] and single.json()["model"] == "gpt-4"
+        assert all(response.json()["success"] for response in responses)
+        assert fake_llm.max_in_flight > 1
+        # Блокуючі виклики дали б ~concurrency * single_latency
+        assert concurrent_latency < single_latency * concurrency / 2
+
+    @pytest.mark.asyncio
+    async def test_claude_calls_overlap(self, fake_llm):
+        """Тест що виклики Claude виконуються паралельно через спільний пул"""
+        claude_client = load_ai_service("claude_client")
+        first, second = claude_client.ClaudeClient(), claude_client.ClaudeClient()
+        try:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                client.analyze_job({"title": "API", "description": "REST"}) for client in (first, second) * 3
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            await self.close_clients()
+
+        assert first.client is second.client
+        assert all(result["success"] for result in results)
+        assert results[0]["analysis"]["complexity_score"] == 6
+        assert elapsed < fake_llm.delay * 3
+
+    @pytest.mark.asyncio
+    async def test_cancellation_and_timeout(self, fake_llm):
+        """Тест що скасування та таймаут виклику не чекають на відповідь моделі"""
+        fake_llm.delay = 3.0
+        openai_client = load_ai_service("openai_client")
+        client = openai_client.OpenAIClient()
+        try:
+            task = asyncio.create_task(client._call_gpt4("prompt"))
+            await asyncio.sleep(0.2)
+            started = time.perf_counter()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert time.perf_counter() - started < 0.5
+
+            started = time.perf_counter()
+            with pytest.raises(Exception):
+                await client._call_gpt4("prompt", timeout=0.3)
+            assert time.perf_counter() - started < 1.5
+        finally:
+            await self.close_clients()
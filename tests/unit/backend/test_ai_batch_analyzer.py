@@ -0,0 +1,290 @@
+"""
+Тести для пакетного аналізу вакансій ai-service
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import importlib
+import json
+import time
+import types
+
+import httpx
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+AI_SERVICE_SRC = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'ai-service', 'src'
+))
+PACKAGE = "ai_service_src"
+
+
+def load_ai_service(module: str):
+    """Завантаження модуля ai-service як пакета (src використовується й іншими сервісами)"""
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [AI_SERVICE_SRC]
+    sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+class FakeLLMClient:
+    """Клієнт з затримкою, що залежить від вакансії, та заданою кількістю відповідей 429"""
+
+    def __init__(self, model: str, rate_limited: int = 0, retry_after=None, available: bool = True,
+                 errors: int = 0, cached: bool = False):
+        self.model = model
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.available = available
+        self.errors = errors
+        self.cached = cached
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def is_available(self):
+        return self.available
+
+    def _create_job_analysis_prompt(self, job):
+        return job.get("description", "")
+
+    async def is_analysis_cached(self, job):
+        return self.cached
+
+    async def analyze_job(self, job):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(job.get("delay", 0.05))
+        finally:
+            self.in_flight -= 1
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return {"success": False, "error": "429", "model": self.model,
+                    "rate_limited": True, "retry_after": self.retry_after}
+        if self.errors:
+            self.errors -= 1
+            return {"success": False, "error": "500", "model": self.model}
+        return {"success": True, "analysis": {"title": job["title"]}, "model": self.model}
+
+
+def make_router(*providers, **config):
+    """ProviderRouter завантаженого пакета ai-service"""
+    router_module = sys.modules[f"{PACKAGE}.provider_router"]
+    return router_module.ProviderRouter(list(providers), router_module.RouterConfig(**config))
+
+
+def make_jobs(count: int, delay=lambda index: 0.05):
+    return [{"id": f"~{index}", "title": f"Job {index}", "description": "x" * 400, "delay": delay(index)}
+            for index in range(count)]
+
+
+class TestProviderBudget:
+    """Тести для бюджету токенів та backoff"""
+
+    def test_token_budget(self):
+        batch = load_ai_service("batch_analyzer")
+        now = [0.0]
+        budget = batch.ProviderBudget("openai", tokens_per_minute=6000, clock=lambda: now[0])
+        assert budget.try_acquire(5000) == 0
+        assert budget.try_acquire(2000) == pytest.approx(10.0)
+        now[0] = 10.0
+        assert budget.try_acquire(2000) == 0
+        # Виклик більший за бюджет чекає на повний бюджет, а не вічно
+        assert budget.try_acquire(10 ** 6) == pytest.approx(60.0)
+
+    def test_adaptive_backoff(self):
+        batch = load_ai_service("batch_analyzer")
+        now = [0.0]
+        budget = batch.ProviderBudget("claude", backoff_base=1.0, backoff_max=4.0, clock=lambda: now[0])
+        assert budget.try_acquire(10 ** 6) == 0
+
+        assert [budget.on_rate_limit() for _ in range(4)] == [1.0, 2.0, 4.0, 4.0]
+        assert budget.on_rate_limit(retry_after=9) == 9
+        assert budget.try_acquire(1) == pytest.approx(9.0)
+
+        budget.on_success()
+        budget.on_success()
+        assert budget.backoff == 1.0
+        budget.on_success()
+        assert budget.backoff == 0.0
+        assert budget.get_stats()["rate_limited"] == 5
+
+
+class TestBatchAnalyzer:
+    """Тести для паралельного аналізу"""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_order(self):
+        """Тест обмеженої паралельності та порядку віддачі результатів"""
+        batch = load_ai_service("batch_analyzer")
+        client = FakeLLMClient("gpt-4")
+        analyzer = batch.BatchAnalyzer(make_router(("openai", client)), concurrency=4)
+        jobs = make_jobs(12, delay=lambda index: 0.02 * (12 - index))
+
+        started = time.perf_counter()
+        unordered = [result["index"] async for result in analyzer.stream(jobs)]
+        elapsed = time.perf_counter() - started
+        ordered = [result async for result in analyzer.stream(jobs, ordered=True)]
+
+        assert client.max_in_flight == 4
+        assert sorted(unordered) == list(range(12)) and unordered != list(range(12))
+        assert [result["index"] for result in ordered] == list(range(12))
+        assert ordered[3]["job_id"] == "~3" and ordered[3]["job_title"] == "Job 3"
+        # Послідовно: ~1.56с
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_falls_back_and_retries(self):
+        """Тест що 429 переводить вакансії на іншого провайдера, а без нього - чекає backoff"""
+        batch = load_ai_service("batch_analyzer")
+        openai_client = FakeLLMClient("gpt-4", rate_limited=1, retry_after=0.2)
+        claude_client = FakeLLMClient("claude-3-sonnet")
+        analyzer = batch.BatchAnalyzer(
+            make_router(("openai", openai_client), ("claude", claude_client)),
+            concurrency=1,
+            budgets={"openai": batch.ProviderBudget("openai", backoff_base=0.05)}
+        )
+        results = [result async for result in analyzer.stream(make_jobs(2), ordered=True)]
+
+        # Перша вакансія - 429 від OpenAI і fallback, друга - до Claude, поки OpenAI на паузі
+        assert [result["model"] for result in results] == ["claude-3-sonnet", "claude-3-sonnet"]
+        assert results[0]["attempts"] == 2 and results[1]["attempts"] == 1
+        assert analyzer.get_stats()["openai"]["rate_limited"] == 1
+
+        openai_client = FakeLLMClient("gpt-4", rate_limited=2)
+        analyzer = batch.BatchAnalyzer(
+            make_router(("openai", openai_client), ("claude", FakeLLMClient("claude-3-sonnet", available=False))),
+            budgets={"openai": batch.ProviderBudget("openai", backoff_base=0.05)}
+        )
+        started = time.perf_counter()
+        result = await analyzer.analyze(0, make_jobs(1)[0])
+        assert result["success"] and result["attempts"] == 3
+        # Пауза 0.05 + 0.1 між спробами
+        assert time.perf_counter() - started >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        batch = load_ai_service("batch_analyzer")
+        analyzer = batch.BatchAnalyzer(
+            make_router(("openai", FakeLLMClient("gpt-4", rate_limited=10))),
+            max_attempts=2,
+            budgets={"openai": batch.ProviderBudget("openai", backoff_base=0.01)}
+        )
+        result = await analyzer.analyze(0, make_jobs(1)[0])
+        assert not result["success"] and result["rate_limited"] and result["attempts"] == 2
+
+        analyzer = batch.BatchAnalyzer(make_router(("openai", FakeLLMClient("gpt-4", available=False))))
+        result = await analyzer.analyze(0, make_jobs(1)[0])
+        assert not result["success"] and result["attempts"] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_shrink_backoff(self):
+        """Тест що backoff після 429 зменшують лише успішні відповіді"""
+        batch = load_ai_service("batch_analyzer")
+        budget = batch.ProviderBudget("openai", backoff_base=0.01)
+        analyzer = batch.BatchAnalyzer(
+            make_router(("openai", FakeLLMClient("gpt-4", rate_limited=1, errors=1))),
+            budgets={"openai": budget}
+        )
+
+        result = await analyzer.analyze(0, make_jobs(1)[0])
+
+        assert not result["success"] and result["attempts"] == 2
+        assert budget.backoff == 0.01
+
+    @pytest.mark.asyncio
+    async def test_cached_analysis_not_charged(self):
+        """Тест що відповіді з кешу промптів не витрачають бюджет токенів"""
+        batch = load_ai_service("batch_analyzer")
+        budget = batch.ProviderBudget("openai", tokens_per_minute=60)
+        analyzer = batch.BatchAnalyzer(
+            make_router(("openai", FakeLLMClient("gpt-4", cached=True))), budgets={"openai": budget}
+        )
+
+        started = time.perf_counter()
+        results = [result async for result in analyzer.stream(make_jobs(5))]
+
+        # Кожен виклик поза кешем забрав би весь хвилинний бюджет
+        assert all(result["success"] for result in results)
+        assert time.perf_counter() - started < 1.0
+        assert budget.stats["calls"] == 0 and budget.tokens == 60
+
+    @pytest.mark.asyncio
+    async def test_shares_router_limits_and_health(self):
+        """Тест що пакетні та одиночні виклики мають спільний ліміт провайдера і вікно вимірювань"""
+        batch = load_ai_service("batch_analyzer")
+        client = FakeLLMClient("gpt-4")
+        router = make_router(("openai", client), max_concurrency=3, hedge_enabled=False)
+        analyzer = batch.BatchAnalyzer(router, concurrency=10)
+
+        async def run_batch():
+            return [result async for result in analyzer.stream(make_jobs(6))]
+
+        batch_results, *single_results = await asyncio.gather(
+            run_batch(), *(router.call("analyze_job", job) for job in make_jobs(4))
+        )
+
+        assert client.max_in_flight == 3
+        assert all(result["success"] for result in batch_results + single_results)
+        stats = router.get_stats()["providers"]["openai"]
+        assert stats["calls"] == stats["samples"] == 10
+
+
+class TestAnalyzeMultipleEndpoint:
+    """Тести для /ai/analyze/multiple"""
+
+    def setup_app(self, monkeypatch):
+        main = load_ai_service("main")
+        batch = sys.modules[f"{PACKAGE}.batch_analyzer"]
+        client = FakeLLMClient("gpt-4")
+        monkeypatch.setattr(main.ai_service, "batch_analyzer",
+                            batch.BatchAnalyzer(make_router(("openai", client)), concurrency=10))
+        return main, client
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stream(self, monkeypatch):
+        main, client = self.setup_app(monkeypatch)
+        jobs = make_jobs(5, delay=lambda index: 0.05 * (5 - index))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://ai") as http:
+            response = await http.post("/ai/analyze/multiple?stream=ndjson", json=jobs)
+            ordered = await http.post("/ai/analyze/multiple?ordered=true", json=jobs,
+                                      headers={"Accept": "application/x-ndjson"})
+            plain = await http.post("/ai/analyze/multiple", json=jobs)
+            invalid = await http.post("/ai/analyze/multiple?stream=xml", json=jobs)
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["index"] for event in events[:-1]] == [4, 3, 2, 1, 0]
+        assert events[-1]["event"] == "done" and events[-1]["succeeded"] == 5
+
+        events = [json.loads(line) for line in ordered.text.splitlines()]
+        assert [event["index"] for event in events[:-1]] == [0, 1, 2, 3, 4]
+
+        body = plain.json()
+        assert body["success"] and body["total_jobs"] == 5
+        assert [result["job_id"] for result in body["results"]] == ["~0", "~1", "~2", "~3", "~4"]
+        assert invalid.status_code == 400
+        assert client.max_in_flight == 5
+
+    @pytest.mark.asyncio
+    async def test_sse_stream(self, monkeypatch):
+        main, _ = self.setup_app(monkeypatch)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://ai") as http:
+            response = await http.post("/ai/analyze/multiple", json=make_jobs(2),
+                                       headers={"Accept": "text/event-stream"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = response.text.strip().split("\n\n")
+        assert [block.split("\n")[0] for block in blocks] == ["event: result", "event: result", "event: done"]
+        assert json.loads(blocks[0].split("\n")[1][len("data: "):])["success"]
@@ -0,0 +1,210 @@
+"""
+Тести для кешу відповідей LLM ai-service
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import importlib
+import json
+import time
+import types
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.config.settings import settings
+
+AI_SERVICE_SRC = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'ai-service', 'src'
+))
+PACKAGE = "ai_service_src"
+
+ANALYSIS = json.dumps({"complexity_score": 4, "success_probability": 0.7})
+
+
+def load_ai_service(module: str):
+    """Завантаження модуля ai-service як пакета (src використовується й іншими сервісами)"""
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [AI_SERVICE_SRC]
+    sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+class CountingModel:
+    """Замінник виклику моделі з лічильником"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    async def __call__(self, prompt, timeout=None, temperature=0.7):
+        self.calls.append((prompt, temperature))
+        await asyncio.sleep(self.delay)
+        return ANALYSIS
+
+
+class TestPromptKey:
+    """Тести для ключа кешу"""
+
+    def test_normalized_prompts_share_key(self):
+        cache = load_ai_service("prompt_cache")
+        key = cache.prompt_key("gpt-4", "Назва: API\n  Опис:   REST  \n\n\nБюджет: $100", 0)
+        assert key == cache.prompt_key("gpt-4", "  Назва: API\nОпис: REST\nБюджет: $100\n", 0.0)
+        assert key != cache.prompt_key("gpt-4", "Назва: API\nОпис: REST\nБюджет: $200", 0)
+        assert key != cache.prompt_key("claude-3", "Назва: API\nОпис: REST\nБюджет: $100", 0)
+        assert key != cache.prompt_key("gpt-4", "Назва: API\nОпис: REST\nБюджет: $100", 0.7)
+        assert key != cache.prompt_key("gpt-4", "Назва: API\nОпис: REST\nБюджет: $100", 0, system="інший")
+
+
+class TestPromptCache:
+    """Тести для рівнів кешу"""
+
+    @pytest.mark.asyncio
+    async def test_memory_lru_and_ttl(self):
+        cache = load_ai_service("prompt_cache")
+        tier = cache.MemoryTier(max_entries=2)
+        tier.set("a", "1", time.time() + 60)
+        tier.set("b", "2", time.time() + 60)
+        assert tier.get("a") == "1"
+        tier.set("c", "3", time.time() + 60)
+        assert tier.get("b") is None and tier.get("a") == "1"
+        tier.set("d", "4", time.time() - 1)
+        assert tier.get("d") is None
+
+    def test_default_cache_creates_no_files(self, tmp_path, monkeypatch):
+        """Тест що без явного налаштування кеш не створює файлів у робочій директорії"""
+        monkeypatch.chdir(tmp_path)
+        cache = load_ai_service("prompt_cache")
+
+        assert cache.get_prompt_cache().get_stats()["backend"] == "memory"
+        assert os.listdir(tmp_path) == []
+        cache.close_prompt_cache()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_tier_survives_restart(self, tmp_path):
+        """Тест що відповіді з SQLite переживають новий процес і піднімаються в пам'ять"""
+        cache = load_ai_service("prompt_cache")
+        path = str(tmp_path / "cache" / "prompts.sqlite3")
+        model = CountingModel()
+
+        first = cache.PromptCache(persistent=cache.SQLiteTier(path))
+        assert await first.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt")) == ANALYSIS
+        await first.set("expired", "old", ttl=-1)
+        first.close()
+
+        second = cache.PromptCache(persistent=cache.SQLiteTier(path))
+        assert await second.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt")) == ANALYSIS
+        assert await second.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt")) == ANALYSIS
+        assert await second.get("expired") is None
+        second.close()
+
+        assert len(model.calls) == 1
+        stats = second.get_stats()
+        assert stats["backend"] == "SQLiteTier"
+        assert stats["persistent_hits"] == 1 and stats["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_and_errors(self):
+        """Тест що конкурентні промахи дають один виклик, а помилки не кешуються"""
+        cache = load_ai_service("prompt_cache")
+        prompt_cache = cache.PromptCache()
+        model = CountingModel(delay=0.05)
+        results = await asyncio.gather(*(
+            prompt_cache.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt")) for _ in range(5)
+        ))
+        assert results == [ANALYSIS] * 5
+        assert len(model.calls) == 1
+        assert prompt_cache.get_stats()["coalesced"] == 4
+
+        async def failing():
+            raise RuntimeError("429")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await prompt_cache.get_or_call("gpt-4", "other", 0, failing)
+        assert prompt_cache.stats["stores"] == 1
+
+        disabled = cache.PromptCache(enabled=False)
+        await disabled.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt"))
+        await disabled.get_or_call("gpt-4", "prompt", 0, lambda: model("prompt"))
+        assert len(model.calls) == 3
+
+
+class TestCachedClients:
+    """Тести для кешованих викликів клієнтів"""
+
+    @pytest.fixture
+    def configured(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-openai-key")
+        monkeypatch.setattr(settings, "CLAUDE_API_KEY", "test-claude-key")
+        monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "sqlite")
+        monkeypatch.setattr(settings, "LLM_CACHE_SQLITE_PATH", str(tmp_path / "prompts.sqlite3"))
+
+    @pytest.mark.asyncio
+    async def test_repeated_analysis_served_from_cache(self, configured, monkeypatch):
+        """Тест що повторний аналіз тієї самої вакансії не викликає модель і займає кілька мс"""
+        main = load_ai_service("main")
+        model = CountingModel(delay=0.05)
+        monkeypatch.setattr(main.ai_service.openai_client, "_call_gpt4", model)
+        # Лише один провайдер, щоб роутер не розподіляв виклики
+        monkeypatch.setattr(main.ai_service.claude_client, "client", None)
+        job = {"title": "FastAPI backend", "description": "Build a REST API", "skills": ["python"]}
+        repost = {**job, "description": "Build a REST API  "}
+
+        first = await main.ai_service.analyze_job(job)
+        started = time.perf_counter()
+        for _ in range(100):
+            again = await main.ai_service.analyze_job(repost)
+        per_call = (time.perf_counter() - started) / 100
+        proposal = await main.ai_service.openai_client.generate_proposal(job, {"skills": ["python"]})
+
+        assert first["success"] and again["analysis"]["complexity_score"] == 4
+        # Аналіз - детермінований і кешований, пропозиція - завжди до моделі
+        assert model.calls[0][1] == settings.LLM_ANALYSIS_TEMPERATURE
+        assert len(model.calls) == 2 and model.calls[1][1] == 0.7
+        assert proposal["success"]
+        # Модель відповідає за 50 мс; запас на роутер і завантажену машину
+        assert per_call < 0.005
+
+        status = main.ai_service.get_service_status()["prompt_cache"]
+        assert status["memory_hits"] == 100 and status["misses"] == 1
+        assert status["hit_rate"] > 0.99
+        main.close_prompt_cache()
+
+    @pytest.mark.asyncio
+    async def test_connection_test_bypasses_cache(self, configured, monkeypatch):
+        """Тест що /ai/test щоразу звертається до моделі, а не до кешу"""
+        main = load_ai_service("main")
+        openai_model, claude_model = CountingModel(), CountingModel()
+        monkeypatch.setattr(main.ai_service.openai_client, "_call_gpt4", openai_model)
+        monkeypatch.setattr(main.ai_service.claude_client, "_call_claude", claude_model)
+
+        for _ in range(3):
+            result = await main.ai_service.test_connection()
+
+        assert result["openai_test"]["success"] and result["claude_test"]["success"]
+        assert len(openai_model.calls) == len(claude_model.calls) == 3
+        assert main.ai_service.get_service_status()["prompt_cache"]["stores"] == 0
+        main.close_prompt_cache()
+
+    @pytest.mark.asyncio
+    async def test_is_analysis_cached(self, configured, monkeypatch):
+        main = load_ai_service("main")
+        client = main.ai_service.claude_client
+        monkeypatch.setattr(client, "_call_claude", CountingModel())
+        job = {"title": "FastAPI backend", "description": "Build a REST API"}
+
+        assert not await client.is_analysis_cached(job)
+        await client.analyze_job(job)
+        assert await client.is_analysis_cached(job)
+        assert not await main.ai_service.openai_client.is_analysis_cached(job)
+        assert main.ai_service.get_service_status()["prompt_cache"]["memory_hits"] == 0
+        main.close_prompt_cache()
@@ -0,0 +1,220 @@
+"""
+Тести для потокової генерації пропозицій ai-service
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import importlib
+import json
+import time
+import types
+
+import httpx
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+AI_SERVICE_SRC = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'ai-service', 'src'
+))
+PACKAGE = "ai_service_src"
+
+PROPOSAL = {
+    "proposal_text": "Вітаю!\nМаю досвід з \"FastAPI\" та REST API.",
+    "estimated_hours": 40,
+    "proposed_rate": "$50/год",
+    "timeline": "2 тижні",
+    "key_points": ["FastAPI", "PostgreSQL, Redis"],
+    "questions": ["Чи є {специфікація}?"]
+}
+
+
+def load_ai_service(module: str):
+    """Завантаження модуля ai-service як пакета (src використовується й іншими сервісами)"""
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [AI_SERVICE_SRC]
+    sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+def split(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class FakeStreamingProvider:
+    """Клієнт провайдера, що віддає відповідь фрагментами із затримкою"""
+
+    def __init__(self, model: str, chunks, delay: float = 0.02, fail_after: int = None, available: bool = True):
+        self.MODEL_NAME = model
+        self.chunks = chunks
+        self.delay = delay
+        self.fail_after = fail_after
+        self.available = available
+        self.calls = 0
+
+    def is_available(self):
+        return self.available
+
+    async def stream_proposal(self, job_data, user_profile, template=None):
+        self.calls += 1
+        for index, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and index == self.fail_after:
+                raise Exception(f"{self.MODEL_NAME} down")
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+class TestProposalStreamParser:
+    """Тести для інкрементального розбору відповіді"""
+
+    def collect(self, parser, chunks):
+        events = []
+        for chunk in chunks:
+            events.extend(parser.feed(chunk))
+        return events
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_json_sections_for_any_chunking(self, size):
+        parser = load_ai_service("proposal_stream").ProposalStreamParser()
+        text = "```json\n" + json.dumps(PROPOSAL, ensure_ascii=False, indent=2) + "\n```"
+        events = self.collect(parser, split(text, size))
+
+        deltas = "".join(event["text"] for event in events if event["event"] == "delta"
+                         and event["section"] == "proposal_text")
+        sections = {event["section"]: event["value"] for event in events if event["event"] == "section"}
+        assert deltas == PROPOSAL["proposal_text"]
+        assert sections == PROPOSAL
+        assert parser.result() == PROPOSAL
+
+    def test_unicode_escapes_and_truncated_response(self):
+        parser = load_ai_service("proposal_stream").ProposalStreamParser()
+        events = self.collect(parser, ['{"proposal_text": "\\u0412\\u0456', 'таю", "timeline": "1 ти'])
+
+        assert "".join(event["text"] for event in events if event["event"] == "delta") == "Вітаю1 ти"
+        assert events[-2] == {"event": "section", "section": "proposal_text", "value": "Вітаю"}
+        # Обірвана відповідь: завершені поля та значення за замовчуванням
+        result = parser.result()
+        assert result["proposal_text"] == "Вітаю" and result["timeline"] == "Не вказано"
+
+    def test_plain_text_response(self):
+        parser = load_ai_service("proposal_stream").ProposalStreamParser()
+        events = self.collect(parser, ["\n  ", "Вітаю! ", "Готовий почати."])
+        assert [event["text"] for event in events] == ["Вітаю! ", "Готовий почати."]
+        assert parser.result()["proposal_text"] == "Вітаю! Готовий почати."
+
+
+class TestProposalStreaming:
+    """Тести для потокової генерації через роутер"""
+
+    def setup_generator(self, monkeypatch, openai_client, claude_client, analysis_delay: float = 0.05):
+        main = load_ai_service("main")
+        router_module = sys.modules[f"{PACKAGE}.provider_router"]
+        ai_service = main.proposal_generator.ai_service
+        monkeypatch.setattr(ai_service, "router", router_module.ProviderRouter(
+            [("openai", openai_client), ("claude", claude_client)],
+            router_module.RouterConfig(min_samples=3)
+        ))
+
+        async def analyze_job(job_data):
+            await asyncio.sleep(analysis_delay)
+            return {"success": True, "analysis": {"complexity_score": 6}}
+
+        monkeypatch.setattr(ai_service, "analyze_job", analyze_job)
+        return main
+
+    @pytest.mark.asyncio
+    async def test_first_token_before_full_completion(self, monkeypatch):
+        """Тест що перший фрагмент тексту надходить за час першого токена, а не всієї відповіді"""
+        chunks = split(json.dumps(PROPOSAL, ensure_ascii=False), 8)
+        openai_client = FakeStreamingProvider("gpt-4", chunks)
+        main = self.setup_generator(monkeypatch, openai_client, FakeStreamingProvider("claude", chunks))
+        job = {"title": "API", "description": "FastAPI backend"}
+
+        started = time.perf_counter()
+        first_delta = None
+        events = []
+        async for event in main.proposal_generator.stream_proposal(job, {"skills": ["python"]}):
+            if first_delta is None and event["event"] == "delta":
+                first_delta = time.perf_counter() - started
+            events.append(event)
+        total = time.perf_counter() - started
+
+        assert events[0]["event"] == "start" and events[0]["template_type"] == "technical"
+        assert first_delta < 0.1 and total > 0.02 * len(chunks)
+        assert [event["analysis"] for event in events if event["event"] == "analysis"] == [{"complexity_score": 6}]
+
+        done = events[-1]
+        assert done["event"] == "done" and done["success"] and done["model"] == "gpt-4"
+        assert done["proposal"]["content"] == PROPOSAL["proposal_text"]
+        assert done["proposal"]["key_points"] == PROPOSAL["key_points"]
+        assert done["analysis"] == {"complexity_score": 6}
+
+    @pytest.mark.asyncio
+    async def test_fails_over_only_before_first_token(self, monkeypatch):
+        chunks = split(json.dumps(PROPOSAL, ensure_ascii=False), 20)
+        openai_client = FakeStreamingProvider("gpt-4", chunks, fail_after=0)
+        claude_client = FakeStreamingProvider("claude", chunks)
+        main = self.setup_generator(monkeypatch, openai_client, claude_client)
+
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "done" and events[-1]["model"] == "claude"
+        stats = main.proposal_generator.ai_service.get_service_status()["router"]["providers"]
+        assert stats["openai"]["errors"] == 1
+
+        # Після першого фрагмента перемикання неможливе - клієнт отримує помилку
+        openai_client.fail_after = claude_client.fail_after = 2
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "error"
+        assert claude_client.calls + openai_client.calls == 3
+
+        # Жоден провайдер не віддав тексту - базова пропозиція з шаблону
+        openai_client.fail_after = claude_client.fail_after = 0
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "done" and events[-1]["fallback"]
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_is_a_failure(self, monkeypatch):
+        """Тест що потік без тексту переходить на іншого провайдера, а без нього - на шаблон"""
+        chunks = split(json.dumps(PROPOSAL, ensure_ascii=False), 20)
+        openai_client = FakeStreamingProvider("gpt-4", [])
+        claude_client = FakeStreamingProvider("claude", chunks)
+        main = self.setup_generator(monkeypatch, openai_client, claude_client)
+
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "done" and events[-1]["model"] == "claude"
+        assert events[-1]["proposal"]["content"] == PROPOSAL["proposal_text"]
+        stats = main.proposal_generator.ai_service.get_service_status()["router"]["providers"]
+        assert stats["openai"]["errors"] == 1 and stats["claude"]["errors"] == 0
+
+        # Обидва провайдери без тексту пропозиції - базова пропозиція з шаблону
+        openai_client.chunks = claude_client.chunks = ['{"proposal_text": "  ", "timeline": "1 тиждень"}']
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "done" and events[-1]["fallback"]
+        claude_client.chunks = []
+        events = [event async for event in main.proposal_generator.stream_proposal({"title": "API"}, {})]
+        assert events[-1]["event"] == "done" and events[-1]["fallback"]
+
+    @pytest.mark.asyncio
+    async def test_sse_endpoint(self, monkeypatch):
+        chunks = split(json.dumps(PROPOSAL, ensure_ascii=False), 16)
+        main = self.setup_generator(
+            monkeypatch, FakeStreamingProvider("gpt-4", chunks, delay=0.0), FakeStreamingProvider("claude", chunks)
+        )
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://ai") as http:
+            response = await http.post("/ai/generate/proposal/stream", json={"job_data": {"title": "API", "description": "REST"}})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+        blocks = response.text.strip().split("\n\n")
+        names = [block.split("\n")[0][len("event: "):] for block in blocks]
+        assert names[0] == "start" and names[-1] == "done"
+        assert {"delta", "section", "analysis"} <= set(names)
+        done = json.loads(blocks[-1].split("\n")[1][len("data: "):])
+        assert done["proposal"]["timeline"] == PROPOSAL["timeline"]
@@ -0,0 +1,191 @@
+"""
+Тести для роутера LLM провайдерів ai-service
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import importlib
+import time
+import types
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+AI_SERVICE_SRC = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'ai-service', 'src'
+))
+PACKAGE = "ai_service_src"
+
+
+def load_ai_service(module: str):
+    """Завантаження модуля ai-service як пакета (src використовується й іншими сервісами)"""
+    for name in [name for name in sys.modules if name == PACKAGE or name.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [AI_SERVICE_SRC]
+    sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{module}")
+
+
+class FakeProvider:
+    """Клієнт провайдера з налаштовуваною затримкою та помилками"""
+
+    def __init__(self, model: str, delay: float = 0.01, fail: bool = False, available: bool = True):
+        self.model = model
+        self.delay = delay
+        self.fail = fail
+        self.available = available
+        self.calls = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def is_available(self):
+        return self.available
+
+    async def generate_proposal(self, job_data, user_profile, template=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if self.fail:
+            return {"success": False, "error": f"{self.model} down", "model": self.model}
+        return {"success": True, "proposal": {"proposal_text": "..."}, "model": self.model}
+
+
+def make_router(router_module, openai_client, claude_client, **config):
+    options = {"min_samples": 3, "hedge_delay": 0.2, "hedge_min_delay": 0.05}
+    options.update(config)
+    return router_module.ProviderRouter(
+        [("openai", openai_client), ("claude", claude_client)],
+        router_module.RouterConfig(**options)
+    )
+
+
+class TestProviderRouter:
+    """Тести для вибору провайдера, failover та hedging"""
+
+    @pytest.mark.asyncio
+    async def test_routes_to_fastest_healthy_provider(self):
+        router_module = load_ai_service("provider_router")
+        openai_client, claude_client = FakeProvider("gpt-4"), FakeProvider("claude")
+        router = make_router(router_module, openai_client, claude_client, hedge_enabled=False)
+
+        for name, latency, success in [("openai", 0.4, True)] * 3 + [("claude", 0.1, True)] * 3:
+            next(p for p in router.providers if p.name == name).record(latency, success)
+        assert router.get_stats()["order"] == ["claude", "openai"]
+        assert (await router.call("generate_proposal", {}, {}))["model"] == "claude"
+
+        # Помилки роблять провайдера нездоровим незалежно від швидкості
+        for _ in range(6):
+            router.providers[1].record(0.05, False)
+        assert router.get_stats()["order"] == ["openai", "claude"]
+        assert not router.get_stats()["providers"]["claude"]["healthy"]
+
+        claude_client.available = False
+        assert router.get_stats()["order"] == ["openai"]
+        openai_client.available = False
+        assert await router.call("generate_proposal", {}, {}) is None
+
+    @pytest.mark.asyncio
+    async def test_old_samples_expire(self):
+        router_module = load_ai_service("provider_router")
+        now = [0.0]
+        router = router_module.ProviderRouter(
+            [("openai", FakeProvider("gpt-4")), ("claude", FakeProvider("claude"))],
+            router_module.RouterConfig(min_samples=1, max_sample_age=60),
+            clock=lambda: now[0]
+        )
+        router.providers[0].record(5.0, True)
+        router.providers[1].record(1.0, True)
+        assert router.get_stats()["order"] == ["claude", "openai"]
+        now[0] = 61.0
+        # Без свіжих вимірювань провайдер знову пробується першим
+        assert router.get_stats()["order"] == ["openai", "claude"]
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_provider(self):
+        """Тест що повільний виклик дублюється іншим провайдером і береться перша відповідь"""
+        router_module = load_ai_service("provider_router")
+        openai_client, claude_client = FakeProvider("gpt-4", delay=2.0), FakeProvider("claude", delay=0.05)
+        router = make_router(router_module, openai_client, claude_client)
+
+        started = time.perf_counter()
+        result = await router.call("generate_proposal", {}, {})
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0)
+
+        assert result["model"] == "claude"
+        assert 0.2 <= elapsed < 0.5
+        assert openai_client.cancelled == 1
+        stats = router.get_stats()["providers"]
+        assert stats["openai"]["hedged"] == 1 and stats["claude"]["hedge_wins"] == 1
+        assert stats["openai"]["cancelled"] == 1 and stats["openai"]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fails_over_without_waiting(self):
+        router_module = load_ai_service("provider_router")
+        openai_client = FakeProvider("gpt-4", delay=0.01, fail=True)
+        claude_client = FakeProvider("claude", delay=0.01)
+        router = make_router(router_module, openai_client, claude_client, hedge_delay=5.0)
+
+        started = time.perf_counter()
+        result = await router.call("generate_proposal", {}, {})
+        assert result["model"] == "claude"
+        assert time.perf_counter() - started < 0.2
+
+        claude_client.fail = True
+        result = await router.call("generate_proposal", {}, {})
+        assert not result["success"] and result["error"] == "claude down"
+        assert router.get_stats()["providers"]["openai"]["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrency_per_provider(self):
+        router_module = load_ai_service("provider_router")
+        openai_client = FakeProvider("gpt-4", delay=0.05)
+        router = make_router(
+            router_module, openai_client, FakeProvider("claude", available=False),
+            max_concurrency=2, hedge_enabled=False
+        )
+        results = await asyncio.gather(*(router.call("generate_proposal", {}, {}) for _ in range(6)))
+        assert all(result["success"] for result in results)
+        assert openai_client.max_in_flight == 2
+
+
+class TestAIServiceRouting:
+    """Тести для AIService поверх роутера"""
+
+    @pytest.mark.asyncio
+    async def test_degraded_vendor_tail_latency(self, monkeypatch):
+        """Тест що деградація одного провайдера не збільшує хвіст затримки генерації пропозицій"""
+        main = load_ai_service("main")
+        router_module = sys.modules[f"{PACKAGE}.provider_router"]
+        openai_client, claude_client = FakeProvider("gpt-4", delay=1.5), FakeProvider("claude", delay=0.05)
+        monkeypatch.setattr(main.ai_service, "router", make_router(router_module, openai_client, claude_client))
+
+        latencies = []
+        for _ in range(12):
+            started = time.perf_counter()
+            result = await main.ai_service.generate_proposal({"title": "API"}, {"skills": ["python"]})
+            latencies.append(time.perf_counter() - started)
+            assert result["success"] and result["model"] == "claude"
+
+        # Перші виклики чекають на поріг hedging, далі роутер одразу обирає Claude
+        assert max(latencies) < 0.5
+        assert sorted(latencies)[len(latencies) // 2] < 0.1
+        assert main.ai_service.get_service_status()["router"]["order"][0] == "claude"
+
+        openai_client.available = claude_client.available = False
+        result = await main.ai_service.generate_proposal({"title": "API"}, {})
+        assert not result["success"] and result["model"] == "none"
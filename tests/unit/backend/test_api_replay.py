@@ -0,0 +1,146 @@
+"""
+Тести для запису та відтворення викликів Upwork API
+"""
+
+import pytest
+import sys
+import os
+import random
+
+import httpx
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from api_replay import (
+    CallRecorder, RecordingTransport, ReplayTransport, load_recording, parse_latency, request_key
+)
+from upwork_client import TokenBucket, UpworkAPIClient, UpworkRateLimitError
+
+
+def upwork_handler(request: httpx.Request) -> httpx.Response:
+    """Stub Upwork API для запису"""
+    if request.url.path.endswith("/search"):
+        return httpx.Response(200, json={"jobs": [{"id": "~1"}], "query": request.url.params.get("q")})
+    return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+
+
+def make_client(transport: httpx.AsyncBaseTransport, **kwargs) -> UpworkAPIClient:
+    """Клієнт з власним транспортом та необмеженим rate limiter"""
+    return UpworkAPIClient(
+        "secret-token",
+        http_client=httpx.AsyncClient(transport=transport),
+        limiter=TokenBucket(rate=1e6, capacity=1e6),
+        max_retries=0,
+        **kwargs
+    )
+
+
+class TestRecording:
+    """Тести для запису викликів"""
+
+    @pytest.mark.asyncio
+    async def test_record_and_replay_roundtrip(self, tmp_path):
+        """Тест що записані відповіді відтворюються без мережі"""
+        path = str(tmp_path / "calls.jsonl.gz")
+        recorder = CallRecorder(path)
+        client = make_client(RecordingTransport(httpx.MockTransport(upwork_handler), recorder))
+        live_search = await client.search_jobs("python", {"budget": 100})
+        live_job = await client.get_job_details("~42")
+        await client.http_client.aclose()
+
+        entries = load_recording(path)
+        assert [entry["key"] for entry in entries] == [
+            "GET /api/v3/jobs/search?budget=100&q=python",
+            "GET /api/v3/jobs/~42"
+        ]
+        assert all("secret-token" not in str(entry) for entry in entries)
+        assert entries[0]["elapsed_ms"] >= 0
+
+        replay = ReplayTransport(entries, latency="none")
+        client = make_client(replay)
+        assert await client.search_jobs("python", {"budget": 100}) == live_search
+        assert await client.get_job_details("~42") == live_job
+        assert replay.get_stats()["replayed"] == 2
+
+    def test_request_key_ignores_host_and_param_order(self):
+        first = request_key("get", httpx.URL("https://a.example/x?b=2&a=1"))
+        assert first == request_key("GET", httpx.URL("http://localhost/x?a=1&b=2")) == "GET /x?a=1&b=2"
+
+
+class TestReplay:
+    """Тести для відтворення із затримкою та помилками"""
+
+    ENTRIES = [
+        {"key": "GET /jobs/~1", "status": 200, "headers": {"content-type": "application/json"},
+         "body": '{"id": "~1", "v": 1}', "elapsed_ms": 200.0},
+        {"key": "GET /jobs/~1", "status": 200, "headers": {"content-type": "application/json"},
+         "body": '{"id": "~1", "v": 2}', "elapsed_ms": 100.0},
+    ]
+
+    async def run(self, transport, count=40):
+        outcomes = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://upwork") as client:
+            for _ in range(count):
+                response = await client.get("/jobs/~1")
+                outcomes.append(response.status_code)
+        return outcomes
+
+    @pytest.mark.asyncio
+    async def test_recorded_latency_and_rotation(self):
+        """Тест записаної затримки з множником та відтворення записів по колу"""
+        delays = []
+
+        async def sleep(seconds):
+            delays.append(seconds)
+
+        transport = ReplayTransport(self.ENTRIES, latency="recorded:0.5", sleep=sleep)
+        async with httpx.AsyncClient(transport=transport, base_url="http://upwork") as client:
+            bodies = [(await client.get("/jobs/~1")).json()["v"] for _ in range(3)]
+            missing = await client.get("/jobs/~2?x=1")
+
+        assert bodies == [1, 2, 1]
+        assert delays == [0.1, 0.05, 0.1]
+        assert missing.status_code == 404
+        assert transport.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_injection_is_deterministic(self):
+        """Тест що 429 та 5xx інжектуються в заданій частці і однаково для того самого seed"""
+        async def sleep(seconds):
+            pass
+
+        def make(seed):
+            return ReplayTransport(self.ENTRIES, latency="lognormal:0.2:0.5", error_rate=0.2,
+                                   rate_limit_rate=0.3, retry_after=2, seed=seed, sleep=sleep)
+
+        first = await self.run(make(7), count=400)
+        second = await self.run(make(7), count=400)
+        other = await self.run(make(8), count=400)
+
+        assert first == second
+        assert first != other
+        assert 0.2 < first.count(429) / 400 < 0.4
+        assert 0.1 < first.count(503) / 400 < 0.3
+
+    @pytest.mark.asyncio
+    async def test_client_sees_retry_after(self):
+        """Тест що клієнт отримує Retry-After з інжектованої 429"""
+        client = make_client(ReplayTransport(self.ENTRIES, latency="none", rate_limit_rate=1.0, retry_after=3),
+                             base_url="http://upwork")
+        with pytest.raises(UpworkRateLimitError) as error:
+            await client._make_request("GET", "/jobs/~1")
+        assert error.value.retry_after == 3
+
+    def test_parse_latency(self):
+        rng = random.Random(0)
+        assert parse_latency("recorded")(rng, 0.3) == 0.3
+        assert parse_latency("constant:0.25")(rng, 5) == 0.25
+        assert 0.1 <= parse_latency("uniform:0.1:0.2")(rng, 0) <= 0.2
+        assert parse_latency("lognormal:0.2:0.5")(rng, 0) > 0
+        for spec in ("gaussian:1", "uniform:1", "constant:x", "lognormal:0:1"):
+            with pytest.raises(ValueError):
+                parse_latency(spec)
@@ -0,0 +1,158 @@
+"""
+Тести для асинхронного шляху DatabaseManager (AsyncEngine, get_async_db)
+"""
+
+import asyncio
+import inspect
+import pytest
+import sys
+import os
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import Column, Integer, String, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import declarative_base
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+pytest.importorskip("aiosqlite")
+
+from shared.database.connection import (
+    DatabaseManager, build_async_database_url, get_async_db, get_db
+)
+
+TestBase = declarative_base()
+
+
+class AsyncItem(TestBase):
+    """Тестова модель"""
+    __tablename__ = "async_items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+
+class TestAsyncDatabaseUrl:
+    """Тести для build_async_database_url"""
+
+    @pytest.mark.parametrize("url,expected", [
+        ("postgresql://user:secret@db:5432/app", "postgresql+asyncpg://user:secret@db:5432/app"),
+        ("postgresql+psycopg2://user@db/app", "postgresql+asyncpg://user@db/app"),
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("postgresql+asyncpg://user@db/app", "postgresql+asyncpg://user@db/app"),
+    ])
+    def test_driver_mapping(self, url, expected):
+        """Тест заміни драйвера на асинхронний"""
+        assert build_async_database_url(url) == expected
+
+
+class TestAsyncSessions:
+    """Тести асинхронних сесій"""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        """Менеджер БД з in-memory SQLite"""
+        monkeypatch.setattr("shared.database.connection.settings.DATABASE_ASYNC_URL", "sqlite+aiosqlite:///:memory:")
+        return DatabaseManager()
+
+    async def create_tables(self, manager):
+        """Створення тестових таблиць"""
+        async with manager.async_engine.begin() as conn:
+            await conn.run_sync(TestBase.metadata.create_all)
+
+    def test_dependencies_are_generators(self):
+        """Тест: FastAPI розпізнає залежності як генератори (сесія закривається)"""
+        assert inspect.isgeneratorfunction(get_db)
+        assert inspect.isasyncgenfunction(get_async_db)
+
+    @pytest.mark.asyncio
+    async def test_async_engine_available(self, manager):
+        """Тест підключення через aiosqlite"""
+        assert manager.async_engine is not None
+        assert await manager.test_async_connection()
+
+    @pytest.mark.asyncio
+    async def test_session_roundtrip(self, manager):
+        """Тест запису та читання через AsyncSession"""
+        await self.create_tables(manager)
+        async for db in manager.get_async_db():
+            db.add(AsyncItem(name="first"))
+            await db.commit()
+
+        async for db in manager.get_async_db():
+            items = (await db.scalars(select(AsyncItem))).all()
+            assert [item.name for item in items] == ["first"]
+
+    @pytest.mark.asyncio
+    async def test_fastapi_dependency(self, manager):
+        """Тест використання get_async_db як FastAPI залежності"""
+        await self.create_tables(manager)
+        app = FastAPI()
+
+        async def override_get_async_db():
+            async for db in manager.get_async_db():
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+
+        @app.post("/items")
+        async def create_item(name: str, db: AsyncSession = Depends(get_async_db)):
+            item = AsyncItem(name=name)
+            db.add(item)
+            await db.commit()
+            return {"id": item.id}
+
+        @app.get("/items/count")
+        async def count_items(db: AsyncSession = Depends(get_async_db)):
+            return {"count": await db.scalar(select(func.count()).select_from(AsyncItem))}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.post("/items", params={"name": "a"})).json() == {"id": 1}
+            await client.post("/items", params={"name": "b"})
+            assert (await client.get("/items/count")).json() == {"count": 2}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_isolated_on_file_sqlite(self, monkeypatch, tmp_path):
+        """Тест що rollback однієї сесії не скасовує commit іншої (SQLite у файлі)"""
+        monkeypatch.setattr(
+            "shared.database.connection.settings.DATABASE_ASYNC_URL",
+            f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+        )
+        manager = DatabaseManager()
+        assert not isinstance(manager.async_engine.pool, StaticPool)
+        await self.create_tables(manager)
+
+        async def write(name: str, commit: bool):
+            async with manager.AsyncSessionLocal() as db:
+                db.add(AsyncItem(name=name))
+                await db.flush()
+                await asyncio.sleep(0.05)
+                if commit:
+                    await db.commit()
+                else:
+                    await db.rollback()
+
+        await asyncio.gather(write("committed", True), write("rolled_back", False))
+
+        async with manager.AsyncSessionLocal() as db:
+            items = (await db.scalars(select(AsyncItem))).all()
+        assert [item.name for item in items] == ["committed"]
+        assert manager.get_pool_metrics()["async"]["checkouts"] >= 3
+        await manager.async_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_missing_async_engine(self):
+        """Тест помилки, якщо асинхронний драйвер недоступний"""
+        manager = DatabaseManager.__new__(DatabaseManager)
+        manager.async_engine = None
+        manager.AsyncSessionLocal = None
+
+        with pytest.raises(Exception):
+            async for _ in manager.get_async_db():
+                pass
+        assert not await manager.test_async_connection()
@@ -0,0 +1,204 @@
+"""
+Тести для кешів автентифікації (верифіковані токени та користувачі)
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import jwt
+from sqlalchemy import Boolean, Column, Integer, String, create_engine, event
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.config.settings import settings
+from shared.utils.auth_cache import (
+    TokenVerificationCache, UserCache, invalidate_user_auth_cache, token_cache, user_cache
+)
+from shared.utils.auth_middleware import AuthMiddleware
+
+TestBase = declarative_base()
+
+
+class CachedUser(TestBase):
+    """Тестова модель користувача"""
+    __tablename__ = "cached_users"
+
+    id = Column(Integer, primary_key=True)
+    email = Column(String(255))
+    is_active = Column(Boolean, default=True)
+
+
+class FakeClock:
+    """Керований годинник"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def session_factory():
+    """Сесії in-memory SQLite з лічильником запитів"""
+    engine = create_engine("sqlite:///:memory:")
+    TestBase.metadata.create_all(engine)
+    engine.queries = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: engine.queries.append(statement))
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        db.add(CachedUser(id=7, email="user@example.com", is_active=True))
+        db.commit()
+
+    engine.queries.clear()
+    return Session, engine
+
+
+def make_token(sub: str = "7", minutes: int = 30) -> str:
+    """Створення тестового JWT"""
+    return jwt.encode(
+        {"sub": sub, "exp": datetime.utcnow() + timedelta(minutes=minutes)},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+
+
+class TestTokenVerificationCache:
+    """Тести для TokenVerificationCache"""
+
+    def test_hit_until_exp(self):
+        """Тест: запис живе до exp токена"""
+        clock = FakeClock()
+        cache = TokenVerificationCache(clock=clock)
+        cache.put("token", {"sub": "1", "exp": 1010})
+
+        assert cache.get("token") == {"sub": "1", "exp": 1010}
+        clock.now = 1010
+        assert cache.get("token") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_expired_token_not_stored(self):
+        """Тест: вже застарілі claims не кешуються"""
+        cache = TokenVerificationCache(clock=FakeClock())
+        cache.put("token", {"sub": "1", "exp": 999})
+        assert cache.get("token") is None
+
+    def test_bounded_lru(self):
+        """Тест обмеження кількості записів"""
+        cache = TokenVerificationCache(max_entries=2, clock=FakeClock())
+        cache.put("a", {"sub": "1"})
+        cache.put("b", {"sub": "2"})
+        cache.get("a")
+        cache.put("c", {"sub": "3"})
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_invalidate_user(self):
+        """Тест видалення всіх токенів користувача"""
+        cache = TokenVerificationCache(clock=FakeClock())
+        cache.put("a", {"sub": "1"})
+        cache.put("b", {"sub": "1"})
+        cache.put("c", {"sub": "2"})
+
+        assert cache.invalidate_user(1) == 2
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+
+class TestUserCache:
+    """Тести для UserCache"""
+
+    def test_hit_does_not_query_database(self, session_factory):
+        """Тест: влучення приєднує користувача до сесії без запиту"""
+        Session, engine = session_factory
+        cache = UserCache(ttl=30)
+
+        with Session() as db:
+            cache.put(db.query(CachedUser).filter(CachedUser.id == 7).first())
+        engine.queries.clear()
+
+        with Session() as db:
+            user = cache.get(db, CachedUser, "7")
+            assert user in db
+            assert user.email == "user@example.com"
+            assert user.is_active
+
+        assert engine.queries == []
+
+    def test_merged_user_can_be_updated(self, session_factory):
+        """Тест: кешований користувач придатний для змін у сесії запиту"""
+        Session, _ = session_factory
+        cache = UserCache(ttl=30)
+
+        with Session() as db:
+            cache.put(db.get(CachedUser, 7))
+
+        with Session() as db:
+            user = cache.get(db, CachedUser, 7)
+            user.email = "new@example.com"
+            db.commit()
+
+        with Session() as db:
+            assert db.get(CachedUser, 7).email == "new@example.com"
+
+    def test_ttl_and_invalidation(self, session_factory):
+        """Тест завершення TTL та явної інвалідації"""
+        Session, _ = session_factory
+        clock = FakeClock()
+        cache = UserCache(ttl=30, clock=clock)
+
+        with Session() as db:
+            cache.put(db.get(CachedUser, 7))
+            assert cache.get(db, CachedUser, 7) is not None
+
+            clock.now += 31
+            assert cache.get(db, CachedUser, 7) is None
+
+            cache.put(db.get(CachedUser, 7))
+            assert cache.invalidate_user(7) == 1
+            assert cache.get(db, CachedUser, 7) is None
+
+
+class TestAuthMiddlewareCaching:
+    """Тести кешування в AuthMiddleware"""
+
+    def setup_method(self):
+        token_cache.clear()
+        user_cache.clear()
+
+    def test_signature_verified_once_per_token(self):
+        """Тест: повторна верифікація токена не викликає jwt.decode"""
+        middleware = AuthMiddleware()
+        token = make_token()
+
+        with patch("shared.utils.auth_middleware.jwt.decode", wraps=jwt.decode) as decode:
+            for _ in range(5):
+                assert middleware._verify_token(token)["sub"] == "7"
+
+        assert decode.call_count == 1
+
+    def test_invalid_token_not_cached(self):
+        """Тест: невірні токени не кешуються"""
+        middleware = AuthMiddleware()
+        for _ in range(2):
+            with pytest.raises(Exception):
+                middleware._verify_token("invalid-token")
+        assert token_cache.get_stats()["entries"] == 0
+
+    def test_logout_invalidation(self):
+        """Тест інвалідації кешів користувача (logout)"""
+        middleware = AuthMiddleware()
+        token = make_token(sub="42")
+        middleware._verify_token(token)
+
+        invalidate_user_auth_cache(42)
+
+        assert token_cache.get(token) is None
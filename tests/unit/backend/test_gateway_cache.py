@@ -0,0 +1,331 @@
+"""
+Тести для кешу відповідей API Gateway
+"""
+
+import pytest
+import asyncio
+import gc
+import sys
+import os
+import time
+import httpx
+import fakeredis
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'api-gateway'))
+
+from src.response_cache import (
+    CacheRule, CachedResponse, MemoryCacheBackend, RedisCacheBackend, ResponseCache
+)
+
+
+class CountingUpstream:
+    """Тестовий мікросервіс, що рахує запити"""
+
+    def __init__(self):
+        self.calls = 0
+        self.version = 1
+        self.app = FastAPI()
+
+        @self.app.api_route("/{path:path}", methods=["GET", "POST"])
+        async def handler(request: Request, path: str):
+            self.calls += 1
+            if path == "private":
+                return JSONResponse({"secret": True}, headers={"Cache-Control": "private"})
+            return {
+                "path": request.url.path,
+                "query": request.url.query,
+                "user": request.headers.get("authorization"),
+                "version": self.version
+            }
+
+
+def create_gateway(cache: ResponseCache, upstream: CountingUpstream) -> httpx.AsyncClient:
+    """Тестовий gateway з кешованим маршрутом"""
+    gateway = FastAPI()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream.app))
+
+    @gateway.api_route("/{path:path}", methods=["GET", "POST"])
+    async def route(request: Request, path: str):
+        return await cache.proxy(client, request, f"http://upstream/{path}")
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=gateway), base_url="http://gateway")
+
+
+@pytest.fixture
+def upstream():
+    """Лічильник запитів до мікросервісу"""
+    return CountingUpstream()
+
+
+@pytest.fixture
+def cache():
+    """Кеш з тестовими правилами"""
+    return ResponseCache(MemoryCacheBackend(), rules=[
+        CacheRule("/analytics/*", ttl=60),
+        CacheRule("/upwork/categories", ttl=60, vary_on_user=False),
+        CacheRule("/private", ttl=60),
+        CacheRule("/stale/*", ttl=0.05, stale_while_revalidate=60),
+    ])
+
+
+class TestResponseCache:
+    """Тести для ResponseCache"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_get_served_from_cache(self, cache, upstream):
+        """Тест повторного GET з кешу"""
+        gateway = create_gateway(cache, upstream)
+
+        first = await gateway.get("/analytics/dashboard")
+        second = await gateway.get("/analytics/dashboard")
+
+        assert upstream.calls == 1
+        assert first.headers["x-cache"] == "MISS"
+        assert second.headers["x-cache"] == "HIT"
+        assert first.json() == second.json()
+        assert first.headers["etag"] == second.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_query_normalization(self, cache, upstream):
+        """Тест нормалізації порядку query параметрів"""
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.get("/analytics/dashboard?b=2&a=1")
+        response = await gateway.get("/analytics/dashboard?a=1&b=2")
+
+        assert upstream.calls == 1
+        assert response.headers["x-cache"] == "HIT"
+
+    @pytest.mark.asyncio
+    async def test_cache_varies_on_user(self, cache, upstream):
+        """Тест окремих записів для різних користувачів"""
+        gateway = create_gateway(cache, upstream)
+
+        alice = await gateway.get("/analytics/dashboard", headers={"Authorization": "Bearer alice"})
+        bob = await gateway.get("/analytics/dashboard", headers={"Authorization": "Bearer bob"})
+
+        assert upstream.calls == 2
+        assert alice.json()["user"] == "Bearer alice"
+        assert bob.json()["user"] == "Bearer bob"
+
+    @pytest.mark.asyncio
+    async def test_shared_entry_when_not_varying_on_user(self, cache, upstream):
+        """Тест спільного запису для довідкових даних"""
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.get("/upwork/categories", headers={"Authorization": "Bearer alice"})
+        await gateway.get("/upwork/categories", headers={"Authorization": "Bearer bob"})
+
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_304(self, cache, upstream):
+        """Тест 304 Not Modified для збіжного ETag"""
+        gateway = create_gateway(cache, upstream)
+
+        first = await gateway.get("/analytics/dashboard")
+        response = await gateway.get("/analytics/dashboard", headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert cache.stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncached_routes_and_methods(self, cache, upstream):
+        """Тест проксування без кешу для POST та маршрутів без правил"""
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.post("/analytics/dashboard", json={})
+        await gateway.post("/analytics/dashboard", json={})
+        await gateway.get("/ai/status")
+        await gateway.get("/ai/status")
+
+        assert upstream.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_private_responses_not_cached(self, cache, upstream):
+        """Тест заборони кешування Cache-Control: private"""
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.get("/private")
+        response = await gateway.get("/private")
+
+        assert upstream.calls == 2
+        assert response.json() == {"secret": True}
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, cache, upstream):
+        """Тест віддачі застарілого запису з фоновим оновленням"""
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.get("/stale/data")
+        await asyncio.sleep(0.1)
+        upstream.version = 2
+
+        stale = await gateway.get("/stale/data")
+        assert stale.headers["x-cache"] == "STALE"
+        assert stale.json()["version"] == 1
+        # Кеш тримає посилання на фонову задачу, доки вона не завершиться
+        assert len(cache._revalidating) == 1
+        gc.collect()
+
+        await asyncio.sleep(0.05)
+        assert cache._revalidating == {}
+        refreshed = await gateway.get("/stale/data")
+        assert refreshed.json()["version"] == 2
+        assert cache.stats["revalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_passthrough(self, upstream):
+        """Тест вимкненого кешу"""
+        cache = ResponseCache(MemoryCacheBackend(), rules=[CacheRule("/analytics/*", ttl=60)], enabled=False)
+        gateway = create_gateway(cache, upstream)
+
+        await gateway.get("/analytics/dashboard")
+        await gateway.get("/analytics/dashboard")
+
+        assert upstream.calls == 2
+
+
+class TestCacheBackends:
+    """Тести для backend-ів кешу"""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_lru_eviction(self):
+        """Тест LRU витіснення"""
+        backend = MemoryCacheBackend(max_entries=2)
+        entry = CachedResponse(200, [], b"{}", '"etag"')
+
+        await backend.set("a", entry, 60)
+        await backend.set("b", entry, 60)
+        await backend.get("a")
+        await backend.set("c", entry, 60)
+
+        assert await backend.get("a") is not None
+        assert await backend.get("b") is None
+        assert len(backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_roundtrip(self):
+        """Тест збереження запису в Redis"""
+        backend = RedisCacheBackend(fakeredis.FakeRedis(decode_responses=True))
+        entry = CachedResponse(200, [("content-type", "application/json")], b'{"a": 1}', '"etag"', time.time())
+
+        await backend.set("key", entry, 60)
+        restored = await backend.get("key")
+
+        assert restored.body == entry.body
+        assert restored.headers == entry.headers
+        assert restored.etag == entry.etag
+        assert await backend.get("missing") is None
+
+
+class SlowUpstream:
+    """Тестовий мікросервіс з затримкою відповіді"""
+
+    def __init__(self, delay: float = 0.05):
+        self.calls = 0
+        self.app = FastAPI()
+
+        @self.app.get("/{path:path}")
+        async def handler(request: Request, path: str):
+            self.calls += 1
+            await asyncio.sleep(delay)
+            return {
+                "path": path,
+                "user": request.headers.get("authorization"),
+                "language": request.headers.get("accept-language")
+            }
+
+
+class TestRequestCoalescing:
+    """Тести для об'єднання конкурентних GET запитів"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_upstream_call(self):
+        """Тест одного запиту до мікросервісу для N однакових GET"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(MemoryCacheBackend(), rules=[], enabled=False, coalesce_routes=["/upwork/jobs*"])
+        gateway = create_gateway(cache, upstream)
+
+        responses = await asyncio.gather(*(gateway.get("/upwork/jobs?q=python") for _ in range(10)))
+
+        assert upstream.calls == 1
+        assert all(response.status_code == 200 for response in responses)
+        assert all(response.json() == responses[0].json() for response in responses)
+        assert cache.single_flight.stats["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_different_users_not_coalesced(self):
+        """Тест окремих запитів для різних користувачів"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(MemoryCacheBackend(), rules=[], enabled=False, coalesce_routes=["/analytics/*"])
+        gateway = create_gateway(cache, upstream)
+
+        alice, bob = await asyncio.gather(
+            gateway.get("/analytics/dashboard", headers={"Authorization": "Bearer alice"}),
+            gateway.get("/analytics/dashboard", headers={"Authorization": "Bearer bob"})
+        )
+
+        assert upstream.calls == 2
+        assert alice.json()["user"] == "Bearer alice"
+        assert bob.json()["user"] == "Bearer bob"
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_stampede_coalesced(self):
+        """Тест одного запиту до мікросервісу при одночасному промаху кешу"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(MemoryCacheBackend(), rules=[CacheRule("/analytics/*", ttl=60)])
+        gateway = create_gateway(cache, upstream)
+
+        await asyncio.gather(*(gateway.get("/analytics/overview") for _ in range(5)))
+        await gateway.get("/analytics/overview")
+
+        assert upstream.calls == 1
+        assert cache.get_stats()["coalescing"]["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_coalescing_disabled(self):
+        """Тест вимкненого об'єднання запитів"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(
+            MemoryCacheBackend(), rules=[], enabled=False, coalesce=False, coalesce_routes=["/upwork/jobs*"]
+        )
+        gateway = create_gateway(cache, upstream)
+
+        await asyncio.gather(*(gateway.get("/upwork/jobs") for _ in range(3)))
+
+        assert upstream.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_different_languages_not_coalesced(self):
+        """Тест окремих запитів для різних Accept-Language"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(MemoryCacheBackend(), rules=[CacheRule("/analytics/*", ttl=60)], enabled=False)
+        gateway = create_gateway(cache, upstream)
+
+        uk, en = await asyncio.gather(
+            gateway.get("/analytics/dashboard", headers={"Accept-Language": "uk"}),
+            gateway.get("/analytics/dashboard", headers={"Accept-Language": "en"})
+        )
+
+        assert upstream.calls == 2
+        assert uk.json()["language"] == "uk" and en.json()["language"] == "en"
+
+    @pytest.mark.asyncio
+    async def test_routes_without_rules_are_streamed(self):
+        """Тест що GET без правила кешування не буферизується і не об'єднується"""
+        upstream = SlowUpstream()
+        cache = ResponseCache(MemoryCacheBackend(), rules=[CacheRule("/analytics/*", ttl=60)])
+        gateway = create_gateway(cache, upstream)
+
+        responses = await asyncio.gather(*(gateway.get("/ai/analyze/multiple") for _ in range(3)))
+
+        assert upstream.calls == 3
+        assert all(response.status_code == 200 for response in responses)
+        assert cache.single_flight.stats == {"calls": 0, "coalesced": 0}
+        # Потокова відповідь не отримує ETag, обчислений з буферизованого тіла
+        assert "etag" not in responses[0].headers
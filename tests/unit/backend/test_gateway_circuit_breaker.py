@@ -0,0 +1,267 @@
+"""
+Тести для circuit breaker та адаптивних таймаутів API Gateway
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+import httpx
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'api-gateway'))
+
+from src.circuit_breaker import BreakerConfig, CircuitBreaker, CircuitState
+from src.upstreams import UpstreamClientRegistry, UpstreamConfig
+
+
+class FakeClock:
+    """Керований годинник"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Тести для CircuitBreaker"""
+
+    def setup_method(self):
+        """Налаштування перед кожним тестом"""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "ai",
+            BreakerConfig(failure_threshold=3, recovery_timeout=10, min_samples=5, max_timeout=30, min_timeout=0.5),
+            clock=self.clock
+        )
+
+    def test_trips_after_consecutive_failures(self):
+        """Тест розмикання після серії помилок"""
+        for _ in range(3):
+            assert self.breaker.allow_request()
+            self.breaker.record_failure()
+
+        assert self.breaker.state == CircuitState.OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.stats["trips"] == 1
+        assert self.breaker.stats["rejected"] == 1
+
+    def test_success_resets_failure_count(self):
+        """Тест скидання лічильника після успіху"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+
+        assert self.breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probe_closes_breaker(self):
+        """Тест замикання після успішної пробної спроби"""
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.clock.now += 11
+        assert self.breaker.allow_request()
+        assert self.breaker.state == CircuitState.HALF_OPEN
+        # Одночасно дозволено лише одну пробну спробу
+        assert not self.breaker.allow_request()
+
+        self.breaker.record_success(0.1)
+        assert self.breaker.state == CircuitState.CLOSED
+        assert self.breaker.allow_request()
+
+    def test_half_open_failure_reopens(self):
+        """Тест повторного розмикання після невдалої проби"""
+        for _ in range(3):
+            self.breaker.record_failure()
+
+        self.clock.now += 11
+        assert self.breaker.allow_request()
+        self.breaker.record_failure()
+
+        assert self.breaker.state == CircuitState.OPEN
+        assert self.breaker.stats["trips"] == 2
+        assert self.breaker.retry_after() == 10
+
+    def test_adaptive_timeout_from_latency(self):
+        """Тест адаптивного таймауту з перцентилів затримки"""
+        assert self.breaker.current_timeout() == 30
+
+        for _ in range(10):
+            self.breaker.record_success(0.2)
+
+        assert self.breaker.current_timeout() == pytest.approx(0.6)
+
+        for _ in range(10):
+            self.breaker.record_success(0.01)
+        assert self.breaker.current_timeout() >= 0.5
+
+    def test_stats(self):
+        """Тест статистики для /health"""
+        self.breaker.record_success(0.1)
+        stats = self.breaker.get_stats()
+
+        assert stats["state"] == "closed"
+        assert stats["latency_p50_ms"] == pytest.approx(100.0)
+        assert stats["successes"] == 1
+
+
+class FailingTransport(httpx.AsyncBaseTransport):
+    """Транспорт, що повертає 500 або відповідає з затримкою"""
+
+    def __init__(self, status_code: int = 500, delay: float = 0.0):
+        self.calls = 0
+        self.status_code = status_code
+        self.delay = delay
+
+    async def handle_async_request(self, request):
+        self.calls += 1
+        if self.delay:
+            timeout = request.extensions.get("timeout", {}).get("read")
+            if timeout is not None and timeout < self.delay:
+                await asyncio.sleep(timeout)
+                raise httpx.ReadTimeout("timed out", request=request)
+            await asyncio.sleep(self.delay)
+        return httpx.Response(self.status_code, json={})
+
+
+class RoutedTransport(httpx.AsyncBaseTransport):
+    """Транспорт із затримкою відповіді за шляхом"""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def handle_async_request(self, request):
+        delay = next(
+            (delay for path, delay in self.delays.items() if request.url.path.startswith(path)), 0.0
+        )
+        timeout = request.extensions.get("timeout", {}).get("read")
+        if timeout is not None and timeout < delay:
+            await asyncio.sleep(timeout)
+            raise httpx.ReadTimeout("timed out", request=request)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={})
+
+
+class TestUpstreamCircuitBreaker:
+    """Тести для breaker у реєстрі пулів"""
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        """Тест швидкої відмови 503 без запиту до мікросервісу"""
+        registry = UpstreamClientRegistry()
+        transport = FailingTransport(status_code=500)
+        client = registry.register(
+            UpstreamConfig(name="ai", base_url="http://ai", breaker_failure_threshold=2),
+            transport=transport
+        )
+
+        for _ in range(2):
+            assert (await client.get("http://ai/generate")).status_code == 500
+
+        response = await client.get("http://ai/generate")
+
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+        assert response.json()["circuit_breaker"] == "open"
+        assert transport.calls == 2
+
+        stats = registry.get_stats()["ai"]["circuit_breaker"]
+        assert stats["state"] == "open"
+        assert stats["trips"] == 1
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_adaptive_timeout_applied_to_requests(self):
+        """Тест обмеження таймауту читання спостережуваною затримкою"""
+        registry = UpstreamClientRegistry()
+        transport = FailingTransport(status_code=200)
+        client = registry.register(
+            UpstreamConfig(name="ai", base_url="http://ai", adaptive_timeout_min=0.05, adaptive_timeout_multiplier=2.0),
+            transport=transport
+        )
+
+        for _ in range(25):
+            await client.get("http://ai/generate")
+
+        transport.delay = 0.5
+        with pytest.raises(httpx.ReadTimeout):
+            await asyncio.wait_for(client.get("http://ai/generate"), timeout=0.4)
+
+        assert registry.get_stats()["ai"]["circuit_breaker"]["failures"] == 1
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fast_routes_do_not_shrink_slow_route_timeout(self):
+        """Тест що часті швидкі запити не зменшують таймаут повільного маршруту того ж сервісу"""
+        registry = UpstreamClientRegistry()
+        transport = RoutedTransport({"/ai/status": 0.0, "/ai/generate/proposal": 0.1, "/ai/analyze/multiple": 0.1})
+        client = registry.register(
+            UpstreamConfig(
+                name="ai", base_url="http://ai", adaptive_timeout_min=0.05, adaptive_timeout_multiplier=2.0,
+                breaker_failure_threshold=2, adaptive_timeout_exclude=["/ai/analyze/multiple"]
+            ),
+            transport=transport
+        )
+
+        for _ in range(3):
+            for _ in range(25):
+                assert (await client.get("http://ai/ai/status")).status_code == 200
+            assert (await client.post("http://ai/ai/generate/proposal")).status_code == 200
+
+        stats = registry.get_stats()["ai"]["circuit_breaker"]
+        assert stats["state"] == "closed" and stats["failures"] == 0
+        assert stats["routes"]["/ai/status"]["current_timeout_s"] == pytest.approx(0.05)
+        assert stats["routes"]["/ai/generate"]["current_timeout_s"] == 30
+
+        # Таймаут маршруту адаптується лише за його власними вимірюваннями
+        for _ in range(20):
+            await client.post("http://ai/ai/generate/proposal")
+        assert registry.get_stats()["ai"]["circuit_breaker"]["routes"]["/ai/generate"]["current_timeout_s"] >= 0.2
+
+        # Виключені та потокові маршрути зберігають налаштований read_timeout
+        for _ in range(25):
+            await client.get("http://ai/ai/analyze/other")
+        assert (await client.post("http://ai/ai/analyze/multiple")).status_code == 200
+        transport.delays["/ai/status"] = 0.1
+        response = await client.get("http://ai/ai/status", headers={"Accept": "text/event-stream"})
+        assert response.status_code == 200
+        assert registry.get_stats()["ai"]["circuit_breaker"]["failures"] == 0
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gateway_pool_exhaustion_does_not_trip_breaker(self):
+        """Тест що PoolTimeout власного пулу шлюзу не вважається відмовою сервісу"""
+        registry = UpstreamClientRegistry()
+        client = registry.register(
+            UpstreamConfig(
+                name="ai", base_url="http://ai", max_connections=1, pool_timeout=0.01, breaker_failure_threshold=2
+            ),
+            transport=FailingTransport(status_code=200, delay=0.1)
+        )
+
+        results = await asyncio.gather(*(client.get("http://ai/generate") for _ in range(4)), return_exceptions=True)
+
+        assert sum(isinstance(result, httpx.PoolTimeout) for result in results) == 3
+        stats = registry.get_stats()["ai"]
+        assert stats["circuit_breaker"]["state"] == "closed"
+        assert stats["circuit_breaker"]["failures"] == 0
+        assert (await client.get("http://ai/generate")).status_code == 200
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_breaker_can_be_disabled(self):
+        """Тест вимкненого breaker"""
+        registry = UpstreamClientRegistry()
+        client = registry.register(
+            UpstreamConfig(name="ai", base_url="http://ai", circuit_breaker=False, breaker_failure_threshold=1),
+            transport=FailingTransport(status_code=500)
+        )
+
+        for _ in range(3):
+            assert (await client.get("http://ai/generate")).status_code == 500
+
+        assert registry.get_stats()["ai"]["circuit_breaker"] is None
+        await registry.aclose()
@@ -0,0 +1,153 @@
+"""
+Тести для streaming reverse-proxy API Gateway
+"""
+
+import pytest
+import sys
+import os
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'api-gateway'))
+
+from src.proxy import proxy_request, filter_request_headers, filter_response_headers
+
+
+def create_upstream_app() -> FastAPI:
+    """Тестовий мікросервіс"""
+    upstream = FastAPI()
+
+    @upstream.api_route("/echo", methods=["GET", "POST", "PUT"])
+    async def echo(request: Request):
+        body = await request.body()
+        return Response(
+            content=body,
+            media_type=request.headers.get("content-type", "application/octet-stream"),
+            headers={"X-Upstream-Query": str(request.query_params)}
+        )
+
+    @upstream.get("/text")
+    async def text():
+        return Response(content="plain text, not json", media_type="text/plain")
+
+    @upstream.get("/cookies")
+    async def cookies():
+        response = Response(content=b"{}", media_type="application/json")
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return response
+
+    @upstream.get("/headers")
+    async def headers(request: Request):
+        return dict(request.headers)
+
+    return upstream
+
+
+def create_gateway_app(upstream: FastAPI) -> FastAPI:
+    """Тестовий gateway з одним проксі-маршрутом"""
+    gateway = FastAPI()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=upstream))
+
+    @gateway.api_route("/svc/{path:path}", methods=["GET", "POST", "PUT"])
+    async def route(request: Request, path: str):
+        return await proxy_request(client, request, f"http://upstream/{path}")
+
+    return gateway
+
+
+@pytest.fixture
+def gateway_client():
+    """HTTP клієнт для тестового gateway"""
+    gateway = create_gateway_app(create_upstream_app())
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=gateway), base_url="http://gateway")
+
+
+class TestStreamingProxy:
+    """Тести для proxy_request"""
+
+    @pytest.mark.asyncio
+    async def test_json_body_passthrough(self, gateway_client):
+        """Тест проксування JSON без зміни байтів"""
+        payload = b'{"b": 1, "a": [1, 2, 3]}'
+        response = await gateway_client.post(
+            "/svc/echo",
+            content=payload,
+            headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 200
+        assert response.content == payload
+        assert response.headers["content-type"] == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_non_json_response(self, gateway_client):
+        """Тест проксування не-JSON відповіді"""
+        response = await gateway_client.get("/svc/text")
+
+        assert response.status_code == 200
+        assert response.text == "plain text, not json"
+
+    @pytest.mark.asyncio
+    async def test_large_binary_body(self, gateway_client):
+        """Тест проксування великого бінарного тіла"""
+        payload = os.urandom(2 * 1024 * 1024)
+        response = await gateway_client.put("/svc/echo", content=payload)
+
+        assert response.status_code == 200
+        assert response.content == payload
+
+    @pytest.mark.asyncio
+    async def test_query_params_forwarded(self, gateway_client):
+        """Тест передачі query параметрів"""
+        response = await gateway_client.get("/svc/echo", params={"q": "python", "page": "2"})
+
+        assert response.headers["x-upstream-query"] == "q=python&page=2"
+
+    @pytest.mark.asyncio
+    async def test_repeated_response_headers_preserved(self, gateway_client):
+        """Тест збереження повторюваних заголовків (set-cookie)"""
+        response = await gateway_client.get("/svc/cookies")
+
+        assert len(response.headers.get_list("set-cookie")) == 2
+
+    @pytest.mark.asyncio
+    async def test_hop_by_hop_headers_not_forwarded(self, gateway_client):
+        """Тест видалення hop-by-hop заголовків"""
+        response = await gateway_client.get(
+            "/svc/headers",
+            headers={"Proxy-Authorization": "Basic c2VjcmV0", "X-Custom": "value"}
+        )
+
+        upstream_headers = response.json()
+        assert upstream_headers["x-custom"] == "value"
+        assert upstream_headers["host"] == "upstream"
+        assert "proxy-authorization" not in upstream_headers
+
+
+class TestHeaderFiltering:
+    """Тести для фільтрації заголовків"""
+
+    def test_filter_request_headers(self):
+        """Тест фільтрації заголовків запиту"""
+        headers = filter_request_headers([
+            ("host", "gateway"),
+            ("transfer-encoding", "chunked"),
+            ("authorization", "Bearer token")
+        ])
+
+        assert headers == {"authorization": "Bearer token"}
+
+    def test_filter_response_headers(self):
+        """Тест фільтрації заголовків відповіді"""
+        headers = filter_response_headers(httpx.Headers([
+            ("content-type", "application/json"),
+            ("connection", "close"),
+            ("set-cookie", "a=1"),
+            ("set-cookie", "b=2")
+        ]))
+
+        assert (b"connection", b"close") not in headers
+        assert [value for key, value in headers if key == b"set-cookie"] == [b"a=1", b"b=2"]
@@ -0,0 +1,124 @@
+"""
+Тести для реєстру пулів з'єднань API Gateway
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+import httpx
+from unittest.mock import patch
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'api-gateway'))
+
+from src.upstreams import UpstreamClientRegistry, UpstreamConfig, build_upstream_configs
+
+
+class BlockingTransport(httpx.AsyncBaseTransport):
+    """Транспорт, що відповідає лише після сигналу"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def handle_async_request(self, request):
+        await self.release.wait()
+        return httpx.Response(200, json={"ok": True})
+
+
+def instant_transport():
+    """Транспорт з миттєвою відповіддю"""
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+
+
+class TestUpstreamClientRegistry:
+    """Тести для UpstreamClientRegistry"""
+
+    @pytest.mark.asyncio
+    async def test_slow_upstream_does_not_block_others(self):
+        """Тест ізоляції пулів: повільний AI не блокує Auth"""
+        registry = UpstreamClientRegistry()
+        ai_transport = BlockingTransport()
+        ai = registry.register(
+            UpstreamConfig(name="ai", base_url="http://ai", max_connections=2, pool_timeout=5.0),
+            transport=ai_transport
+        )
+        auth = registry.register(
+            UpstreamConfig(name="auth", base_url="http://auth", max_connections=2),
+            transport=instant_transport()
+        )
+
+        pending = [asyncio.create_task(ai.get("http://ai/slow")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+
+        response = await asyncio.wait_for(auth.get("http://auth/health"), timeout=1.0)
+        assert response.status_code == 200
+
+        stats = registry.get_stats()
+        assert stats["ai"]["in_use"] == 2
+        assert stats["auth"]["in_use"] == 0
+
+        ai_transport.release.set()
+        await asyncio.gather(*pending)
+        assert registry.get_stats()["ai"]["in_use"] == 0
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pool_timeout(self):
+        """Тест таймауту очікування вільного з'єднання"""
+        registry = UpstreamClientRegistry()
+        transport = BlockingTransport()
+        client = registry.register(
+            UpstreamConfig(name="ai", base_url="http://ai", max_connections=1, pool_timeout=0.05),
+            transport=transport
+        )
+
+        blocked = asyncio.create_task(client.get("http://ai/slow"))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(httpx.PoolTimeout):
+            await client.get("http://ai/slow")
+
+        stats = registry.get_stats()["ai"]
+        assert stats["pool_timeouts"] == 1
+        assert stats["waiting"] == 0
+
+        transport.release.set()
+        await blocked
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_holds_slot_until_closed(self):
+        """Тест утримання слоту до закриття потокової відповіді"""
+        registry = UpstreamClientRegistry()
+        client = registry.register(
+            UpstreamConfig(name="upwork", base_url="http://upwork"),
+            transport=instant_transport()
+        )
+
+        async with client.stream("GET", "http://upwork/jobs") as response:
+            assert registry.get_stats()["upwork"]["in_use"] == 1
+            await response.aread()
+
+        stats = registry.get_stats()["upwork"]
+        assert stats["in_use"] == 0
+        assert stats["total_requests"] == 1
+        await registry.aclose()
+
+    def test_unknown_url_gets_default_pool(self):
+        """Тест створення пулу для незареєстрованого URL"""
+        registry = UpstreamClientRegistry()
+        client = registry.client("http://other:9000")
+
+        assert registry.client("http://other:9000") is client
+        assert registry.get_stats()["http://other:9000"]["max_connections"] == 100
+
+    def test_build_upstream_configs_overrides(self):
+        """Тест застосування пер-сервісних налаштувань"""
+        with patch("src.upstreams.settings.GATEWAY_UPSTREAM_POOLS", {"auth": {"max_connections": 7, "http2": True}}):
+            configs = build_upstream_configs()
+
+        assert set(configs) == {"auth", "upwork", "ai", "analytics", "notification"}
+        assert configs["auth"].max_connections == 7
+        assert configs["auth"].http2 is True
+        assert configs["ai"].read_timeout == 120.0
@@ -0,0 +1,102 @@
+"""
+Тести для матеріалізованої аналітики вакансій (JobAnalyticsView)
+"""
+
+import pytest
+import sys
+import os
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from analytics import JobAnalyticsView, budget_bounds
+from upwork_client import MockUpworkAPIClient
+
+
+def make_job(job_id, budget=None, skills=(), posted_time="2024-01-15T10:00:00Z"):
+    """Вакансія у форматі Upwork API"""
+    return {"id": job_id, "budget": budget, "skills": list(skills), "posted_time": posted_time}
+
+
+class TestBudgetBounds:
+    """Тести для внеску бюджету"""
+
+    def test_formats(self):
+        assert budget_bounds({"min": 100, "max": 500}) == (600.0, 2)
+        assert budget_bounds("100-500") == (600.0, 2)
+        assert budget_bounds("250") == (250.0, 1)
+        assert budget_bounds({"min": "n/a"}) == (0.0, 0)
+        assert budget_bounds("negotiable") == (0.0, 0)
+        assert budget_bounds(None) == (0.0, 0)
+
+
+class TestJobAnalyticsView:
+    """Тести для інкрементальних агрегатів"""
+
+    def test_incremental_aggregates(self):
+        """Тест середнього бюджету та частот навичок"""
+        view = JobAnalyticsView(top_k=2)
+        view.add_jobs([
+            make_job("1", {"min": 100, "max": 300}, ["python", "django"]),
+            make_job("2", {"min": 500, "max": 700}, ["python", "react"]),
+        ])
+        view.add_jobs([make_job("3", None, ["python", "react"])])
+
+        overview = view.overview()
+
+        assert overview["total_jobs"] == 3
+        assert overview["average_budget"] == 400.0
+        assert overview["top_skills"] == [("python", 3), ("react", 2)]
+        assert overview["as_of"] is not None
+        assert overview["staleness_s"] >= 0
+
+    def test_reingested_job_replaces_contribution(self):
+        """Тест що повторна вакансія не рахується двічі"""
+        view = JobAnalyticsView()
+        view.add_jobs([make_job("1", {"min": 100, "max": 100}, ["python", "python"])])
+        view.add_jobs([make_job("1", {"min": 300, "max": 300}, ["rust"])])
+
+        overview = view.overview()
+
+        assert overview["total_jobs"] == 1
+        assert overview["average_budget"] == 300.0
+        assert overview["top_skills"] == [("rust", 1)]
+
+    def test_recent_jobs(self):
+        """Тест найновіших вакансій за часом публікації"""
+        view = JobAnalyticsView()
+        view.add_jobs([make_job(str(n), posted_time=f"2024-01-{10 + n:02d}T00:00:00Z") for n in range(5)])
+        view.add_jobs([make_job("old", posted_time="2023-12-01T00:00:00Z")])
+
+        assert [job["id"] for job in view.recent_jobs] == ["4", "3", "2"]
+
+    def test_empty_view(self):
+        overview = JobAnalyticsView().overview()
+
+        assert overview["total_jobs"] == 0
+        assert overview["average_budget"] == 0
+        assert overview["as_of"] is None
+
+    def test_overview_is_materialized(self):
+        """Тест що читання не перераховує агрегати"""
+        view = JobAnalyticsView()
+        view.add_jobs([make_job("1", skills=["python"])])
+        view.skill_counts["python"] = 100  # зміна без add_jobs не видна у знімку
+
+        assert view.overview()["top_skills"] == [("python", 1)]
+
+    @pytest.mark.asyncio
+    async def test_mock_jobs(self):
+        """Тест на вакансіях mock клієнта (раніше ітерувались ключі словника)"""
+        result = await MockUpworkAPIClient().search_jobs("")
+        view = JobAnalyticsView()
+
+        view.add_jobs(result["jobs"])
+
+        overview = view.overview()
+        assert overview["total_jobs"] == len(result["jobs"])
+        assert overview["average_budget"] > 0
+        assert overview["top_skills"]
@@ -0,0 +1,137 @@
+"""
+Тести для індексу вакансій у пам'яті (JobIndex)
+"""
+
+import pytest
+import sys
+import os
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from job_index import JobIndex, budget_range, tokenize
+
+
+def make_job(number, title="Python developer", skills=("python",), budget=None, hourly_rate=None,
+             location="Canada", day=1):
+    """Вакансія у форматі Upwork API"""
+    return {
+        "id": f"~job{number}",
+        "title": title,
+        "description": "Backend work",
+        "skills": list(skills),
+        "budget": budget,
+        "hourly_rate": hourly_rate,
+        "client": {"location": location},
+        "posted_time": f"2024-01-{day:02d}T00:00:00Z"
+    }
+
+
+def ids(jobs):
+    return [job["id"] for job in jobs]
+
+
+class TestHelpers:
+    """Тести для токенізації та бюджетів"""
+
+    def test_tokenize(self):
+        assert tokenize("C++ and C# Developer, Python!") == {"c++", "and", "c#", "developer", "python"}
+        assert tokenize(None) == set()
+
+    def test_budget_range(self):
+        assert budget_range({"min": 100, "max": 500}) == (100.0, 500.0)
+        assert budget_range("100-500") == (100.0, 500.0)
+        assert budget_range(250) == (250.0, 250.0)
+        assert budget_range("negotiable") is None
+        assert budget_range({}) is None
+
+
+class TestJobIndex:
+    """Тести для пошуку в JobIndex"""
+
+    @pytest.fixture
+    def index(self):
+        index = JobIndex()
+        index.add_jobs([
+            make_job(1, "Python FastAPI backend", ["python", "fastapi"], {"min": 100, "max": 500}, day=1),
+            make_job(2, "React dashboard", ["react", "typescript"], {"min": 1000, "max": 3000}, location="Ukraine", day=2),
+            make_job(3, "Django API for Python shop", ["python", "django"], {"min": 2000, "max": 5000}, day=3),
+            make_job(4, "Data analysis in Python", ["python", "pandas"], None, hourly_rate=45, day=4),
+            make_job(5, "Senior Python engineer", ["python"], None, hourly_rate=90, day=5),
+        ])
+        return index
+
+    def test_newest_first(self, index):
+        assert ids(index.search()) == ["~job5", "~job4", "~job3", "~job2", "~job1"]
+        assert ids(index.search(skip=1, limit=2)) == ["~job4", "~job3"]
+
+    def test_skills_and_query(self, index):
+        assert ids(index.search(skills="python, django")) == ["~job3"]
+        assert ids(index.search(skills=["REACT"])) == ["~job2"]
+        assert ids(index.search(query="python")) == ["~job5", "~job4", "~job3", "~job1"]
+        assert ids(index.search(query="python api")) == ["~job3"]
+        assert index.search(skills="rust") == []
+
+    def test_location(self, index):
+        assert ids(index.search(location="ukraine")) == ["~job2"]
+
+    def test_budget_range(self, index):
+        """Тест перетину діапазону бюджету вакансії з фільтром"""
+        assert ids(index.search(budget_min=2500)) == ["~job3", "~job2"]
+        assert ids(index.search(budget_max=1000)) == ["~job2", "~job1"]
+        assert ids(index.search(budget_min=400, budget_max=1500)) == ["~job2", "~job1"]
+        assert ids(index.search(skills="python", budget_min=400)) == ["~job3", "~job1"]
+
+    def test_hourly_rate(self, index):
+        assert ids(index.search(hourly_rate_min=50)) == ["~job5"]
+        assert ids(index.search(hourly_rate_min=40, hourly_rate_max=90)) == ["~job5", "~job4"]
+
+    def test_update_and_remove(self, index):
+        """Тест інкрементального оновлення та видалення"""
+        index.add_job(make_job(1, "Rust service", ["rust"], {"min": 9000, "max": 9000}, day=1))
+        assert index.remove_job("~job5")
+        assert not index.remove_job("~job5")
+
+        assert ids(index.search(skills="rust", budget_min=8000)) == ["~job1"]
+        assert "~job1" not in ids(index.search(skills="python"))
+        assert "~job5" not in ids(index.search())
+        assert len(index) == 4
+        assert "rust" in index._skills and "senior" not in index._terms
+
+    def test_matches_linear_scan(self):
+        """Тест що індекс дає той самий результат, що й лінійний перебір"""
+        index = JobIndex()
+        jobs = [
+            make_job(n, f"Job {n} {'python' if n % 3 else 'react'}", ["python"] if n % 2 else ["react"],
+                     {"min": n * 10, "max": n * 20}, day=1 + n % 28)
+            for n in range(300)
+        ]
+        index.add_jobs(jobs)
+
+        expected = sorted(
+            (job for job in jobs if "python" in job["skills"] and job["budget"]["max"] >= 2000),
+            key=lambda job: (job["posted_time"], job["id"]), reverse=True
+        )
+        assert ids(index.search(skills="python", budget_min=2000, limit=1000)) == ids(expected)
+
+    def test_keyset_pages(self):
+        """Тест курсора (posted, job_id): обидва плани запиту дають ті самі сторінки, що й skip"""
+        index = JobIndex()
+        index.add_jobs([
+            make_job(n, "Python job", ["python"] if n % 2 else ["react"], {"min": n, "max": n}, day=1 + n % 5)
+            for n in range(100)
+        ])
+
+        for params in (dict(), dict(skills="react"), dict(skills="react", budget_min=90)):
+            expected = ids(index.search(limit=1000, **params))
+            pages, after = [], None
+            while True:
+                page = index.search(limit=7, after=after, **params)
+                if not page:
+                    break
+                pages.extend(ids(page))
+                after = index.sort_key(page[-1]["id"])
+            assert pages == expected
+            assert ids(index.search(skip=7, limit=7, **params)) == expected[7:14]
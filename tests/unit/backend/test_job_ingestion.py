@@ -0,0 +1,257 @@
+"""
+Тести для інкрементального завантаження вакансій (JobIngestionWorker)
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+pytest.importorskip("aiosqlite")
+
+from ingestion import JobIngestionWorker, filter_profiles, job_matches, job_to_row, parse_posted_date, query_jobs
+from shared.database.mvp_models import async_bulk_upsert_job_matches
+
+BASE_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def make_job(number: int, hours_ago: float, **overrides):
+    """Вакансія у форматі Upwork API"""
+    job = {
+        "id": f"~job{number}",
+        "title": f"Python job {number}",
+        "description": "FastAPI backend",
+        "budget": {"min": 100, "max": 500, "type": "fixed"},
+        "client": {"name": "Client", "rating": 4.5, "location": "Canada"},
+        "skills": ["python", "fastapi"],
+        "posted_time": (BASE_TIME - timedelta(hours=hours_ago)).isoformat().replace("+00:00", "Z"),
+        "experience_level": "expert",
+        "job_type": "fixed"
+    }
+    job.update(overrides)
+    return job
+
+
+class FakeUpworkClient:
+    """Stub search_jobs: вакансії, відсортовані за новизною, посторінково"""
+
+    def __init__(self, jobs):
+        self.jobs = sorted(jobs, key=lambda job: job["posted_time"], reverse=True)
+        self.calls = []
+
+    async def search_jobs(self, query, filters=None):
+        self.calls.append((query, dict(filters or {})))
+        offset = filters.get("offset", 0)
+        count = filters.get("count", 20)
+        return {"jobs": self.jobs[offset:offset + count]}
+
+
+class TestJobMapping:
+    """Тести для перетворення вакансій"""
+
+    def test_job_to_row(self):
+        row = job_to_row(make_job(1, 1), user_id=7, filter_profile_id=3)
+
+        assert row["job_id"] == "~job1"
+        assert row["user_id"] == 7
+        assert row["filter_profile_id"] == 3
+        assert row["budget"] == "100-500"
+        assert row["client_name"] == "Client"
+        assert row["country"] == "Canada"
+        assert row["posted_date"] == BASE_TIME - timedelta(hours=1)
+
+    def test_parse_posted_date(self):
+        assert parse_posted_date("2024-01-15T12:00:00Z") == BASE_TIME
+        assert parse_posted_date(None) is None
+        assert parse_posted_date("not a date") is None
+
+
+class TestJobIngestion:
+    """Тести для worker та локального сховища"""
+
+    def setup_store(self, tmp_path):
+        """SQLite з таблицями filter_profiles та job_matches"""
+        path = tmp_path / "jobs.db"
+        metadata = MetaData()
+        Table("users", metadata, Column("id", Integer, primary_key=True))
+        filter_profiles.to_metadata(metadata)
+        job_matches.to_metadata(metadata)
+        sync_engine = create_engine(f"sqlite:///{path}")
+        metadata.create_all(sync_engine)
+        with sync_engine.begin() as conn:
+            conn.execute(insert(filter_profiles), [
+                {"id": 1, "user_id": 1, "name": "Python", "keywords": ["python"], "exclude_keywords": ["wordpress"],
+                 "is_active": True, "is_paused": False},
+                {"id": 2, "user_id": 2, "name": "Paused", "keywords": ["react"], "exclude_keywords": None,
+                 "is_active": True, "is_paused": True},
+            ])
+        sync_engine.dispose()
+
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        return async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def count_rows(self, session_factory):
+        async with session_factory() as session:
+            return (await session.execute(select(func.count()).select_from(job_matches))).scalar()
+
+    @pytest.mark.asyncio
+    async def test_run_once_ingests_active_profiles(self, tmp_path):
+        """Тест завантаження вакансій активних профілів"""
+        session_factory = self.setup_store(tmp_path)
+        client = FakeUpworkClient([make_job(n, n) for n in range(1, 6)])
+        worker = JobIngestionWorker(session_factory, lambda user_id: client, interval=60, page_size=2, max_pages=10)
+
+        totals = await worker.run_once()
+
+        assert totals == {"profiles": 1, "upserted": 5}
+        assert client.calls[0][0] == "python"
+        assert client.calls[0][1]["sort"] == "recency"
+        assert [call[1]["offset"] for call in client.calls] == [0, 2, 4]
+        assert await self.count_rows(session_factory) == 5
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_cursor_stops_paging(self, tmp_path):
+        """Тест що наступне опитування читає лише сторінки до курсора"""
+        session_factory = self.setup_store(tmp_path)
+        client = FakeUpworkClient([make_job(n, n) for n in range(1, 11)])
+        worker = JobIngestionWorker(session_factory, lambda user_id: client, interval=60, page_size=3, max_pages=10)
+        await worker.run_once()
+
+        client.jobs = sorted(
+            client.jobs + [make_job(100, 0.5), make_job(101, 0.25)],
+            key=lambda job: job["posted_time"], reverse=True
+        )
+        client.calls.clear()
+        totals = await worker.run_once()
+
+        # Перша сторінка: 2 нові + найновіша з уже збережених (дорівнює курсору), далі - старші
+        assert len(client.calls) == 2
+        assert totals["upserted"] == 3
+        assert await self.count_rows(session_factory) == 12
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_cursor_restored_from_store(self, tmp_path):
+        """Тест відновлення курсора з БД після перезапуску"""
+        session_factory = self.setup_store(tmp_path)
+        client = FakeUpworkClient([make_job(n, n) for n in range(1, 7)])
+        await JobIngestionWorker(session_factory, lambda user_id: client, page_size=2).run_once()
+
+        client.calls.clear()
+        restarted = JobIngestionWorker(session_factory, lambda user_id: client, page_size=2)
+        totals = await restarted.run_once()
+
+        # Лише перша сторінка: найновіша вакансія (дорівнює курсору) перезаписується
+        assert len(client.calls) == 1
+        assert totals["upserted"] == 1
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_dedupe_and_exclude(self, tmp_path):
+        """Тест дедуплікації за job_id та мінус-слів профілю"""
+        session_factory = self.setup_store(tmp_path)
+        client = FakeUpworkClient([
+            make_job(1, 1),
+            make_job(1, 1, title="Python job 1 (duplicate)"),
+            make_job(2, 2, title="WordPress plugin")
+        ])
+        worker = JobIngestionWorker(session_factory, lambda user_id: client, page_size=10)
+
+        totals = await worker.run_once()
+
+        assert totals["upserted"] == 1
+        assert await self.count_rows(session_factory) == 1
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_on_jobs_hook(self, tmp_path):
+        """Тест передачі записаних вакансій (без виключених та дублікатів)"""
+        session_factory = self.setup_store(tmp_path)
+        client = FakeUpworkClient([make_job(1, 1), make_job(1, 1), make_job(2, 2, title="WordPress site")])
+        received = []
+        worker = JobIngestionWorker(session_factory, lambda user_id: client, page_size=10, on_jobs=received.extend)
+
+        await worker.run_once()
+
+        assert [job["id"] for job in received] == ["~job1"]
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_upsert_keeps_user_status(self, tmp_path):
+        """Тест що upsert оновлює вміст, але не статус вакансії"""
+        session_factory = self.setup_store(tmp_path)
+        async with session_factory() as session:
+            await async_bulk_upsert_job_matches(session, [job_to_row(make_job(1, 1), 1, 1)])
+            await session.execute(job_matches.update().values(status="applied"))
+            written = await async_bulk_upsert_job_matches(
+                session, [job_to_row(make_job(1, 1, title="Updated"), 1, 1)]
+            )
+            await session.commit()
+
+            row = (await session.execute(select(job_matches))).one()
+
+        assert written == 1
+        assert row.job_title == "Updated"
+        assert row.status == "applied"
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_query_jobs(self, tmp_path):
+        """Тест локальних запитів: новизна, пагінація, фільтри, одна вакансія на job_id"""
+        session_factory = self.setup_store(tmp_path)
+        async with session_factory() as session:
+            await async_bulk_upsert_job_matches(session, [
+                job_to_row(make_job(1, 3), 1, 1),
+                job_to_row(make_job(2, 2, skills=["react"], client={"name": "X", "location": "Ukraine"}), 1, 1),
+                job_to_row(make_job(3, 1, title="Django API"), 1, 1),
+                job_to_row(make_job(1, 3), 2, None),
+            ])
+            await session.commit()
+
+            newest = await query_jobs(session, skip=0, limit=2)
+            rest = await query_jobs(session, skip=2, limit=10)
+            by_skill = await query_jobs(session, skills="react")
+            by_location = await query_jobs(session, location="ukraine")
+            by_text = await query_jobs(session, query="django")
+
+        assert [job["id"] for job in newest] == ["~job3", "~job2"]
+        assert [job["id"] for job in rest] == ["~job1"]
+        assert [job["id"] for job in by_skill] == ["~job2"]
+        assert [job["id"] for job in by_location] == ["~job2"]
+        assert [job["id"] for job in by_text] == ["~job3"]
+        assert newest[0]["posted_time"] == "2024-01-15T11:00:00Z"
+        await self.engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_query_jobs_keyset(self, tmp_path):
+        """Тест keyset-пагінації: сторінки після курсора (posted_date, job_id) без пропусків і повторів"""
+        session_factory = self.setup_store(tmp_path)
+        async with session_factory() as session:
+            await async_bulk_upsert_job_matches(
+                session, [job_to_row(make_job(number, number % 3), 1, 1) for number in range(1, 8)]
+            )
+            await session.commit()
+
+            pages, after = [], None
+            while True:
+                page = await query_jobs(session, limit=3, after=after)
+                if not page:
+                    break
+                pages.append([job["id"] for job in page])
+                last = page[-1]
+                after = (parse_posted_date(last["posted_time"]), last["id"])
+
+        everything = [job_id for page in pages for job_id in page]
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert everything == ["~job6", "~job3", "~job7", "~job4", "~job1", "~job5", "~job2"]
+        await self.engine.dispose()
@@ -0,0 +1,130 @@
+"""
+Тести для пакетного upsert JobMatch (INSERT ... ON CONFLICT)
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, event, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.database.mvp_models import (
+    FilterProfile, JobMatch, bulk_upsert_job_matches, job_match_upsert_statement
+)
+
+job_matches = JobMatch.__table__
+
+
+def make_row(user_id: int, number: int, **overrides):
+    """Рядок job_matches"""
+    row = {
+        "user_id": user_id,
+        "filter_profile_id": None,
+        "job_id": f"~job{number}",
+        "job_title": f"Job {number}",
+        "skills": ["python"],
+        "posted_date": datetime(2024, 1, 15, tzinfo=timezone.utc),
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def engine():
+    """SQLite з таблицею job_matches"""
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Integer, primary_key=True))
+    FilterProfile.__table__.to_metadata(metadata)
+    job_matches.to_metadata(metadata)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestJobMatchUpsert:
+    """Тести для bulk_upsert_job_matches"""
+
+    def test_unique_index(self):
+        """Тест унікального індексу, на який спирається ON CONFLICT"""
+        indexes = {index.name: index for index in job_matches.indexes}
+        index = indexes["uq_job_matches_user_job"]
+
+        assert index.unique
+        assert [column.name for column in index.columns] == ["user_id", "job_id"]
+
+    def test_postgres_statement(self):
+        """Тест SQL для PostgreSQL"""
+        sql = str(job_match_upsert_statement("postgresql").compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (user_id, job_id) DO UPDATE" in sql
+        assert "job_title = excluded.job_title" in sql
+        assert "status" not in sql.split("DO UPDATE")[1]
+
+    def test_unsupported_dialect(self):
+        with pytest.raises(NotImplementedError):
+            job_match_upsert_statement("mysql")
+
+    def test_insert_and_update(self, engine):
+        """Тест вставки нових та оновлення існуючих рядків"""
+        with Session(engine) as session:
+            bulk_upsert_job_matches(session, [make_row(1, n) for n in range(5)])
+            session.execute(job_matches.update().where(job_matches.c.job_id == "~job0").values(status="applied"))
+            written = bulk_upsert_job_matches(session, [make_row(1, 0, job_title="Updated"), make_row(1, 5)])
+            session.commit()
+
+            rows = {row.job_id: row for row in session.execute(select(job_matches)).all()}
+
+        assert written == 2
+        assert len(rows) == 6
+        assert rows["~job0"].job_title == "Updated"
+        assert rows["~job0"].status == "applied"
+        assert rows["~job0"].updated_at is not None
+        assert rows["~job5"].status == "new"
+
+    def test_same_job_for_different_users(self, engine):
+        """Тест що ключ - пара (user_id, job_id)"""
+        with Session(engine) as session:
+            bulk_upsert_job_matches(session, [make_row(1, 1), make_row(2, 1)])
+            session.commit()
+
+            count = session.execute(select(func.count()).select_from(job_matches)).scalar()
+
+        assert count == 2
+
+    def test_duplicates_in_batch(self, engine):
+        """Тест дублікатів в одному пакеті - залишається останній"""
+        with Session(engine) as session:
+            written = bulk_upsert_job_matches(session, [make_row(1, 1), make_row(1, 1, job_title="Last")])
+            session.commit()
+
+            titles = session.execute(select(job_matches.c.job_title)).scalars().all()
+
+        assert written == 1
+        assert titles == ["Last"]
+
+    def test_chunking(self, engine):
+        """Тест розбиття на пакети: один запит на пакет"""
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        with Session(engine) as session:
+            written = bulk_upsert_job_matches(session, [make_row(1, n) for n in range(25)], chunk_size=10)
+            session.commit()
+
+            count = session.execute(select(func.count()).select_from(job_matches)).scalar()
+
+        upserts = [statement for statement in statements if "ON CONFLICT" in statement]
+        assert written == 25
+        assert count == 25
+        assert len(upserts) == 3
+
+    def test_empty(self, engine):
+        with Session(engine) as session:
+            assert bulk_upsert_job_matches(session, []) == 0
@@ -0,0 +1,85 @@
+"""
+Тести для keyset-пагінації (курсори)
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, select
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.utils.pagination import (
+    InvalidCursorError, decode_cursor, encode_cursor, keyset_filter, keyset_slice
+)
+
+BASE_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class TestCursor:
+    """Тести для кодування курсора"""
+
+    def test_roundtrip(self):
+        """Тест що datetime, рядки та числа повертаються тих самих типів"""
+        cursor = encode_cursor(BASE_TIME, 42)
+        assert "=" not in cursor
+        assert decode_cursor(cursor) == (BASE_TIME, 42)
+        assert decode_cursor(encode_cursor("2024-01-15T12:00:00Z", "~job1")) == ("2024-01-15T12:00:00Z", "~job1")
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor(1, 2, 3), encode_cursor({"x": 1}, 2)])
+    def test_invalid(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+class TestKeyset:
+    """Тести для умови та зрізу за курсором"""
+
+    def test_slice(self):
+        """Тест сторінок зі списку за зростанням: нові першими, без пропусків і повторів"""
+        items = [{"created_at": f"2024-01-{day:02d}", "id": f"p{number}"}
+                 for day in range(1, 6) for number in range(3)]
+        key = lambda item: (item["created_at"], item["id"])
+
+        pages, after = [], None
+        while True:
+            page = keyset_slice(items, key, after, limit=4)
+            if not page:
+                break
+            pages.append(page)
+            after = key(page[-1])
+
+        assert [len(page) for page in pages] == [4, 4, 4, 3]
+        assert [item for page in pages for item in page] == items[::-1]
+
+    def test_filter_sqlite(self):
+        """Тест умови (created_at, id) < курсор у SQL з рівними created_at"""
+        metadata = MetaData()
+        drafts = Table(
+            "drafts", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("created_at", DateTime(timezone=True))
+        )
+        engine = create_engine("sqlite://")
+        metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(drafts.insert(), [
+                {"id": number, "created_at": BASE_TIME - timedelta(hours=number // 2)} for number in range(1, 9)
+            ])
+
+            order = (drafts.c.created_at.desc(), drafts.c.id.desc())
+            pages, after = [], None
+            while True:
+                query = select(drafts).order_by(*order).limit(3)
+                if after is not None:
+                    query = query.where(keyset_filter((drafts.c.created_at, drafts.c.id), after))
+                rows = connection.execute(query).all()
+                if not rows:
+                    break
+                pages.append([row.id for row in rows])
+                after = decode_cursor(encode_cursor(rows[-1].created_at, rows[-1].id))
+
+        assert pages == [[1, 3, 2], [5, 4, 7], [6, 8]]
@@ -0,0 +1,241 @@
+"""
+Тести для метрик та автопідбору пулу з'єднань БД
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, exc, text
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.database import pool_metrics as pool_metrics_module
+from shared.database.pool_metrics import (
+    AUTOTUNE_ADJUST, AUTOTUNE_RECOMMEND, InstrumentedQueuePool, PoolMetrics
+)
+from shared.utils.performance_metrics import PerformanceMetricsCollector, register_pool_metrics
+
+
+def make_engine(tmp_path, pool_size=2, max_overflow=0, timeout=0.2, autotune="off", max_size=10):
+    """Engine з невеликим інструментованим пулом"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=timeout,
+        connect_args={"check_same_thread": False}
+    )
+    metrics = PoolMetrics("sync", max_size=max_size)
+    metrics.attach(engine, autotune=autotune)
+    return engine, metrics
+
+
+def hold_connections(engine, count, seconds):
+    """Утримання з'єднань у фонових потоках"""
+    ready = threading.Barrier(count + 1)
+
+    def worker():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            ready.wait()
+            time.sleep(seconds)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    return threads
+
+
+class TestPoolMetrics:
+    """Тести для PoolMetrics"""
+
+    def test_checkout_and_in_use(self, tmp_path):
+        """Тест підрахунку checkout та зайнятих з'єднань"""
+        engine, metrics = make_engine(tmp_path)
+
+        with engine.connect() as first, engine.connect() as second:
+            summary = metrics.summary()
+            assert summary["in_use"] == 2
+            assert summary["peak_in_use"] == 2
+
+        summary = metrics.summary()
+        assert summary["in_use"] == 0
+        assert summary["idle"] == 2
+        assert summary["checkouts"] == 2
+        assert summary["checkins"] == 2
+        assert summary["timeouts"] == 0
+        assert len(metrics.checkout_waits) == 2
+
+    def test_timeout_recorded(self, tmp_path):
+        """Тест запису таймауту при вичерпаному пулі"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, timeout=0.05)
+
+        threads = hold_connections(engine, 1, 0.3)
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        for thread in threads:
+            thread.join()
+
+        summary = metrics.summary()
+        assert summary["timeouts"] == 1
+        assert summary["max_checkout_ms"] >= 50
+        assert summary["waiting"] == 0
+
+    def test_wait_recorded(self, tmp_path):
+        """Тест запису часу очікування вільного з'єднання"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, timeout=2.0)
+
+        threads = hold_connections(engine, 1, 0.1)
+        with engine.connect():
+            pass
+        for thread in threads:
+            thread.join()
+
+        summary = metrics.summary()
+        assert summary["slow_checkouts"] == 1
+        assert summary["max_checkout_ms"] >= 50
+        assert max(metrics.demand_samples) == 2
+
+    def test_overflow(self, tmp_path):
+        """Тест підрахунку overflow з'єднань"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, max_overflow=2)
+
+        with engine.connect(), engine.connect(), engine.connect():
+            assert metrics.summary()["overflow"] == 2
+
+    def test_recommend_from_demand(self, tmp_path):
+        """Тест рекомендації розміру за спостережуваною конкурентністю"""
+        engine, metrics = make_engine(tmp_path, pool_size=10, max_size=20)
+        metrics.demand_samples.extend([2] * 95 + [4] * 5)
+
+        recommendation = metrics.recommend()
+
+        # p95 = 4 з запасом 25% → 5
+        assert recommendation["pool_size"] == 5
+        assert recommendation["max_overflow"] == 0
+
+    def test_recommend_grows_after_timeouts(self, tmp_path):
+        """Тест рекомендації більшого пулу після таймаутів"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, timeout=0.05, max_size=10)
+
+        threads = hold_connections(engine, 1, 0.3)
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        for thread in threads:
+            thread.join()
+
+        # Попит 2 (зайняте + очікуюче) з запасом 25% → 3
+        recommendation = metrics.recommend()
+        assert recommendation["pool_size"] == 3
+
+    def test_recommend_capped_by_max_size(self, tmp_path):
+        """Тест обмеження рекомендації DB_POOL_MAX_SIZE"""
+        engine, metrics = make_engine(tmp_path, max_size=3)
+        metrics.demand_samples.extend([10] * 10)
+
+        assert metrics.recommend()["pool_size"] == 3
+
+
+class TestPoolAutotune:
+    """Тести для режимів автопідбору"""
+
+    def test_recommend_mode_keeps_size(self, tmp_path):
+        """Тест режиму recommend - пул не змінюється"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, timeout=0.05, autotune=AUTOTUNE_RECOMMEND)
+
+        threads = hold_connections(engine, 1, 0.3)
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.recommendation["pool_size"] == 3
+        assert engine.pool.size() == 1
+        assert metrics.stats["resizes"] == 0
+
+    def test_adjust_mode_grows_pool(self, tmp_path):
+        """Тест режиму adjust - пул збільшується після таймауту"""
+        engine, metrics = make_engine(tmp_path, pool_size=1, timeout=0.05, autotune=AUTOTUNE_ADJUST)
+
+        threads = hold_connections(engine, 1, 0.3)
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        # Новий пул вже має вільне місце, хоча старе з'єднання ще зайняте
+        assert engine.pool.size() == 3
+        assert metrics.pool is engine.pool
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+        for thread in threads:
+            thread.join()
+
+        assert metrics.stats["resizes"] == 1
+        assert metrics.summary()["timeouts"] == 1
+
+    def test_adjust_mode_does_not_shrink(self, tmp_path, monkeypatch):
+        """Тест що adjust не зменшує пул"""
+        monkeypatch.setattr(pool_metrics_module, "AUTOTUNE_INTERVAL", 5)
+        engine, metrics = make_engine(tmp_path, pool_size=4, autotune=AUTOTUNE_ADJUST)
+
+        for _ in range(10):
+            with engine.connect():
+                pass
+
+        assert metrics.recommendation["pool_size"] == 2
+        assert engine.pool.size() == 4
+        assert metrics.stats["resizes"] == 0
+
+
+class TestPoolMetricsScrape:
+    """Тести для збору метрик пулу PerformanceMetricsCollector"""
+
+    def test_register_pool_metrics(self, tmp_path):
+        """Тест реєстрації метрик пулу як кастомних метрик"""
+        engine, metrics = make_engine(tmp_path)
+        collector = PerformanceMetricsCollector("test-service")
+        register_pool_metrics(collector, {"sync": metrics})
+
+        with engine.connect():
+            values = {metric.name: metric.value for metric in collector._collect_custom_metrics()}
+
+        assert values["db_pool_sync_in_use"] == 1.0
+        assert values["db_pool_sync_overflow"] == 0.0
+        assert values["db_pool_sync_timeouts"] == 0.0
+        assert "db_pool_sync_checkout_p95_ms" in values
+        assert "db_pool_sync_waiting" in values
+
+
+class TestInMemorySqlitePool:
+    """Тести для пулу sync engine з in-memory SQLite"""
+
+    def test_memory_database_shared_between_sessions(self, monkeypatch):
+        """Тест що in-memory база не губиться між з'єднаннями, а метрики збираються"""
+        from sqlalchemy.pool import StaticPool
+        from shared.database.connection import DatabaseManager, is_sqlite_memory
+
+        assert is_sqlite_memory("sqlite://") and is_sqlite_memory("sqlite:///:memory:")
+        assert not is_sqlite_memory("sqlite:///./test.db")
+        assert not is_sqlite_memory("postgresql://user@db/app")
+
+        monkeypatch.setattr("shared.database.connection.settings.DATABASE_URL", "sqlite:///:memory:")
+        manager = DatabaseManager()
+        assert isinstance(manager.engine.pool, StaticPool)
+
+        with manager.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+        # Друге одночасне з'єднання бачить ту саму базу
+        with manager.engine.connect(), manager.engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+            # StaticPool: обидва Connection використовують одне DBAPI з'єднання
+            assert manager.get_pool_metrics()["sync"]["in_use"] == 1
+
+        summary = manager.get_pool_metrics()["sync"]
+        assert summary["pool_class"] == "StaticPool"
+        assert summary["in_use"] == 0 and summary["checkouts"] == 3
@@ -0,0 +1,201 @@
+"""
+Тести для атомарного sliding-window rate limiter
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from fakeredis import aioredis as fake_aioredis
+from fastapi import HTTPException
+from shared.utils.rate_limiter import LocalTokenBucket, RateLimiter, WindowResult, rate_limit_middleware
+
+
+@pytest.fixture
+def server():
+    """Спільний Redis сервер (для кількох реплік)"""
+    return fakeredis.FakeServer()
+
+
+def make_limiter(server) -> RateLimiter:
+    """Rate limiter, підключений до спільного Redis"""
+    rate_limiter = RateLimiter()
+    rate_limiter.use_redis(fakeredis.FakeRedis(server=server))
+    rate_limiter.use_async_redis(fake_aioredis.FakeRedis(server=server))
+    return rate_limiter
+
+
+@pytest.fixture
+def limiter(server):
+    """Rate limiter з локальним Redis"""
+    return make_limiter(server)
+
+
+class TestSlidingWindowRateLimiter:
+    """Тести для RateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_allows_until_limit_then_blocks(self, limiter):
+        """Тест блокування після досягнення ліміту"""
+        windows = [("minute", 3), ("hour", 100)]
+
+        for expected_remaining in (2, 1, 0):
+            allowed, results = await limiter._check_rate_limits("client", windows)
+            assert allowed
+            assert results[0].remaining == expected_remaining
+
+        allowed, results = await limiter._check_rate_limits("client", windows)
+        assert not allowed
+        assert results[0].current == 3
+        assert 0 < results[0].retry_after <= 60
+
+    @pytest.mark.asyncio
+    async def test_remaining_reported_per_window(self, limiter):
+        """Тест окремого remaining для хвилинного та годинного вікна"""
+        allowed, results = await limiter._check_rate_limits("client", [("minute", 10), ("hour", 50)])
+
+        assert allowed
+        assert [(result.window, result.remaining) for result in results] == [("minute", 9), ("hour", 49)]
+
+    @pytest.mark.asyncio
+    async def test_blocked_request_not_counted(self, limiter):
+        """Тест: відхилений запит не записується в жодне вікно"""
+        windows = [("minute", 100), ("hour", 2)]
+        await limiter._check_rate_limits("client", windows)
+        await limiter._check_rate_limits("client", windows)
+
+        allowed, results = await limiter._check_rate_limits("client", windows)
+        assert not allowed
+        assert results[0].current == 2
+        assert results[1].retry_after > 60
+
+    @pytest.mark.asyncio
+    async def test_identifiers_are_independent(self, limiter):
+        """Тест незалежних лімітів для різних клієнтів"""
+        windows = [("minute", 1)]
+        assert (await limiter._check_rate_limits("a", windows))[0]
+        assert (await limiter._check_rate_limits("b", windows))[0]
+        assert not (await limiter._check_rate_limits("a", windows))[0]
+
+    @pytest.mark.asyncio
+    async def test_fail_open_without_redis(self):
+        """Тест пропуску запитів, якщо Redis недоступний"""
+        rate_limiter = RateLimiter()
+        rate_limiter.use_async_redis(None)
+
+        allowed, results = await rate_limiter._check_rate_limits("client", [("minute", 1)])
+        assert allowed
+        assert results[0].remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_cost_is_capped_by_remaining(self, limiter):
+        """Тест резервування пакета: виділяється не більше залишку"""
+        granted, results = await limiter._check_rate_limits("client", [("minute", 3)], cost=5)
+        assert granted == 3
+        assert results[0].remaining == 0
+
+        granted, _ = await limiter._check_rate_limits("client", [("minute", 3)], cost=5)
+        assert granted == 0
+
+    def test_allow_request_sync(self, limiter):
+        """Тест простого синхронного методу allow_request"""
+        assert limiter.allow_request("oauth:1.2.3.4", max_requests=2, window=3600)
+        assert limiter.allow_request("oauth:1.2.3.4", max_requests=2, window=3600)
+        assert not limiter.allow_request("oauth:1.2.3.4", max_requests=2, window=3600)
+
+
+class TestLocalTokenBucket:
+    """Тести для локального рівня rate limiter"""
+
+    def test_batch_grows_when_lease_exhausted_and_shrinks_when_idle(self):
+        """Тест адаптації розміру пакета"""
+        bucket = LocalTokenBucket()
+        assert bucket.next_batch(now=0.0, max_batch=8) == 1
+
+        bucket.refill(1, [], now=0.0, lease_seconds=1.0)
+        assert bucket.take(0.1)
+        assert bucket.next_batch(now=0.2, max_batch=8) == 2
+
+        bucket.refill(2, [], now=0.2, lease_seconds=1.0)
+        assert bucket.take(0.3)
+        assert not bucket.take(1.5)
+        assert bucket.next_batch(now=1.5, max_batch=8) == 1
+
+    def test_remaining_includes_unused_tokens(self):
+        """Тест залишку з урахуванням зарезервованих токенів"""
+        bucket = LocalTokenBucket()
+        bucket.refill(4, [WindowResult("minute", 60, 10, 50, 0)], now=0.0, lease_seconds=1.0)
+        bucket.take(0.0)
+        assert bucket.remaining() == {"remaining_minute": 53}
+
+    @pytest.mark.asyncio
+    async def test_redis_calls_independent_of_request_rate(self, limiter):
+        """Тест: активний клієнт резервує токени пакетами"""
+        windows = [("minute", 100000), ("hour", 1000000)]
+        with patch("shared.utils.rate_limiter.settings.RATE_LIMIT_LOCAL_BATCH_MAX", 64):
+            for _ in range(500):
+                await limiter._take_local_token("client", windows)
+
+        assert limiter.stats["local_hits"] == 500
+        assert limiter.stats["redis_reservations"] < 20
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_reservation(self, limiter):
+        """Тест одного резервування для конкурентних запитів клієнта"""
+        import asyncio
+        windows = [("minute", 1000)]
+        await asyncio.gather(*(limiter._take_local_token("client", windows) for _ in range(10)))
+
+        assert limiter.stats["redis_reservations"] < 10
+
+    @pytest.mark.asyncio
+    async def test_global_limit_holds_across_replicas(self, server):
+        """Тест: дві репліки разом не перевищують глобальний ліміт"""
+        replicas = [make_limiter(server), make_limiter(server)]
+        windows = [("minute", 40), ("hour", 1000)]
+        allowed = 0
+
+        with patch("shared.utils.rate_limiter.settings.RATE_LIMIT_LOCAL_LEASE_SECONDS", 60.0):
+            for step in range(100):
+                try:
+                    await replicas[step % 2]._take_local_token("client", windows)
+                    allowed += 1
+                except HTTPException as e:
+                    assert e.status_code == 429
+
+        assert allowed == 40
+
+
+class TestRateLimitMiddleware:
+    """Тести для rate_limit_middleware"""
+
+    def test_middleware_headers_and_429(self, limiter):
+        """Тест заголовків remaining та відповіді 429"""
+        app = FastAPI()
+        app.middleware("http")(rate_limit_middleware)
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        with patch("shared.utils.rate_limiter.rate_limiter", limiter), \
+             patch("shared.utils.rate_limiter.settings.RATE_LIMIT_PER_MINUTE", 2), \
+             patch("shared.utils.rate_limiter.settings.RATE_LIMIT_PER_HOUR", 10):
+            client = TestClient(app)
+            first = client.get("/ping")
+            client.get("/ping")
+            blocked = client.get("/ping")
+
+        assert first.headers["X-RateLimit-Remaining-Minute"] == "1"
+        assert first.headers["X-RateLimit-Remaining-Hour"] == "9"
+        assert blocked.status_code == 429
+        assert int(blocked.headers["Retry-After"]) <= 60
@@ -0,0 +1,125 @@
+"""
+Тести для кешу довідкових даних Upwork (ReferenceDataCache)
+"""
+
+import pytest
+import sys
+import os
+import json
+import asyncio
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+from reference_data import ReferenceDataCache, default_loaders
+from upwork_client import MockUpworkAPIClient
+
+
+class CountingLoader:
+    """Завантажувач, що рахує виклики"""
+
+    def __init__(self, value, fail=False):
+        self.value = value
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("Upwork недоступний")
+        return self.value
+
+
+class TestReferenceDataCache:
+    """Тести для ReferenceDataCache"""
+
+    @pytest.mark.asyncio
+    async def test_reads_served_from_memory(self, tmp_path):
+        """Тест що після прогріву читання не звертаються до API"""
+        loader = CountingLoader({"categories": ["Web"]})
+        cache = ReferenceDataCache({"categories": loader}, snapshot_path=str(tmp_path / "ref.json"))
+
+        await cache.warm()
+        for _ in range(100):
+            assert await cache.get("categories") == {"categories": ["Web"]}
+
+        assert loader.calls == 1
+        assert cache.stats["hits"] == 100
+
+    @pytest.mark.asyncio
+    async def test_cold_start_from_snapshot(self, tmp_path):
+        """Тест холодного старту зі знімка без звернення до API"""
+        path = str(tmp_path / "ref.json")
+        first = ReferenceDataCache({"skills": CountingLoader(["python"])}, snapshot_path=path)
+        await first.warm()
+
+        loader = CountingLoader(["rust"])
+        restarted = ReferenceDataCache({"skills": loader}, snapshot_path=path)
+        await restarted.warm()
+
+        assert await restarted.get("skills") == ["python"]
+        assert loader.calls == 0
+        assert restarted.stats["snapshot_loads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_last_good(self, tmp_path):
+        """Тест що помилка оновлення не затирає дані та знімок"""
+        path = tmp_path / "ref.json"
+        loader = CountingLoader(["python"])
+        cache = ReferenceDataCache({"skills": loader}, snapshot_path=str(path))
+        await cache.warm()
+
+        loader.fail = True
+        assert await cache.refresh() == 0
+
+        assert await cache.get("skills") == ["python"]
+        assert json.loads(path.read_text())["entries"]["skills"]["data"] == ["python"]
+        assert cache.stats["refresh_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_is_single_flight(self):
+        """Тест що паралельні промахи завантажують дані один раз"""
+        loader = CountingLoader(["python"])
+        cache = ReferenceDataCache({"skills": loader})
+
+        results = await asyncio.gather(*(cache.get("skills") for _ in range(10)))
+
+        assert results == [["python"]] * 10
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_unavailable(self):
+        cache = ReferenceDataCache({"skills": CountingLoader(None, fail=True)})
+
+        with pytest.raises(LookupError):
+            await cache.get("skills")
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self, tmp_path):
+        """Тест фонового оновлення за розкладом"""
+        loader = CountingLoader(["python"])
+        cache = ReferenceDataCache({"skills": loader}, refresh_interval=0.01)
+        await cache.warm()
+
+        cache.start()
+        await asyncio.sleep(0.1)
+        await cache.stop()
+
+        assert loader.calls > 1
+        assert not cache.get_stats()["running"]
+
+    @pytest.mark.asyncio
+    async def test_default_loaders(self):
+        """Тест завантажувачів через клієнт Upwork"""
+        cache = ReferenceDataCache(default_loaders(MockUpworkAPIClient))
+        await cache.warm()
+
+        sections = await cache.get("profile_sections")
+
+        assert await cache.get("categories")
+        assert await cache.get("skills")
+        assert set(sections) == {"portfolio_items", "certifications", "education", "languages"}
@@ -0,0 +1,97 @@
+"""
+Тести для SingleFlight
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+
+from shared.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Тести для SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """Тест спільного результату для однакового ключа"""
+        group = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert group.stats == {"calls": 1, "coalesced": 4}
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Тест окремих викликів для різних ключів"""
+        group = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(group.do("a", lambda: work(1)), group.do("b", lambda: work(2)))
+
+        assert results == [1, 2]
+        assert group.stats["calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_all_waiters(self):
+        """Тест передачі винятку всім очікувачам"""
+        group = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream error")
+
+        results = await asyncio.gather(
+            *(group.do("key", failing) for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert group.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Тест: скасування одного очікувача не впливає на інших"""
+        group = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(group.do("key", work))
+        second = asyncio.create_task(group.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_coalesced(self):
+        """Тест повторного виконання після завершення"""
+        group = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await group.do("key", work) == 1
+        assert await group.do("key", work) == 2
@@ -0,0 +1,540 @@
+"""
+Тести для асинхронного UpworkAPIClient (token bucket, Retry-After, повтори)
+"""
+
+import pytest
+import sys
+import os
+import asyncio
+import threading
+import time
+import types
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+
+# Додаємо шлях до модулів
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'app', 'backend'))
+sys.path.append(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', 'app', 'backend', 'services', 'upwork-service', 'src'
+))
+
+import upwork_client
+from upwork_client import (
+    AccessTokenCache, LatencyHistogram, MockUpworkAPIClient, TokenBucket, UpworkAPIClient, UpworkAPIError, UpworkAPIManager,
+    UpworkAuthError, UpworkRateLimitError, fetch_many, get_user_rate_limiter, parse_retry_after
+)
+
+
+class FakeClock:
+    """Керований годинник"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubServer:
+    """Локальний stub Upwork API: відповіді за чергою, запити записуються"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def client(self, **kwargs) -> UpworkAPIClient:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        kwargs.setdefault("limiter", TokenBucket(rate=1000, capacity=1000))
+        return UpworkAPIClient("test_token", base_url="http://upwork.test", http_client=http_client, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Без реальних затримок між повторами"""
+    monkeypatch.setattr(upwork_client, "backoff_delay", lambda attempt: 0.0)
+
+
+class TestTokenBucket:
+    """Тести для TokenBucket"""
+
+    def test_burst_then_throttle(self):
+        """Тест вичерпання burst та часу до наступного токена"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+    def test_refill_over_time(self):
+        """Тест поповнення токенів з часом"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+        for _ in range(3):
+            bucket.try_acquire()
+
+        clock.now += 1.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() == 0.0
+        assert bucket.try_acquire() > 0
+
+    def test_pause(self):
+        """Тест паузи за Retry-After"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=10, clock=clock)
+
+        bucket.pause(5)
+        assert bucket.try_acquire() == pytest.approx(5.0)
+
+        clock.now += 5.0
+        assert bucket.try_acquire() > 0  # токени поповнюються лише після паузи
+        clock.now += 0.1
+        assert bucket.try_acquire() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits(self):
+        """Тест очікування токена в acquire"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+        await bucket.acquire()
+
+        assert bucket.stats["acquired"] == 2
+        assert bucket.stats["throttled"] == 1
+
+
+class TestHelpers:
+    """Тести для Retry-After та гістограми"""
+
+    def test_parse_retry_after_seconds(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("garbage") is None
+
+    def test_parse_retry_after_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        assert 25 <= parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram()
+        for seconds in [0.01] * 90 + [0.3] * 10:
+            histogram.observe(seconds)
+
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["p50_ms"] == 50.0
+        assert summary["p95_ms"] == 500.0
+        assert summary["buckets"]["le_50"] == 90
+        assert summary["buckets"]["le_inf"] == 100
+
+
+class TestUpworkAPIClient:
+    """Тести для UpworkAPIClient проти stub сервера"""
+
+    @pytest.mark.asyncio
+    async def test_success(self):
+        """Тест успішного запиту"""
+        server = StubServer(httpx.Response(200, json={"jobs": [{"id": "1"}]}))
+        client = server.client()
+
+        result = await client.search_jobs("python", {"budget_min": 100})
+
+        assert result == {"jobs": [{"id": "1"}]}
+        request = server.requests[0]
+        assert request.headers["Authorization"] == "Bearer test_token"
+        assert request.url.params["q"] == "python"
+        assert upwork_client.latency_histograms["search_jobs"].count >= 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_honored(self):
+        """Тест повтору після 429 з Retry-After"""
+        server = StubServer(
+            httpx.Response(429, headers={"Retry-After": "0.01"}),
+            httpx.Response(200, json={"ok": True})
+        )
+        limiter = TokenBucket(rate=1000, capacity=1000)
+        client = server.client(limiter=limiter)
+
+        assert await client.get_categories() == {"ok": True}
+        assert len(server.requests) == 2
+        assert limiter.stats["pauses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_exhausted(self):
+        """Тест помилки після вичерпання повторів"""
+        server = StubServer(httpx.Response(429, headers={"Retry-After": "0"}))
+        client = server.client(max_retries=2)
+
+        with pytest.raises(UpworkRateLimitError):
+            await client.get_skills()
+        assert len(server.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_not_waited(self):
+        """Тест що надто довгий Retry-After повертається викликачу"""
+        server = StubServer(httpx.Response(429, headers={"Retry-After": "3600"}))
+        client = server.client(max_retry_after=60)
+
+        with pytest.raises(UpworkRateLimitError) as error:
+            await client.get_skills()
+        assert error.value.retry_after == 3600
+        assert len(server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_server_error_retried_for_get(self):
+        """Тест повтору GET після 503"""
+        server = StubServer(httpx.Response(503), httpx.Response(200, json={"id": "job"}))
+        client = server.client()
+
+        assert await client.get_job_details("job") == {"id": "job"}
+        assert len(server.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_server_error_not_retried_for_post(self):
+        """Тест що POST після 503 не повторюється"""
+        server = StubServer(httpx.Response(503), httpx.Response(200, json={"success": True}))
+        client = server.client()
+
+        with pytest.raises(UpworkAPIError) as error:
+            await client.submit_proposal("job", {"cover_letter": "Hi"})
+        assert error.value.status_code == 503
+        assert len(server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_error_retried(self):
+        """Тест повтору після помилки з'єднання"""
+        server = StubServer(httpx.ConnectError("refused"), httpx.Response(200, json={"ok": True}))
+        client = server.client()
+
+        assert await client.send_message("thread", "Hello") == {"ok": True}
+        assert len(server.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_unauthorized(self):
+        """Тест 401 без повторів"""
+        server = StubServer(httpx.Response(401))
+        client = server.client()
+
+        with pytest.raises(UpworkAuthError):
+            await client.get_user_profile()
+        assert len(server.requests) == 1
+
+
+class TestBatchFetching:
+    """Тести для пакетного отримання деталей (fetch_many)"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_and_dedupe(self):
+        """Тест обмеження паралельності та дедуплікації ID"""
+        active = 0
+        peak = 0
+        calls = []
+
+        async def fetch(item_id):
+            nonlocal active, peak
+            calls.append(item_id)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"id": item_id}
+
+        ids = [f"job{n}" for n in range(20)]
+        batch = await fetch_many(ids + ids[:5] + [""], fetch, concurrency=4)
+
+        assert peak == 4
+        assert sorted(calls) == sorted(ids)
+        assert list(batch["results"]) == ids
+        assert batch["errors"] == {}
+
+    @pytest.mark.asyncio
+    async def test_wall_time_is_slowest_call(self):
+        """Тест що 50 запитів займають час найповільнішого, а не суму"""
+        async def fetch(item_id):
+            await asyncio.sleep(0.05)
+            return {"id": item_id}
+
+        started = time.perf_counter()
+        batch = await fetch_many([f"job{n}" for n in range(50)], fetch, concurrency=50)
+
+        assert len(batch["results"]) == 50
+        assert time.perf_counter() - started < 0.5
+
+    @pytest.mark.asyncio
+    async def test_partial_results(self):
+        """Тест часткових результатів з помилками для окремих ID"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            job_id = request.url.path.rsplit("/", 1)[-1]
+            if job_id == "missing":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"id": job_id})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        manager = UpworkAPIManager(db_session=None, user_id="user1")
+        manager.client = UpworkAPIClient(
+            "test_token", base_url="http://upwork.test", http_client=http_client,
+            limiter=TokenBucket(rate=1000, capacity=1000)
+        )
+
+        batch = await manager.get_job_details_many(["a", "missing", "b"])
+
+        assert batch["results"] == {"a": {"id": "a"}, "b": {"id": "b"}}
+        assert batch["errors"]["missing"]["status_code"] == 404
+
+    def test_user_rate_limiter(self):
+        """Тест окремого rate limiter для кожного користувача"""
+        assert get_user_rate_limiter("user1") is get_user_rate_limiter("user1")
+        assert get_user_rate_limiter("user1") is not get_user_rate_limiter("user2")
+
+    def test_user_rate_limiters_bounded(self, monkeypatch):
+        """Тест що бакети користувачів не накопичуються: повні видаляються, решта - LRU"""
+        monkeypatch.setattr(upwork_client, "user_rate_limiters", OrderedDict())
+        monkeypatch.setattr(upwork_client.settings, "UPWORK_API_MAX_USER_LIMITERS", 3)
+
+        # Невикористаний бакет повний - видаляється при появі нового користувача
+        get_user_rate_limiter("idle")
+        for user_id in ("user1", "user2", "user3"):
+            get_user_rate_limiter(user_id).try_acquire()
+        assert list(upwork_client.user_rate_limiters) == ["user1", "user2", "user3"]
+
+        get_user_rate_limiter("user1")
+        get_user_rate_limiter("user4").try_acquire()
+        assert list(upwork_client.user_rate_limiters) == ["user3", "user1", "user4"]
+
+
+class TestAccessTokenCache:
+    """Тести для кешу access token"""
+
+    @pytest.mark.asyncio
+    async def test_cached_until_refresh_margin(self):
+        """Тест повторного використання токена до expires_at - refresh_margin"""
+        clock = FakeClock()
+        cache = AccessTokenCache(refresh_margin=60, clock=clock)
+        expires_at = datetime.fromtimestamp(clock.now + 600, tz=timezone.utc)
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return f"token{len(loads)}", expires_at
+
+        assert await cache.get_token(1, loader) == "token1"
+        clock.now += 500
+        assert await cache.get_token(1, loader) == "token1"
+        clock.now += 60
+        assert await cache.get_token(1, loader) == "token2"
+        assert cache.stats["hits"] == 1
+        assert cache.stats["loads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_naive_expires_at_is_utc(self):
+        """Тест naive expires_at з БД (UTC)"""
+        cache = AccessTokenCache(refresh_margin=60)
+        expires_at = datetime.utcnow() + timedelta(minutes=30)
+
+        await cache.get_token(1, lambda: ("token", expires_at))
+
+        assert await cache.get_token(1, lambda: ("other", expires_at)) == "token"
+
+    @pytest.mark.asyncio
+    async def test_single_flight_off_loop(self):
+        """Тест що паралельні запити завантажують токен один раз і не блокують event loop"""
+        cache = AccessTokenCache()
+        loads = []
+
+        def loader():
+            loads.append(threading.current_thread())
+            time.sleep(0.1)
+            return "token", None
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(cache.get_token(1, loader) for _ in range(10)))
+        ticking.cancel()
+
+        assert results == ["token"] * 10
+        assert len(loads) == 1 and loads[0] is not threading.main_thread()
+        assert ticks >= 5
+        assert cache.stats["misses"] == 1 and cache.stats["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_failed_load_not_cached(self):
+        cache = AccessTokenCache()
+
+        def loader():
+            raise UpworkAuthError("Upwork не підключено")
+
+        results = await asyncio.gather(*(cache.get_token(1, loader) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, UpworkAuthError) for result in results)
+        assert await cache.get_token(1, lambda: ("token", None)) == "token"
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        cache = AccessTokenCache()
+        await cache.get_token(1, lambda: ("old", None))
+
+        cache.invalidate(1)
+
+        assert await cache.get_token(1, lambda: ("new", None)) == "new"
+        assert cache.stats["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_before_expiry(self):
+        """Тест фонового оновлення токена до настання refresh_margin"""
+        cache = AccessTokenCache(refresh_margin=0.2)
+        refreshed = asyncio.Event()
+
+        def loader():
+            return "old", datetime.now(timezone.utc) + timedelta(seconds=0.3)
+
+        def refresher():
+            refreshed.set()
+            return "new", datetime.now(timezone.utc) + timedelta(hours=1)
+
+        assert await cache.get_token(1, loader, refresher) == "old"
+        await asyncio.wait_for(refreshed.wait(), timeout=1)
+        await asyncio.sleep(0.05)
+
+        assert await cache.get_token(1, loader, refresher) == "new"
+        assert cache.stats["background_refreshes"] == 1
+        assert cache.stats["misses"] == 1
+        cache.clear()
+        assert cache.get_stats()["scheduled_refreshes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cancels_background_refresh(self):
+        cache = AccessTokenCache(refresh_margin=0.1)
+        refreshes = []
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=0.4)
+
+        await cache.get_token(1, lambda: ("token", expires_at), lambda: refreshes.append(1))
+        assert cache.get_stats()["scheduled_refreshes"] == 1
+        cache.invalidate(1)
+        await asyncio.sleep(0.4)
+
+        assert refreshes == []
+        assert cache.get_stats()["scheduled_refreshes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_manager_uses_cache(self, monkeypatch):
+        """Тест що нові менеджери не звертаються до БД за токеном"""
+        cache = AccessTokenCache()
+        monkeypatch.setattr(upwork_client, "access_token_cache", cache)
+        loads = []
+
+        def load(manager):
+            loads.append(manager.user_id)
+            return "token", datetime.now(timezone.utc) + timedelta(hours=1)
+
+        monkeypatch.setattr(UpworkAPIManager, "_load_access_token", load)
+
+        clients = [await UpworkAPIManager(db_session=None, user_id=1).get_client() for _ in range(3)]
+
+        assert loads == [1]
+        assert all(client.access_token == "token" for client in clients)
+        cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_unauthorized_invalidates_token(self, monkeypatch):
+        """Тест що 401 прибирає токен з кешу і наступний запит завантажує новий"""
+        cache = AccessTokenCache()
+        monkeypatch.setattr(upwork_client, "access_token_cache", cache)
+        tokens = iter(["revoked", "fresh"])
+        monkeypatch.setattr(UpworkAPIManager, "_load_access_token", lambda manager: (next(tokens), None))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers["Authorization"] == "Bearer revoked":
+                return httpx.Response(401)
+            return httpx.Response(200, json={"id": "me"})
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(upwork_client, "get_http_client", lambda: http_client)
+        manager = UpworkAPIManager(db_session=None, user_id=1)
+
+        with pytest.raises(UpworkAuthError):
+            await manager.get_user_profile()
+        assert cache.stats["invalidations"] == 1 and manager.client is None
+
+        assert await UpworkAPIManager(db_session=None, user_id=1).get_user_profile() == {"id": "me"}
+
+
+class TestConnectionTokenRefresh:
+    """Тести для оновлення токенів через спільний OAuth обмін"""
+
+    class Session:
+        def __init__(self):
+            self.commits = 0
+
+        def commit(self):
+            self.commits += 1
+
+    def make_connection(self):
+        from shared.utils.encryption import encrypt_data
+
+        return types.SimpleNamespace(
+            user_id=1, access_token=None, refresh_token=encrypt_data("refresh"), expires_at=None, updated_at=None
+        )
+
+    def test_refresh_saves_tokens(self, monkeypatch):
+        from shared.utils.encryption import decrypt_data
+
+        monkeypatch.setattr(upwork_client.settings, "UPWORK_CLIENT_SECRET", None)
+        session, connection = self.Session(), self.make_connection()
+
+        upwork_client.refresh_connection_token(session, connection)
+
+        assert decrypt_data(connection.access_token).startswith("test_access_token_")
+        assert connection.expires_at > datetime.utcnow() and session.commits == 1
+
+    def test_rejected_refresh_is_auth_error(self, monkeypatch):
+        from shared.utils import oauth_manager
+
+        monkeypatch.setattr(upwork_client.settings, "UPWORK_CLIENT_SECRET", "secret")
+        requests_made = []
+
+        def post(url, data, timeout):
+            requests_made.append((url, data["grant_type"], data["refresh_token"]))
+            return types.SimpleNamespace(status_code=401, text="invalid_grant")
+
+        monkeypatch.setattr(oauth_manager.requests, "post", post)
+        session = self.Session()
+
+        with pytest.raises(UpworkAuthError) as error:
+            upwork_client.refresh_connection_token(session, self.make_connection())
+
+        assert error.value.status_code == 401 and session.commits == 0
+        assert requests_made == [(oauth_manager.UPWORK_OAUTH2_TOKEN_URL, "refresh_token", "refresh")]
+
+
+class TestMockUpworkAPIClient:
+    """Mock клієнт має той самий асинхронний інтерфейс"""
+
+    @pytest.mark.asyncio
+    async def test_mock_interface(self):
+        client = MockUpworkAPIClient()
+
+        jobs = await client.search_jobs("")
+        job = await client.get_job_details(jobs["jobs"][0]["id"])
+
+        assert jobs["jobs"]
+        assert job
+        for name in ("get_user_profile", "search_jobs", "get_job_details", "submit_proposal", "get_messages",
+                     "send_message", "get_client_info", "get_freelancer_profile", "get_categories",
+                     "get_skills", "get_workdiary", "get_contracts", "get_earnings"):
+            assert hasattr(UpworkAPIClient, name)
+            assert hasattr(MockUpworkAPIClient, name)